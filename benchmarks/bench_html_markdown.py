@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: lxml markdown converter vs. markdownify.
+
+The old path serialized the article element to HTML, ran markdownify over
+all of it, cleaned the result with regexes and only then truncated it to
+MAX_CONTENT_LENGTH. The new path converts the already-parsed element and
+stops at the budget.
+
+Pages come from a directory of saved .html files; without one, a long
+synthetic Distill-style article is generated.
+
+Usage:
+    python benchmarks/bench_html_markdown.py [pages_dir] [--repeat N]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from markdownify import markdownify as md
+
+from paper_library.html_markdown import html_to_markdown
+from paper_library.html_scan import scan_html
+from paper_library.web_fetcher import WebFetcher
+
+
+def synthetic_corpus() -> dict[str, bytes]:
+    """One short and one very long article."""
+    section = (
+        "<section><h2>Section</h2>"
+        + "<p>Features connect into <strong>circuits</strong>, see "
+          "<a href='/ref'>the earlier article</a> and <code>mixed4a</code>.</p>" * 40
+        + "<ul>" + "<li>An observation about a neuron</li>" * 20 + "</ul>"
+        + "<table>" + "<tr><td>unit</td><td>0.42</td></tr>" * 20 + "</table>"
+        + "<pre>for unit in layer:\n    visualize(unit)</pre></section>"
+    )
+    return {
+        "short.html": f"<html><body><article>{section * 2}</article></body></html>".encode(),
+        "long.html": f"<html><body><article>{section * 400}</article></body></html>".encode(),
+    }
+
+
+def legacy_convert(content_html: str, budget: int) -> str:
+    """markdownify + the old _clean_markdown regexes, then truncate."""
+    markdown = md(content_html, heading_style="atx")
+    markdown = re.sub(r'\n\n\n+', '\n\n', markdown)
+    markdown = '\n'.join(line.rstrip() for line in markdown.split('\n')).strip()
+    return markdown[:budget]
+
+
+def best_time(func, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages_dir", nargs="?", type=Path, help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per page (best is kept)")
+    args = parser.parse_args()
+
+    if args.pages_dir:
+        pages = {path.name: path.read_bytes() for path in sorted(args.pages_dir.glob("*.html"))}
+    else:
+        pages = synthetic_corpus()
+    if not pages:
+        sys.exit(f"✗ No .html files in {args.pages_dir}")
+
+    budget = WebFetcher.MAX_CONTENT_LENGTH
+    print(f"{'page':<30} {'KB':>7} {'old ms':>9} {'new ms':>9} {'speedup':>8}")
+    for name, html_content in pages.items():
+        page = scan_html(html_content)
+        if page.content is None:
+            print(f"{name[:30]:<30} ⊘ no content found")
+            continue
+        # The old path started from serialized HTML; that's part of its cost
+        old = best_time(lambda: legacy_convert(page.content_html, budget), args.repeat)
+        new = best_time(lambda: html_to_markdown(page.content, max_chars=budget), args.repeat)
+        print(f"{name[:30]:<30} {len(html_content) / 1024:>7.0f} "
+              f"{old * 1000:>9.1f} {new * 1000:>9.1f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
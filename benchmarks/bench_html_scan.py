@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass lxml scan vs. the old BeautifulSoup sweeps.
+
+The old path parsed with html.parser, ran one soup.find() per metadata
+field, called get_text() on every div for the fallback content, and
+serialized the whole tree again for the paywall check. The new path is
+html_scan.scan_html().
+
+Pages come from a directory of saved .html files (save a few articles with
+your browser's "Save Page As... > HTML only"). Without one, a synthetic
+corpus is generated: a blog post, a long Distill-style article and a deep
+comment thread.
+
+Usage:
+    python benchmarks/bench_html_scan.py [pages_dir] [--repeat N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+
+from paper_library.html_scan import scan_html
+
+
+PARAGRAPH = (
+    "<p>Attention lets every position look at every other position, which is "
+    "expensive, but it parallelizes well and <a href='/ref'>scales</a>.</p>"
+)
+
+
+def synthetic_corpus() -> dict[str, bytes]:
+    """Three representative pages, built in memory."""
+    head = (
+        "<head><title>Page | Site</title>"
+        "<meta property='og:title' content='A Page'>"
+        "<meta property='article:author' content='A. Writer'>"
+        "<meta property='og:site_name' content='Site'></head>"
+    )
+    nav = "<header><nav>" + "<a href='/x'>Link</a>" * 50 + "</nav></header>"
+
+    blog = f"<html>{head}<body>{nav}<article>{PARAGRAPH * 40}</article></body></html>"
+
+    sections = "".join(
+        f"<section><h2>Section {i}</h2>{PARAGRAPH * 30}"
+        f"<table>{'<tr><td>1</td><td>2</td></tr>' * 20}</table></section>"
+        for i in range(40)
+    )
+    distill = f"<html>{head}<body>{nav}<div class='d-article'>{sections}</div></body></html>"
+
+    depth = 200
+    comments = "".join(
+        f"<div class='comment'><div class='body'>{PARAGRAPH}</div>" for _ in range(depth)
+    ) + "</div>" * depth
+    thread = (
+        f"<html>{head}<body>{nav}<div class='post'>{PARAGRAPH * 20}</div>"
+        f"{comments * 5}</body></html>"
+    )
+
+    return {
+        "blog.html": blog.encode(),
+        "distill.html": distill.encode(),
+        "thread.html": thread.encode(),
+    }
+
+
+def legacy_scan(html_content: bytes) -> None:
+    """What WebFetcher._handle_html did before html_scan.py."""
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    for prop in ("og:title", "article:title"):
+        soup.find("meta", property=prop)
+    soup.find("h1")
+    soup.find("title")
+    soup.find_all("meta", property="article:author")
+    soup.find(class_=["byline", "author-name", "author", "author-info"])
+    for prop in ("article:published_time", "datePublished", "og:site_name", "article:publisher"):
+        soup.find("meta", property=prop)
+
+    for tag in soup(["script", "style", "nav", "header", "footer", "aside"]):
+        tag.decompose()
+    content = soup.find("article")
+    if not content:
+        for selector in ("article-content", "post-content", "entry-content", "article-body", "content"):
+            content = soup.find(attrs={"class": selector})
+            if content:
+                break
+    if not content:
+        largest, largest_size = None, 0
+        for tag in soup.find_all(["div", "section"]):
+            text_length = len(tag.get_text(strip=True))
+            if text_length > largest_size and text_length > 200:
+                largest, largest_size = tag, text_length
+        content = largest
+    str(content)
+
+    html_text = str(soup).lower()
+    any(marker in html_text for marker in ("paywall", "subscribe-wall", "metered-paywall", "limited-access"))
+
+
+def new_scan(html_content: bytes) -> None:
+    """The single-pass scan, including serializing the chosen content."""
+    scan_html(html_content).content_html
+
+
+def best_time(func, html_content: bytes, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html_content)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("pages_dir", nargs="?", type=Path, help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per page (best is kept)")
+    args = parser.parse_args()
+
+    if args.pages_dir:
+        pages = {path.name: path.read_bytes() for path in sorted(args.pages_dir.glob("*.html"))}
+    else:
+        pages = synthetic_corpus()
+    if not pages:
+        sys.exit(f"✗ No .html files in {args.pages_dir}")
+
+    print(f"{'page':<30} {'KB':>7} {'old ms':>9} {'new ms':>9} {'speedup':>8}")
+    total_old = total_new = 0.0
+    for name, html_content in pages.items():
+        old = best_time(legacy_scan, html_content, args.repeat)
+        new = best_time(new_scan, html_content, args.repeat)
+        total_old += old
+        total_new += new
+        print(f"{name[:30]:<30} {len(html_content) / 1024:>7.0f} "
+              f"{old * 1000:>9.1f} {new * 1000:>9.1f} {old / new:>7.1f}x")
+    print(f"{'total':<30} {'':>7} {total_old * 1000:>9.1f} {total_new * 1000:>9.1f} "
+          f"{total_old / total_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
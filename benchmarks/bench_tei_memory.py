@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of streaming vs. in-memory TEI parsing.
+
+The in-memory path (_parse_tei) holds the TEI as a str, as bytes and as a
+full lxml tree. The streaming path (_parse_tei_stream, used for GROBID
+responses and cache hits) parses the file in chunks and frees each
+reference and paragraph once extracted.
+
+The documents are synthetic surveys with more and more references; what
+still grows in streaming mode is the output itself (the citations).
+
+Each measurement runs in a fresh subprocess: peak RSS only goes up, and a
+child starts from its parent's peak, so the parent doesn't even build the
+documents itself.
+
+Usage:
+    python benchmarks/bench_tei_memory.py [--sizes 1000,5000,20000]
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_tei_parse import make_document
+
+
+def measure(mode: str, tei_path: Path) -> int:
+    """Run one parse in this process and return the growth of peak RSS in KB."""
+    from paper_library.grobid_processor import GrobidProcessor
+
+    processor = GrobidProcessor("http://localhost:8070")
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if mode == "tree":
+        processor._parse_tei(tei_path.read_text(encoding="utf-8"))
+    else:
+        with open(tei_path, "rb") as tei_file:
+            processor._parse_tei_stream(tei_file)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1000,5000,20000", help="Reference counts to try")
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--write", nargs=2, metavar=("SIZE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(measure(args.measure[0], Path(args.measure[1])))
+        return
+    if args.write:
+        Path(args.write[1]).write_bytes(make_document(int(args.write[0])))
+        return
+
+    print(f"{'references':>10} {'TEI MB':>8} {'tree MB':>8} {'stream MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(n) for n in args.sizes.split(",")):
+            tei_path = Path(tmp) / f"survey-{size}.tei.xml"
+            subprocess.run([sys.executable, __file__, "--write", str(size), str(tei_path)], check=True)
+
+            peaks = {}
+            for mode in ("tree", "stream"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--measure", mode, str(tei_path)],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                peaks[mode] = int(output) / 1024
+
+            print(f"{size:>10} {tei_path.stat().st_size / 1024 / 1024:>8.1f} "
+                  f"{peaks['tree']:>8.0f} {peaks['stream']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Benchmark: precompiled XPath TEI extraction vs. the old per-field find()s.
+
+The old path ran one root.find('.//tei:...') per header field and 8-10
+bibl.find('.//tei:...') per reference. The new path is tei_extract.py:
+one compiled query for the header and one per <biblStruct>. Both must
+produce identical PaperMetadata (and body text); the benchmark checks.
+
+TEI comes from a directory of stored GROBID output (*.tei.xml, or the
+gzipped *.tei.xml.gz entries of the TEI cache in vault/_meta/tei_cache).
+Without one, a synthetic corpus is generated: a typical 30-reference
+paper, a 450-reference survey and a preprint with a sparse header.
+
+Usage:
+    python benchmarks/bench_tei_parse.py [tei_dir] [--repeat N]
+"""
+
+import argparse
+import gzip
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lxml import etree
+
+from paper_library.grobid_processor import GrobidProcessor
+from paper_library.models import Citation, PaperMetadata
+
+
+def reference(i: int) -> str:
+    """One <biblStruct>, varied so every field path gets exercised."""
+    title_level = "m" if i % 5 == 0 else "a"
+    venue = (
+        f'<title level="j">Journal of Studies {i % 17}</title>' if i % 3
+        else f'<meeting>Conference {i % 11}</meeting>'
+    )
+    scopes = (
+        f'<biblScope unit="volume">{i % 40}</biblScope>'
+        f'<biblScope unit="issue">{i % 4}</biblScope>'
+        f'<biblScope unit="page" from="{i}" to="{i + 12}"/>' if i % 2 else ""
+    )
+    doi = f'<idno type="DOI">10.1000/ref.{i}</idno>' if i % 4 == 0 else ""
+    authors = "".join(
+        f'<author><persName><forename type="first">Author{j}</forename>'
+        f'<forename type="middle">M</forename><surname>Surname{i}x{j}</surname></persName>'
+        f'<affiliation><orgName>Institute {j}</orgName></affiliation></author>'
+        for j in range(1 + i % 6)
+    )
+    return f"""
+          <biblStruct xml:id="b{i}">
+            <analytic>
+              <title level="{title_level}" type="main">Learning representations number {i}</title>
+              {authors}
+            </analytic>
+            <monogr>
+              {venue}
+              <imprint>{scopes}<date type="published" when="{1990 + i % 35}"/></imprint>
+            </monogr>
+            {doi}
+            <note type="raw_reference">Surname{i}x0, Learning representations number {i}, {1990 + i % 35}</note>
+          </biblStruct>"""
+
+
+def make_document(references: int, sparse_header: bool = False) -> bytes:
+    """A GROBID-shaped TEI document with a body and `references` references."""
+    header_extras = "" if sparse_header else """
+            <monogr>
+              <title level="j">Journal of Benchmarks</title>
+              <imprint>
+                <biblScope unit="volume">7</biblScope>
+                <biblScope unit="page" from="100" to="130"/>
+                <date type="published" when="2021-03-01">2021</date>
+              </imprint>
+            </monogr>
+            <idno type="DOI">10.1000/paper</idno>"""
+    body = "".join(
+        f'<div><head n="{i}">Section {i}</head>'
+        + '<p>We build on <ref type="bibr" target="#b1">[1]</ref> and extend it.</p>' * 20
+        + "</div>"
+        for i in range(12)
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0">
+  <teiHeader>
+    <fileDesc>
+      <titleStmt><title level="a" type="main">A Benchmark Paper</title></titleStmt>
+      <sourceDesc>
+        <biblStruct>
+          <analytic>
+            <author><persName><forename type="first">Ada</forename><surname>Lovelace</surname></persName></author>
+            <author><persName><forename type="first">Alan</forename><surname>Turing</surname></persName></author>
+          </analytic>{header_extras}
+        </biblStruct>
+      </sourceDesc>
+    </fileDesc>
+    <profileDesc>
+      <abstract><div><p>First paragraph of the abstract.</p><p>Second one.</p></div></abstract>
+    </profileDesc>
+  </teiHeader>
+  <text>
+    <body>{body}</body>
+    <back>
+      <div type="references">
+        <listBibl>{"".join(reference(i) for i in range(references))}
+        </listBibl>
+      </div>
+    </back>
+  </text>
+</TEI>""".encode()
+
+
+def synthetic_corpus() -> dict[str, str]:
+    """Three representative documents, built in memory."""
+    return {
+        "paper-30-refs": make_document(30).decode(),
+        "survey-450-refs": make_document(450).decode(),
+        "preprint-sparse-header": make_document(60, sparse_header=True).decode(),
+    }
+
+
+def load_corpus(tei_dir: Path) -> dict[str, str]:
+    """Stored TEI files, plain or gzipped (as in the TEI cache)."""
+    corpus = {}
+    for path in sorted(tei_dir.glob("*.tei.xml")):
+        corpus[path.name] = path.read_text(encoding="utf-8")
+    for path in sorted(tei_dir.glob("*.tei.xml.gz")):
+        corpus[path.name] = gzip.decompress(path.read_bytes()).decode("utf-8")
+    return corpus
+
+
+class LegacyProcessor(GrobidProcessor):
+    """GrobidProcessor's TEI extraction before tei_extract.py (one find() per field)."""
+
+    def _parse_tei(self, xml_content: str) -> tuple[PaperMetadata, Optional[str]]:
+        root = etree.fromstring(xml_content.encode("utf-8"))
+        title = self._legacy_title(root)
+        authors = self._legacy_authors(root)
+        year = self._legacy_year(root)
+        abstract = self._legacy_abstract(root)
+        venue = self._legacy_venue(root)
+        volume, issue, pages = self._legacy_publication_info(root)
+        doi = self._legacy_doi(root)
+        citations = self._legacy_citations(root)
+        body_text = self._extract_body_text(root, abstract)
+        metadata = PaperMetadata(
+            title=title, authors=authors, year=year, abstract=abstract, venue=venue,
+            volume=volume, issue=issue, pages=pages, doi=doi, citations=citations,
+            source="grobid"
+        )
+        return metadata, body_text
+
+    def _legacy_title(self, root):
+        for path in ('.//tei:titleStmt/tei:title[@type="main"]', './/tei:analytic/tei:title[@type="main"]'):
+            title_elem = root.find(path, self.NS)
+            if title_elem is not None and title_elem.text:
+                return self._clean_title(title_elem.text.strip())
+        return None
+
+    def _legacy_authors(self, root):
+        authors = []
+        for author_elem in root.findall('.//tei:analytic/tei:author', self.NS):
+            persname = author_elem.find('tei:persName', self.NS)
+            if persname is None:
+                continue
+            surname_elem = persname.find('tei:surname', self.NS)
+            surname = surname_elem.text.strip() if surname_elem is not None and surname_elem.text else ""
+            forenames = [f.text.strip() for f in persname.findall('tei:forename', self.NS) if f.text]
+            if surname:
+                authors.append(f"{surname}, {' '.join(forenames)}" if forenames else surname)
+        return authors
+
+    def _legacy_year(self, root):
+        date_elem = root.find('.//tei:monogr/tei:imprint/tei:date[@type="published"]', self.NS)
+        if date_elem is not None:
+            date_str = date_elem.get('when') or date_elem.text
+            if date_str:
+                try:
+                    return int(date_str.strip()[:4])
+                except (ValueError, IndexError):
+                    pass
+        return None
+
+    def _legacy_abstract(self, root):
+        abstract_elem = root.find('.//tei:profileDesc/tei:abstract', self.NS)
+        if abstract_elem is not None:
+            paragraphs = []
+            for p_elem in abstract_elem.findall('.//tei:p', self.NS):
+                text = "".join(p_elem.itertext()).strip()
+                if text:
+                    paragraphs.append(text)
+            if paragraphs:
+                return "\n\n".join(paragraphs)
+        return None
+
+    def _legacy_venue(self, elem):
+        venue_elem = elem.find('.//tei:monogr/tei:title[@level="j"]', self.NS)
+        return venue_elem.text.strip() if venue_elem is not None and venue_elem.text else None
+
+    def _legacy_publication_info(self, elem):
+        imprint = elem.find('.//tei:monogr/tei:imprint', self.NS)
+        if imprint is None:
+            return None, None, None
+        volume_elem = imprint.find('tei:biblScope[@unit="volume"]', self.NS)
+        volume = volume_elem.text.strip() if volume_elem is not None and volume_elem.text else None
+        issue_elem = imprint.find('tei:biblScope[@unit="issue"]', self.NS)
+        issue = issue_elem.text.strip() if issue_elem is not None and issue_elem.text else None
+        page_elem = imprint.find('tei:biblScope[@unit="page"]', self.NS)
+        pages = None
+        if page_elem is not None:
+            from_page, to_page = page_elem.get('from'), page_elem.get('to')
+            if from_page and to_page:
+                pages = f"{from_page}-{to_page}"
+            elif page_elem.text:
+                pages = page_elem.text.strip()
+        return volume, issue, pages
+
+    def _legacy_doi(self, elem):
+        doi_elem = elem.find('.//tei:idno[@type="DOI"]', self.NS)
+        return doi_elem.text.strip() if doi_elem is not None and doi_elem.text else None
+
+    def _legacy_citations(self, root):
+        citations = []
+        listbibl = root.find('.//tei:back//tei:listBibl', self.NS)
+        if listbibl is None:
+            return citations
+        for bibl in listbibl.findall('tei:biblStruct', self.NS):
+            raw_text = re.sub(r'\s+', ' ', "".join(bibl.itertext()).strip())
+            if len(raw_text) < 10:
+                continue
+            title_elem = bibl.find('.//tei:title[@level="a"]', self.NS)
+            if title_elem is None:
+                title_elem = bibl.find('.//tei:title[@level="m"]', self.NS)
+            title = title_elem.text.strip() if title_elem is not None and title_elem.text else None
+            authors = []
+            for author_elem in bibl.findall('.//tei:author', self.NS):
+                persname = author_elem.find('tei:persName', self.NS)
+                if persname is not None:
+                    surname = persname.find('tei:surname', self.NS)
+                    forenames = persname.findall('tei:forename', self.NS)
+                    if surname is not None and surname.text:
+                        name_parts = [surname.text.strip()]
+                        name_parts.extend(f.text[0] + "." for f in forenames if f.text)
+                        authors.append(" ".join(name_parts))
+            date_elem = bibl.find('.//tei:date[@type="published"]', self.NS)
+            year = None
+            if date_elem is not None:
+                date_str = date_elem.get('when') or date_elem.text
+                if date_str:
+                    try:
+                        year = int(date_str[:4])
+                    except (ValueError, IndexError):
+                        pass
+            volume, issue, pages = self._legacy_publication_info(bibl)
+            citation = Citation(
+                raw_text=raw_text, authors=authors if authors else None, title=title,
+                year=year, venue=self._legacy_venue(bibl), volume=volume, issue=issue,
+                pages=pages, doi=self._legacy_doi(bibl), mention_count=1
+            )
+            if self._calculate_garbage_score(citation) > 60:
+                continue
+            citations.append(citation)
+        return citations
+
+
+def best_time(func, xml_content: str, repeat: int) -> float:
+    """Fastest of `repeat` runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(xml_content)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("tei_dir", nargs="?", type=Path, help="Directory of stored TEI (*.tei.xml[.gz])")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per document (best is kept)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.tei_dir) if args.tei_dir else synthetic_corpus()
+    if not corpus:
+        sys.exit(f"✗ No TEI files in {args.tei_dir}")
+
+    legacy = LegacyProcessor("http://localhost:8070")
+    current = GrobidProcessor("http://localhost:8070")
+
+    print(f"{'document':<30} {'refs':>5} {'old ms':>9} {'new ms':>9} {'speedup':>8}")
+    total_old = total_new = 0.0
+    for name, xml_content in corpus.items():
+        try:
+            expected = legacy._parse_tei(xml_content)
+        except Exception as e:
+            print(f"⊘ {name[:30]}: {e}")
+            continue
+        metadata, body_text = current._parse_tei(xml_content)
+        if (metadata.model_dump(), body_text) != (expected[0].model_dump(), expected[1]):
+            sys.exit(f"✗ {name}: output differs from the old extraction")
+
+        old = best_time(legacy._parse_tei, xml_content, args.repeat)
+        new = best_time(current._parse_tei, xml_content, args.repeat)
+        total_old += old
+        total_new += new
+        print(f"{name[:30]:<30} {len(metadata.citations):>5} "
+              f"{old * 1000:>9.1f} {new * 1000:>9.1f} {old / new:>7.1f}x")
+    if total_new:
+        print(f"{'total':<30} {'':>5} {total_old * 1000:>9.1f} {total_new * 1000:>9.1f} "
+              f"{total_old / total_new:>7.1f}x")
+    print("✓ Identical PaperMetadata and body text for every document")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,15 +11,22 @@ Python concepts:
 - XML parsing (arXiv API returns Atom XML)
 - File downloading
 - Regular expressions for ID parsing
+- async/await versions of the same calls (for AsyncPaperProcessor)
+- Bulk queries: many IDs per API call, cached in memory for fetch()
 """
 
 import re
+import threading
+import httpx
 import requests
 from pathlib import Path
 from typing import Optional, Tuple
 from lxml import etree
 
+from paper_library.downloads import DownloadError, DownloadManager, is_complete_pdf
+from paper_library.http_cache import HttpCache, cached_get, cached_get_async
 from paper_library.models import PaperMetadata
+from paper_library.rate_limit import limited_session
 
 
 class ArxivError(Exception):
@@ -39,6 +46,10 @@ class ArxivFetcher:
     Usage:
         fetcher = ArxivFetcher(vault_path=Path("./vault"))
         pdf_path, metadata = fetcher.fetch("2312.12345")
+        
+        # For batches: one API call per PREFETCH_CHUNK_SIZE papers
+        fetcher.prefetch_metadata(["2312.12345", "1706.03762"])
+        pdf_path, metadata = fetcher.fetch("1706.03762")  # No metadata request
     """
     
     # arXiv API endpoint
@@ -51,18 +62,36 @@ class ArxivFetcher:
         'arxiv': 'http://arxiv.org/schemas/atom'
     }
     
-    def __init__(self, vault_path: Path):
+    # IDs per bulk metadata query (arXiv asks for modest result pages)
+    PREFETCH_CHUNK_SIZE = 50
+    
+    def __init__(
+        self,
+        vault_path: Path,
+        downloads: Optional[DownloadManager] = None,
+        http_cache: Optional[HttpCache] = None
+    ):
         """
         Initialize the arXiv fetcher.
         
         Args:
             vault_path: Path to vault (for storing PDFs)
+            downloads: Shared DownloadManager (a private one is created if None)
+            http_cache: Optional HTTP cache; unchanged API responses come from disk
         """
         self.vault_path = vault_path
         self.pdfs_dir = vault_path / "PDFs"
+        self.downloads = downloads or DownloadManager()
+        self.http_cache = http_cache
+        # API requests are paced per host (arXiv: one every 3 s)
+        self.session = limited_session(pool_size=1)
         
         # Ensure PDFs directory exists
         self.pdfs_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Metadata from prefetch_metadata(), used (once) by fetch()
+        self._metadata_cache: dict[str, PaperMetadata] = {}
+        self._cache_lock = threading.Lock()
     
     def fetch(self, arxiv_id: str) -> Tuple[Path, PaperMetadata]:
         """
@@ -90,8 +119,8 @@ class ArxivFetcher:
         
         print(f"→ Fetching arXiv {clean_id}...")
         
-        # Fetch metadata from API
-        metadata = self._fetch_metadata(clean_id)
+        # Fetch metadata from API (unless prefetched)
+        metadata = self._take_cached_metadata(clean_id) or self._fetch_metadata(clean_id)
         
         # Download PDF
         pdf_path = self._download_pdf(clean_id)
@@ -103,6 +132,110 @@ class ArxivFetcher:
         
         return pdf_path, metadata
     
+    async def fetch_async(
+        self,
+        arxiv_id: str,
+        client: httpx.AsyncClient
+    ) -> Tuple[Path, PaperMetadata]:
+        """
+        Async version of fetch() for use on an event loop.
+        
+        Same steps and same parsing as fetch(), but the HTTP calls are
+        awaited on a shared httpx.AsyncClient instead of blocking a thread.
+        
+        Args:
+            arxiv_id: arXiv identifier
+            client: Shared async HTTP client
+            
+        Returns:
+            Tuple of (pdf_path, metadata)
+            
+        Raises:
+            ArxivError: If fetching fails
+        """
+        clean_id = self.parse_arxiv_id(arxiv_id)
+        if not clean_id:
+            raise ArxivError(f"Invalid arXiv ID: {arxiv_id}")
+        
+        print(f"→ Fetching arXiv {clean_id}...")
+        
+        # Metadata (unless prefetched)
+        metadata = self._take_cached_metadata(clean_id)
+        if metadata is None:
+            try:
+                content = await cached_get_async(
+                    client,
+                    f"{self.API_BASE}?id_list={clean_id}",
+                    self.http_cache,
+                    timeout=30
+                )
+            except httpx.HTTPError as e:
+                raise ArxivError(f"Failed to fetch metadata from arXiv: {e}")
+            metadata = self._parse_metadata_response(content, clean_id)
+        
+        # PDF
+        pdf_path = self._pdf_path_for(clean_id)
+        if is_complete_pdf(pdf_path):
+            print(f"  ✓ PDF already exists: {pdf_path.name}")
+        else:
+            try:
+                print(f"  → Downloading PDF from arXiv...")
+                await self.downloads.download_pdf_async(
+                    f"{self.PDF_BASE}/{clean_id}.pdf", pdf_path, client
+                )
+                print(f"  ✓ PDF downloaded: {pdf_path.name}")
+            except DownloadError as e:
+                raise ArxivError(f"Failed to download PDF: {e}")
+        
+        metadata.pdf_path = str(pdf_path)
+        metadata.arxiv_id = clean_id
+        metadata.source = "arxiv"
+        
+        return pdf_path, metadata
+    
+    def prefetch_metadata(self, arxiv_ids: list[str]) -> int:
+        """
+        Fetch metadata for many papers with a few bulk API calls.
+        
+        The arXiv API accepts comma-separated ID lists, so a batch of 200
+        papers needs 4 requests instead of 200. Results are kept in memory
+        until fetch() (or fetch_async()) asks for them.
+        
+        A failed chunk is only a warning: fetch() falls back to the
+        per-paper request for anything that wasn't prefetched.
+        
+        Args:
+            arxiv_ids: arXiv identifiers in any format parse_arxiv_id() accepts
+            
+        Returns:
+            Number of papers whose metadata was cached
+        """
+        wanted = []
+        with self._cache_lock:
+            for arxiv_id in arxiv_ids:
+                clean_id = self.parse_arxiv_id(arxiv_id)
+                if clean_id and clean_id not in self._metadata_cache and clean_id not in wanted:
+                    wanted.append(clean_id)
+        
+        cached = 0
+        for start in range(0, len(wanted), self.PREFETCH_CHUNK_SIZE):
+            chunk = wanted[start:start + self.PREFETCH_CHUNK_SIZE]
+            try:
+                # max_results defaults to 10, so ask for the whole chunk
+                url = f"{self.API_BASE}?id_list={','.join(chunk)}&max_results={len(chunk)}"
+                found = self._parse_feed(cached_get(self.session, url, self.http_cache, timeout=60))
+            except (requests.RequestException, ArxivError) as e:
+                print(f"  Warning: arXiv metadata prefetch failed for {len(chunk)} papers: {e}")
+                continue
+            
+            with self._cache_lock:
+                for clean_id in chunk:
+                    if clean_id in found:
+                        self._metadata_cache[clean_id] = found[clean_id]
+                        cached += 1
+        
+        return cached
+    
     def parse_arxiv_id(self, text: str) -> Optional[str]:
         """
         Parse arXiv ID from various formats.
@@ -187,49 +320,121 @@ class ArxivFetcher:
             # id_list parameter searches by arXiv ID
             url = f"{self.API_BASE}?id_list={arxiv_id}"
             
-            # Make request with timeout
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse XML
-            root = etree.fromstring(response.content)
-            
-            # Find entry element (the paper)
-            entry = root.find('atom:entry', self.NS)
-            if entry is None:
-                raise ArxivError(f"Paper not found: {arxiv_id}")
+            # Make request with timeout (a 304 is answered from the HTTP cache)
+            content = cached_get(self.session, url, self.http_cache, timeout=30)
             
-            # Extract fields
-            title = self._extract_text(entry, 'atom:title')
-            authors = self._extract_authors(entry)
-            year = self._extract_year(entry)
-            abstract = self._extract_text(entry, 'atom:summary')
+        except requests.RequestException as e:
+            raise ArxivError(f"Failed to fetch metadata from arXiv: {e}")
+        
+        return self._parse_metadata_response(content, arxiv_id)
+    
+    def _parse_metadata_response(self, content: bytes, arxiv_id: str) -> PaperMetadata:
+        """
+        Parse an arXiv API Atom response into PaperMetadata.
+        
+        Shared by the blocking and async fetch paths.
+        
+        Args:
+            content: Raw Atom XML bytes from the API
+            arxiv_id: Clean arXiv ID that was requested
             
-            # Clean up title and abstract (remove extra whitespace)
-            if title:
-                # arXiv titles often have newlines and extra spaces
-                title = " ".join(title.split())
-            if abstract:
-                abstract = " ".join(abstract.split())
+        Returns:
+            PaperMetadata object
             
-            # Validate required fields
-            if not title or not authors or not year:
-                raise ArxivError(
-                    f"Incomplete metadata from arXiv for {arxiv_id}"
-                )
+        Raises:
+            ArxivError: If the response is invalid or incomplete
+        """
+        try:
+            # Parse XML
+            root = etree.fromstring(content)
+        except etree.XMLSyntaxError as e:
+            raise ArxivError(f"Invalid XML from arXiv API: {e}")
+        
+        # Find entry element (the paper)
+        entry = root.find('atom:entry', self.NS)
+        if entry is None:
+            raise ArxivError(f"Paper not found: {arxiv_id}")
+        
+        return self._metadata_from_entry(entry, arxiv_id)
+    
+    def _parse_feed(self, content: bytes) -> dict[str, PaperMetadata]:
+        """
+        Parse every entry of a multi-ID Atom response in one pass.
+        
+        Each entry's <id> is its abs URL (http://arxiv.org/abs/2312.12345v2),
+        which tells us which paper it is. Entries that aren't papers (arXiv
+        reports bad IDs as error entries) or lack required fields are skipped.
+        
+        Args:
+            content: Raw Atom XML bytes from the API
             
-            return PaperMetadata(
-                title=title,
-                authors=authors,
-                year=year,
-                abstract=abstract,
-                arxiv_id=arxiv_id
-            )
+        Returns:
+            Dictionary of clean arXiv ID -> PaperMetadata
             
-        except requests.RequestException as e:
-            raise ArxivError(f"Failed to fetch metadata from arXiv: {e}")
+        Raises:
+            ArxivError: If the response isn't valid XML
+        """
+        try:
+            root = etree.fromstring(content)
         except etree.XMLSyntaxError as e:
             raise ArxivError(f"Invalid XML from arXiv API: {e}")
+        
+        found = {}
+        for entry in root.iterfind('atom:entry', self.NS):
+            arxiv_id = self.parse_arxiv_id(self._extract_text(entry, 'atom:id') or "")
+            if not arxiv_id:
+                continue
+            try:
+                found[arxiv_id] = self._metadata_from_entry(entry, arxiv_id)
+            except ArxivError:
+                continue
+        return found
+    
+    def _take_cached_metadata(self, arxiv_id: str) -> Optional[PaperMetadata]:
+        """Remove and return prefetched metadata for a clean ID, if any."""
+        with self._cache_lock:
+            return self._metadata_cache.pop(arxiv_id, None)
+    
+    def _metadata_from_entry(self, entry: etree._Element, arxiv_id: str) -> PaperMetadata:
+        """
+        Build PaperMetadata from one Atom <entry>.
+        
+        Args:
+            entry: Entry element from arXiv API
+            arxiv_id: Clean arXiv ID of the entry
+            
+        Returns:
+            PaperMetadata object
+            
+        Raises:
+            ArxivError: If required fields are missing
+        """
+        # Extract fields
+        title = self._extract_text(entry, 'atom:title')
+        authors = self._extract_authors(entry)
+        year = self._extract_year(entry)
+        abstract = self._extract_text(entry, 'atom:summary')
+        
+        # Clean up title and abstract (remove extra whitespace)
+        if title:
+            # arXiv titles often have newlines and extra spaces
+            title = " ".join(title.split())
+        if abstract:
+            abstract = " ".join(abstract.split())
+        
+        # Validate required fields
+        if not title or not authors or not year:
+            raise ArxivError(
+                f"Incomplete metadata from arXiv for {arxiv_id}"
+            )
+        
+        return PaperMetadata(
+            title=title,
+            authors=authors,
+            year=year,
+            abstract=abstract,
+            arxiv_id=arxiv_id
+        )
     
     def _extract_text(self, element: etree._Element, xpath: str) -> Optional[str]:
         """
@@ -307,11 +512,20 @@ class ArxivFetcher:
         
         return None
     
+    def _pdf_path_for(self, arxiv_id: str) -> Path:
+        """
+        Where the PDF for an arXiv ID lives in the vault.
+        
+        Format: PDFs/arxiv_YYMM.NNNNN.pdf (old-style "/" becomes "_")
+        """
+        return self.pdfs_dir / f"arxiv_{arxiv_id.replace('/', '_')}.pdf"
+    
     def _download_pdf(self, arxiv_id: str) -> Path:
         """
         Download PDF from arXiv.
         
         PDFs are available at: https://arxiv.org/pdf/{id}.pdf
+        The transfer itself is handled by DownloadManager (see downloads.py).
         
         Args:
             arxiv_id: Clean arXiv ID
@@ -326,36 +540,25 @@ class ArxivFetcher:
         pdf_url = f"{self.PDF_BASE}/{arxiv_id}.pdf"
         
         # Destination path
-        # Format: PDFs/arxiv_YYMM.NNNNN.pdf
-        pdf_filename = f"arxiv_{arxiv_id.replace('/', '_')}.pdf"
-        pdf_path = self.pdfs_dir / pdf_filename
+        pdf_path = self._pdf_path_for(arxiv_id)
+        pdf_filename = pdf_path.name
         
-        # Skip if already downloaded
-        if pdf_path.exists():
+        # Skip if already downloaded (and complete: a truncated file is resumed)
+        if is_complete_pdf(pdf_path):
             print(f"  ✓ PDF already exists: {pdf_filename}")
             return pdf_path
         
         try:
             print(f"  → Downloading PDF from arXiv...")
             
-            # Stream the download (PDFs can be large)
-            # stream=True means we download in chunks
-            response = requests.get(pdf_url, timeout=120, stream=True)
-            response.raise_for_status()
-            
-            # Write to file in chunks
-            with open(pdf_path, 'wb') as f:
-                # Download in 8KB chunks
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            # Streams to a .part file, resumes with Range requests on
+            # errors, and only renames it to pdf_path once it's a whole PDF
+            self.downloads.download_pdf(pdf_url, pdf_path)
             
             print(f"  ✓ PDF downloaded: {pdf_filename}")
             return pdf_path
             
-        except requests.RequestException as e:
-            # Clean up partial file if download failed
-            if pdf_path.exists():
-                pdf_path.unlink()
+        except DownloadError as e:
             raise ArxivError(f"Failed to download PDF: {e}")
 
 
@@ -0,0 +1,398 @@
+"""
+Asyncio-native paper processing orchestrator.
+
+PaperProcessor makes blocking calls (requests + the synchronous Anthropic
+client), so the only way to have many papers in flight is more threads or
+processes. AsyncPaperProcessor runs the same pipeline on a single event loop:
+every network wait is a coroutine, and each remote service gets its own
+semaphore so we never exceed what it can take:
+
+- GROBID: starts at config.grobid_pool_size (GROBID_POOL_SIZE in
+  docker-compose.yml) and adapts to 503s (GrobidClient, grobid_client.py)
+- Anthropic: config.anthropic_max_concurrency (your API rate tier)
+- arXiv: config.arxiv_max_concurrency (their politeness limit)
+
+The non-network steps (merging metadata, writing notes, updating state) are
+shared with PaperProcessor, so both processors produce identical notes.
+So are its stage checkpoints and the duplicate-PDF check: an interrupted
+async batch resumes each paper at its first unfinished stage, and the
+same PDF under two names is only processed once.
+Those that touch the disk (hashing PDFs, rewriting JSON state, writing
+notes) run in worker threads via asyncio.to_thread, so one paper's file
+work never stalls the others' network waits.
+
+Python concepts:
+- async/await: Functions that can pause while waiting on I/O
+- asyncio.Semaphore: "At most N coroutines inside this block at once"
+- asyncio.to_thread: Run a blocking function (CPU or disk) without freezing the loop
+- Async context managers (async with)
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+
+from paper_library.config import config
+from paper_library.grobid_processor import GrobidUnavailableError
+from paper_library.state import StateManager
+from paper_library.orchestrator import PaperJob, PaperProcessor, ProcessingError
+from paper_library.rate_limit import RateLimitedTransport
+
+
+class AsyncPaperProcessor:
+    """
+    Orchestrate the paper processing pipeline on one event loop.
+
+    Supports the same identifiers as PaperProcessor (arXiv IDs, local PDFs)
+    plus web articles via WebFetcher.
+
+    Usage:
+        state = StateManager.load()
+        processor = AsyncPaperProcessor(config, state)
+
+        # From synchronous code
+        results = asyncio.run(processor.process_batch(identifiers))
+
+        # From async code
+        await processor.process("2312.12345")
+    """
+
+    def __init__(self, config, state_manager: StateManager):
+        """
+        Initialize the processor.
+
+        Args:
+            config: Configuration object
+            state_manager: State manager for tracking processed papers
+        """
+        self.config = config
+        self.state = state_manager
+
+        # Reuse PaperProcessor's components and non-network steps
+        self._sync = PaperProcessor(config, state_manager)
+        self.arxiv_fetcher = self._sync.arxiv_fetcher
+        self.grobid = self._sync.grobid
+        self.synthesis_gen = self._sync.synthesis_gen
+        self.markdown_writer = self._sync.markdown_writer
+
+        # Imported here so web support stays optional for paper-only use
+        from paper_library.web_fetcher import WebFetcher
+        self.web_fetcher = WebFetcher(config.vault_path, http_cache=self._sync.http_cache)
+
+        # Per-service concurrency limits
+        self.limits = {
+            "grobid": self._sync.grobid_client.limit.maximum,
+            "anthropic": config.anthropic_max_concurrency,
+            "arxiv": config.arxiv_max_concurrency,
+        }
+
+        # Created inside the running event loop by _session()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def _session(self):
+        """
+        Open the shared HTTP client and semaphores for a run.
+
+        Nested calls (process() inside process_batch()) reuse the outer session.
+        """
+        if self._client is not None:
+            yield
+            return
+
+        self._semaphores = {
+            name: asyncio.Semaphore(max(1, limit))
+            for name, limit in self.limits.items()
+        }
+        # Every request is paced per host and honors Retry-After (see rate_limit.py)
+        async with httpx.AsyncClient(transport=RateLimitedTransport()) as client:
+            self._client = client
+            try:
+                yield
+            finally:
+                self._client = None
+                self._semaphores = {}
+
+    async def process(self, identifier: str, force: bool = False) -> bool:
+        """
+        Process a single paper or article.
+
+        Args:
+            identifier: arXiv ID, local PDF path, or web URL
+            force: If True, reprocess even if already done
+
+        Returns:
+            True if successful, False if skipped (already processed)
+
+        Raises:
+            ProcessingError: If processing fails
+        """
+        # May fingerprint vault/PDFs on first use, so off the loop
+        if not force and await asyncio.to_thread(self._sync.is_processed, identifier):
+            print(f"⊘ Already processed: {identifier}")
+            return False
+
+        async with self._session():
+            try:
+                if self._is_web_url(identifier):
+                    await self._process_article(identifier)
+                elif not await self._process_paper(identifier, force):
+                    return False  # Same PDF as a processed paper
+            except Exception as e:
+                await asyncio.to_thread(
+                    self.state.mark_failed, self._sync.identifiers.resolve(identifier), str(e)
+                )
+                print(f"✗ FAILED: {identifier}: {e}")
+                raise ProcessingError(f"Failed to process {identifier}: {e}") from e
+
+        print(f"✓ SUCCESS: {identifier}")
+        return True
+
+    async def process_batch(
+        self,
+        identifiers: list[str],
+        stop_on_error: bool = False,
+        force: bool = False
+    ) -> dict:
+        """
+        Process many papers concurrently.
+
+        Every identifier becomes a coroutine right away; the per-service
+        semaphores decide how many actually talk to each service at once.
+
+        Args:
+            identifiers: List of paper identifiers
+            stop_on_error: If True, cancel remaining papers on first error
+            force: If True, reprocess even if already done
+
+        Returns:
+            Dictionary with results: {"success": int, "failed": int, "skipped": int}
+        """
+        results = {
+            "success": 0,
+            "failed": 0,
+            "skipped": 0,
+            "errors": []
+        }
+
+        print(f"\n{'='*70}")
+        print(f"ASYNC BATCH PROCESSING: {len(identifiers)} papers")
+        if force:
+            print(f"  --force enabled: Reprocessing all papers")
+        print(f"{'='*70}\n")
+
+        identifiers = self._sync.dedupe(identifiers, results)
+
+        # Bulk arXiv metadata (blocking requests, so off the event loop)
+        await asyncio.to_thread(self._sync.prefetch_arxiv_metadata, identifiers, force)
+
+        async def run_one(identifier: str) -> tuple[str, Optional[bool], Optional[str]]:
+            # Return the outcome instead of raising so one failure
+            # doesn't tear down the whole batch
+            try:
+                return identifier, await self.process(identifier, force=force), None
+            except Exception as e:
+                return identifier, None, str(e)
+
+        async with self._session():
+            tasks = [asyncio.create_task(run_one(identifier)) for identifier in identifiers]
+
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    identifier, success, error = await next_done
+                    if error is not None:
+                        results["failed"] += 1
+                        results["errors"].append((identifier, error))
+                        if stop_on_error:
+                            print(f"\n✗ Stopping batch due to error")
+                            break
+                    elif success:
+                        results["success"] += 1
+                    else:
+                        results["skipped"] += 1
+            finally:
+                # Cancel anything still running (stop_on_error or Ctrl-C)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        # GROBID may be back already for papers that had to go without it
+        enrichment = None
+        if self._sync.enrichment.identifiers():
+            enrichment = await asyncio.to_thread(self._sync.reenrich)
+
+        print(f"\n{'='*70}")
+        print(f"BATCH COMPLETE")
+        print(f"{'='*70}")
+        print(f"  ✓ Processed: {results['success']}")
+        print(f"  ⊘ Skipped:   {results['skipped']}")
+        print(f"  ✗ Failed:    {results['failed']}")
+        if self.grobid.cache is not None:
+            stats = self.grobid.cache.stats()
+            print(f"  TEI cache:   {stats['hits']} hits, {stats['misses']} misses")
+        if self.synthesis_gen.cache is not None:
+            stats = self.synthesis_gen.cache.stats()
+            print(f"  Synthesis cache: {stats['hits']} hits, {stats['misses']} misses")
+        if self._sync.http_cache is not None:
+            stats = self._sync.http_cache.stats()
+            print(f"  HTTP cache:  {stats['hits']} not modified, {stats['misses']} downloaded")
+        if enrichment is not None:
+            print(f"  ⚠ Without GROBID: {enrichment['remaining']} papers waiting "
+                  f"for reenrich() ({enrichment['enriched']} enriched now)")
+        stats = self._sync.grobid_client.stats()
+        if stats["uploads"] or stats["failures"]:
+            print(f"  GROBID:      {stats['uploads']} uploads, {stats['overloads']} busy (503), "
+                  f"window {stats['window']:.1f}, p95 {stats['latency_p95'] or 0:.1f}s")
+        print(f"{'='*70}\n")
+
+        return results
+
+    async def _grobid_extract(self, job: PaperJob, tiers: list[str]) -> None:
+        """Async version of PaperProcessor._grobid_extract()."""
+        async with self._semaphores["grobid"]:
+            if "fulltext" in tiers:
+                grobid_metadata, body_text = await self.grobid.process_with_text_async(
+                    job.pdf_path, self._client
+                )
+                job.metadata = self._sync._merge_metadata(job.metadata, grobid_metadata)
+                self._sync._use_grobid_text(job, body_text)
+                return
+
+            if "header" in tiers:
+                header = await self.grobid.process_header_async(job.pdf_path, self._client)
+                job.metadata = self._sync._merge_metadata(job.metadata, header)
+            job.metadata.citations = await self.grobid.process_references_async(
+                job.pdf_path, self._client
+            )
+
+    async def _process_paper(self, identifier: str, force: bool = False) -> bool:
+        """
+        Run the paper pipeline (arXiv ID or local PDF) for one identifier.
+
+        Stages go through _run_stage(), so a checkpoint from an interrupted
+        run (sync or async) is picked up and each finished stage is saved.
+
+        Args:
+            identifier: arXiv ID or local PDF path
+            force: If True, ignore checkpoints and the duplicate-PDF check
+
+        Returns:
+            True if processed, False if the PDF is a copy of a processed paper
+        """
+        job = PaperJob(identifier=identifier)
+
+        # Reads the checkpoint file, so off the loop
+        await asyncio.to_thread(self._sync._resume, job, force)
+        if job.completed:
+            print(f"↻ Resuming {identifier} from checkpoint (done: {', '.join(job.completed)})")
+
+        await self._run_stage(job, "fetch", self._stage_fetch)
+
+        # Hashes the PDF, so off the loop
+        if not force and await asyncio.to_thread(self._sync._is_duplicate_pdf, job):
+            return False
+
+        await self._run_stage(job, "grobid", self._stage_grobid)
+
+        # pdfplumber fallback is CPU work, keep it off the event loop
+        await self._run_stage(job, "text", self._in_thread(self._sync._stage_extract_text))
+
+        await self._run_stage(job, "synthesis", self._stage_synthesize)
+
+        # Write the note and update state (disk: JSON rewrites, PDF fingerprint)
+        await self._run_stage(job, "write", self._in_thread(self._sync._stage_write))
+        await self._run_stage(job, "state", self._in_thread(self._sync._stage_update_state))
+        return True
+
+    async def _run_stage(self, job: PaperJob, name: str, stage) -> None:
+        """Async version of PaperProcessor._run_stage(): skip if done, then checkpoint."""
+        if name in job.completed:
+            return
+        await stage(job)
+        await asyncio.to_thread(self._sync._checkpoint, job, name)
+
+    def _in_thread(self, func):
+        """Wrap a blocking PaperProcessor stage as a coroutine that runs it in a thread."""
+        async def run(job: PaperJob) -> None:
+            await asyncio.to_thread(func, job)
+        return run
+
+    async def _stage_fetch(self, job: PaperJob) -> None:
+        """Stage 1: Fetch the PDF and source metadata."""
+        if self.arxiv_fetcher.parse_arxiv_id(job.identifier):
+            async with self._semaphores["arxiv"]:
+                job.pdf_path, job.metadata = await self.arxiv_fetcher.fetch_async(
+                    job.identifier, self._client
+                )
+        else:
+            # Local PDFs need no network; reuse the sync fetch logic
+            # (it hashes the PDF for the duplicate check, so off the loop)
+            await asyncio.to_thread(self._sync._stage_fetch, job)
+
+    async def _stage_grobid(self, job: PaperJob) -> None:
+        """Stage 2: GROBID (only the tiers we need, as in PaperProcessor)."""
+        try:
+            await self._grobid_extract(job, self._sync._grobid_tiers(job.metadata))
+        except GrobidUnavailableError as e:
+            # Degraded: source metadata, no citations (reads the PDF, so off the loop)
+            await asyncio.to_thread(self._sync._without_grobid, job, e)
+
+    async def _stage_synthesize(self, job: PaperJob) -> None:
+        """Stage 4: Claude."""
+        async with self._semaphores["anthropic"]:
+            job.synthesis = await self.synthesis_gen.generate_quick_synthesis_async(
+                job.text, job.metadata
+            )
+
+    async def _process_article(self, url: str) -> None:
+        """
+        Fetch a web article, synthesize it, and write an article note.
+
+        Args:
+            url: Article URL
+        """
+        metadata, content = await self.web_fetcher.fetch_async(url, self._client)
+
+        if metadata.source == "pdf_from_web":
+            raise ProcessingError(
+                f"PDF URLs aren't supported by the async processor yet. "
+                f"Download the PDF and pass its local path instead: {url}"
+            )
+
+        async with self._semaphores["anthropic"]:
+            synthesis = await self.synthesis_gen.generate_quick_synthesis_async(content, metadata)
+
+        markdown = self.markdown_writer.article_to_markdown(metadata, synthesis, content)
+        filename = self.markdown_writer.generate_filename(metadata)
+
+        output_dir = self.config.articles_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread((output_dir / f"{filename}.md").write_text, markdown, encoding='utf-8')
+
+        await asyncio.to_thread(self.state.mark_processed, self._sync.identifiers.resolve(url), "web")
+
+    def _is_web_url(self, identifier: str) -> bool:
+        """True for http(s) URLs that aren't arXiv links."""
+        return (
+            self.web_fetcher.is_url(identifier)
+            and not self.arxiv_fetcher.parse_arxiv_id(identifier)
+        )
+
+
+def process_batch_async(identifiers: list[str], force: bool = False) -> dict:
+    """
+    Convenience function to run an async batch from synchronous code.
+
+    Args:
+        identifiers: Paper identifiers
+        force: Reprocess even if already done
+
+    Returns:
+        Batch results dictionary
+    """
+    state = StateManager.load()
+    processor = AsyncPaperProcessor(config, state)
+    return asyncio.run(processor.process_batch(identifiers, force=force))
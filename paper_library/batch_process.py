@@ -4,10 +4,13 @@
 Batch process papers from a text file.
 
 Usage:
-    python batch_process.py papers.txt [--force]
+    python batch_process.py papers.txt [--force] [--pipelined] [--message-batch]
 
 Options:
-    --force    Reprocess papers even if already done
+    --force          Reprocess papers even if already done
+    --pipelined      Overlap stages across papers (download, GROBID, Claude)
+    --message-batch  Send all syntheses as one Message Batch (half price,
+                     results can take a while - good for overnight runs)
 
 File format (one per line):
     1706.03762
@@ -27,7 +30,12 @@ from paper_library.state import StateManager
 from paper_library.orchestrator import PaperProcessor
 
 
-def batch_process(input_file: str, force: bool = False):
+def batch_process(
+    input_file: str,
+    force: bool = False,
+    pipelined: bool = False,
+    message_batch: bool = False
+):
     """Process all papers from a text file."""
     
     # Read identifiers from file
@@ -71,7 +79,12 @@ def batch_process(input_file: str, force: bool = False):
     processor = PaperProcessor(config, state)
     
     # Process batch with force flag
-    results = processor.process_batch(identifiers, force=force)
+    results = processor.process_batch(
+        identifiers,
+        force=force,
+        pipelined=pipelined,
+        message_batch=message_batch
+    )
     
     # Final summary
     print(f"\n{'='*70}")
@@ -96,5 +109,7 @@ if __name__ == "__main__":
     
     input_file = sys.argv[1]
     force = '--force' in sys.argv
+    pipelined = '--pipelined' in sys.argv
+    message_batch = '--message-batch' in sys.argv
     
-    batch_process(input_file, force=force)
\ No newline at end of file
+    batch_process(input_file, force=force, pipelined=pipelined, message_batch=message_batch)
\ No newline at end of file
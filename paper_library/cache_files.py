@@ -0,0 +1,159 @@
+"""
+Files behind the on-disk caches: atomic writes and size-bounded directories.
+
+TeiCache and HttpCache both keep one file per entry in a directory and
+delete the least recently used files once the directory grows past
+max_bytes ("recently used" is the file's modification time, bumped on
+every hit). SynthesisCache and CheckpointStore have no size limit but
+write their files the same way. This module holds that shared part.
+
+Knowing the directory's size used to mean globbing and stat-ing every
+file, and we did it after every write: fine for 50 entries, but a batch of
+thousands of writes then costs thousands of scans (quadratic). Instead,
+LruDirectory scans once, then keeps a running byte total: each write adds
+its size (minus the file it replaces). Only when the total crosses
+max_bytes do we scan again, to pick what to evict by mtime. That scan also
+corrects the total for anything another process wrote or deleted.
+
+Python concepts:
+- Atomic replace: write a temp file, then Path.replace() it into place
+- os.stat / os.utime: File sizes and timestamps (our LRU clock)
+- Callables as arguments: the caller decides how to write the temp file
+- threading.Lock: Safe to share between pipeline worker threads
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+
+def write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    """
+    Write a file so readers see either the old file or the new one, never half.
+    
+    write() fills a temp file next to path (same directory, so the final
+    rename doesn't cross filesystems); it's then renamed over path.
+    
+    Args:
+        path: Final file
+        write: Function that writes the content to the temp path it's given
+    """
+    tmp_path = _tmp_path(path)
+    write(tmp_path)
+    tmp_path.replace(path)
+
+
+class LruDirectory:
+    """
+    A directory of cache files kept under max_bytes, least recently used out first.
+    
+    Usage:
+        files = LruDirectory(cache_dir, suffix=".tei.xml.gz", max_bytes=512 * 1024 * 1024)
+        files.write(cache_dir / "abc.tei.xml.gz", lambda tmp: tmp.write_bytes(data))
+        files.touch(cache_dir / "abc.tei.xml.gz")  # On a hit
+        print(files.stats())  # {"evictions": 0, "entries": 1, "bytes": 1234}
+    """
+    
+    def __init__(self, directory: Path, suffix: str, max_bytes: int):
+        """
+        Initialize the directory (nothing is read until the first write).
+        
+        Args:
+            directory: Directory holding the cache files
+            suffix: Suffix of cache files (temp files and others are ignored)
+            max_bytes: Total size to keep before evicting
+        """
+        self.directory = directory
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        
+        self.evictions = 0
+        self._total: Optional[int] = None  # Bytes in cache files (None = not scanned yet)
+        self._lock = threading.Lock()
+    
+    def write(self, path: Path, write: Callable[[Path], None]) -> None:
+        """
+        Store a cache file atomically, then evict if the directory is too big.
+        
+        Like write_atomic(); only the rename and the bookkeeping hold the
+        lock, so threads can write (e.g., compress) their files in parallel.
+        
+        Args:
+            path: Cache file (inside the directory, with the suffix)
+            write: Function that writes the content to the temp path it's given
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = _tmp_path(path)
+        write(tmp_path)
+        
+        with self._lock:
+            replaced = _size(path)
+            tmp_path.replace(path)
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._entries())
+            else:
+                self._total += _size(path) - replaced
+            if self._total > self.max_bytes:
+                self._evict()
+    
+    def touch(self, path: Path) -> None:
+        """
+        Mark a cache file as just used.
+        
+        Raises:
+            OSError: If the file is gone (e.g., evicted meanwhile)
+        """
+        os.utime(path)
+    
+    def stats(self) -> dict:
+        """
+        Evictions in this run plus the directory's current size.
+        
+        Returns:
+            Dictionary with evictions, entries and bytes
+        """
+        entries = self._entries()
+        return {
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
+    
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        """All cache files as (path, size, mtime)."""
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Deleted by another thread or process while we looked
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+    
+    def _evict(self) -> None:
+        """Delete least recently used files until under max_bytes (lock held)."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        
+        # Oldest mtime first
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._total = total
+
+
+def _tmp_path(path: Path) -> Path:
+    """Temp file next to path, unique per thread."""
+    return path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+
+
+def _size(path: Path) -> int:
+    """Size of a file, 0 if it doesn't exist."""
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
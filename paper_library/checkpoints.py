@@ -0,0 +1,151 @@
+"""
+Per-paper stage checkpoints.
+
+ProcessingState only knows "processed" or "failed". If a run dies after
+GROBID but before Claude (crash, Ctrl-C, full disk), the next run would
+start that paper over from the download. Checkpoints remember how far each
+paper got, plus everything the finished stages produced:
+
+- The fetched PDF path and metadata
+- The metadata merged with GROBID's (the TEI itself is in the TEI cache)
+- The extracted text
+- The synthesis (so Claude is never paid twice for the same paper)
+
+One small JSON file per paper lives in vault/_meta/checkpoints/. It is
+deleted once the paper is marked processed. Files are named by the paper's
+key (key_for, e.g. IdentifierIndex.resolve), so "arXiv:2309.14316v2" and
+"2309.14316" share one checkpoint and a retry in either form resumes.
+
+Python concepts:
+- Serializing dataclasses and Pydantic models to JSON
+- hashlib: Turn any identifier (URLs, file paths) into a safe filename
+- Atomic writes: write a temp file, then rename it into place
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Callable, Optional
+
+from paper_library.cache_files import write_atomic
+from paper_library.models import PaperMetadata, Synthesis
+
+
+class CheckpointStore:
+    """
+    Save and restore a paper's progress through the pipeline.
+    
+    Works on PaperJob objects (see orchestrator.py); job.completed lists
+    the stages that already ran.
+    
+    Usage:
+        checkpoints = CheckpointStore(config.checkpoints_dir, key_for=index.resolve)
+        checkpoints.save(job)             # After each stage
+        data = checkpoints.load("arXiv:2312.12345v2")  # Same file as "2312.12345"
+        checkpoints.discard("2312.12345")  # Once the paper is done
+    """
+    
+    def __init__(self, checkpoint_dir: Path, key_for: Callable[[str], str] = str.strip):
+        """
+        Initialize the store.
+        
+        Args:
+            checkpoint_dir: Directory holding one JSON file per paper
+            key_for: Function giving the paper key an identifier is stored under
+        """
+        self.checkpoint_dir = checkpoint_dir
+        self.key_for = key_for
+    
+    def save(self, job) -> None:
+        """
+        Write a job's progress to disk.
+        
+        Args:
+            job: PaperJob with completed stages and their outputs
+        """
+        data = {
+            "identifier": job.identifier,
+            "completed": list(job.completed),
+            "pdf_path": str(job.pdf_path) if job.pdf_path else None,
+            "metadata": job.metadata.model_dump(mode="json") if job.metadata else None,
+            "text": job.text,
+            "text_source": job.text_source,
+            "synthesis": job.synthesis.model_dump(mode="json") if job.synthesis else None,
+            "output_path": str(job.output_path) if job.output_path else None,
+            "needs_enrichment": job.needs_enrichment,
+        }
+        
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        content = json.dumps(data)
+        # A crash mid-write leaves the previous checkpoint, never half of one
+        write_atomic(
+            self._path(job.identifier),
+            lambda tmp_path: tmp_path.write_text(content, encoding='utf-8')
+        )
+    
+    def load(self, identifier: str) -> Optional[dict]:
+        """
+        Read a paper's checkpoint.
+        
+        Args:
+            identifier: Paper identifier
+        
+        Returns:
+            Dictionary of PaperJob fields (models rebuilt), or None if
+            there's no usable checkpoint
+        """
+        path = self._path(identifier)
+        if not path.exists():
+            return None
+        
+        try:
+            data = json.loads(path.read_text(encoding='utf-8'))
+            return {
+                "completed": data["completed"],
+                "pdf_path": Path(data["pdf_path"]) if data["pdf_path"] else None,
+                "metadata": (
+                    PaperMetadata.model_validate(data["metadata"]) if data["metadata"] else None
+                ),
+                "text": data["text"],
+                "text_source": data["text_source"],
+                "synthesis": (
+                    Synthesis.model_validate(data["synthesis"]) if data["synthesis"] else None
+                ),
+                "output_path": Path(data["output_path"]) if data["output_path"] else None,
+                "needs_enrichment": data.get("needs_enrichment", False),
+            }
+        except Exception as e:
+            # A damaged checkpoint just means starting this paper over
+            print(f"Warning: Ignoring unreadable checkpoint for {identifier}: {e}")
+            return None
+    
+    def identifiers(self) -> list[str]:
+        """
+        Identifiers of every paper with a saved checkpoint.
+        
+        Returns:
+            Identifiers, oldest checkpoint first
+        """
+        if not self.checkpoint_dir.exists():
+            return []
+        identifiers = []
+        for path in sorted(self.checkpoint_dir.glob("*.json"), key=lambda p: p.stat().st_mtime):
+            try:
+                identifiers.append(json.loads(path.read_text(encoding='utf-8'))["identifier"])
+            except (OSError, ValueError, KeyError):
+                continue
+        return identifiers
+    
+    def discard(self, identifier: str) -> None:
+        """
+        Delete a paper's checkpoint (it's done, or being reprocessed).
+        
+        Args:
+            identifier: Paper identifier
+        """
+        self._path(identifier).unlink(missing_ok=True)
+    
+    def _path(self, identifier: str) -> Path:
+        """Checkpoint file for an identifier's paper key (hashed, since URLs/paths aren't filenames)."""
+        digest = hashlib.sha256(self.key_for(identifier).encode('utf-8')).hexdigest()[:32]
+        return self.checkpoint_dir / f"{digest}.json"
@@ -41,6 +41,60 @@ class Config:
     anthropic_api_key: str = os.getenv("ANTHROPIC_API_KEY", "")
     grobid_url: str = os.getenv("GROBID_URL", "http://localhost:8070")
     
+    # Concurrency limits (how many requests each service gets at once)
+    # int() converts the environment variable string into a number
+    # GROBID: match GROBID_POOL_SIZE in docker-compose.yml
+    grobid_pool_size: int = int(os.getenv("GROBID_POOL_SIZE", "4"))
+    # GROBID uploads start at grobid_pool_size at once, then adapt: more while
+    # GROBID keeps up, fewer when it answers 503 (see grobid_client.py)
+    grobid_max_concurrency: int = int(os.getenv("GROBID_MAX_CONCURRENCY", "16"))
+    # After this many failed GROBID requests in a row, stop calling it and
+    # process papers without it (arXiv/PDF metadata, no citations) ...
+    grobid_breaker_failures: int = int(os.getenv("GROBID_BREAKER_FAILURES", "3"))
+    # ... checking /api/isalive again every this many seconds
+    grobid_breaker_reset: float = float(os.getenv("GROBID_BREAKER_RESET", "30"))
+    # Anthropic: depends on your API rate tier
+    anthropic_max_concurrency: int = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "4"))
+    # arXiv: their API terms ask for no more than one connection at a time
+    arxiv_max_concurrency: int = int(os.getenv("ARXIV_MAX_CONCURRENCY", "1"))
+    
+    # Request pacing per remote host (see rate_limit.py)
+    # float() allows fractions like 0.5 requests per second
+    # arXiv API: seconds between requests (their terms ask for 3)
+    arxiv_request_interval: float = float(os.getenv("ARXIV_REQUEST_INTERVAL", "3"))
+    # Every other remote host: requests per second (0 = no pacing)
+    host_requests_per_second: float = float(os.getenv("HOST_REQUESTS_PER_SECOND", "2"))
+    
+    # Where the synthesis prompt text comes from
+    # "grobid": body text from GROBID's TEI (pdfplumber only if GROBID finds no body)
+    # "pdfplumber": always re-read the PDF with pdfplumber
+    text_source: str = os.getenv("TEXT_SOURCE", "grobid")
+    
+    # GROBID TEI cache (vault/_meta/tei_cache), so the same PDF is only parsed once
+    # Size limit in megabytes of compressed TEI; 0 turns the cache off
+    tei_cache_max_mb: int = int(os.getenv("TEI_CACHE_MAX_MB", "512"))
+    
+    # HTTP cache of web pages and arXiv API responses (vault/_meta/http_cache)
+    # Unchanged pages are answered with "304 Not Modified" and read from disk
+    # Size limit in megabytes; 0 turns the cache off
+    http_cache_max_mb: int = int(os.getenv("HTTP_CACHE_MAX_MB", "256"))
+    # Pin the GROBID version used in cache keys (skips asking GROBID for it,
+    # so cached papers can be re-rendered with GROBID switched off)
+    grobid_version: str = os.getenv("GROBID_VERSION", "")
+    
+    # Claude synthesis cache (vault/_meta/synthesis_cache)
+    # Re-rendering notes reuses stored syntheses unless the prompt changed
+    # .lower() == "true" turns the string into a bool
+    synthesis_cache: bool = os.getenv("SYNTHESIS_CACHE", "true").lower() == "true"
+    
+    # How often (seconds) to check on a Message Batch (batch_process.py --message-batch)
+    synthesis_batch_poll_seconds: int = int(os.getenv("SYNTHESIS_BATCH_POLL_SECONDS", "60"))
+    
+    # Where processing state is kept
+    # "json": vault/_meta/processing_state.json (fine for small vaults)
+    # "sqlite": vault/_meta/processing_state.db (imports the JSON file on first run)
+    state_backend: str = os.getenv("STATE_BACKEND", "json")
+    
     # File paths
     # Path() creates a pathlib Path object, better than string manipulation
     # .resolve() converts to absolute path (e.g., ./vault -> /home/user/vault)
@@ -69,11 +123,56 @@ class Config:
         """Directory for metadata and processing state."""
         return self.vault_path / "_meta"
     
+    @property
+    def tei_cache_dir(self) -> Path:
+        """Directory holding cached GROBID TEI responses."""
+        return self.meta_dir / "tei_cache"
+    
+    @property
+    def http_cache_dir(self) -> Path:
+        """Directory holding cached HTTP responses (with ETag/Last-Modified)."""
+        return self.meta_dir / "http_cache"
+    
+    @property
+    def synthesis_cache_dir(self) -> Path:
+        """Directory holding cached Claude syntheses."""
+        return self.meta_dir / "synthesis_cache"
+    
+    @property
+    def checkpoints_dir(self) -> Path:
+        """Directory holding per-paper stage checkpoints."""
+        return self.meta_dir / "checkpoints"
+    
+    @property
+    def synthesis_batch_file(self) -> Path:
+        """ID of the Message Batch being waited on (so an interrupted run can collect it)."""
+        return self.meta_dir / "synthesis_batch.json"
+    
+    @property
+    def enrichment_dir(self) -> Path:
+        """Papers processed while GROBID was down, waiting for its metadata and citations."""
+        return self.meta_dir / "needs_enrichment"
+    
+    @property
+    def identifier_aliases_file(self) -> Path:
+        """Known alternative identifiers (e.g., DOI -> arXiv ID) for dedup."""
+        return self.meta_dir / "identifier_aliases.json"
+    
+    @property
+    def fingerprints_file(self) -> Path:
+        """Content hashes of PDFs in the vault (finds identical files under other names)."""
+        return self.meta_dir / "pdf_fingerprints.json"
+    
     @property
     def processing_state_file(self) -> Path:
         """JSON file tracking which papers have been processed."""
         return self.meta_dir / "processing_state.json"
     
+    @property
+    def state_db_file(self) -> Path:
+        """SQLite database tracking processed papers (STATE_BACKEND=sqlite)."""
+        return self.meta_dir / "processing_state.db"
+    
     def validate(self) -> None:
         """
         Check that all required configuration is present.
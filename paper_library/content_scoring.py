@@ -0,0 +1,226 @@
+"""
+Readability-style scoring to find a page's main content.
+
+When a page has no <article> tag or known container class, we have to
+guess which element holds the article. The old guess, "the <div> with the
+most text", called get_text() on every div. Each call walks the div's
+whole subtree again, so nested divs cost O(n^2): a LessWrong comment
+thread hundreds of levels deep took seconds.
+
+ContentScorer is fed every element exactly once, children before parents
+(bottom-up), and adds up for each element:
+
+- text_length: characters of text inside it
+- link_length: characters of that text that sit inside <a> links
+- paragraphs: how many <p>-like blocks it contains
+
+Paragraphs with real sentences also score points for their parent (full
+score) and grandparent (half), as in Mozilla's Readability. The best
+candidate is the one with the highest score, discounted by link density
+(navigation menus and comment footers are mostly links) and nudged by
+class/id names like "content" or "comment".
+
+How the sums are built: the tree walk is lxml's iterwalk, which reports a
+"start" event when it enters an element and an "end" event when it
+leaves. start() creates the element's counters in a dict keyed by
+element; end() adds up the counters of its direct children, which have all
+ended by then. There's no recursion and no stack of our own - the event
+order alone guarantees children are totalled first.
+
+The scorer doesn't walk the tree itself: html_scan.py feeds it from the
+same pass that collects metadata. best_content_node() is the standalone
+version.
+
+Python concepts:
+- Event-driven tree walk (lxml iterwalk "start"/"end" events)
+- dataclass for per-node counters
+- Regular expressions on class/id names
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from lxml import etree
+
+
+# Elements that may hold the article
+CANDIDATE_TAGS = {"div", "section", "main", "article", "td", "body"}
+
+# Elements whose text counts as a paragraph
+PARAGRAPH_TAGS = {"p", "pre", "blockquote", "li", "td"}
+
+# Never content: their text is ignored and they're stripped from the result
+BOILERPLATE_TAGS = {"script", "style", "nav", "header", "footer", "aside"}
+
+# Paragraphs shorter than this are captions, buttons and bylines
+MIN_PARAGRAPH_LENGTH = 25
+
+# The chosen element must have at least this much text (same as before)
+MIN_CONTENT_LENGTH = 200
+
+POSITIVE_NAMES = re.compile(
+    r"article|body|content|entry|main|page|post|story|text", re.IGNORECASE
+)
+NEGATIVE_NAMES = re.compile(
+    r"ad-|banner|comment|footer|meta|nav|related|share|sidebar|social|sponsor|widget",
+    re.IGNORECASE
+)
+
+
+@dataclass
+class NodeStats:
+    """Counters for one element, including everything inside it."""
+    text_length: int = 0
+    link_length: int = 0
+    paragraphs: int = 0
+    score: float = 0.0  # Credit from the paragraphs directly below
+    
+    @property
+    def link_density(self) -> float:
+        """Fraction of the text that is link text (0 = none, 1 = all links)."""
+        return self.link_length / self.text_length if self.text_length else 0.0
+
+
+class ContentScorer:
+    """
+    Bottom-up content scorer fed one element at a time.
+    
+    Usage:
+        scorer = ContentScorer()
+        for event, element in etree.iterwalk(root, events=("start", "end")):
+            if event == "start":
+                scorer.start(element)
+            else:
+                scorer.end(element)
+        best = scorer.best()
+    """
+    
+    def __init__(self):
+        """Initialize an empty scorer."""
+        # Keyed by element: holding on to lxml's proxy objects keeps them
+        # the same objects between the start and end events
+        self.stats: dict[etree._Element, NodeStats] = {}
+        self.candidates: list[etree._Element] = []
+        self._boilerplate_depth = 0
+    
+    @property
+    def in_boilerplate(self) -> bool:
+        """True while inside <nav>, <script>, <aside> etc."""
+        return self._boilerplate_depth > 0
+    
+    def start(self, element: etree._Element) -> None:
+        """Enter an element (before its children)."""
+        self.stats[element] = NodeStats()
+        if element.tag in BOILERPLATE_TAGS:
+            self._boilerplate_depth += 1
+    
+    def end(self, element: etree._Element) -> None:
+        """Leave an element (after its children): total up its counters."""
+        if element.tag in BOILERPLATE_TAGS:
+            # Counts for nothing, and neither does anything inside it
+            self._boilerplate_depth -= 1
+            return
+        if self.in_boilerplate:
+            return
+        
+        node = self.stats[element]
+        node.text_length += _text_length(element.text)
+        for child in element:
+            node.text_length += _text_length(child.tail)
+            child_stats = self.stats.get(child)
+            if child_stats is None:
+                continue  # Comments and processing instructions
+            node.text_length += child_stats.text_length
+            node.link_length += child_stats.link_length
+            node.paragraphs += child_stats.paragraphs
+        
+        if element.tag == "a":
+            node.link_length = node.text_length
+        
+        if element.tag in PARAGRAPH_TAGS and node.text_length >= MIN_PARAGRAPH_LENGTH:
+            node.paragraphs += 1
+            self._credit_ancestors(element, node)
+        
+        if element.tag in CANDIDATE_TAGS:
+            self.candidates.append(element)
+    
+    def best(self) -> Optional[etree._Element]:
+        """
+        Pick the element most likely to be the article body.
+        
+        Returns:
+            Highest-scoring candidate element, or None if nothing has at
+            least MIN_CONTENT_LENGTH characters of text
+        """
+        best = None
+        best_score = 0.0
+        for element in self.candidates:
+            node = self.stats[element]
+            if node.text_length <= MIN_CONTENT_LENGTH:
+                continue
+            # Pages built from bare <div>s (no paragraphs at all) are scored by length
+            base = node.score if node.paragraphs else node.text_length / 100
+            score = (base + class_weight(element)) * (1 - node.link_density)
+            if score > best_score:
+                best = element
+                best_score = score
+        return best
+    
+    def _credit_ancestors(self, element: etree._Element, node: NodeStats) -> None:
+        """Give a paragraph's score to its parent and (halved) grandparent."""
+        # One point per paragraph, one per comma, up to 3 for length
+        points = 1 + _commas(element) + min(node.text_length / 100, 3)
+        
+        parent = element.getparent()
+        if parent is None or parent not in self.stats:
+            return
+        self.stats[parent].score += points
+        grandparent = parent.getparent()
+        if grandparent is not None and grandparent in self.stats:
+            self.stats[grandparent].score += points / 2
+
+
+def _text_length(text: Optional[str]) -> int:
+    """Length of a text node without surrounding whitespace."""
+    return len(text.strip()) if text else 0
+
+
+def _commas(element: etree._Element) -> int:
+    """Commas in an element's direct text (a cheap "is this prose?" signal)."""
+    count = (element.text or "").count(",")
+    for child in element:
+        count += (child.tail or "").count(",")
+    return count
+
+
+def class_weight(element: etree._Element) -> float:
+    """Bonus or penalty from an element's class and id names."""
+    names = f"{element.get('class') or ''} {element.get('id') or ''}"
+    weight = 0.0
+    if NEGATIVE_NAMES.search(names):
+        weight -= 25
+    if POSITIVE_NAMES.search(names):
+        weight += 25
+    return weight
+
+
+def best_content_node(root: etree._Element) -> Optional[etree._Element]:
+    """
+    Score a parsed page on its own and return its main content element.
+    
+    Args:
+        root: Parsed document (e.g., from html_scan.parse_html())
+    
+    Returns:
+        Best candidate element, or None (see ContentScorer.best())
+    """
+    scorer = ContentScorer()
+    for event, element in etree.iterwalk(root, events=("start", "end")):
+        if not isinstance(element.tag, str):
+            continue  # Comments
+        if event == "start":
+            scorer.start(element)
+        else:
+            scorer.end(element)
+    return scorer.best()
@@ -0,0 +1,256 @@
+"""
+PDF fingerprints for recognizing the same file under different names.
+
+The same PDF often reaches the vault more than once: downloaded from arXiv
+as PDFs/arxiv_2309.14316.pdf, then again as ~/Downloads/physics_lm.pdf, or
+saved from a conference site. Identifiers can't tell those apart, but the
+bytes can.
+
+Each PDF gets two fingerprints:
+- prehash: SHA-256 of the file size plus its first and last 64 KB. Cheap
+  (reads at most 128 KB), and almost always unique on its own.
+- sha256: SHA-256 of the whole file. Only computed when a prehash matches,
+  to confirm the files really are byte-identical.
+
+The index maps sha256 -> the key the paper is tracked under (its arXiv ID,
+DOI or path; see identifiers.py) and is stored in
+vault/_meta/pdf_fingerprints.json. scan() fills it from vault/PDFs in
+parallel, skipping files whose size and modification time haven't changed.
+
+Rewriting the whole JSON file for every processed paper would make a big
+batch quadratic, so add() only appends one line to a journal
+(pdf_fingerprints.jsonl). Loading replays the journal over the JSON file,
+and scan() - which runs once per processor - folds it back in.
+
+Python concepts:
+- hashlib: Streaming SHA-256 over file chunks
+- File seeking: Read the end of a file without reading the middle
+- concurrent.futures.ThreadPoolExecutor: Hash many files in parallel
+  (hashlib releases the GIL, so threads really do run at once)
+- Append-only journals: Cheap writes now, one compaction later
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+from paper_library.cache_files import write_atomic
+
+
+class FingerprintIndex:
+    """
+    Index of PDF content hashes -> paper keys.
+    
+    Usage:
+        index = FingerprintIndex(config.fingerprints_file)
+        index.scan(config.pdfs_dir, key_for=lambda path: path.stem)
+        
+        key = index.lookup(Path("~/Downloads/paper.pdf").expanduser())
+        if key is not None:
+            print(f"Same PDF as {key}")
+        
+        index.add(pdf_path, "2309.14316")
+    """
+    
+    # Bytes read from each end of the file for the prehash
+    EDGE_BYTES = 64 * 1024
+    
+    # Chunk size for full-file hashing
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, index_file: Path):
+        """
+        Load the index from disk (or start empty).
+        
+        Args:
+            index_file: JSON file storing the index (the journal sits next to it)
+        """
+        self.index_file = index_file
+        self.journal_file = index_file.with_suffix(".jsonl")
+        self._lock = threading.Lock()
+        
+        # sha256 -> paper key
+        self.by_sha256: dict[str, str] = {}
+        # prehash -> list of sha256 with that prehash
+        self.by_prehash: dict[str, list[str]] = {}
+        # path -> {"size", "mtime", "prehash", "sha256"} (to skip unchanged files)
+        self.files: dict[str, dict] = {}
+        
+        if index_file.exists():
+            try:
+                data = json.loads(index_file.read_text())
+                self.by_sha256 = data["by_sha256"]
+                self.by_prehash = data["by_prehash"]
+                self.files = data["files"]
+            except Exception as e:
+                print(f"Warning: Could not load PDF fingerprints: {e}")
+        
+        # Entries added since the JSON file was last written
+        self._journaled = 0
+        if self.journal_file.exists():
+            for line in self.journal_file.read_text().splitlines():
+                try:
+                    record = json.loads(line)
+                    pdf_path, key = Path(record.pop("path")), record.pop("key")
+                    self._store(pdf_path, record, key)
+                except (ValueError, KeyError):
+                    continue  # Half-written line from a crash
+                self._journaled += 1
+    
+    def prehash(self, pdf_path: Path) -> str:
+        """
+        Cheap fingerprint: size + first and last EDGE_BYTES.
+        
+        Args:
+            pdf_path: PDF file
+        
+        Returns:
+            Hex SHA-256 digest
+        """
+        size = pdf_path.stat().st_size
+        digest = hashlib.sha256(str(size).encode())
+        with open(pdf_path, 'rb') as f:
+            digest.update(f.read(self.EDGE_BYTES))
+            if size > self.EDGE_BYTES:
+                # seek() jumps to a position; reading the tail skips the middle
+                f.seek(max(self.EDGE_BYTES, size - self.EDGE_BYTES))
+                digest.update(f.read())
+        return digest.hexdigest()
+    
+    def sha256(self, pdf_path: Path) -> str:
+        """
+        Full-content fingerprint.
+        
+        Args:
+            pdf_path: PDF file
+        
+        Returns:
+            Hex SHA-256 digest of the whole file
+        """
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            while chunk := f.read(self.CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def lookup(self, pdf_path: Path) -> Optional[str]:
+        """
+        Find the paper key of a byte-identical, already-indexed PDF.
+        
+        Only reads the whole file if its prehash matches a known PDF.
+        
+        Args:
+            pdf_path: PDF file to check
+        
+        Returns:
+            Paper key, or None if no identical PDF is indexed
+        """
+        with self._lock:
+            if not self.by_prehash:
+                return None
+        
+        # Hash outside the lock; only the dict reads need it
+        prehash = self.prehash(pdf_path)
+        with self._lock:
+            if not self.by_prehash.get(prehash):
+                return None
+        
+        sha256 = self.sha256(pdf_path)
+        with self._lock:
+            return self.by_sha256.get(sha256)
+    
+    def add(self, pdf_path: Path, key: str) -> None:
+        """
+        Index a PDF under a paper key and append it to the journal.
+        
+        Args:
+            pdf_path: PDF file
+            key: Key the paper is tracked under
+        """
+        entry = self._fingerprint(pdf_path)
+        record = json.dumps({"path": str(pdf_path), "key": key, **entry})
+        with self._lock:
+            self._store(pdf_path, entry, key)
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, 'a') as f:
+                f.write(record + "\n")
+            self._journaled += 1
+    
+    def scan(
+        self,
+        pdfs_dir: Path,
+        key_for: Callable[[Path], str],
+        workers: int = 4
+    ) -> int:
+        """
+        Index every PDF in a directory, hashing new or changed files in parallel.
+        
+        Files that are already indexed keep their existing key. Also folds
+        the journal into the JSON file.
+        
+        Args:
+            pdfs_dir: Directory of PDFs (e.g., vault/PDFs)
+            key_for: Function giving a new file's paper key (e.g., from its filename)
+            workers: Hashing threads
+        
+        Returns:
+            Number of files that were (re)hashed
+        """
+        changed = []
+        if pdfs_dir.exists():
+            with self._lock:
+                files = dict(self.files)
+            for pdf_path in pdfs_dir.glob("*.pdf"):
+                stat = pdf_path.stat()
+                known = files.get(str(pdf_path))
+                if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+                    continue
+                changed.append(pdf_path)
+        
+        entries = []
+        if changed:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                entries = list(pool.map(self._fingerprint, changed))
+        
+        with self._lock:
+            for pdf_path, entry in zip(changed, entries):
+                key = self.by_sha256.get(entry["sha256"]) or key_for(pdf_path)
+                self._store(pdf_path, entry, key)
+            if changed or self._journaled:
+                self._save()
+        
+        return len(changed)
+    
+    def _fingerprint(self, pdf_path: Path) -> dict:
+        """Both hashes plus the size/mtime they were computed for."""
+        stat = pdf_path.stat()
+        return {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "prehash": self.prehash(pdf_path),
+            "sha256": self.sha256(pdf_path),
+        }
+    
+    def _store(self, pdf_path: Path, entry: dict, key: str) -> None:
+        """Add one fingerprint to the in-memory index (caller holds the lock)."""
+        self.files[str(pdf_path)] = entry
+        self.by_sha256[entry["sha256"]] = key
+        shas = self.by_prehash.setdefault(entry["prehash"], [])
+        if entry["sha256"] not in shas:
+            shas.append(entry["sha256"])
+    
+    def _save(self) -> None:
+        """Write the whole index to disk and empty the journal (caller holds the lock)."""
+        self.index_file.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({
+            "by_sha256": self.by_sha256,
+            "by_prehash": self.by_prehash,
+            "files": self.files,
+        })
+        write_atomic(self.index_file, lambda tmp_path: tmp_path.write_text(data))
+        # A crash before this line only means replaying entries we already have
+        self.journal_file.unlink(missing_ok=True)
+        self._journaled = 0
@@ -0,0 +1,548 @@
+"""
+GROBID HTTP client: keep-alive connections, adaptive concurrency, retries.
+
+GROBID runs a fixed pool of workers (GROBID_POOL_SIZE in docker-compose.yml).
+When they're all busy it doesn't queue an upload, it answers 503 right
+away. Sending "exactly GROBID_POOL_SIZE at a time" only works if our
+setting matches the container's and nobody else is using the server.
+
+GrobidClient finds the right number at runtime, the way TCP finds how much
+a network link can take (AIMD):
+- Additive increase: each upload that succeeds while every slot is in use
+  grows the window by 1/window, so about one slot per window of uploads
+- Multiplicative decrease: a 503 halves the window (once per burst of 503s)
+Uploads beyond the window wait in our queue instead of being turned away.
+
+Turned-away (503) and disconnected uploads are retried after a random
+exponential backoff ("jitter"), so uploads rejected together don't all
+come back at the same instant. stats() reports the window, queue depth,
+retries and latencies.
+
+A GROBID that's down (container stopped or OOM-killed) is a different
+problem: every upload would sit through its retries and fail anyway. A
+circuit breaker counts consecutive connection failures and timeouts; after
+a few it "opens", and uploads fail at once with GrobidUnavailable so the
+caller can carry on without GROBID. Once the cool-down is over, one caller
+asks /api/isalive; if GROBID answers, the circuit closes again.
+
+Python concepts:
+- AIMD (additive increase, multiplicative decrease) congestion control
+- Circuit breaker pattern (closed -> open -> half-open -> closed)
+- threading.Condition: threads sleep until a slot frees up
+- asyncio futures woken from another thread (call_soon_threadsafe)
+- Exponential backoff with full jitter (random.uniform)
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency window, shared by threads and coroutines.
+    
+    Usage:
+        limit = AdaptiveLimit(initial=4, maximum=16)
+        ticket = limit.acquire()          # or: await limit.acquire_async()
+        ...
+        limit.release(ticket, overloaded=(status == 503))
+    """
+    
+    # Window multiplier after an overload (TCP halves its window too)
+    DECREASE = 0.5
+    
+    def __init__(self, initial: float, minimum: float = 1, maximum: float = 64):
+        """
+        Initialize the window.
+        
+        Args:
+            initial: Starting window (e.g., GROBID_POOL_SIZE)
+            minimum: The window never shrinks below this
+            maximum: The window never grows above this
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self.waiting = 0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        self._async_waiters: list[tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+    
+    @property
+    def window(self) -> int:
+        """Requests allowed in flight right now."""
+        return int(self.limit)
+    
+    def acquire(self) -> float:
+        """
+        Block until a slot is free and take it.
+        
+        Returns:
+            Ticket (start time) to hand back to release()
+        """
+        with self._cond:
+            self.waiting += 1
+            try:
+                while self.in_flight >= self.window:
+                    self._cond.wait()
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            return time.monotonic()
+    
+    async def acquire_async(self) -> float:
+        """Async version of acquire(): waits without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < self.window:
+                    self.in_flight += 1
+                    return time.monotonic()
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+                self.waiting += 1
+            try:
+                await waiter[1]
+            finally:
+                with self._cond:
+                    self.waiting -= 1
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+    
+    def release(self, ticket: float, overloaded: bool = False) -> None:
+        """
+        Give a slot back and adjust the window.
+        
+        Args:
+            ticket: What acquire() returned
+            overloaded: The server turned the request away (503)
+        """
+        with self._cond:
+            # Only grow when the window was the bottleneck (every slot in use)
+            saturated = self.in_flight + self.waiting >= self.window
+            self.in_flight -= 1
+            if overloaded:
+                # Requests sent before the last decrease saw the old window:
+                # their 503s are the same burst, not a new signal
+                if ticket >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit * self.DECREASE)
+                    self._last_decrease = time.monotonic()
+            elif saturated:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_wake, future)
+
+
+def _wake(future: asyncio.Future) -> None:
+    """Resolve a waiter's future (unless it was cancelled meanwhile)."""
+    if not future.done():
+        future.set_result(None)
+
+
+class GrobidUnavailable(Exception):
+    """Raised instead of uploading while the circuit breaker is open (GROBID is down)."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stop calling a service that keeps failing, and notice when it's back.
+    
+    - closed: calls go through; consecutive failures are counted
+    - open: after failure_threshold of them, calls are refused
+    - half-open: reset_timeout later, one caller checks whether the service
+      is back (probe); success closes the circuit, failure reopens it
+    
+    Usage:
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+        if breaker.closed or (breaker.should_probe() and probe_ok()): ...
+        breaker.record_success()  # or breaker.record_failure()
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+    
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the breaker (closed).
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing
+            clock: Time source in seconds (tests pass a fake one)
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+    
+    @property
+    def closed(self) -> bool:
+        """Calls may go through."""
+        return self.state == self.CLOSED
+    
+    def should_probe(self) -> bool:
+        """
+        Claim the health probe, if it's due.
+        
+        Returns:
+            True for exactly one caller once the circuit has been open for
+            reset_timeout (the circuit is then half-open until that caller
+            records the probe's result)
+        """
+        with self._lock:
+            if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+    
+    def record_success(self) -> None:
+        """The service answered: close the circuit."""
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+    
+    def record_failure(self) -> None:
+        """The service didn't answer: count it, and open the circuit if it's too many."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class GrobidClient:
+    """
+    Uploads PDFs to GROBID through one connection pool and an AIMD window.
+    
+    One client per GROBID server, shared by every thread (and coroutine)
+    that uploads to it.
+    
+    Usage:
+        client = GrobidClient(initial_concurrency=4, max_concurrency=16)
+        with open("paper.tei.xml", "wb") as dest:
+            client.upload(f"{grobid_url}/api/processFulltextDocument", pdf_path, dest)
+        print(client.stats())  # {"window": 4.75, "queued": 0, ...}
+    """
+    
+    # GROBID's answer when all its workers are busy
+    OVERLOAD_STATUSES = {503}
+    
+    # Retries per upload (503s and dropped connections)
+    MAX_RETRIES = 5
+    
+    # Backoff before retry n: random between 0 and BACKOFF_BASE * 2**n seconds
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 30.0
+    
+    # Download GROBID's response in 1 MB chunks
+    CHUNK_SIZE = 1024 * 1024
+    
+    # Recent upload latencies kept for stats()
+    LATENCY_SAMPLES = 500
+    
+    # Marks our requests so RateLimitedTransport doesn't retry them itself
+    NO_RATE_LIMIT = {"rate_limit": False}
+    
+    def __init__(
+        self,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 16,
+        timeout: float = 300,
+        health_url: Optional[str] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Initialize the client.
+        
+        Args:
+            initial_concurrency: Starting window (match GROBID_POOL_SIZE)
+            max_concurrency: Largest window (and keep-alive connections) to try
+            timeout: Seconds to wait for GROBID (connect and between reads)
+            health_url: GROBID's /api/isalive, probed while the circuit is
+                open (None: the next upload is the probe)
+            breaker: Circuit breaker (a default one if None)
+        """
+        self.limit = AdaptiveLimit(initial_concurrency, maximum=max_concurrency)
+        self.timeout = timeout
+        self.health_url = health_url
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        self.uploads = 0
+        self.overloads = 0
+        self.retries = 0
+        self.failures = 0
+        self._latencies: deque[float] = deque(maxlen=self.LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+    
+    def get(self, url: str, timeout: float = 10) -> requests.Response:
+        """
+        Plain GET on the pooled connections (e.g., /api/version).
+        
+        Not counted against the window: GROBID answers these without a worker.
+        """
+        return self.session.get(url, timeout=timeout)
+    
+    def available(self) -> bool:
+        """
+        Whether GROBID may be called now.
+        
+        While the circuit is open this is False without any network
+        traffic, except for the one caller whose turn it is to probe.
+        """
+        if self.breaker.closed:
+            return True
+        if self.breaker.should_probe():
+            self._probed(self._isalive())
+        return self.breaker.closed
+    
+    async def available_async(self) -> bool:
+        """Async version of available() (the probe runs in a thread)."""
+        if self.breaker.closed:
+            return True
+        if self.breaker.should_probe():
+            self._probed(await asyncio.to_thread(self._isalive))
+        return self.breaker.closed
+    
+    def upload(self, url: str, pdf_path: Path, dest: BinaryIO, headers: Optional[dict] = None) -> None:
+        """
+        Upload a PDF and write GROBID's response body to dest.
+        
+        Waits for a slot in the window first; 503s and dropped connections
+        are retried with backoff. dest only holds the successful response.
+        
+        Args:
+            url: GROBID endpoint (e.g., .../api/processFulltextDocument)
+            pdf_path: PDF to upload
+            dest: Binary file for the response body
+            headers: Extra request headers (e.g., Accept)
+        
+        Raises:
+            GrobidUnavailable: If the circuit breaker is (or goes) open
+            requests.RequestException: If GROBID still fails after MAX_RETRIES
+                (HTTPError for an error status)
+        """
+        try:
+            for attempt in range(self.MAX_RETRIES + 1):
+                last = attempt == self.MAX_RETRIES
+                if not self.available():
+                    raise GrobidUnavailable(self._unavailable_message())
+                ticket = self.limit.acquire()
+                overloaded = False
+                try:
+                    with open(pdf_path, 'rb') as pdf_file:
+                        files = {'input': (pdf_path.name, pdf_file, 'application/pdf')}
+                        response = self.session.post(
+                            url, files=files, headers=headers, timeout=self.timeout, stream=True
+                        )
+                    self.breaker.record_success()
+                    with response:
+                        overloaded = response.status_code in self.OVERLOAD_STATUSES
+                        if not overloaded or last:
+                            response.raise_for_status()
+                            dest.seek(0)
+                            dest.truncate()
+                            for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                                dest.write(chunk)
+                            self._finished(ticket)
+                            return
+                        reason = f"GROBID busy ({response.status_code})"
+                        retry_after = response.headers.get("Retry-After")
+                except (requests.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                    self.breaker.record_failure()
+                    if not self.breaker.closed:
+                        raise GrobidUnavailable(self._unavailable_message()) from e
+                    if last:
+                        raise
+                    reason, retry_after = f"GROBID connection failed ({type(e).__name__})", None
+                except requests.Timeout:
+                    # A hung GROBID (e.g., out of memory) counts as down too
+                    self.breaker.record_failure()
+                    raise
+                finally:
+                    self.limit.release(ticket, overloaded)
+                
+                time.sleep(self._retrying(attempt, reason, overloaded, retry_after))
+        except requests.RequestException:
+            self._count("failures")
+            raise
+    
+    async def upload_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        pdf_path: Path,
+        dest: BinaryIO,
+        headers: Optional[dict] = None
+    ) -> None:
+        """
+        Async version of upload() on a shared httpx.AsyncClient.
+        
+        Raises:
+            GrobidUnavailable: If the circuit breaker is (or goes) open
+            httpx.HTTPError: If GROBID still fails after MAX_RETRIES
+                (HTTPStatusError for an error status)
+        """
+        # Read once, in a worker thread: a large PDF would stall the loop
+        pdf_bytes = await asyncio.to_thread(pdf_path.read_bytes)
+        try:
+            for attempt in range(self.MAX_RETRIES + 1):
+                last = attempt == self.MAX_RETRIES
+                if not await self.available_async():
+                    raise GrobidUnavailable(self._unavailable_message())
+                ticket = await self.limit.acquire_async()
+                overloaded = False
+                try:
+                    files = {'input': (pdf_path.name, pdf_bytes, 'application/pdf')}
+                    async with client.stream(
+                        "POST", url, files=files, headers=headers, timeout=self.timeout,
+                        extensions=self.NO_RATE_LIMIT
+                    ) as response:
+                        self.breaker.record_success()
+                        overloaded = response.status_code in self.OVERLOAD_STATUSES
+                        if not overloaded or last:
+                            response.raise_for_status()
+                            dest.seek(0)
+                            dest.truncate()
+                            async for chunk in response.aiter_bytes(self.CHUNK_SIZE):
+                                dest.write(chunk)
+                            self._finished(ticket)
+                            return
+                        reason = f"GROBID busy ({response.status_code})"
+                        retry_after = response.headers.get("Retry-After")
+                except (httpx.ConnectError, httpx.RemoteProtocolError, httpx.ReadError) as e:
+                    self.breaker.record_failure()
+                    if not self.breaker.closed:
+                        raise GrobidUnavailable(self._unavailable_message()) from e
+                    if last:
+                        raise
+                    reason, retry_after = f"GROBID connection failed ({type(e).__name__})", None
+                except httpx.TimeoutException:
+                    self.breaker.record_failure()
+                    raise
+                finally:
+                    self.limit.release(ticket, overloaded)
+                
+                await asyncio.sleep(self._retrying(attempt, reason, overloaded, retry_after))
+        except httpx.HTTPError:
+            self._count("failures")
+            raise
+    
+    def stats(self) -> dict:
+        """
+        Window, queue and latency numbers for this run.
+        
+        Returns:
+            Dictionary with window, in_flight, queued, uploads, overloads,
+            retries, failures, circuit (breaker state), and latency_avg /
+            latency_p95 in seconds (None before the first upload)
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = {
+                "uploads": self.uploads,
+                "overloads": self.overloads,
+                "retries": self.retries,
+                "failures": self.failures,
+            }
+        return {
+            "window": round(self.limit.limit, 2),
+            "in_flight": self.limit.in_flight,
+            "queued": self.limit.waiting,
+            **counts,
+            "circuit": self.breaker.state,
+            "latency_avg": sum(latencies) / len(latencies) if latencies else None,
+            "latency_p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+        }
+    
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.session.close()
+    
+    def _isalive(self) -> bool:
+        """Ask GROBID's health endpoint whether it's up."""
+        if self.health_url is None:
+            return True
+        try:
+            response = self.session.get(self.health_url, timeout=5)
+        except requests.RequestException:
+            return False
+        return response.ok and response.text.strip().lower() != "false"
+    
+    def _probed(self, alive: bool) -> None:
+        """Close or reopen the circuit after a health probe."""
+        if alive:
+            self.breaker.record_success()
+            print("  ✓ GROBID is back, resuming uploads")
+        else:
+            self.breaker.record_failure()
+    
+    def _unavailable_message(self) -> str:
+        """GrobidUnavailable's message."""
+        return f"GROBID unavailable ({self.breaker.failures} failed requests in a row)"
+    
+    def _finished(self, ticket: float) -> None:
+        """Record a successful upload's latency (slot taken to body read)."""
+        with self._lock:
+            self.uploads += 1
+            self._latencies.append(time.monotonic() - ticket)
+    
+    def _retrying(self, attempt: int, reason: str, overloaded: bool, retry_after: Optional[str]) -> float:
+        """
+        Count a retry and pick its delay.
+        
+        Args:
+            attempt: Attempts made so far, minus one
+            reason: What went wrong (for the log line)
+            overloaded: It was a 503
+            retry_after: The response's Retry-After header, if any
+        
+        Returns:
+            Seconds to wait: Retry-After if GROBID sent one (in seconds),
+            otherwise random up to BACKOFF_BASE * 2**attempt
+        """
+        with self._lock:
+            self.retries += 1
+            if overloaded:
+                self.overloads += 1
+        
+        if retry_after and retry_after.strip().isdigit():
+            delay = min(float(retry_after), self.BACKOFF_MAX)
+        else:
+            delay = random.uniform(0, min(self.BACKOFF_MAX, self.BACKOFF_BASE * 2 ** attempt))
+        print(f"  ↻ {reason}, window {self.limit.window}, retrying in {delay:.1f}s")
+        return delay
+    
+    def _count(self, counter: str) -> None:
+        """Increment one of the stats counters."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
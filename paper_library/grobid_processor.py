@@ -11,16 +11,32 @@ XML/TEI encoded documents.
 Python concepts:
 - HTTP requests with files (multipart/form-data)
 - XML parsing with lxml
-- XPath queries for navigating XML
+- XPath queries for navigating XML (precompiled, see tei_extract.py)
 - Error handling with custom exceptions
+- async/await version of the upload (for AsyncPaperProcessor), with the
+  blocking parts (hashing the PDF, parsing TEI) in asyncio.to_thread
+- Optional on-disk cache of TEI responses (see tei_cache.py)
+- Streaming: responses go to a temp file and are parsed incrementally
+- Extraction tiers: header-only, references-only or full text (TIERS)
+- Uploads go through GrobidClient (connection pool, adaptive concurrency,
+  retries on 503; see grobid_client.py)
 """
 
+import asyncio
+import httpx
 import requests
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterable, Optional
 from lxml import etree
 
+from paper_library.grobid_client import GrobidClient, GrobidUnavailable
 from paper_library.models import PaperMetadata, Citation
+from paper_library.tei_cache import TeiCache
+from paper_library.tei_extract import (
+    TeiHeader, body_sections, body_text, count_mentions, extract_citation,
+    extract_header, extract_references, stream_tei
+)
 
 
 class GrobidError(Exception):
@@ -28,6 +44,11 @@ class GrobidError(Exception):
     pass
 
 
+class GrobidUnavailableError(GrobidError):
+    """Raised when GROBID is down (circuit breaker open): callers can go on without it."""
+    pass
+
+
 class GrobidProcessor:
     """
     Process PDFs with GROBID to extract structured metadata.
@@ -39,6 +60,17 @@ class GrobidProcessor:
         processor = GrobidProcessor("http://localhost:8070")
         metadata = processor.process(Path("paper.pdf"))
         print(metadata.title, metadata.authors)
+        
+        # Also get the paper's body text (sections + paragraphs) from the TEI
+        metadata, body_text = processor.process_with_text(Path("paper.pdf"))
+        
+        # Cheaper tiers when the body isn't needed
+        metadata = processor.process_header(Path("paper.pdf"))
+        citations = processor.process_references(Path("paper.pdf"))
+        
+        # Reuse TEI from disk when the same PDF comes back
+        cache = TeiCache(config.tei_cache_dir, max_bytes=512 * 1024 * 1024)
+        processor = GrobidProcessor("http://localhost:8070", cache=cache)
     """
     
     # XML namespaces used by GROBID/TEI
@@ -47,15 +79,44 @@ class GrobidProcessor:
         'tei': 'http://www.tei-c.org/ns/1.0'
     }
     
-    def __init__(self, grobid_url: str):
+    # Extraction tiers, cheapest first: GROBID endpoint for each
+    # - header: title, authors, year, abstract, venue, DOI (first pages only)
+    # - references: the bibliography only
+    # - fulltext: all of the above plus the body text
+    TIERS = {
+        "header": "processHeaderDocument",
+        "references": "processReferences",
+        "fulltext": "processFulltextDocument",
+    }
+    
+    # processHeaderDocument answers BibTeX unless asked for TEI
+    ACCEPT_TEI = {"Accept": "application/xml"}
+    
+    def __init__(
+        self,
+        grobid_url: str,
+        cache: Optional[TeiCache] = None,
+        grobid_version: Optional[str] = None,
+        client: Optional[GrobidClient] = None
+    ):
         """
         Initialize the GROBID processor.
         
         Args:
             grobid_url: Base URL of GROBID service (e.g., http://localhost:8070)
+            cache: Optional TEI cache; hits skip the upload entirely
+            grobid_version: GROBID version for cache keys. If None, it's
+                asked from GROBID's /api/version once, on first use.
+            client: GrobidClient for uploads (a default one if None)
         """
         self.grobid_url = grobid_url.rstrip('/')
-        self.api_url = f"{self.grobid_url}/api/processFulltextDocument"
+        self.tier_urls = {tier: f"{self.grobid_url}/api/{endpoint}" for tier, endpoint in self.TIERS.items()}
+        self.api_url = self.tier_urls["fulltext"]
+        self.version_url = f"{self.grobid_url}/api/version"
+        self.cache = cache
+        self.grobid_version = grobid_version
+        # Keep-alive pool + adaptive concurrency; a busy GROBID's 503s are retried
+        self.client = client or GrobidClient()
     
     def process(self, pdf_path: Path) -> PaperMetadata:
         """
@@ -71,63 +132,293 @@ class GrobidProcessor:
             GrobidError: If GROBID processing fails
             FileNotFoundError: If PDF doesn't exist
         """
+        metadata, _ = self.process_with_text(pdf_path)
+        return metadata
+    
+    def process_with_text(self, pdf_path: Path) -> tuple[PaperMetadata, Optional[str]]:
+        """
+        Process a PDF and return its metadata plus its body text.
+        
+        GROBID's full-text response already contains the whole paper, split
+        into sections, so there's no need to parse the PDF a second time
+        (e.g., with pdfplumber) just to build the synthesis prompt.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Tuple of (metadata, body_text). body_text is None if GROBID
+            found no body (e.g., scanned PDFs without a text layer).
+            
+        Raises:
+            GrobidError: If GROBID processing fails (GrobidUnavailableError
+                if GROBID is down; cached TEI is still used then)
+            FileNotFoundError: If PDF doesn't exist
+        """
+        metadata, body_text = self._process(pdf_path, "fulltext", self._parse_tei_stream)
+        
+        # Store the PDF path
+        metadata.pdf_path = str(pdf_path)
+        
+        return metadata, body_text
+    
+    def process_header(self, pdf_path: Path) -> PaperMetadata:
+        """
+        Extract only the paper's own metadata (GROBID's fast header tier).
+        
+        processHeaderDocument only looks at the first pages, so it's much
+        cheaper than the full text. No citations, no body text.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            PaperMetadata (citations empty)
+            
+        Raises:
+            GrobidError: If GROBID processing fails
+            FileNotFoundError: If PDF doesn't exist
+        """
+        metadata, _ = self._process(pdf_path, "header", self._parse_tei_stream)
+        metadata.pdf_path = str(pdf_path)
+        return metadata
+    
+    def process_references(self, pdf_path: Path) -> list[Citation]:
+        """
+        Extract only the bibliography (GROBID's references tier).
+        
+        Args:
+            pdf_path: Path to the PDF file
+            
+        Returns:
+            Citations, garbage-filtered as in process_with_text()
+            
+        Raises:
+            GrobidError: If GROBID processing fails
+            FileNotFoundError: If PDF doesn't exist
+        """
+        return self._process(pdf_path, "references", self._parse_references_stream)
+    
+    def _process(self, pdf_path: Path, tier: str, parse):
+        """
+        Get the TEI for one tier (from the cache or GROBID) and parse it.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            tier: Key of TIERS
+            parse: Parser for the TEI file (e.g., _parse_tei_stream)
+            
+        Returns:
+            Whatever parse returns
+        """
         # Validate PDF exists
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
         
-        # Send PDF to GROBID
-        xml_content = self._call_grobid(pdf_path)
+        # Reuse TEI from disk if we have it (streamed straight from the gzip file)
+        url = self.tier_urls[tier]
+        key = self._cache_key(pdf_path, url, self._get_version())
+        result = self._parse_cached(key, parse)
         
-        # Parse XML response
-        metadata = self._parse_xml(xml_content)
+        if result is None:
+            # Send PDF to GROBID; the TEI goes to a temp file, not into memory
+            with tempfile.TemporaryFile() as tei_file:
+                self._call_grobid(pdf_path, tei_file, url)
+                result = self._store_and_parse(key, tei_file, parse)
         
-        # Store the PDF path
+        return result
+    
+    async def process_with_text_async(
+        self,
+        pdf_path: Path,
+        client: httpx.AsyncClient
+    ) -> tuple[PaperMetadata, Optional[str]]:
+        """
+        Async version of process_with_text() for use on an event loop.
+        
+        The upload is awaited on a shared httpx.AsyncClient; parsing is the
+        same _parse_tei_stream() used by process_with_text(), run in a worker
+        thread (like hashing the PDF for the cache key) so the event loop
+        keeps serving other papers meanwhile.
+        
+        Args:
+            pdf_path: Path to the PDF file
+            client: Shared async HTTP client
+            
+        Returns:
+            Tuple of (metadata, body_text)
+            
+        Raises:
+            GrobidError: If GROBID processing fails
+            FileNotFoundError: If PDF doesn't exist
+        """
+        metadata, body_text = await self._process_async(
+            pdf_path, client, "fulltext", self._parse_tei_stream
+        )
         metadata.pdf_path = str(pdf_path)
         
+        return metadata, body_text
+    
+    async def process_header_async(self, pdf_path: Path, client: httpx.AsyncClient) -> PaperMetadata:
+        """Async version of process_header()."""
+        metadata, _ = await self._process_async(pdf_path, client, "header", self._parse_tei_stream)
+        metadata.pdf_path = str(pdf_path)
         return metadata
     
-    def _call_grobid(self, pdf_path: Path) -> str:
+    async def process_references_async(self, pdf_path: Path, client: httpx.AsyncClient) -> list[Citation]:
+        """Async version of process_references()."""
+        return await self._process_async(pdf_path, client, "references", self._parse_references_stream)
+    
+    async def _process_async(self, pdf_path: Path, client: httpx.AsyncClient, tier: str, parse):
+        """Async version of _process()."""
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF not found: {pdf_path}")
+        
+        # Hashing the PDF and parsing TEI are blocking: worker threads
+        url = self.tier_urls[tier]
+        version = await self._get_version_async(client)
+        key = await asyncio.to_thread(self._cache_key, pdf_path, url, version)
+        result = await asyncio.to_thread(self._parse_cached, key, parse)
+        
+        if result is None:
+            with tempfile.TemporaryFile() as tei_file:
+                try:
+                    await self.client.upload_async(client, url, pdf_path, tei_file, headers=self.ACCEPT_TEI)
+                except GrobidUnavailable as e:
+                    raise GrobidUnavailableError(str(e))
+                except httpx.TimeoutException:
+                    raise GrobidError(f"GROBID request timed out for {pdf_path.name}")
+                except httpx.HTTPError as e:
+                    raise GrobidError(f"GROBID request failed: {e}")
+                
+                result = await asyncio.to_thread(self._store_and_parse, key, tei_file, parse)
+        
+        return result
+    
+    def _parse_cached(self, key: Optional[str], parse):
+        """
+        Parse cached TEI for key, streaming it from disk.
+        
+        Args:
+            key: Cache key (None = caching off)
+            parse: Parser for the TEI file
+        
+        Returns:
+            What parse returns, or None on a miss (or if the cached file
+            turns out to be corrupt)
+        """
+        tei_file = self.cache.open(key) if key else None
+        if tei_file is None:
+            return None
+        try:
+            with tei_file:
+                return parse(tei_file)
+        except (OSError, EOFError):
+            # Truncated or corrupt gzip: ask GROBID again
+            print("  ⚠ Cached TEI unreadable, sending the PDF to GROBID again")
+            return None
+    
+    def _store_and_parse(self, key: Optional[str], tei_file: BinaryIO, parse):
         """
-        Send PDF to GROBID API and get XML response.
+        Cache a freshly downloaded TEI file (if caching is on) and parse it.
         
-        This uses multipart/form-data to upload the file.
+        Args:
+            key: Cache key, or None to skip the cache
+            tei_file: File holding GROBID's response (any position)
+            parse: Parser for the TEI file
+        """
+        if key:
+            tei_file.seek(0)
+            self.cache.put_stream(key, tei_file)
+        tei_file.seek(0)
+        return parse(tei_file)
+    
+    def _cache_key(self, pdf_path: Path, url: str, version: Optional[str]) -> Optional[str]:
+        """
+        TEI cache key for a PDF, or None if caching is off or unusable.
+        
+        Args:
+            pdf_path: PDF file
+            url: GROBID endpoint (each tier is cached separately)
+            version: GROBID version (None if it couldn't be determined)
+        """
+        if self.cache is None or version is None:
+            return None
+        return self.cache.make_key(pdf_path, url, version)
+    
+    def _get_version(self) -> Optional[str]:
+        """
+        GROBID version for cache keys, looked up once and remembered.
+        
+        The request goes through the client's circuit breaker: while it's
+        open nothing is sent, and a failed request counts towards opening
+        it. GROBID can't be asked then, so we use the version saved in the
+        TEI cache by an earlier run - cached TEI is still found while
+        GROBID is down. Returns None only if there is no saved version
+        either; the cache is then skipped for this call (the upload will
+        report the real error).
+        """
+        if self.cache is None or self.grobid_version is not None:
+            return self.grobid_version
+        if self.client.available():
+            try:
+                response = self.client.get(self.version_url, timeout=10)
+                response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout):
+                self.client.breaker.record_failure()
+            except requests.RequestException:
+                pass  # GROBID answered, just not with a version
+            else:
+                self.client.breaker.record_success()
+                self.grobid_version = response.text.strip()
+                self.cache.remember_version(self.grobid_version)
+                return self.grobid_version
+        return self.cache.last_version()
+    
+    async def _get_version_async(self, client: httpx.AsyncClient) -> Optional[str]:
+        """Async version of _get_version()."""
+        if self.cache is None or self.grobid_version is not None:
+            return self.grobid_version
+        if await self.client.available_async():
+            try:
+                response = await client.get(self.version_url, timeout=10, extensions=GrobidClient.NO_RATE_LIMIT)
+                response.raise_for_status()
+            except httpx.TransportError:
+                self.client.breaker.record_failure()
+            except httpx.HTTPError:
+                pass
+            else:
+                self.client.breaker.record_success()
+                self.grobid_version = response.text.strip()
+                await asyncio.to_thread(self.cache.remember_version, self.grobid_version)
+                return self.grobid_version
+        return await asyncio.to_thread(self.cache.last_version)
+    
+    def _call_grobid(self, pdf_path: Path, dest: BinaryIO, url: str) -> None:
+        """
+        Send PDF to GROBID API and write the XML response to dest.
+        
+        This uses multipart/form-data to upload the file. The response is
+        streamed to dest chunk by chunk: for book-length PDFs the TEI runs
+        to tens of MB, and we never need it in memory as one string.
+        
+        GrobidClient waits for a slot in its concurrency window first, and
+        retries if GROBID is busy (503) or drops the connection.
         
         Args:
             pdf_path: Path to PDF file
-            
-        Returns:
-            XML content as string
+            dest: Binary file to write the TEI XML (UTF-8 bytes) to
+            url: GROBID endpoint (see TIERS)
             
         Raises:
             GrobidError: If request fails
         """
         try:
-            # Open the PDF file in binary mode
-            # 'rb' means "read binary"
-            with open(pdf_path, 'rb') as pdf_file:
-                # Send the file as multipart/form-data
-                # The 'input' field is what GROBID expects
-                files = {
-                    'input': (pdf_path.name, pdf_file, 'application/pdf')
-                }
-                
-                # Make the request with a reasonable timeout
-                # timeout=300 means 5 minutes (GROBID can be slow)
-                response = requests.post(
-                    self.api_url,
-                    files=files,
-                    timeout=300  # 5 minutes
-                )
-                
-                # Check if request was successful
-                # raise_for_status() raises an exception for 4xx/5xx status codes
-                response.raise_for_status()
-                
-                # GROBID returns UTF-8 XML, but requests might guess wrong encoding
-                # Force UTF-8 decoding to prevent mojibake (Ã© instead of é)
-                response.encoding = 'utf-8'
-                return response.text
-                
+            # Raw bytes, no decoding: lxml reads the XML's own encoding
+            # declaration (UTF-8 from GROBID)
+            self.client.upload(url, pdf_path, dest, headers=self.ACCEPT_TEI)
+        except GrobidUnavailable as e:
+            raise GrobidUnavailableError(str(e))
         except requests.Timeout:
             raise GrobidError(f"GROBID request timed out for {pdf_path.name}")
         except requests.RequestException as e:
@@ -135,7 +426,23 @@ class GrobidProcessor:
     
     def _parse_xml(self, xml_content: str) -> PaperMetadata:
         """
-        Parse GROBID XML response into PaperMetadata.
+        Parse GROBID XML response into PaperMetadata (without body text).
+        
+        Args:
+            xml_content: XML string from GROBID
+            
+        Returns:
+            PaperMetadata object
+            
+        Raises:
+            GrobidError: If XML parsing fails
+        """
+        metadata, _ = self._parse_tei(xml_content)
+        return metadata
+    
+    def _parse_tei(self, xml_content: str) -> tuple[PaperMetadata, Optional[str]]:
+        """
+        Parse GROBID XML response into PaperMetadata plus body text.
         
         GROBID returns TEI XML with structure like:
         <TEI>
@@ -174,7 +481,7 @@ class GrobidProcessor:
             xml_content: XML string from GROBID
             
         Returns:
-            PaperMetadata object
+            Tuple of (PaperMetadata, body_text or None)
             
         Raises:
             GrobidError: If XML parsing fails
@@ -184,75 +491,92 @@ class GrobidProcessor:
             # etree.fromstring() converts string to XML element
             root = etree.fromstring(xml_content.encode('utf-8'))
             
-            # Extract metadata using XPath
-            # .// means "search anywhere in the tree"
-            # @type means "attribute named type"
-            title = self._extract_title(root)
-            authors = self._extract_authors(root)
-            year = self._extract_year(root)
-            abstract = self._extract_abstract(root)
-            venue = self._extract_venue(root)
-            volume, issue, pages = self._extract_publication_info(root)
-            doi = self._extract_doi(root)
+            # Extract metadata with precompiled XPath (see tei_extract.py):
+            # one query for the header, one per reference
+            header = extract_header(root)
             citations = self._extract_citations(root)
-            
-            # Create PaperMetadata object
-            # We require title, authors, and year
-            # Everything else is optional
-            if not title or not authors or not year:
-                raise GrobidError(
-                    "Could not extract required fields (title, authors, year) from GROBID output"
-                )
-            
-            return PaperMetadata(
-                title=title,
-                authors=authors,
-                year=year,
-                abstract=abstract,
-                venue=venue,
-                volume=volume,
-                issue=issue,
-                pages=pages,
-                doi=doi,
-                citations=citations,
-                source="grobid"
-            )
+            body_text = self._extract_body_text(root, header.abstract)
             
         except etree.XMLSyntaxError as e:
             raise GrobidError(f"Invalid XML from GROBID: {e}")
+        
+        return self._build_metadata(header, citations), body_text
     
-    def _extract_title(self, root: etree._Element) -> Optional[str]:
+    def _parse_tei_stream(self, source: BinaryIO) -> tuple[PaperMetadata, Optional[str]]:
         """
-        Extract paper title from XML.
+        Streaming version of _parse_tei() for TEI in a file.
         
-        XPath: //tei:titleStmt/tei:title[@type='main']
+        The TEI is parsed in chunks and each reference and paragraph is
+        freed once extracted (see tei_extract.stream_tei()), so a
+        book-length document never sits in memory as a str, bytes and a
+        full tree at once. Results are the same as _parse_tei().
         
         Args:
-            root: XML root element
+            source: Binary file object positioned at the start of the TEI
             
         Returns:
-            Title string or None
-        """
-        # XPath query: find <title type="main"> inside <titleStmt>
-        # The .// means "anywhere in the tree"
-        # The [@type='main'] filters for main title (not subtitle)
-        title_elem = root.find('.//tei:titleStmt/tei:title[@type="main"]', self.NS)
-        
-        if title_elem is not None and title_elem.text:
-            # .strip() removes leading/trailing whitespace
-            title = title_elem.text.strip()
-            # Clean up common garbage from GROBID extraction
-            title = self._clean_title(title)
-            return title
-        
-        # Fallback: try title in biblStruct (alternative location)
-        title_elem = root.find('.//tei:analytic/tei:title[@type="main"]', self.NS)
-        if title_elem is not None and title_elem.text:
-            title = title_elem.text.strip()
-            title = self._clean_title(title)
-            return title
-        
-        return None
+            Tuple of (PaperMetadata, body_text or None)
+            
+        Raises:
+            GrobidError: If XML parsing fails
+        """
+        try:
+            document = stream_tei(source)
+        except etree.XMLSyntaxError as e:
+            raise GrobidError(f"Invalid XML from GROBID: {e}")
+        
+        citations = self._filter_citations(document.citations)
+        return self._build_metadata(document.header, citations), document.body_text
+    
+    def _parse_references_stream(self, source: BinaryIO) -> list[Citation]:
+        """
+        Parse processReferences TEI (bibliography only, no header) into citations.
+        
+        Args:
+            source: Binary file object positioned at the start of the TEI
+            
+        Returns:
+            Garbage-filtered citations
+            
+        Raises:
+            GrobidError: If XML parsing fails
+        """
+        try:
+            document = stream_tei(source)
+        except etree.XMLSyntaxError as e:
+            raise GrobidError(f"Invalid XML from GROBID: {e}")
+        return self._filter_citations(document.citations)
+    
+    def _build_metadata(self, header: TeiHeader, citations: list[Citation]) -> PaperMetadata:
+        """
+        Turn extracted header fields and citations into PaperMetadata.
+        
+        Raises:
+            GrobidError: If title, authors or year is missing
+        """
+        title = self._clean_title(header.title) if header.title else None
+        
+        # We require title, authors, and year
+        # Everything else is optional
+        if not title or not header.authors or not header.year:
+            raise GrobidError(
+                "Could not extract required fields (title, authors, year) from GROBID output"
+            )
+        
+        return PaperMetadata(
+            title=title,
+            authors=header.authors,
+            year=header.year,
+            abstract=header.abstract,
+            venue=header.venue,
+            volume=header.volume,
+            issue=header.issue,
+            pages=header.pages,
+            doi=header.doi,
+            doi_guessed=header.doi is not None and not header.doi_in_header,
+            citations=citations,
+            source="grobid"
+        )
     
     def _clean_title(self, title: str) -> str:
         """
@@ -299,259 +623,35 @@ class GrobidProcessor:
         
         return title.strip()
     
-    def _extract_authors(self, root: etree._Element) -> list[str]:
-        """
-        Extract author names from XML.
-        
-        XPath: //tei:analytic/tei:author/tei:persName
-        
-        Authors are formatted as "Lastname, Firstname Middlename"
-        
-        Args:
-            root: XML root element
-            
-        Returns:
-            List of author name strings
-        """
-        authors = []
-        
-        # Find all author elements
-        # .findall() returns all matching elements (not just first)
-        author_elems = root.findall('.//tei:analytic/tei:author', self.NS)
-        
-        for author_elem in author_elems:
-            # Get persName (personal name) element
-            persname = author_elem.find('tei:persName', self.NS)
-            if persname is None:
-                continue
-            
-            # Extract surname (last name)
-            surname_elem = persname.find('tei:surname', self.NS)
-            surname = surname_elem.text.strip() if surname_elem is not None and surname_elem.text else ""
-            
-            # Extract forename(s) (first/middle names)
-            # There can be multiple forename elements
-            forenames = []
-            for forename_elem in persname.findall('tei:forename', self.NS):
-                if forename_elem.text:
-                    forenames.append(forename_elem.text.strip())
-            
-            # Format as "Lastname, Firstname Middlename"
-            if surname:
-                if forenames:
-                    author_name = f"{surname}, {' '.join(forenames)}"
-                else:
-                    author_name = surname
-                authors.append(author_name)
-        
-        return authors
-    
-    def _extract_year(self, root: etree._Element) -> Optional[int]:
-        """
-        Extract publication year from XML.
-        
-        XPath: //tei:monogr/tei:imprint/tei:date[@type='published']/@when
-        
-        Args:
-            root: XML root element
-            
-        Returns:
-            Year as integer or None
-        """
-        # Try to find publication date
-        date_elem = root.find('.//tei:monogr/tei:imprint/tei:date[@type="published"]', self.NS)
-        
-        if date_elem is not None:
-            # Date can be in @when attribute (ISO format: "2023-01-15")
-            # or in text content
-            date_str = date_elem.get('when') or date_elem.text
-            
-            if date_str:
-                # Extract just the year (first 4 digits)
-                # "2023-01-15" -> "2023"
-                try:
-                    year_str = date_str.strip()[:4]
-                    return int(year_str)
-                except (ValueError, IndexError):
-                    pass
-        
-        return None
-    
-    def _extract_abstract(self, root: etree._Element) -> Optional[str]:
-        """
-        Extract abstract text from XML.
-        
-        XPath: //tei:profileDesc/tei:abstract/tei:div/tei:p
-        
-        Args:
-            root: XML root element
-            
-        Returns:
-            Abstract text or None
-        """
-        # Find abstract element
-        abstract_elem = root.find('.//tei:profileDesc/tei:abstract', self.NS)
-        
-        if abstract_elem is not None:
-            # Abstract can have multiple paragraphs
-            # Join them with newlines
-            paragraphs = []
-            for p_elem in abstract_elem.findall('.//tei:p', self.NS):
-                # itertext() gets all text content, including nested elements
-                # "".join(...) concatenates all text pieces
-                text = "".join(p_elem.itertext()).strip()
-                if text:
-                    paragraphs.append(text)
-            
-            if paragraphs:
-                return "\n\n".join(paragraphs)
-        
-        return None
-    
-    def _extract_venue(self, root: etree._Element) -> Optional[str]:
+    def _extract_body_text(self, root: etree._Element, abstract: Optional[str]) -> Optional[str]:
         """
-        Extract venue (journal or conference) name from XML.
+        Extract the paper's body text from <text><body>, section by section.
         
-        XPath: //tei:monogr/tei:title[@level='j']
+        XPath: //tei:text/tei:body//tei:div (each with a <head> and <p>s)
         
-        Args:
-            root: XML root element
+        Output looks like:
+            ## Abstract
             
-        Returns:
-            Venue name or None
-        """
-        # level='j' means journal
-        # level='m' would be monograph (book)
-        venue_elem = root.find('.//tei:monogr/tei:title[@level="j"]', self.NS)
-        
-        if venue_elem is not None and venue_elem.text:
-            return venue_elem.text.strip()
-        
-        return None
-    
-    def _extract_publication_info(self, root: etree._Element) -> tuple[Optional[str], Optional[str], Optional[str]]:
-        """
-        Extract volume, issue, and page numbers from XML.
-        
-        XPath: //tei:monogr/tei:imprint
-        
-        Args:
-            root: XML root element
+            ...
             
-        Returns:
-            Tuple of (volume, issue, pages)
-        """
-        imprint = root.find('.//tei:monogr/tei:imprint', self.NS)
-        
-        if imprint is None:
-            return None, None, None
-        
-        # Extract volume
-        volume_elem = imprint.find('tei:biblScope[@unit="volume"]', self.NS)
-        volume = volume_elem.text.strip() if volume_elem is not None and volume_elem.text else None
-        
-        # Extract issue
-        issue_elem = imprint.find('tei:biblScope[@unit="issue"]', self.NS)
-        issue = issue_elem.text.strip() if issue_elem is not None and issue_elem.text else None
-        
-        # Extract pages
-        page_elem = imprint.find('tei:biblScope[@unit="page"]', self.NS)
-        if page_elem is not None:
-            # Pages can be "123-145" or separate @from/@to attributes
-            from_page = page_elem.get('from')
-            to_page = page_elem.get('to')
+            ## 1 Introduction
             
-            if from_page and to_page:
-                pages = f"{from_page}-{to_page}"
-            elif page_elem.text:
-                pages = page_elem.text.strip()
-            else:
-                pages = None
-        else:
-            pages = None
-        
-        return volume, issue, pages
-    
-    def _extract_doi(self, root: etree._Element) -> Optional[str]:
-        """
-        Extract DOI from XML.
+            First paragraph...
         
-        XPath: //tei:idno[@type='DOI']
+        Figures, tables and formulas are skipped - they read badly as prose.
         
         Args:
             root: XML root element
+            abstract: Abstract text (already extracted), put first if present
             
         Returns:
-            DOI string or None
+            Body text, or None if GROBID found no body paragraphs
         """
-        doi_elem = root.find('.//tei:idno[@type="DOI"]', self.NS)
+        body = root.find('tei:text/tei:body', self.NS)
+        if body is None:
+            return None
         
-        if doi_elem is not None and doi_elem.text:
-            return doi_elem.text.strip()
-        
-        return None
-    
-    def _extract_venue_from_bibl(self, bibl: etree._Element) -> Optional[str]:
-        """
-        Extract venue (journal/conference) from a biblStruct citation element.
-        
-        Similar to _extract_venue() but works on citation elements instead of root.
-        
-        Args:
-            bibl: biblStruct element from bibliography
-            
-        Returns:
-            Venue name or None
-        """
-        venue_elem = bibl.find('.//tei:monogr/tei:title[@level="j"]', self.NS)
-        
-        if venue_elem is not None and venue_elem.text:
-            return venue_elem.text.strip()
-        
-        return None
-    
-    def _extract_publication_info_from_bibl(self, bibl: etree._Element) -> tuple[Optional[str], Optional[str], Optional[str]]:
-        """
-        Extract volume, issue, and page numbers from a biblStruct citation element.
-        
-        Similar to _extract_publication_info() but works on citation elements.
-        
-        Args:
-            bibl: biblStruct element from bibliography
-            
-        Returns:
-            Tuple of (volume, issue, pages)
-        """
-        imprint = bibl.find('.//tei:monogr/tei:imprint', self.NS)
-        
-        if imprint is None:
-            return None, None, None
-        
-        # Extract volume
-        volume_elem = imprint.find('tei:biblScope[@unit="volume"]', self.NS)
-        volume = volume_elem.text.strip() if volume_elem is not None and volume_elem.text else None
-        
-        # Extract issue
-        issue_elem = imprint.find('tei:biblScope[@unit="issue"]', self.NS)
-        issue = issue_elem.text.strip() if issue_elem is not None and issue_elem.text else None
-        
-        # Extract pages
-        page_elem = imprint.find('tei:biblScope[@unit="page"]', self.NS)
-        if page_elem is not None:
-            # Pages can be "123-145" or separate @from/@to attributes
-            from_page = page_elem.get('from')
-            to_page = page_elem.get('to')
-            
-            if from_page and to_page:
-                pages = f"{from_page}-{to_page}"
-            elif page_elem.text:
-                pages = page_elem.text.strip()
-            else:
-                pages = None
-        else:
-            pages = None
-        
-        return volume, issue, pages
+        return body_text(body_sections(body), abstract)
     
     def _calculate_garbage_score(self, citation: Citation) -> int:
         """
@@ -734,11 +834,14 @@ class GrobidProcessor:
         """
         Extract bibliography/citations from XML.
         
-        XPath: //tei:back//tei:listBibl/tei:biblStruct
+        XPath: //tei:back//tei:listBibl/tei:biblStruct (one query per
+        reference, see tei_extract.extract_citation())
         
         Each citation is stored as a Citation object with:
         - raw_text: The full citation string
         - Parsed fields (authors, title, year, doi) when available
+        - mention_count: in-text <ref type="bibr"> pointing at it, counted
+          in one pass over the body (see tei_extract.count_mentions())
         
         Args:
             root: XML root element
@@ -746,87 +849,29 @@ class GrobidProcessor:
         Returns:
             List of Citation objects
         """
-        citations = []
+        body = root.find('tei:text/tei:body', self.NS)
+        mentions = count_mentions(body) if body is not None else None
         
-        # Find bibliography section
-        # //tei:back//tei:listBibl means "find listBibl anywhere under back element"
-        listbibl = root.find('.//tei:back//tei:listBibl', self.NS)
-        
-        if listbibl is None:
-            return citations
+        # Each biblStruct is one citation (None if too short to be real)
+        return self._filter_citations(
+            extract_citation(bibl, mentions) for bibl in extract_references(root)
+        )
+    
+    def _filter_citations(self, candidates: Iterable[Optional[Citation]]) -> list[Citation]:
+        """
+        Drop missing and garbage citations.
         
-        # Each biblStruct is one citation
-        for bibl in listbibl.findall('tei:biblStruct', self.NS):
-            # Extract raw citation text (all text concatenated)
-            raw_text = "".join(bibl.itertext()).strip()
-            
-            # Clean up excessive whitespace
-            # Replace multiple whitespace chars (spaces, tabs, newlines) with single space
-            import re
-            raw_text = re.sub(r'\s+', ' ', raw_text)
+        Args:
+            candidates: Citations from extract_citation() (None = skipped)
             
-            # Skip if too short to be a real citation
-            if len(raw_text) < 10:
+        Returns:
+            Citations that look like real references
+        """
+        citations = []
+        for citation in candidates:
+            if citation is None:
                 continue
             
-            # Try to parse citation fields
-            # Note: Citation parsing is complex and often incomplete
-            # For MVP, we just store the raw text + whatever we can extract
-            
-            # Title
-            title_elem = bibl.find('.//tei:title[@level="a"]', self.NS)  # article title
-            if title_elem is None:
-                title_elem = bibl.find('.//tei:title[@level="m"]', self.NS)  # book title
-            title = title_elem.text.strip() if title_elem is not None and title_elem.text else None
-            
-            # Authors
-            authors = []
-            for author_elem in bibl.findall('.//tei:author', self.NS):
-                persname = author_elem.find('tei:persName', self.NS)
-                if persname is not None:
-                    surname = persname.find('tei:surname', self.NS)
-                    forenames = persname.findall('tei:forename', self.NS)
-                    
-                    if surname is not None and surname.text:
-                        name_parts = [surname.text.strip()]
-                        if forenames:
-                            initials = [f.text[0] + "." for f in forenames if f.text]
-                            name_parts.extend(initials)
-                        authors.append(" ".join(name_parts))
-            
-            # Year
-            date_elem = bibl.find('.//tei:date[@type="published"]', self.NS)
-            year = None
-            if date_elem is not None:
-                date_str = date_elem.get('when') or date_elem.text
-                if date_str:
-                    try:
-                        year = int(date_str[:4])
-                    except (ValueError, IndexError):
-                        pass
-            
-            # DOI
-            doi_elem = bibl.find('.//tei:idno[@type="DOI"]', self.NS)
-            doi = doi_elem.text.strip() if doi_elem is not None and doi_elem.text else None
-            
-            # Extract venue and publication info (just like for main paper)
-            venue = self._extract_venue_from_bibl(bibl)
-            volume, issue, pages = self._extract_publication_info_from_bibl(bibl)
-            
-            # Create Citation object with full bibliographic data
-            citation = Citation(
-                raw_text=raw_text,
-                authors=authors if authors else None,
-                title=title,
-                year=year,
-                venue=venue,
-                volume=volume,
-                issue=issue,
-                pages=pages,
-                doi=doi,
-                mention_count=1  # We don't track mentions in MVP
-            )
-            
             # === GARBAGE DETECTION: SCORING-BASED HEURISTIC ===
             # Uses parsed fields as baseline trust + categorizes garbage types
             # Each garbage category scores independently (algo, math, figure, bio)
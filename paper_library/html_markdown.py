@@ -0,0 +1,376 @@
+"""
+HTML to markdown, straight from the lxml tree.
+
+WebFetcher used to serialize the article element back to HTML, hand it to
+markdownify (which parses it again with BeautifulSoup and builds the whole
+markdown string recursively), clean the result up with regexes, and only
+then cut it to MAX_CONTENT_LENGTH. On long Distill or Transformer Circuits
+pages that conversion took most of the CPU time, mostly on text we then
+threw away.
+
+MarkdownConverter walks the element lxml already parsed, once, and yields
+markdown as it goes. html_to_markdown() stops pulling as soon as it has
+enough characters, so the rest of a huge page is never converted.
+
+The output follows markdownify's conventions (our existing notes): ATX
+headings (#), * + - bullets by nesting level, **strong**, *emphasis*,
+`code`, ``` fences, > quotes and pipe tables. It comes out already clean:
+no trailing spaces, no runs of blank lines. The few places it differs
+from the old notes on purpose (soft wraps joined, <noscript> dropped,
+table cells escaped and padded) are listed in tests/test_html_markdown.py.
+
+Python concepts:
+- Generators: produce output piece by piece, stop whenever the caller does
+- Event-driven tree walk (lxml iterwalk) with explicit state instead of
+  recursion, so deep nesting can't hit Python's recursion limit
+"""
+
+import re
+from typing import Iterator, Optional
+
+from lxml import etree
+
+
+# Never rendered
+SKIP_TAGS = {"script", "style", "noscript", "template", "head", "title"}
+
+# Separated from their surroundings by a blank line
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "body", "html", "figure",
+    "figcaption", "header", "footer", "aside", "nav", "form", "fieldset",
+    "details", "summary", "address", "center", "dl",
+}
+
+HEADING_LEVELS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+
+# Inline formatting: tag -> marker written on both sides
+INLINE_MARKERS = {
+    "strong": "**", "b": "**",
+    "em": "*", "i": "*",
+    "del": "~~", "s": "~~", "strike": "~~",
+}
+
+# Bullet per nesting level (as markdownify does)
+BULLETS = "*+-"
+
+WHITESPACE = re.compile(r"\s+")
+
+
+class MarkdownConverter:
+    """
+    Convert one lxml element to markdown, yielding pieces as it walks.
+    
+    One converter per element (it keeps state while walking).
+    
+    Usage:
+        for piece in MarkdownConverter().iter_markdown(element):
+            ...
+    """
+    
+    def __init__(self):
+        """Initialize the converter's walk state."""
+        self._out: list[str] = []
+        self._started = False       # Anything written yet?
+        self._newlines = 0          # Line breaks owed before the next text
+        self._blank_prefix = ""     # Prefix for blank lines among those
+        self._space = False         # A space is owed before the next text
+        self._prefixes: list[str] = []          # "> " per quote, indent per list item
+        self._marker: Optional[tuple[str, str]] = None  # (line prefix, "## " or "* ")
+        self._opening: list[str] = []           # Inline markers not written yet
+        self._closing: list[Optional[str]] = []  # Closing text per open inline element
+        self._lists: list[list] = []            # [ordered, next number] per open list
+        self._code = 0                          # Inside inline <code> (no escaping)
+    
+    def iter_markdown(self, element: etree._Element) -> Iterator[str]:
+        """
+        Walk element and yield its markdown in order.
+        
+        Args:
+            element: Parsed HTML element (e.g., PageScan.content)
+        
+        Yields:
+            Pieces of markdown; joined, they're the whole conversion
+        """
+        walker = etree.iterwalk(element, events=("start", "end", "comment"))
+        for event, node in walker:
+            if event == "comment":
+                self._text(node.tail)
+            elif node.tag in SKIP_TAGS:
+                if event == "start":
+                    walker.skip_subtree()
+                elif node is not element:
+                    self._text(node.tail)
+            elif event == "start":
+                if self._start(node):
+                    walker.skip_subtree()
+                else:
+                    self._text(node.text)
+            else:
+                self._end(node)
+                if node is not element:
+                    self._text(node.tail)
+            
+            if self._out:
+                yield "".join(self._out)
+                self._out.clear()
+    
+    def _start(self, node: etree._Element) -> bool:
+        """
+        Handle an opening tag.
+        
+        Returns:
+            True if the whole element was rendered (skip its children)
+        """
+        tag = node.tag
+        
+        if tag in INLINE_MARKERS:
+            self._open(INLINE_MARKERS[tag], INLINE_MARKERS[tag])
+        elif tag == "a":
+            href = node.get("href")
+            if href and len(node) == 0 and (node.text or "").strip() == href:
+                # Bare URL: <https://...> autolink
+                self._emit(f"<{href}>")
+                self._closing.append(None)
+                return True
+            if href:
+                title = node.get("title")
+                self._open("[", f']({href} "{title}")' if title else f"]({href})")
+            else:
+                self._closing.append(None)
+        elif tag == "code":
+            self._code += 1
+            self._open("`", "`")
+        elif tag == "img":
+            src = node.get("src")
+            if src:
+                title = node.get("title")
+                suffix = f' "{title}"' if title else ""
+                self._emit(f"![{node.get('alt') or ''}]({src}{suffix})")
+        elif tag == "br":
+            if self._started:
+                self._newlines = max(self._newlines, 1)
+                self._space = False
+        elif tag in HEADING_LEVELS:
+            self._block(2)
+            self._set_marker("#" * HEADING_LEVELS[tag] + " ")
+        elif tag in ("ul", "ol"):
+            self._block(1 if self._lists else 2)
+            start = node.get("start")
+            self._lists.append([tag == "ol", int(start) if start and start.isdigit() else 1])
+        elif tag == "li":
+            self._block(1)
+            self._set_marker(self._list_marker())
+            self._prefixes.append(" " * len(self._marker[1]))
+        elif tag == "dt":
+            self._block(1)
+        elif tag == "dd":
+            self._block(1)
+            self._set_marker(":   ")
+            self._prefixes.append("    ")
+        elif tag == "blockquote":
+            self._block(2)
+            self._prefixes.append("> ")
+        elif tag == "hr":
+            self._block(2)
+            self._emit("---")
+            self._block(2)
+        elif tag == "pre":
+            self._pre(node)
+            return True
+        elif tag == "table":
+            self._table(node)
+            return True
+        elif tag in BLOCK_TAGS:
+            self._block(2)
+        return False
+    
+    def _end(self, node: etree._Element) -> None:
+        """Handle a closing tag."""
+        tag = node.tag
+        
+        if tag in INLINE_MARKERS or tag == "a":
+            self._close()
+        elif tag == "code":
+            self._code -= 1
+            self._close()
+        elif tag in HEADING_LEVELS:
+            self._marker = None  # Empty heading: drop it
+            self._block(2)
+        elif tag in ("ul", "ol"):
+            self._lists.pop()
+            self._block(1 if self._lists else 2)
+        elif tag in ("li", "dd"):
+            self._marker = None
+            self._prefixes.pop()
+            self._block(1)
+        elif tag == "dt":
+            self._block(1)
+        elif tag == "blockquote":
+            self._prefixes.pop()
+            self._block(2)
+        elif tag in ("pre", "table") or tag in BLOCK_TAGS:
+            self._block(2)
+    
+    def _list_marker(self) -> str:
+        """Bullet or number for the next <li>."""
+        if not self._lists:
+            return "* "
+        current = self._lists[-1]
+        if current[0]:
+            number = current[1]
+            current[1] += 1
+            return f"{number}. "
+        return BULLETS[(len(self._lists) - 1) % len(BULLETS)] + " "
+    
+    def _pre(self, node: etree._Element) -> None:
+        """Write a <pre> block as a ``` fence, verbatim."""
+        code = node.text_content()
+        if code.startswith("\n"):
+            code = code[1:]
+        self._block(2)
+        self._lines(["```", *code.rstrip("\n").split("\n"), "```"])
+        self._block(2)
+    
+    def _table(self, node: etree._Element) -> None:
+        """Write a <table> as a pipe table (first row of <th>s is the header)."""
+        rows = []
+        for row in node.iter("tr"):
+            cells = [cell for cell in row if cell.tag in ("td", "th")]
+            if cells:
+                rows.append(cells)
+        if not rows:
+            return
+        
+        width = max(len(cells) for cells in rows)
+        if all(cell.tag == "th" for cell in rows[0]):
+            header, rows = [_cell_markdown(cell) for cell in rows[0]], rows[1:]
+        else:
+            header = []
+        header += [""] * (width - len(header))
+        
+        lines = [_table_row(header), _table_row(["---"] * width)]
+        for cells in rows:
+            texts = [_cell_markdown(cell) for cell in cells]
+            lines.append(_table_row(texts + [""] * (width - len(texts))))
+        
+        self._block(2)
+        self._lines(lines)
+        self._block(2)
+    
+    def _block(self, newlines: int) -> None:
+        """Ask for a line break (1) or blank line (2) before the next text."""
+        if not self._started or self._marker is not None:
+            return
+        if self._newlines == 0:
+            self._blank_prefix = "".join(self._prefixes).rstrip()
+        self._newlines = max(self._newlines, newlines)
+        self._space = False
+    
+    def _set_marker(self, marker: str) -> None:
+        """Start the next line with a heading or list marker."""
+        self._marker = ("".join(self._prefixes), marker)
+    
+    def _open(self, opening: str, closing: str) -> None:
+        """Open an inline element; its marker is written with the first text inside."""
+        self._opening.append(opening)
+        self._closing.append(closing)
+    
+    def _close(self) -> None:
+        """Close the innermost inline element."""
+        closing = self._closing.pop()
+        if closing is None:
+            return
+        if self._opening:
+            # Nothing was written inside it: write nothing at all
+            self._opening.pop()
+        else:
+            self._out.append(closing)
+    
+    def _text(self, text: Optional[str]) -> None:
+        """Write a text node (whitespace collapsed, markdown characters escaped)."""
+        if not text:
+            return
+        text = WHITESPACE.sub(" ", text)
+        if text.startswith(" "):
+            self._space = True
+        stripped = text.strip()
+        if not stripped:
+            return
+        if not self._code:
+            stripped = stripped.replace("*", r"\*").replace("_", r"\_")
+        self._emit(stripped)
+        self._space = text.endswith(" ")
+    
+    def _emit(self, text: str) -> None:
+        """Write inline text, paying any owed line breaks, space and markers first."""
+        if self._newlines or self._marker is not None:
+            self._start_line()
+        elif self._space and self._started:
+            self._out.append(" ")
+        self._space = False
+        if self._opening:
+            self._out.append("".join(self._opening))
+            self._opening.clear()
+        self._out.append(text)
+        self._started = True
+    
+    def _start_line(self) -> None:
+        """Write owed line breaks, then the new line's prefix and marker."""
+        prefix = "".join(self._prefixes)
+        if self._marker is not None:
+            prefix = "".join(self._marker)
+            self._marker = None
+        if self._started:
+            # Blank lines only keep the prefix both neighbors share ("> " inside quotes)
+            blank = _common_prefix(self._blank_prefix, prefix.rstrip())
+            self._out.append("\n" + (blank + "\n") * (max(self._newlines, 1) - 1))
+        self._out.append(prefix)
+        self._newlines = 0
+    
+    def _lines(self, lines: list[str]) -> None:
+        """Write whole lines verbatim (fences, tables), each with the current prefix."""
+        self._emit(lines[0])
+        prefix = "".join(self._prefixes)
+        for line in lines[1:]:
+            self._out.append("\n" + (prefix + line).rstrip())
+
+
+def _common_prefix(a: str, b: str) -> str:
+    """Longest common prefix of two strings."""
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    return a[:i]
+
+
+def _cell_markdown(cell: etree._Element) -> str:
+    """A table cell's markdown on one line, with | escaped."""
+    markdown = "".join(MarkdownConverter().iter_markdown(cell))
+    return WHITESPACE.sub(" ", markdown).strip().replace("|", r"\|")
+
+
+def _table_row(cells: list[str]) -> str:
+    """One pipe table row."""
+    return "| " + " | ".join(cells) + " |"
+
+
+def html_to_markdown(element: etree._Element, max_chars: Optional[int] = None) -> str:
+    """
+    Convert an element to markdown, stopping once max_chars are produced.
+    
+    Args:
+        element: Parsed HTML element
+        max_chars: Character budget (None = convert everything)
+    
+    Returns:
+        Markdown, at most max_chars long
+    """
+    pieces = []
+    length = 0
+    for piece in MarkdownConverter().iter_markdown(element):
+        pieces.append(piece)
+        length += len(piece)
+        if max_chars is not None and length >= max_chars:
+            break
+    markdown = "".join(pieces)
+    return markdown if max_chars is None else markdown[:max_chars]
@@ -0,0 +1,187 @@
+"""
+Single-pass scan of an HTML page.
+
+WebFetcher used to parse pages with BeautifulSoup's pure-Python
+html.parser, then search the whole tree once per question (og:title?
+article:title? <h1>? author byline? published date? site name? <article>?
+each container class?). The paywall check then turned the whole tree back
+into a string just to look for words in it.
+
+scan_html() parses with lxml (libxml2, written in C) and walks the tree
+once. On the way it collects:
+
+- Every <meta property="..."> tag (OG and article:* metadata)
+- The first <title>, <h1> and author byline
+- Paywall markers in class and id attributes
+- The <article> element and known content containers
+- Readability scores for every block (see content_scoring.py)
+
+WebFetcher then answers each of its questions from the resulting PageScan.
+
+Python concepts:
+- lxml.html: Fast HTML parsing into an ElementTree
+- etree.iterwalk: One walk with "start" and "end" events per element
+- dataclass with helper methods
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import lxml.html
+from lxml import etree
+
+from paper_library.content_scoring import BOILERPLATE_TAGS, ContentScorer
+
+
+# Content containers by priority: (attribute, value)
+CONTAINER_SELECTORS = [
+    ("class", "article-content"),
+    ("class", "post-content"),
+    ("class", "entry-content"),
+    ("class", "article-body"),
+    ("class", "content"),
+    ("id", "main-content"),
+    ("class", "main-content"),
+]
+
+# Class names of author bylines
+BYLINE_CLASSES = {"byline", "author-name", "author", "author-info"}
+
+# Substrings of class/id names that mark a paywall overlay
+PAYWALL_MARKERS = ["paywall", "subscribe-wall", "metered-paywall", "limited-access"]
+
+# libxml2 gives up below 256 levels of nesting by default, silently
+# dropping the rest of the page; huge_tree raises that limit
+HTML_PARSER = lxml.html.HTMLParser(huge_tree=True)
+
+# For bytes that decode as UTF-8: without a <meta charset>, libxml2 would
+# read them as Latin-1 and turn every "—" into mojibake
+UTF8_HTML_PARSER = lxml.html.HTMLParser(huge_tree=True, encoding="utf-8")
+
+
+@dataclass
+class PageScan:
+    """Everything WebFetcher needs from one HTML page."""
+    meta: dict[str, list[str]] = field(default_factory=dict)
+    title: Optional[str] = None
+    h1: Optional[str] = None
+    byline: Optional[str] = None
+    paywall_marker: Optional[str] = None
+    content: Optional[etree._Element] = None
+    
+    def first_meta(self, prop: str) -> Optional[str]:
+        """Content of the first <meta property=prop> tag (may be empty)."""
+        values = self.meta.get(prop)
+        return values[0] if values else None
+    
+    @property
+    def content_html(self) -> Optional[str]:
+        """Main content element serialized back to HTML."""
+        if self.content is None:
+            return None
+        return lxml.html.tostring(self.content, encoding="unicode", with_tail=False)
+
+
+def parse_html(html_content: bytes) -> Optional[etree._Element]:
+    """
+    Parse a page with lxml.
+    
+    Args:
+        html_content: Raw HTML bytes (UTF-8 if they decode as such, else
+            the encoding from <meta charset>)
+    
+    Returns:
+        Root <html> element, or None if there's no document at all
+    """
+    try:
+        html_content.decode("utf-8")
+        parser = UTF8_HTML_PARSER
+    except UnicodeDecodeError:
+        parser = HTML_PARSER
+    try:
+        return lxml.html.document_fromstring(html_content, parser=parser)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def scan_html(html_content: bytes) -> PageScan:
+    """
+    Parse a page and collect metadata, paywall markers and main content.
+    
+    Content is chosen like before: the first <article>, else the first
+    known container (by CONTAINER_SELECTORS priority), else the
+    best-scoring block. <script>, <nav>, <aside> etc. never count and are
+    removed from the chosen element.
+    
+    Args:
+        html_content: Raw HTML bytes
+    
+    Returns:
+        PageScan (empty if the page couldn't be parsed)
+    """
+    page = PageScan()
+    root = parse_html(html_content)
+    if root is None:
+        return page
+    
+    scorer = ContentScorer()
+    article = None
+    containers: list[Optional[etree._Element]] = [None] * len(CONTAINER_SELECTORS)
+    boilerplate = []
+    
+    for event, element in etree.iterwalk(root, events=("start", "end")):
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue  # Comments
+        if event == "end":
+            scorer.end(element)
+            continue
+        
+        # Content may only come from outside <nav>, <aside> etc.
+        is_content = not scorer.in_boilerplate and tag not in BOILERPLATE_TAGS
+        if tag in BOILERPLATE_TAGS and not scorer.in_boilerplate:
+            boilerplate.append(element)
+        scorer.start(element)
+        
+        if tag == "meta":
+            prop = element.get("property")
+            if prop:
+                page.meta.setdefault(prop, []).append(element.get("content") or "")
+        elif tag == "title" and page.title is None:
+            page.title = element.text_content().strip()
+        elif tag == "h1" and page.h1 is None:
+            page.h1 = element.text_content().strip()
+        elif tag == "article" and article is None and is_content:
+            article = element
+        
+        classes = element.get("class") or ""
+        element_id = element.get("id") or ""
+        if not classes and not element_id:
+            continue
+        
+        if page.byline is None and BYLINE_CLASSES.intersection(classes.split()):
+            page.byline = element.text_content().strip()
+        
+        if page.paywall_marker is None:
+            names = f"{classes} {element_id}".lower()
+            page.paywall_marker = next((m for m in PAYWALL_MARKERS if m in names), None)
+        
+        if is_content:
+            for i, (attr, value) in enumerate(CONTAINER_SELECTORS):
+                if containers[i] is None and value in (element.get(attr) or "").split():
+                    containers[i] = element
+    
+    # (lxml elements with no children are falsy, hence the "is not None"s)
+    container = next((c for c in containers if c is not None), None)
+    if article is not None:
+        page.content = article
+    elif container is not None:
+        page.content = container
+    else:
+        page.content = scorer.best()
+    
+    # Strip <script>, <nav> etc. (drop_tree keeps the text that follows them)
+    for element in boilerplate:
+        element.drop_tree()
+    
+    return page
@@ -0,0 +1,237 @@
+"""
+On-disk HTTP cache using conditional requests.
+
+Re-running an overlapping link list used to download every article and
+every arXiv Atom response again, even when nothing had changed. Most
+servers attach validators to their responses:
+
+- ETag: an opaque version tag ("abc123")
+- Last-Modified: when the resource last changed
+
+We keep the body together with those validators under
+vault/_meta/http_cache/. Next time we send them back as If-None-Match /
+If-Modified-Since. If nothing changed the server answers
+"304 Not Modified" with an empty body, and we use the stored copy.
+
+Responses without validators aren't stored (there would be no way to ask
+"has this changed?"). The cache is size-bounded: past max_bytes, the least
+recently used entries are deleted (see cache_files.py).
+
+Python concepts:
+- HTTP caching headers (ETag, Last-Modified, 304 Not Modified)
+- One file per entry: a JSON header line, then the raw body
+- threading.Lock: Safe to share between pipeline worker threads
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import requests
+
+from paper_library.cache_files import LruDirectory
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body and its content type."""
+    content: bytes
+    content_type: str
+
+
+class HttpCache:
+    """
+    Validator-based (ETag / Last-Modified), size-bounded HTTP response cache.
+    
+    Usage:
+        cache = HttpCache(config.http_cache_dir, max_bytes=256 * 1024 * 1024)
+        content = cached_get(session, url, cache, timeout=30)
+        
+        # Or by hand, e.g. around a streaming request:
+        headers = cache.conditional_headers(url)
+        ...
+        if response.status_code == 304:
+            cached = cache.revalidated(url)
+        else:
+            cache.store(url, response.headers, response.content)
+    """
+    
+    SUFFIX = ".http"
+    
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            cache_dir: Directory holding one file per cached URL
+            max_bytes: Total size to keep before evicting
+        """
+        self.cache_dir = cache_dir
+        self.files = LruDirectory(cache_dir, self.SUFFIX, max_bytes)
+        
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+    
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """
+        Request headers asking "send the body only if it changed".
+        
+        Args:
+            url: Full request URL (including query string)
+        
+        Returns:
+            If-None-Match / If-Modified-Since headers, or {} if url isn't cached
+        """
+        # Only the header line: the body can be megabytes we don't need here
+        entry = self._read(url, body=False)
+        if entry is None:
+            return {}
+        meta, _ = entry
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+    
+    def revalidated(self, url: str) -> Optional[CachedResponse]:
+        """
+        Get the stored response after the server answered 304.
+        
+        Args:
+            url: Full request URL
+        
+        Returns:
+            Stored response, or None if it vanished (evicted meanwhile)
+        """
+        entry = self._read(url)
+        if entry is None:
+            return None
+        meta, body = entry
+        try:
+            self.files.touch(self._path(url))
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return CachedResponse(content=body, content_type=meta.get("content_type", ""))
+    
+    def store(self, url: str, headers, body: bytes) -> None:
+        """
+        Remember a full (200) response if it carries validators.
+        
+        Args:
+            url: Full request URL
+            headers: Response headers (case-insensitive mapping)
+            body: Response body
+        """
+        with self._lock:
+            self.misses += 1
+        
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": headers.get("content-type", ""),
+        }
+        data = json.dumps(meta).encode('utf-8') + b"\n" + body
+        self.files.write(self._path(url), lambda tmp_path: tmp_path.write_bytes(data))
+    
+    def stats(self) -> dict:
+        """
+        Counters for this run plus the cache's current size.
+        
+        Returns:
+            Dictionary with hits (304s served from disk), misses (full
+            responses), evictions, entries and bytes
+        """
+        return {"hits": self.hits, "misses": self.misses, **self.files.stats()}
+    
+    def _path(self, url: str) -> Path:
+        """File that stores the entry for url."""
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}{self.SUFFIX}"
+    
+    def _read(self, url: str, body: bool = True) -> Optional[tuple[dict, bytes]]:
+        """Stored (meta, body) for url, or None. body=False skips the body (returns b"")."""
+        try:
+            with open(self._path(url), 'rb') as f:
+                meta = json.loads(f.readline())
+                content = f.read() if body else b""
+        except (OSError, ValueError):
+            # Missing or damaged - either way, not cached
+            return None
+        if meta.get("url") != url:
+            return None
+        return meta, content
+
+
+def cached_get(
+    session: requests.Session,
+    url: str,
+    cache: Optional[HttpCache],
+    timeout: float
+) -> bytes:
+    """
+    GET a URL's body, revalidating a cached copy when there is one.
+    
+    Args:
+        session: Session to send the request on
+        url: Full URL (including query string)
+        cache: HttpCache, or None to just GET
+        timeout: Request timeout in seconds
+    
+    Returns:
+        Response body (fresh or from the cache)
+    
+    Raises:
+        requests.RequestException: If the request fails
+    """
+    headers = cache.conditional_headers(url) if cache else {}
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cache:
+        cached = cache.revalidated(url)
+        if cached is not None:
+            return cached.content
+        # Evicted after we sent the validators: ask again without them
+        response = session.get(url, timeout=timeout)
+    
+    response.raise_for_status()
+    if cache:
+        cache.store(url, response.headers, response.content)
+    return response.content
+
+
+async def cached_get_async(
+    client: httpx.AsyncClient,
+    url: str,
+    cache: Optional[HttpCache],
+    timeout: float
+) -> bytes:
+    """
+    Async version of cached_get() on a shared httpx.AsyncClient.
+    
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    headers = cache.conditional_headers(url) if cache else {}
+    response = await client.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and cache:
+        cached = cache.revalidated(url)
+        if cached is not None:
+            return cached.content
+        response = await client.get(url, timeout=timeout)
+    
+    response.raise_for_status()
+    if cache:
+        cache.store(url, response.headers, response.content)
+    return response.content
@@ -0,0 +1,229 @@
+"""
+Canonical identifiers for duplicate detection.
+
+The same paper shows up in many spellings:
+
+    https://arxiv.org/abs/2309.14316
+    arXiv:2309.14316v2
+    2309.14316
+    https://doi.org/10.48550/arXiv.2309.14316
+
+If we compare raw strings, each of those is a "new" paper: a new download,
+a new GROBID run and a new (paid) Claude call. This module maps every form
+to one canonical key before we look at the processing state:
+
+- arXiv IDs: bare ID without version ("2309.14316"), via ArxivFetcher.parse_arxiv_id
+- DOIs: lower-cased, without "doi:" or resolver prefixes ("10.1162/coli_a_00123")
+  (arXiv's own DOIs, 10.48550/arXiv.*, become arXiv IDs)
+- URLs: tracking parameters (utm_*, fbclid, ...) and #fragments removed;
+  arXiv and doi.org links become arXiv IDs / DOIs
+- Local files: absolute path
+
+The alias index remembers other keys we've learned for a paper (e.g., the
+DOI GROBID found inside an arXiv PDF), so a later request by DOI is
+recognized as the same paper without any network call. New aliases are
+appended to a journal (identifier_aliases.jsonl) rather than rewriting the
+whole JSON file each time; loading the index folds the journal back in,
+as fingerprints.py does.
+
+Python concepts:
+- urllib.parse: Split URLs into parts and put them back together
+- Regular expressions for DOI matching
+- JSON persistence with a lock for thread safety
+- Append-only journals: Cheap writes now, one compaction later
+"""
+
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from paper_library.cache_files import write_atomic
+
+
+# DOI syntax: "10." + registrant code + "/" + suffix (anything but whitespace)
+DOI_PATTERN = re.compile(r'10\.\d{4,9}/[^\s?#]+', re.IGNORECASE)
+
+# arXiv registers DOIs for its own papers: 10.48550/arXiv.2309.14316
+ARXIV_DOI_PREFIX = "10.48550/arxiv."
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "si", "igshid",
+    "_hsenc", "_hsmi", "mkt_tok",
+}
+
+
+class IdentifierIndex:
+    """
+    Turn any paper identifier into one canonical key, plus known aliases.
+    
+    Usage:
+        index = IdentifierIndex(config.identifier_aliases_file, arxiv_fetcher)
+        index.resolve("https://arxiv.org/abs/2309.14316v2")  # "2309.14316"
+        
+        # Remember that a DOI belongs to an already-processed paper
+        index.add_alias("10.1234/example", "2309.14316")
+        index.resolve("https://doi.org/10.1234/EXAMPLE")     # "2309.14316"
+    """
+    
+    def __init__(self, alias_file: Path, arxiv_fetcher):
+        """
+        Initialize the index.
+        
+        Args:
+            alias_file: JSON file storing alias -> canonical key (the journal sits next to it)
+            arxiv_fetcher: ArxivFetcher (for its arXiv ID parser)
+        """
+        self.alias_file = alias_file
+        self.journal_file = alias_file.with_suffix(".jsonl")
+        self.arxiv_fetcher = arxiv_fetcher
+        self._lock = threading.Lock()
+        
+        self._aliases: dict[str, str] = {}
+        if alias_file.exists():
+            try:
+                self._aliases = json.loads(alias_file.read_text())
+            except Exception as e:
+                print(f"Warning: Could not load identifier aliases: {e}")
+        
+        # Aliases added since the JSON file was last written
+        if self.journal_file.exists():
+            for line in self.journal_file.read_text().splitlines():
+                try:
+                    record = json.loads(line)
+                    self._aliases[record["alias"]] = record["key"]
+                except (ValueError, KeyError):
+                    continue  # Half-written line from a crash
+            self._compact()
+    
+    def canonical(self, identifier: str) -> str:
+        """
+        Canonical form of an identifier (no network, no alias lookup).
+        
+        Args:
+            identifier: arXiv ID, DOI, URL or file path, in any common spelling
+        
+        Returns:
+            Canonical key (unrecognized input comes back stripped)
+        """
+        text = identifier.strip()
+        
+        doi = self._parse_doi(text)
+        if doi:
+            if doi.startswith(ARXIV_DOI_PREFIX):
+                return doi[len(ARXIV_DOI_PREFIX):]
+            return doi
+        
+        if text.lower().startswith(("http://", "https://")):
+            if "arxiv.org/" in text.lower():
+                arxiv_id = self.arxiv_fetcher.parse_arxiv_id(text)
+                if arxiv_id:
+                    return arxiv_id
+            return self._clean_url(text)
+        
+        arxiv_id = self.arxiv_fetcher.parse_arxiv_id(text)
+        if arxiv_id:
+            return arxiv_id
+        
+        path = Path(text).expanduser()
+        if path.exists():
+            return str(path.resolve())
+        
+        return text
+    
+    def resolve(self, identifier: str) -> str:
+        """
+        Canonical key for an identifier, following any known alias.
+        
+        Args:
+            identifier: Any identifier form
+        
+        Returns:
+            The key the paper is tracked under
+        """
+        key = self.canonical(identifier)
+        with self._lock:
+            return self._aliases.get(key, key)
+    
+    def add_alias(self, alias: Optional[str], key: str) -> None:
+        """
+        Record that `alias` refers to the paper tracked as `key`.
+        
+        Args:
+            alias: Another identifier for the paper (e.g., its DOI); None is ignored
+            key: Canonical key the paper is tracked under
+        """
+        if not alias:
+            return
+        alias_key = self.canonical(alias)
+        if alias_key == key:
+            return
+        
+        with self._lock:
+            if self._aliases.get(alias_key) == key:
+                return
+            self._aliases[alias_key] = key
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, 'a') as f:
+                f.write(json.dumps({"alias": alias_key, "key": key}) + "\n")
+    
+    def _compact(self) -> None:
+        """Write every alias to the JSON file and empty the journal."""
+        data = json.dumps(self._aliases, indent=2, sort_keys=True)
+        try:
+            write_atomic(self.alias_file, lambda tmp_path: tmp_path.write_text(data))
+            # A crash before this line only means replaying aliases we already have
+            self.journal_file.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Warning: Could not save identifier aliases: {e}")
+    
+    def _parse_doi(self, text: str) -> Optional[str]:
+        """
+        Extract a DOI from "10.x/y", "doi:10.x/y" or a doi.org / publisher /doi/ URL.
+        
+        Returns:
+            Lower-cased DOI, or None if text isn't a DOI form
+        """
+        lowered = text.lower()
+        if lowered.startswith(("http://", "https://")):
+            parts = urlsplit(text)
+            host = parts.netloc.lower()
+            if host.endswith("doi.org"):
+                candidate = parts.path.lstrip("/")
+            elif "/doi/" in parts.path.lower():
+                # Publisher pages like https://dl.acm.org/doi/10.1145/3442188.3445922
+                candidate = parts.path[parts.path.lower().index("/doi/") + 5:]
+            else:
+                return None
+        else:
+            candidate = re.sub(r'^doi:\s*', '', text, flags=re.IGNORECASE)
+        
+        match = DOI_PATTERN.match(candidate)
+        if not match:
+            return None
+        # Trailing punctuation is almost always from the surrounding sentence
+        return match.group(0).rstrip(".,;").lower()
+    
+    def _clean_url(self, url: str) -> str:
+        """
+        Normalize a URL: lower-case scheme and host, drop tracking parameters,
+        the #fragment and a trailing slash.
+        """
+        parts = urlsplit(url)
+        query = [
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name.lower() not in TRACKING_PARAMS and not name.lower().startswith("utm_")
+        ]
+        path = parts.path.rstrip("/") or "/"
+        return urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            path,
+            urlencode(query),
+            "",
+        ))
@@ -109,11 +109,14 @@ class MarkdownWriter:
         if metadata.citations:
             sections.append("## Cites (Key Papers)")
             sections.append("")
-            # Show top 10 citations as wikilinks
-            # In Phase 2, we'll have logic to pick "key" papers
-            # For now, just show first 10
-            for citation in metadata.citations[:10]:
+            # Show top 10 citations as wikilinks: the most-mentioned in the
+            # text first (sorted() is stable, so ties keep bibliography order).
+            # Unknown counts (no body was parsed) rank like a single mention
+            key_papers = sorted(metadata.citations, key=lambda c: c.mention_count or 1, reverse=True)
+            for citation in key_papers[:10]:
                 citation_link = MarkdownWriter._format_citation_wikilink(citation)
+                if (citation.mention_count or 1) > 1:
+                    citation_link += f" (cited {citation.mention_count}×)"
                 sections.append(f"- {citation_link}")
             
             if len(metadata.citations) > 10:
@@ -78,14 +78,16 @@ class Citation(BibliographicEntry):
             volume="123",
             issue="4",
             pages="567-890",
-            mention_count=1
+            mention_count=3
         )
     
     Future: Can be "promoted" to PaperMetadata when we process the cited paper,
     enabling the citation graph feature.
     """
     # How many times this citation is mentioned in the parent paper
-    mention_count: int = 1
+    # (in-text refs GROBID linked to it; None when there was no body to
+    # count in, e.g. GROBID's references-only tier)
+    mention_count: Optional[int] = None
     
     # Future fields for citation graph (Phase 2):
     # citation_key: Optional[str] = None  # For Pandoc/BibTeX integration
@@ -120,6 +122,10 @@ class PaperMetadata(BibliographicEntry):
     # These track when and how the paper was processed
     processed_at: Optional[datetime] = None
     source: Optional[str] = None  # e.g., "arxiv", "doi", "grobid", "local"
+    
+    # True if GROBID found the DOI outside the paper's own header, where it
+    # is usually a cited paper's: kept for the note, never used as an alias
+    doi_guessed: bool = False
 
 
 class ArticleMetadata(BaseModel):
@@ -165,6 +171,10 @@ class Synthesis(BaseModel):
     generated_at: datetime = Field(default_factory=datetime.now)
     model_used: str = "claude-haiku-20250514"
     cost_usd: float = 0.0  # Track how much we spent
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_write_tokens: int = 0  # Prompt-cache writes (billed at 1.25x input)
+    cache_read_tokens: int = 0   # Prompt-cache reads (billed at 0.1x input)
 
 
 class ProcessingState(BaseModel):
@@ -178,6 +188,8 @@ class ProcessingState(BaseModel):
     processed_dois: set[str] = Field(default_factory=set)
     processed_arxiv_ids: set[str] = Field(default_factory=set)
     processed_urls: set[str] = Field(default_factory=set)
+    # Local PDFs, by absolute path (see identifiers.py)
+    processed_files: set[str] = Field(default_factory=set)
     
     # Papers that failed processing
     # dict[str, str] means "dictionary with string keys and string values"
@@ -202,6 +214,7 @@ class ProcessingState(BaseModel):
             identifier in self.processed_dois
             or identifier in self.processed_arxiv_ids
             or identifier in self.processed_urls
+            or identifier in self.processed_files
         )
     
     def mark_processed(self, identifier: str, source: str) -> None:
@@ -210,7 +223,7 @@ class ProcessingState(BaseModel):
         
         Args:
             identifier: DOI, arXiv ID, or URL
-            source: Where it came from ("arxiv", "doi", "web")
+            source: Where it came from ("arxiv", "doi", "web", "local")
         """
         if source == "arxiv":
             self.processed_arxiv_ids.add(identifier)
@@ -218,6 +231,8 @@ class ProcessingState(BaseModel):
             self.processed_dois.add(identifier)
         elif source == "web":
             self.processed_urls.add(identifier)
+        elif source == "local":
+            self.processed_files.add(identifier)
         
         # Update timestamp
         self.last_updated = datetime.now()
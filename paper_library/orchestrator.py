@@ -8,24 +8,50 @@ This module coordinates the entire pipeline:
 4. Write Obsidian note
 5. Update processing state
 
+Each step is its own "stage" method, so the same steps can run one paper at
+a time (process), as a pipeline across many papers (process_batch with
+pipelined=True), or with every synthesis sent as one Message Batch
+(process_batch with message_batch=True).
+
+After every stage, the paper's progress is checkpointed (see checkpoints.py),
+so an interrupted run picks each paper up at its first unfinished stage.
+
+If GROBID is down, papers still get notes (source metadata, pdfplumber text,
+no citations) and are queued for reenrich(), which adds GROBID's metadata
+and citations once it's back.
+
 Python concepts:
 - Coordination/orchestration patterns
 - Error handling and recovery
 - State management
 - File path manipulation
+- Dataclasses for passing work between stages
 """
 
+import hashlib
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional, Union
 import pdfplumber
 
 from paper_library.config import config
 from paper_library.state import StateManager
-from paper_library.models import PaperMetadata
+from paper_library.models import Citation, PaperMetadata, Synthesis
+from paper_library.pipeline import Stage, StagedPipeline
 from paper_library.arxiv_fetcher import ArxivFetcher
-from paper_library.grobid_processor import GrobidProcessor
-from paper_library.synthesis_generator import SynthesisGenerator
+from paper_library.grobid_client import CircuitBreaker, GrobidClient
+from paper_library.grobid_processor import GrobidProcessor, GrobidUnavailableError
+from paper_library.tei_cache import TeiCache
+from paper_library.checkpoints import CheckpointStore
+from paper_library.downloads import DownloadManager
+from paper_library.fingerprints import FingerprintIndex
+from paper_library.http_cache import HttpCache
+from paper_library.identifiers import IdentifierIndex
+from paper_library.synthesis_generator import SynthesisError, SynthesisGenerator
+from paper_library.synthesis_cache import SynthesisCache
 from paper_library.markdown_writer import MarkdownWriter
+from paper_library.pdf_metadata import read_pdf_metadata
 
 
 class ProcessingError(Exception):
@@ -33,6 +59,27 @@ class ProcessingError(Exception):
     pass
 
 
+@dataclass
+class PaperJob:
+    """
+    One paper's progress through the pipeline.
+    
+    Each stage fills in the next field, so a job can be handed from one
+    stage (or worker thread) to the next without any shared state.
+    `completed` lists the stages already done (restored from a checkpoint
+    when resuming an interrupted run).
+    """
+    identifier: str
+    pdf_path: Optional[Path] = None
+    metadata: Optional[PaperMetadata] = None
+    text: Optional[str] = None
+    text_source: Optional[str] = None  # "grobid" or "pdfplumber"
+    synthesis: Optional[Synthesis] = None
+    output_path: Optional[Path] = None
+    completed: list[str] = field(default_factory=list)
+    needs_enrichment: bool = False  # Processed without GROBID (see reenrich())
+
+
 class PaperProcessor:
     """
     Orchestrate the paper processing pipeline.
@@ -48,8 +95,33 @@ class PaperProcessor:
         
         # Process batch
         results = processor.process_batch(["2312.12345", "1706.03762"])
+        
+        # Process batch with overlapping stages
+        results = processor.process_batch(identifiers, pipelined=True)
+        
+        # Overnight ingest: all syntheses in one Message Batch (half price)
+        results = processor.process_batch(identifiers, message_batch=True)
     """
     
+    # Worker threads per stage in pipelined batch mode
+    # Fetch, GROBID and synthesis are overridden from config in __init__
+    # Writing notes and saving state are quick, one worker each is plenty
+    PIPELINE_WORKERS = {
+        "fetch": 2,
+        "grobid": 4,
+        "text": 2,
+        "synthesis": 4,
+        "write": 1,
+        "state": 1,
+    }
+    
+    # Max papers waiting in front of each stage (keeps memory bounded)
+    PIPELINE_QUEUE_SIZE = 4
+    
+    # Stage names in pipeline order (used for checkpoints)
+    # When the last one finishes, the paper's checkpoint is deleted
+    STAGES = ["fetch", "grobid", "text", "synthesis", "write", "state"]
+    
     def __init__(self, config, state_manager: StateManager):
         """
         Initialize the processor.
@@ -62,10 +134,67 @@ class PaperProcessor:
         self.state = state_manager
         
         # Initialize components
-        self.arxiv_fetcher = ArxivFetcher(config.vault_path)
-        self.grobid = GrobidProcessor(config.grobid_url)
-        self.synthesis_gen = SynthesisGenerator(config.anthropic_api_key)
+        # One pool of keep-alive connections for all PDF downloads
+        self.downloads = DownloadManager(pool_size=config.arxiv_max_concurrency)
+        self.http_cache = None
+        if config.http_cache_max_mb > 0:
+            self.http_cache = HttpCache(
+                config.http_cache_dir,
+                max_bytes=config.http_cache_max_mb * 1024 * 1024
+            )
+        self.arxiv_fetcher = ArxivFetcher(
+            config.vault_path,
+            downloads=self.downloads,
+            http_cache=self.http_cache
+        )
+        self.tei_cache = None
+        if config.tei_cache_max_mb > 0:
+            self.tei_cache = TeiCache(
+                config.tei_cache_dir,
+                max_bytes=config.tei_cache_max_mb * 1024 * 1024
+            )
+        # GROBID uploads adapt their concurrency to what the server can take
+        # and stop calling it altogether while it's down (circuit breaker)
+        self.grobid_client = GrobidClient(
+            initial_concurrency=config.grobid_pool_size,
+            max_concurrency=max(config.grobid_pool_size, config.grobid_max_concurrency),
+            health_url=f"{config.grobid_url.rstrip('/')}/api/isalive",
+            breaker=CircuitBreaker(
+                failure_threshold=config.grobid_breaker_failures,
+                reset_timeout=config.grobid_breaker_reset
+            )
+        )
+        self.grobid = GrobidProcessor(
+            config.grobid_url,
+            cache=self.tei_cache,
+            grobid_version=config.grobid_version or None,
+            client=self.grobid_client
+        )
+        self.synthesis_cache = None
+        if config.synthesis_cache:
+            self.synthesis_cache = SynthesisCache(config.synthesis_cache_dir)
+        self.synthesis_gen = SynthesisGenerator(
+            config.anthropic_api_key,
+            cache=self.synthesis_cache
+        )
         self.markdown_writer = MarkdownWriter()
+        self.identifiers = IdentifierIndex(config.identifier_aliases_file, self.arxiv_fetcher)
+        # Both keyed like the processing state, so any form of an identifier finds them
+        self.checkpoints = CheckpointStore(config.checkpoints_dir, key_for=self.identifiers.resolve)
+        # Papers processed without GROBID, kept (with their synthesis) for reenrich()
+        self.enrichment = CheckpointStore(config.enrichment_dir, key_for=self.identifiers.resolve)
+        self.fingerprints = FingerprintIndex(config.fingerprints_file)
+        self._fingerprints_scanned = False
+        self._fingerprints_lock = threading.Lock()
+        
+        # Network-bound stages follow the configured per-service limits
+        # (GROBID gets enough workers to keep the client's adaptive window full)
+        self.pipeline_workers = {
+            **self.PIPELINE_WORKERS,
+            "fetch": config.arxiv_max_concurrency,
+            "grobid": self.grobid_client.limit.maximum,
+            "synthesis": config.anthropic_max_concurrency,
+        }
     
     def process(self, identifier: str, force: bool = False) -> bool:
         """
@@ -92,53 +221,51 @@ class PaperProcessor:
         print(f"{'='*70}\n")
         
         # Check if already processed (unless force=True)
-        if not force and self.state.is_processed(identifier):
+        if not force and self.is_processed(identifier):
             print(f"⊘ Already processed: {identifier}")
             print(f"  Use force=True to reprocess\n")
             return False
         
+        job = PaperJob(identifier=identifier)
+        
         try:
+            # Pick up where an interrupted run left off (if it did)
+            self._resume(job, force)
+            if job.completed:
+                print(f"↻ Resuming from checkpoint (done: {', '.join(job.completed)})\n")
+            
             # Step 1: Determine source type and fetch
             print("Step 1: Fetching paper...")
-            pdf_path, metadata = self._fetch_paper(identifier)
-            print(f"  ✓ Fetched: {metadata.title}")
+            self._run_stage(job, "fetch", self._stage_fetch)
+            print(f"  ✓ Fetched: {job.metadata.title}")
+            
+            if not force and self._is_duplicate_pdf(job):
+                print(f"  Use force=True to reprocess\n")
+                return False
             
             # Step 2: Process with GROBID
             print("\nStep 2: Extracting metadata with GROBID...")
-            grobid_metadata = self.grobid.process(pdf_path)
-            
-            # Merge GROBID results with fetched metadata
-            # GROBID is more detailed, so we prefer its data when available
-            metadata = self._merge_metadata(metadata, grobid_metadata)
-            print(f"  ✓ Extracted {len(metadata.citations)} citations")
+            self._run_stage(job, "grobid", self._stage_grobid)
+            print(f"  ✓ Extracted {len(job.metadata.citations)} citations")
             
             # Step 3: Extract text for synthesis
-            print("\nStep 3: Extracting text from PDF...")
-            text = self._extract_text(pdf_path)
-            print(f"  ✓ Extracted {len(text)} characters")
+            print("\nStep 3: Extracting text...")
+            self._run_stage(job, "text", self._stage_extract_text)
+            print(f"  ✓ Extracted {len(job.text)} characters ({job.text_source})")
             
             # Step 4: Generate synthesis with Claude
             print("\nStep 4: Generating AI synthesis...")
-            synthesis = self.synthesis_gen.generate_quick_synthesis(text, metadata)
-            print(f"  ✓ Generated synthesis (cost: ${synthesis.cost_usd:.4f})")
+            self._run_stage(job, "synthesis", self._stage_synthesize)
+            print(f"  ✓ Generated synthesis (cost: ${job.synthesis.cost_usd:.4f})")
             
             # Step 5: Write Obsidian note
             print("\nStep 5: Writing Obsidian note...")
-            markdown = self.markdown_writer.paper_to_markdown(metadata, synthesis)
-            filename = self.markdown_writer.generate_filename(metadata)
-            
-            # Write to appropriate directory
-            output_dir = self.config.papers_dir
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            output_path = output_dir / f"{filename}.md"
-            output_path.write_text(markdown, encoding='utf-8')
-            print(f"  ✓ Written to: {output_path.relative_to(self.config.vault_path)}")
+            self._run_stage(job, "write", self._stage_write)
+            print(f"  ✓ Written to: {job.output_path.relative_to(self.config.vault_path)}")
             
             # Step 6: Update state
             print("\nStep 6: Updating state...")
-            source = self._get_source_type(identifier)
-            self.state.mark_processed(identifier, source)
+            self._run_stage(job, "state", self._stage_update_state)
             print(f"  ✓ Marked as processed")
             
             print(f"\n{'='*70}")
@@ -149,7 +276,7 @@ class PaperProcessor:
             
         except Exception as e:
             # Mark as failed in state
-            self.state.mark_failed(identifier, str(e))
+            self.state.mark_failed(self.identifiers.resolve(identifier), str(e))
             
             print(f"\n{'='*70}")
             print(f"✗ FAILED: {identifier}")
@@ -159,7 +286,14 @@ class PaperProcessor:
             # Re-raise as ProcessingError
             raise ProcessingError(f"Failed to process {identifier}: {e}") from e
     
-    def process_batch(self, identifiers: list[str], stop_on_error: bool = False, force: bool = False) -> dict:
+    def process_batch(
+        self,
+        identifiers: list[str],
+        stop_on_error: bool = False,
+        force: bool = False,
+        pipelined: bool = False,
+        message_batch: bool = False
+    ) -> dict:
         """
         Process multiple papers.
         
@@ -167,6 +301,10 @@ class PaperProcessor:
             identifiers: List of paper identifiers
             stop_on_error: If True, stop on first error. Otherwise continue.
             force: If True, reprocess even if already done
+            pipelined: If True, run stages concurrently across papers
+                (paper N+1 downloads while paper N is in GROBID, etc.)
+            message_batch: If True, submit all syntheses as one Message
+                Batch and write notes once it finishes (slower, half price)
             
         Returns:
             Dictionary with results: {"success": int, "failed": int, "skipped": int}
@@ -182,25 +320,43 @@ class PaperProcessor:
         print(f"BATCH PROCESSING: {len(identifiers)} papers")
         if force:
             print(f"  --force enabled: Reprocessing all papers")
+        if pipelined:
+            print(f"  Pipelined mode: stages run concurrently")
+        if message_batch:
+            print(f"  Message Batch mode: syntheses submitted together")
         print(f"{'='*70}\n")
         
-        for i, identifier in enumerate(identifiers, 1):
-            print(f"[{i}/{len(identifiers)}] Processing: {identifier}")
-            
-            try:
-                success = self.process(identifier, force=force)
-                if success:
-                    results["success"] += 1
-                else:
-                    results["skipped"] += 1
-                    
-            except Exception as e:
-                results["failed"] += 1
-                results["errors"].append((identifier, str(e)))
+        # Drop repeats of the same paper (e.g., an arXiv URL and its bare ID)
+        identifiers = self.dedupe(identifiers, results)
+        
+        # One arXiv API call per chunk of papers instead of one per paper
+        self.prefetch_arxiv_metadata(identifiers, force)
+        
+        if message_batch:
+            self._run_message_batch(identifiers, results, stop_on_error, force)
+        elif pipelined:
+            self._run_pipelined(identifiers, results, stop_on_error, force)
+        else:
+            for i, identifier in enumerate(identifiers, 1):
+                print(f"[{i}/{len(identifiers)}] Processing: {identifier}")
                 
-                if stop_on_error:
-                    print(f"\n✗ Stopping batch due to error")
-                    break
+                try:
+                    success = self.process(identifier, force=force)
+                    if success:
+                        results["success"] += 1
+                    else:
+                        results["skipped"] += 1
+                        
+                except Exception as e:
+                    results["failed"] += 1
+                    results["errors"].append((identifier, str(e)))
+                    
+                    if stop_on_error:
+                        print(f"\n✗ Stopping batch due to error")
+                        break
+        
+        # GROBID may be back already for papers that had to go without it
+        enrichment = self.reenrich() if self.enrichment.identifiers() else None
         
         # Print summary
         print(f"\n{'='*70}")
@@ -209,6 +365,22 @@ class PaperProcessor:
         print(f"  ✓ Processed: {results['success']}")
         print(f"  ⊘ Skipped:   {results['skipped']}")
         print(f"  ✗ Failed:    {results['failed']}")
+        if self.tei_cache is not None:
+            stats = self.tei_cache.stats()
+            print(f"  TEI cache:   {stats['hits']} hits, {stats['misses']} misses")
+        if self.synthesis_cache is not None:
+            stats = self.synthesis_cache.stats()
+            print(f"  Synthesis cache: {stats['hits']} hits, {stats['misses']} misses")
+        if self.http_cache is not None:
+            stats = self.http_cache.stats()
+            print(f"  HTTP cache:  {stats['hits']} not modified, {stats['misses']} downloaded")
+        if enrichment is not None:
+            print(f"  ⚠ Without GROBID: {enrichment['remaining']} papers waiting "
+                  f"for reenrich() ({enrichment['enriched']} enriched now)")
+        stats = self.grobid_client.stats()
+        if stats["uploads"] or stats["failures"]:
+            print(f"  GROBID:      {stats['uploads']} uploads, {stats['overloads']} busy (503), "
+                  f"window {stats['window']:.1f}, p95 {stats['latency_p95'] or 0:.1f}s")
         
         if results["errors"]:
             print(f"\nErrors:")
@@ -219,6 +391,613 @@ class PaperProcessor:
         
         return results
     
+    def _run_pipelined(
+        self,
+        identifiers: list[str],
+        results: dict,
+        stop_on_error: bool,
+        force: bool
+    ) -> None:
+        """
+        Run a batch through the stage pipeline (see pipeline.py).
+        
+        Each stage gets its own bounded queue and worker pool, sized by
+        pipeline_workers. Results are tallied into the same dictionary
+        format as the sequential loop.
+        
+        Args:
+            identifiers: List of paper identifiers
+            results: Results dictionary to fill in (modified in place)
+            stop_on_error: If True, stop feeding new papers after an error
+            force: If True, reprocess even if already done
+        """
+        # Worker threads report results concurrently, so guard the counters
+        results_lock = threading.Lock()
+        
+        def check_and_fetch(job: PaperJob) -> Optional[bool]:
+            if not force and self.is_processed(job.identifier):
+                return False
+            self._resume(job, force)
+            self._run_stage(job, "fetch", self._stage_fetch)
+            if not force and self._is_duplicate_pdf(job):
+                return False
+        
+        def on_complete(job: PaperJob) -> None:
+            with results_lock:
+                results["success"] += 1
+            print(f"  ✓ SUCCESS: {job.identifier}")
+        
+        def on_skip(job: PaperJob) -> None:
+            with results_lock:
+                results["skipped"] += 1
+            print(f"  ⊘ Already processed: {job.identifier}")
+        
+        def on_error(job: PaperJob, stage_name: str, error: Exception) -> None:
+            # Same bookkeeping and message as process() uses
+            self._record_batch_failure(job, stage_name, error, results, results_lock)
+            
+            if stop_on_error and not pipeline.stopped:
+                print(f"\n✗ Stopping batch due to error")
+                pipeline.stop()
+        
+        workers = self.pipeline_workers
+        pipeline = StagedPipeline(
+            stages=[
+                Stage("fetch", check_and_fetch, workers["fetch"]),
+                Stage("grobid", self._checkpointed("grobid", self._stage_grobid), workers["grobid"]),
+                Stage("text", self._checkpointed("text", self._stage_extract_text), workers["text"]),
+                Stage(
+                    "synthesis",
+                    self._checkpointed("synthesis", self._stage_synthesize),
+                    workers["synthesis"]
+                ),
+                Stage("write", self._checkpointed("write", self._stage_write), workers["write"]),
+                Stage("state", self._checkpointed("state", self._stage_update_state), workers["state"]),
+            ],
+            queue_size=self.PIPELINE_QUEUE_SIZE,
+            on_complete=on_complete,
+            on_skip=on_skip,
+            on_error=on_error,
+        )
+        
+        pipeline.run(PaperJob(identifier=identifier) for identifier in identifiers)
+    
+    def _run_message_batch(
+        self,
+        identifiers: list[str],
+        results: dict,
+        stop_on_error: bool,
+        force: bool
+    ) -> None:
+        """
+        Run a batch with every synthesis sent as one Message Batch.
+        
+        1. Fetch, GROBID and text stages run for every paper (pipelined)
+        2. All prompts go to Claude together (SynthesisGenerator batch mode)
+        3. Write and state stages run for each result as it comes back
+        
+        Args:
+            identifiers: List of paper identifiers
+            results: Results dictionary to fill in (modified in place)
+            stop_on_error: If True, stop at the first error
+            force: If True, reprocess even if already done
+        """
+        results_lock = threading.Lock()
+        ready: list[PaperJob] = []
+        
+        def check_and_fetch(job: PaperJob) -> Optional[bool]:
+            if not force and self.is_processed(job.identifier):
+                return False
+            self._resume(job, force)
+            self._run_stage(job, "fetch", self._stage_fetch)
+            if not force and self._is_duplicate_pdf(job):
+                return False
+        
+        def on_ready(job: PaperJob) -> None:
+            with results_lock:
+                ready.append(job)
+            print(f"  ✓ Ready for synthesis: {job.identifier}")
+        
+        def on_skip(job: PaperJob) -> None:
+            with results_lock:
+                results["skipped"] += 1
+            print(f"  ⊘ Already processed: {job.identifier}")
+        
+        def on_error(job: PaperJob, stage_name: str, error: Exception) -> None:
+            self._record_batch_failure(job, stage_name, error, results, results_lock)
+            if stop_on_error and not pipeline.stopped:
+                print(f"\n✗ Stopping batch due to error")
+                pipeline.stop()
+        
+        workers = self.pipeline_workers
+        pipeline = StagedPipeline(
+            stages=[
+                Stage("fetch", check_and_fetch, workers["fetch"]),
+                Stage("grobid", self._checkpointed("grobid", self._stage_grobid), workers["grobid"]),
+                Stage("text", self._checkpointed("text", self._stage_extract_text), workers["text"]),
+            ],
+            queue_size=self.PIPELINE_QUEUE_SIZE,
+            on_complete=on_ready,
+            on_skip=on_skip,
+            on_error=on_error,
+        )
+        pipeline.run(PaperJob(identifier=identifier) for identifier in identifiers)
+        
+        if pipeline.stopped or not ready:
+            return
+        
+        def finish(job: PaperJob, outcome) -> bool:
+            # Write + state for one synthesized paper; False means stop the batch
+            try:
+                if isinstance(outcome, SynthesisError):
+                    raise outcome
+                if "synthesis" not in job.completed:
+                    job.synthesis = outcome
+                    self._checkpoint(job, "synthesis")
+                self._run_stage(job, "write", self._stage_write)
+                self._run_stage(job, "state", self._stage_update_state)
+            except Exception as e:
+                self._record_batch_failure(job, "synthesis", e, results, results_lock)
+                if stop_on_error:
+                    print(f"\n✗ Stopping batch due to error")
+                    return False
+                return True
+            
+            results["success"] += 1
+            print(f"  ✓ SUCCESS: {job.identifier} (cost: ${job.synthesis.cost_usd:.4f})")
+            return True
+        
+        # Papers synthesized before an interruption don't go into the batch
+        pending = []
+        for job in ready:
+            if "synthesis" in job.completed:
+                if not finish(job, job.synthesis):
+                    return
+            else:
+                pending.append(job)
+        if not pending:
+            return
+        
+        jobs = {self._batch_custom_id(job): job for job in pending}
+        items = {custom_id: (job.text, job.metadata) for custom_id, job in jobs.items()}
+        
+        print(f"\nSynthesizing {len(items)} papers with the Message Batches API...")
+        for custom_id, outcome in self.synthesis_gen.generate_quick_synthesis_batch(
+            items,
+            poll_interval=self.config.synthesis_batch_poll_seconds,
+            batch_file=self.config.synthesis_batch_file
+        ):
+            if not finish(jobs[custom_id], outcome):
+                return
+    
+    def _batch_custom_id(self, job: PaperJob) -> str:
+        """
+        Message Batch custom_id for a job.
+        
+        custom_ids must be short and simple, and the same in every run (so
+        an interrupted batch can be collected later): hash the paper key.
+        """
+        key = self.identifiers.resolve(job.identifier)
+        return f"paper-{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}"
+    
+    def _record_batch_failure(
+        self,
+        job: PaperJob,
+        stage_name: str,
+        error: Exception,
+        results: dict,
+        results_lock: threading.Lock
+    ) -> None:
+        """Mark a paper failed and add it to the batch results (same message as process())."""
+        self.state.mark_failed(self.identifiers.resolve(job.identifier), str(error))
+        with results_lock:
+            results["failed"] += 1
+            results["errors"].append(
+                (job.identifier, f"Failed to process {job.identifier}: {error}")
+            )
+        print(f"  ✗ FAILED ({stage_name}): {job.identifier}: {error}")
+    
+    # === DUPLICATE DETECTION ===
+    
+    def is_processed(self, identifier: str) -> bool:
+        """
+        Check the processing state under the identifier's canonical key.
+        
+        "https://arxiv.org/abs/2309.14316", "arXiv:2309.14316v2" and
+        "2309.14316" are all the same paper (see identifiers.py). The raw
+        string is checked too, for state written before canonical keys.
+        
+        Args:
+            identifier: Paper identifier in any form
+            
+        Returns:
+            True if the paper was already processed
+        """
+        key = self.identifiers.resolve(identifier)
+        if self.state.is_processed(key) or self.state.is_processed(identifier.strip()):
+            return True
+        
+        # A local PDF may be a copy of one we already processed under another name
+        path = Path(identifier.strip()).expanduser()
+        if path.suffix.lower() == '.pdf' and path.is_file():
+            return self._processed_pdf_key(path, key) is not None
+        return False
+    
+    def dedupe(self, identifiers: list[str], results: dict) -> list[str]:
+        """
+        Drop identifiers that are another form of one earlier in the list.
+        
+        Runs before any network call. Each dropped identifier counts as
+        skipped in results.
+        
+        Args:
+            identifiers: Paper identifiers, in batch order
+            results: Batch results dictionary (skipped is incremented)
+            
+        Returns:
+            Identifiers with repeats removed (first occurrence kept)
+        """
+        first_seen: dict[str, str] = {}
+        unique = []
+        for identifier in identifiers:
+            key = self.identifiers.resolve(identifier)
+            if key in first_seen:
+                results["skipped"] += 1
+                print(f"⊘ Duplicate of {first_seen[key]}: {identifier}")
+                continue
+            first_seen[key] = identifier
+            unique.append(identifier)
+        return unique
+    
+    def _processed_pdf_key(self, pdf_path: Path, key: str) -> Optional[str]:
+        """
+        Key of an already-processed paper whose PDF is byte-identical to this one.
+        
+        The fingerprint index is filled from vault/PDFs on first use, so
+        PDFs downloaded before the index existed are recognized too.
+        
+        Args:
+            pdf_path: PDF to check
+            key: The paper's own key (a match on itself isn't a duplicate)
+            
+        Returns:
+            The other paper's key, or None
+        """
+        self._scan_pdfs()
+        other = self.fingerprints.lookup(pdf_path)
+        if other is None or other == key or not self.state.is_processed(other):
+            return None
+        return other
+    
+    def _is_duplicate_pdf(self, job: PaperJob) -> bool:
+        """
+        Check a freshly fetched PDF against the fingerprint index.
+        
+        If it's the same file as an already-processed paper, remember the
+        job's identifier as an alias of that paper and drop the checkpoint.
+        """
+        key = self.identifiers.resolve(job.identifier)
+        other = self._processed_pdf_key(job.pdf_path, key)
+        if other is None:
+            return False
+        
+        # Discard first: once aliased, job.identifier resolves to the other paper
+        self.checkpoints.discard(job.identifier)
+        self.identifiers.add_alias(job.identifier, other)
+        print(f"  ⊘ Same PDF as {other}: {job.identifier}")
+        return True
+    
+    def _scan_pdfs(self) -> None:
+        """Fingerprint vault/PDFs once per processor (unchanged files are skipped)."""
+        with self._fingerprints_lock:
+            if self._fingerprints_scanned:
+                return
+            self._fingerprints_scanned = True
+            hashed = self.fingerprints.scan(self.config.pdfs_dir, key_for=self._key_for_vault_pdf)
+        if hashed:
+            print(f"  ✓ Fingerprinted {hashed} PDFs in {self.config.pdfs_dir.name}/")
+    
+    def _key_for_vault_pdf(self, pdf_path: Path) -> str:
+        """Paper key for a PDF found in vault/PDFs (arxiv_<id>.pdf -> arXiv ID)."""
+        if pdf_path.stem.startswith("arxiv_"):
+            arxiv_id = self.arxiv_fetcher.parse_arxiv_id(pdf_path.stem[len("arxiv_"):])
+            if arxiv_id:
+                return arxiv_id
+        return self.identifiers.canonical(str(pdf_path))
+    
+    def prefetch_arxiv_metadata(self, identifiers: list[str], force: bool = False) -> None:
+        """
+        Bulk-fetch arXiv metadata for a batch before processing it.
+        
+        Only papers that will actually be fetched are included (already
+        processed ones are skipped unless force=True). Anything the
+        prefetch misses is fetched per paper as before.
+        
+        Args:
+            identifiers: Paper identifiers, in batch order
+            force: If True, include already-processed papers
+        """
+        arxiv_ids = [
+            identifier for identifier in identifiers
+            if self.arxiv_fetcher.parse_arxiv_id(identifier)
+            and (force or not self.is_processed(identifier))
+        ]
+        if len(arxiv_ids) < 2:
+            return  # A single paper gains nothing over the normal request
+        
+        cached = self.arxiv_fetcher.prefetch_metadata(arxiv_ids)
+        print(f"✓ Prefetched arXiv metadata: {cached}/{len(arxiv_ids)} papers\n")
+    
+    # === CHECKPOINTS ===
+    # Stages run through _run_stage(), which skips stages a checkpoint says
+    # are done and saves a checkpoint after each one that runs.
+    
+    def _resume(self, job: PaperJob, force: bool) -> None:
+        """
+        Fill in a job from its checkpoint, if there is one.
+        
+        With force=True (or if the checkpointed PDF is gone) the checkpoint
+        is thrown away and the paper starts from the beginning.
+        """
+        if force:
+            self.checkpoints.discard(job.identifier)
+            return
+        
+        saved = self.checkpoints.load(job.identifier)
+        if saved is None:
+            return
+        
+        pdf_path = saved["pdf_path"]
+        if "grobid" not in saved["completed"] and pdf_path and not pdf_path.exists():
+            # GROBID would need the PDF, so fetch it again
+            self.checkpoints.discard(job.identifier)
+            return
+        
+        for name, value in saved.items():
+            setattr(job, name, value)
+    
+    def _run_stage(self, job: PaperJob, name: str, func) -> None:
+        """Run one stage unless already done, then checkpoint the job."""
+        if name in job.completed:
+            return
+        func(job)
+        self._checkpoint(job, name)
+    
+    def _checkpointed(self, name: str, func):
+        """Wrap a stage for StagedPipeline so it goes through _run_stage()."""
+        def run(job: PaperJob) -> None:
+            self._run_stage(job, name, func)
+        return run
+    
+    def _checkpoint(self, job: PaperJob, name: str) -> None:
+        """Record a finished stage; the last stage clears the checkpoint."""
+        job.completed.append(name)
+        if name == self.STAGES[-1]:
+            self.checkpoints.discard(job.identifier)
+        else:
+            self.checkpoints.save(job)
+    
+    # === PIPELINE STAGES ===
+    # Each stage takes a PaperJob and fills in the next piece of it.
+    # process() calls them in order; _run_pipelined() runs them concurrently.
+    
+    def _stage_fetch(self, job: PaperJob) -> None:
+        """Stage 1: Fetch the PDF and source metadata."""
+        job.pdf_path, job.metadata = self._fetch_paper(job.identifier)
+    
+    def _stage_grobid(self, job: PaperJob) -> None:
+        """Stage 2: Extract metadata, citations (and body text) with GROBID and merge them in."""
+        try:
+            self._grobid_extract(job, self._grobid_tiers(job.metadata))
+        except GrobidUnavailableError as e:
+            self._without_grobid(job, e)
+    
+    def _grobid_extract(self, job: PaperJob, tiers: list[str]) -> None:
+        """
+        Run GROBID tiers on a job's PDF and merge the results into the job.
+        
+        Args:
+            job: Job with pdf_path and the fetcher's metadata
+            tiers: From _grobid_tiers()
+        """
+        if "fulltext" in tiers:
+            grobid_metadata, body_text = self.grobid.process_with_text(job.pdf_path)
+            
+            # Merge GROBID results with fetched metadata
+            # GROBID is more detailed, so we prefer its data when available
+            job.metadata = self._merge_metadata(job.metadata, grobid_metadata)
+            self._use_grobid_text(job, body_text)
+            return
+        
+        if "header" in tiers:
+            job.metadata = self._merge_metadata(job.metadata, self.grobid.process_header(job.pdf_path))
+        job.metadata.citations = self.grobid.process_references(job.pdf_path)
+    
+    def _without_grobid(self, job: PaperJob, error: Exception) -> None:
+        """
+        Degraded stage 2 for when GROBID is down.
+        
+        The paper still gets its note: the arXiv API's metadata (local PDFs:
+        what the PDF says about itself), pdfplumber text in stage 3, and no
+        citations. It's flagged so reenrich() can fill in the rest later.
+        """
+        print(f"  ⚠ {error}: continuing without GROBID (no citations)")
+        if job.metadata.source == "local":
+            found = read_pdf_metadata(job.pdf_path)
+            if found:
+                job.metadata = job.metadata.model_copy(update=found)
+                print(f"  ✓ PDF metadata: {', '.join(found)}")
+        job.metadata.citations = []
+        job.needs_enrichment = True
+    
+    def _grobid_tiers(self, metadata: PaperMetadata) -> list[str]:
+        """
+        Pick the cheapest GROBID tiers that give us what we still lack.
+        
+        - Body text is only used when text_source is "grobid": that needs
+          the full text (which includes the header and references too)
+        - Otherwise the header tier only runs if the fetcher's metadata is
+          incomplete (local PDFs have placeholders; arXiv already has it all)
+        - Citations always come from GROBID (the note lists them)
+        
+        Args:
+            metadata: Metadata from the fetcher
+            
+        Returns:
+            Keys of GrobidProcessor.TIERS, in the order to call them
+        """
+        if self.config.text_source == "grobid":
+            return ["fulltext"]
+        return self._metadata_tiers(metadata)
+    
+    def _metadata_tiers(self, metadata: PaperMetadata) -> list[str]:
+        """GROBID tiers for metadata and citations only (no body text)."""
+        has_header = (
+            metadata.source != "local"
+            and metadata.title and metadata.authors and metadata.year and metadata.abstract
+        )
+        return ["references"] if has_header else ["header", "references"]
+    
+    def _use_grobid_text(self, job: PaperJob, body_text: Optional[str]) -> None:
+        """Keep GROBID's body text as the synthesis text, if configured and present."""
+        if self.config.text_source == "grobid" and body_text:
+            job.text = body_text
+            job.text_source = "grobid"
+    
+    def _stage_extract_text(self, job: PaperJob) -> None:
+        """
+        Stage 3: Extract text for synthesis.
+        
+        Usually GROBID already gave us the body text in stage 2. pdfplumber is
+        the fallback (no body in the TEI) or the configured source.
+        """
+        if job.text:
+            return
+        job.text = self._extract_text(job.pdf_path)
+        job.text_source = "pdfplumber"
+    
+    def _stage_synthesize(self, job: PaperJob) -> None:
+        """Stage 4: Generate synthesis with Claude."""
+        job.synthesis = self.synthesis_gen.generate_quick_synthesis(job.text, job.metadata)
+    
+    def _stage_write(self, job: PaperJob) -> None:
+        """Stage 5: Write the Obsidian note."""
+        markdown = self.markdown_writer.paper_to_markdown(job.metadata, job.synthesis)
+        filename = self.markdown_writer.generate_filename(job.metadata)
+        
+        # Write to appropriate directory
+        output_dir = self.config.papers_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        job.output_path = output_dir / f"{filename}.md"
+        job.output_path.write_text(markdown, encoding='utf-8')
+    
+    def _stage_update_state(self, job: PaperJob) -> None:
+        """Stage 6: Mark the paper as processed."""
+        source = self._get_source_type(job.identifier)
+        key = self.identifiers.resolve(job.identifier)
+        self.state.mark_processed(key, source)
+        
+        # Remember the paper's other identifiers, so asking for it by DOI
+        # (or arXiv ID) later is recognized as a duplicate. Not a guessed
+        # DOI: that one usually belongs to a paper this one cites
+        if not job.metadata.doi_guessed:
+            self.identifiers.add_alias(job.metadata.doi, key)
+        self.identifiers.add_alias(job.metadata.arxiv_id, key)
+        
+        # And its PDF, so a copy under another name is recognized too
+        if job.pdf_path and job.pdf_path.exists():
+            self.fingerprints.add(job.pdf_path, key)
+        
+        # Made without GROBID: keep everything reenrich() needs to finish it
+        if job.needs_enrichment:
+            self.enrichment.save(job)
+        else:
+            self.enrichment.discard(job.identifier)
+    
+    def reenrich(self) -> dict:
+        """
+        Add GROBID's metadata and citations to papers processed while it was down.
+        
+        Each note is rewritten with the synthesis it already has (Claude
+        isn't called again). Stops early if GROBID is still unavailable.
+        
+        Returns:
+            Dictionary with enriched, failed and remaining counts
+        """
+        results = {"enriched": 0, "failed": 0, "remaining": 0}
+        identifiers = self.enrichment.identifiers()
+        
+        for i, identifier in enumerate(identifiers):
+            if not self.grobid_client.available():
+                results["remaining"] += len(identifiers) - i
+                print(f"⊘ GROBID still unavailable, {len(identifiers) - i} papers left to re-enrich")
+                break
+            
+            saved = self.enrichment.load(identifier)
+            if saved is None:
+                self.enrichment.discard(identifier)
+                continue
+            job = PaperJob(identifier=identifier)
+            for name, value in saved.items():
+                setattr(job, name, value)
+            
+            try:
+                print(f"↻ Re-enriching: {job.metadata.title}")
+                old_path = job.output_path
+                previous = job.metadata.citations
+                self._grobid_extract(job, self._metadata_tiers(job.metadata))
+                # The references tier has no body to count mentions in
+                self._keep_mention_counts(previous, job.metadata.citations)
+                job.needs_enrichment = False
+                self._stage_write(job)
+                if old_path and old_path != job.output_path:
+                    # GROBID found the real title, so the note has a new name
+                    old_path.unlink(missing_ok=True)
+                if not job.metadata.doi_guessed:
+                    self.identifiers.add_alias(job.metadata.doi, self.identifiers.resolve(identifier))
+                self.enrichment.discard(identifier)
+                results["enriched"] += 1
+                print(f"  ✓ {len(job.metadata.citations)} citations added")
+            except GrobidUnavailableError:
+                # Went down again: the rest wait for the next pass
+                results["remaining"] += len(identifiers) - i
+                break
+            except Exception as e:
+                results["failed"] += 1
+                results["remaining"] += 1
+                print(f"  ✗ Re-enrichment failed for {identifier}: {e}")
+        
+        return results
+    
+    def _keep_mention_counts(self, previous: list[Citation], citations: list[Citation]) -> None:
+        """
+        Carry mention counts over to re-extracted citations that have none.
+        
+        A reference matches by DOI, or else by its text (case and
+        whitespace ignored). Counts GROBID did find are left alone.
+        
+        Args:
+            previous: Citations the paper had before (e.g., from a full-text pass)
+            citations: Newly extracted citations (updated in place)
+        """
+        counts = {}
+        for citation in previous:
+            if citation.mention_count is not None:
+                counts.update(dict.fromkeys(self._citation_keys(citation), citation.mention_count))
+        
+        for citation in citations:
+            if citation.mention_count is None:
+                citation.mention_count = next(
+                    (counts[key] for key in self._citation_keys(citation) if key in counts), None
+                )
+    
+    def _citation_keys(self, citation: Citation) -> list[str]:
+        """Keys that identify a reference across extractions: DOI, then normalized text."""
+        keys = [f"doi:{citation.doi.lower()}"] if citation.doi else []
+        keys.append(" ".join(citation.raw_text.lower().split()))
+        return keys
+    
     def _fetch_paper(self, identifier: str) -> tuple[Path, PaperMetadata]:
         """
         Fetch paper based on identifier type.
@@ -277,6 +1056,9 @@ class PaperProcessor:
         Returns:
             Merged metadata
         """
+        # A DOI GROBID only guessed loses to one the source gave us
+        grobid_doi = None if grobid.doi_guessed and base.doi else grobid.doi
+        
         # Start with GROBID data (most complete)
         merged = PaperMetadata(
             title=grobid.title or base.title,
@@ -287,7 +1069,8 @@ class PaperProcessor:
             volume=grobid.volume,
             issue=grobid.issue,
             pages=grobid.pages,
-            doi=grobid.doi or base.doi,
+            doi=grobid_doi or base.doi,
+            doi_guessed=grobid_doi is not None and grobid.doi_guessed,
             citations=grobid.citations,
             pdf_path=base.pdf_path,
             source=base.source
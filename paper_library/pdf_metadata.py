@@ -0,0 +1,162 @@
+"""
+Metadata a PDF carries about itself: the Info dictionary and XMP.
+
+Local PDFs get their title, authors and year from GROBID. When GROBID is
+down, the note would be left with the placeholders ("Unknown", 2023).
+Most PDFs say something about themselves, though. LaTeX (hyperref),
+publishers and Word fill in the document Info dictionary (Title, Author,
+CreationDate), and publishers often add an XMP packet (RDF/XML with
+Dublin Core: dc:title, dc:creator, prism:doi).
+
+Neither is as reliable as GROBID's header extraction (an Info Title may be
+"Microsoft Word - draft3.docx"), so this is only the fallback, and junk
+values are skipped.
+
+Python concepts:
+- pdfplumber/pdfminer: reading the document catalog and Info dictionary
+- XML namespaces with lxml (XMP is RDF/XML)
+- Regular expressions for PDF dates ("D:20210314...") and author lists
+"""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+import pdfplumber
+from lxml import etree
+from pdfminer.pdftypes import resolve1
+
+XMP_NS = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "prism": "http://prismstandard.org/namespaces/basic/2.0/",
+    "xmp": "http://ns.adobe.com/xap/1.0/",
+}
+
+YEAR = re.compile(r"\b(1[89]\d\d|20\d\d)")
+DOI = re.compile(r"10\.\d{4,9}/\S+")
+
+# "Ada Lovelace; Alan Turing", "Ada Lovelace, Alan Turing and Grace Hopper"
+AUTHOR_SEPARATORS = re.compile(r"\s*(?:;|,|\band\b|&)\s*")
+
+# Titles that are really file names or tool defaults
+JUNK_TITLE = re.compile(
+    r"^(untitled|microsoft word\b.*|.*\.(docx?|tex|dvi|pdf|ps))$", re.IGNORECASE
+)
+
+
+def read_pdf_metadata(pdf_path: Path) -> dict:
+    """
+    Title, authors, year and DOI as recorded in the PDF itself.
+    
+    XMP wins over the Info dictionary where both have a field (it's usually
+    written by the publisher, Info by whatever tool made the file).
+    
+    Args:
+        pdf_path: PDF file
+    
+    Returns:
+        Dictionary with whichever of title, authors, year and doi were
+        found (empty if the PDF can't be read)
+    """
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            info = pdf.metadata or {}
+            xmp = _xmp_packet(pdf)
+    except Exception:
+        return {}
+    
+    found = _from_info(info)
+    if xmp:
+        found.update(_from_xmp(xmp))
+    return found
+
+
+def _xmp_packet(pdf) -> Optional[bytes]:
+    """The catalog's /Metadata stream (XMP), if any."""
+    stream = resolve1(pdf.doc.catalog.get("Metadata"))
+    if stream is None or not hasattr(stream, "get_data"):
+        return None
+    return stream.get_data()
+
+
+def _from_info(info: dict) -> dict:
+    """Fields from the Info dictionary (values already decoded by pdfplumber)."""
+    found = {}
+    title = _text(info.get("Title"))
+    if title and not JUNK_TITLE.match(title):
+        found["title"] = title
+    authors = _split_authors(_text(info.get("Author")))
+    if authors:
+        found["authors"] = authors
+    year = _year(_text(info.get("CreationDate")))
+    if year:
+        found["year"] = year
+    doi = DOI.search(_text(info.get("doi")) or _text(info.get("Subject")) or "")
+    if doi:
+        found["doi"] = doi.group(0)
+    return found
+
+
+def _from_xmp(packet: bytes) -> dict:
+    """Fields from an XMP packet (Dublin Core + PRISM)."""
+    try:
+        root = etree.fromstring(packet.strip(), etree.XMLParser(recover=True))
+    except etree.XMLSyntaxError:
+        return {}
+    if root is None:
+        return {}
+    
+    found = {}
+    titles = root.xpath(".//dc:title//rdf:li/text()", namespaces=XMP_NS)
+    if titles and titles[0].strip() and not JUNK_TITLE.match(titles[0].strip()):
+        found["title"] = titles[0].strip()
+    creators = [c.strip() for c in root.xpath(".//dc:creator//rdf:li/text()", namespaces=XMP_NS)]
+    if any(creators):
+        found["authors"] = [c for c in creators if c]
+    
+    # Publication date first; the file's creation date is only a guess
+    for name in ("prism:publicationDate", "prism:coverDate", "dc:date", "xmp:CreateDate"):
+        year = _year(" ".join(_xmp_values(root, name)))
+        if year:
+            found["year"] = year
+            break
+    
+    identifiers = _xmp_values(root, "prism:doi") + _xmp_values(root, "dc:identifier")
+    for identifier in identifiers:
+        doi = DOI.search(identifier)
+        if doi:
+            found["doi"] = doi.group(0)
+            break
+    return found
+
+
+def _xmp_values(root: etree._Element, name: str) -> list[str]:
+    """
+    Values of an XMP property, which may be written three ways:
+    <dc:date><rdf:Seq><rdf:li>2021</rdf:li>...</dc:date>,
+    <prism:doi>10.1/x</prism:doi>, or <rdf:Description prism:doi="10.1/x"/>.
+    """
+    return root.xpath(f".//{name}//text() | .//@{name}", namespaces=XMP_NS)
+
+
+def _text(value) -> Optional[str]:
+    """An Info value as a stripped string (None if it isn't text)."""
+    if isinstance(value, bytes):
+        value = value.decode("latin-1", errors="replace")
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
+
+def _split_authors(value: Optional[str]) -> list[str]:
+    """Split an Info Author string into names."""
+    if not value:
+        return []
+    return [name for name in AUTHOR_SEPARATORS.split(value) if name]
+
+
+def _year(value: Optional[str]) -> Optional[int]:
+    """First plausible year in a date string ("D:20210314...", "2021-03-14")."""
+    match = YEAR.search(value or "")
+    return int(match.group(1)) if match else None
@@ -0,0 +1,212 @@
+"""
+Pipelined (multi-stage) executor.
+
+The orchestrator's pipeline has several slow stages that wait on different
+things: the arXiv download waits on the network, GROBID waits on its
+container's CPU, and synthesis waits on Claude. Running papers strictly one
+at a time means only one of those is ever busy.
+
+This module runs each stage with its own worker threads and its own bounded
+queue, like an assembly line:
+
+    [fetch] --queue--> [grobid] --queue--> [text] --queue--> [synthesis] ...
+
+So paper N+1 can download while paper N is in GROBID and paper N-1 is
+waiting on Claude.
+
+Python concepts:
+- threading.Thread: Run functions concurrently (great for I/O-bound work)
+- queue.Queue: Thread-safe FIFO; maxsize makes producers wait (backpressure)
+- threading.Event: A thread-safe on/off flag (used for "stop everything")
+- Sentinel objects: A unique marker that means "no more work"
+"""
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+
+# Sentinel that tells a worker "no more items are coming"
+# object() creates a unique value that can never be confused with real work
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """
+    One step of the pipeline.
+
+    Attributes:
+        name: Short name for logging (e.g., "grobid")
+        func: Function called with each item. Mutates the item in place.
+              Return False to stop the item here (e.g., "already processed").
+        workers: How many threads run this stage concurrently
+    """
+    name: str
+    func: Callable[[Any], Optional[bool]]
+    workers: int = 1
+
+
+class StagedPipeline:
+    """
+    Run items through a sequence of stages, each with its own worker pool.
+
+    Every stage reads from its own bounded queue and writes to the next
+    stage's queue. When a queue is full, the upstream stage waits, so a fast
+    stage can never pile up unbounded work in front of a slow one.
+
+    Callbacks (all optional) are called from worker threads:
+    - on_complete(item): Item made it through every stage
+    - on_skip(item): A stage returned False for the item
+    - on_error(item, stage_name, exception): A stage raised
+
+    A callback that raises is reported and ignored: the worker has to keep
+    draining its queue, or upstream put() calls (and run()) would wait
+    forever.
+
+    Usage:
+        pipeline = StagedPipeline(
+            stages=[Stage("fetch", fetch, workers=2), Stage("parse", parse)],
+            on_complete=lambda item: print("done", item),
+        )
+        pipeline.run(items)
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = 4,
+        on_complete: Optional[Callable[[Any], None]] = None,
+        on_skip: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Any, str, Exception], None]] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in execution order
+            queue_size: Max items waiting in front of each stage
+            on_complete: Called when an item finishes the last stage
+            on_skip: Called when a stage stops an item by returning False
+            on_error: Called when a stage raises for an item
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_complete = on_complete
+        self.on_skip = on_skip
+        self.on_error = on_error
+
+        # Set by stop() - workers drop remaining items once this is set
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """
+        Ask the pipeline to stop early.
+
+        Items already inside a stage finish that stage; everything still
+        queued is dropped. run() returns once all workers have exited.
+        """
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        """True if stop() has been called."""
+        return self._stop.is_set()
+
+    def run(self, items: Iterable[Any]) -> None:
+        """
+        Push every item through the pipeline and wait until all are done.
+
+        Args:
+            items: Work items (each is handed to every stage in turn)
+        """
+        # One bounded queue in front of each stage
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+
+        # Start all worker threads up front
+        # daemon=True means a stuck worker won't keep Python alive on Ctrl-C
+        threads: list[list[threading.Thread]] = []
+        for index, stage in enumerate(self.stages):
+            stage_threads = []
+            for worker_num in range(max(1, stage.workers)):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, queues),
+                    name=f"{stage.name}-{worker_num}",
+                    daemon=True,
+                )
+                thread.start()
+                stage_threads.append(thread)
+            threads.append(stage_threads)
+
+        # Feed the first stage
+        # put() blocks while the queue is full - that's the backpressure
+        for item in items:
+            if self._stop.is_set():
+                break
+            queues[0].put(item)
+
+        # Shut down stage by stage
+        # A stage is only finished once all of its workers have exited, and
+        # only then can we tell the next stage that nothing more is coming
+        for index, stage_threads in enumerate(threads):
+            for _ in stage_threads:
+                queues[index].put(_DONE)
+            for thread in stage_threads:
+                thread.join()
+
+    def _worker(self, index: int, queues: list[queue.Queue]) -> None:
+        """
+        Worker loop for one thread of one stage.
+
+        Args:
+            index: Position of this worker's stage in self.stages
+            queues: All stage queues (we read ours, write the next one)
+        """
+        stage = self.stages[index]
+        in_queue = queues[index]
+        out_queue = queues[index + 1] if index + 1 < len(queues) else None
+
+        while True:
+            item = in_queue.get()
+            if item is _DONE:
+                return
+
+            # Drain (don't process) once a stop was requested
+            if self._stop.is_set():
+                continue
+
+            try:
+                result = stage.func(item)
+            except Exception as e:
+                self._callback("on_error", item, stage.name, e)
+                continue
+
+            if result is False:
+                self._callback("on_skip", item)
+                continue
+
+            if out_queue is not None:
+                out_queue.put(item)
+            else:
+                self._callback("on_complete", item)
+
+    def _callback(self, name: str, *args) -> None:
+        """
+        Call an optional callback, reporting (not raising) its errors.
+
+        Args:
+            name: "on_complete", "on_skip" or "on_error"
+            *args: Arguments for the callback
+        """
+        callback = getattr(self, name)
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"  ⚠ Pipeline {name} callback failed: {e}")
@@ -0,0 +1,344 @@
+"""
+Per-host request pacing shared by every fetcher.
+
+Remote hosts ban clients that hammer them. arXiv's API terms ask for no
+more than one request every 3 seconds, and once we fetch concurrently,
+arXiv starts answering 429 (Too Many Requests) or 503 (Service
+Unavailable). This module paces requests per host so that adding workers
+raises throughput instead of triggering bans.
+
+How it works:
+- Each host gets a token bucket: it refills at `rate` tokens per second up
+  to `burst` tokens, and every request spends one. With no token left the
+  request waits until the bucket refills.
+- A 429/503 response with a Retry-After header puts the whole host on
+  hold for that long. The request is then retried (a few times at most).
+- Loopback hosts (a local GROBID server) aren't paced unless a rate is
+  set for them explicitly.
+
+All requests go through one process-wide `rate_limiter`:
+- requests: mount RateLimitedAdapter on a Session (see limited_session())
+- httpx: pass RateLimitedTransport() as the AsyncClient's transport
+  (a request with extensions={"rate_limit": False} goes straight through:
+  GrobidClient paces and retries GROBID uploads itself)
+
+Python concepts:
+- Token bucket algorithm (the usual way to express "N requests per second")
+- Subclassing library extension points (HTTPAdapter, AsyncBaseTransport)
+- threading.Lock, and asyncio.sleep for the async path
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from paper_library.config import config
+
+
+class TokenBucket:
+    """
+    Token bucket for one host.
+    
+    reserve() never blocks: it takes a token (possibly one that only exists
+    in the future) and returns how long the caller must wait. Waiting is up
+    to the caller, so the same bucket works for threads and asyncio.
+    
+    A bucket with rate=None never runs dry, but can still be paused.
+    """
+    
+    def __init__(
+        self,
+        rate: Optional[float],
+        burst: float = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the bucket (full).
+        
+        Args:
+            rate: Tokens added per second (None = unlimited)
+            burst: Maximum tokens stored (requests allowed back to back)
+            clock: Time source in seconds (tests pass a fake one)
+        """
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """
+        Take one token.
+        
+        Returns:
+            Seconds to wait before sending the request (0 if a token was ready)
+        """
+        with self._lock:
+            if self.rate is None:
+                return max(0.0, self._paused_until - self._clock())
+            self._refill()
+            # Tokens may go negative: that's the queue of requests already waiting
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Hold off every request to this host for `seconds` (e.g., Retry-After).
+        
+        Args:
+            seconds: How long the host asked us to wait
+        """
+        with self._lock:
+            if self.rate is None:
+                self._paused_until = max(self._paused_until, self._clock() + seconds)
+                return
+            self._refill()
+            # Debt of `seconds` worth of tokens: nothing is free until it's
+            # paid, and the requests queued behind it stay evenly spaced
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+    
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update (caller holds the lock)."""
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RateLimiter:
+    """
+    Token buckets for every host we talk to.
+    
+    Usage:
+        limiter = RateLimiter(default_rate=2)
+        limiter.set_rate("export.arxiv.org", 1 / 3)
+        
+        limiter.wait("http://export.arxiv.org/api/query?id_list=...")   # threads
+        await limiter.wait_async(url)                                     # asyncio
+        limiter.retry_after(url, response.headers.get("Retry-After"))
+    """
+    
+    # Never paced unless set_rate() says otherwise (local GROBID, test servers)
+    LOOPBACK_HOSTS = {"localhost", "127.0.0.1", "::1"}
+    
+    # Longest Retry-After we'll sit out before giving up on the request
+    MAX_RETRY_AFTER = 120.0
+    
+    # Wait used for 429/503 responses without a usable Retry-After
+    DEFAULT_RETRY_AFTER = 5.0
+    
+    def __init__(self, default_rate: float, default_burst: Optional[float] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            default_rate: Requests per second for hosts without their own rate
+            default_burst: Back-to-back requests allowed (defaults to the rate, min 1)
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst or max(1.0, default_rate)
+        self._rates: dict[str, tuple[float, float]] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def set_rate(self, host: str, rate: float, burst: float = 1) -> None:
+        """
+        Use a specific rate for one host.
+        
+        Args:
+            host: Hostname (e.g., "export.arxiv.org")
+            rate: Requests per second
+            burst: Back-to-back requests allowed
+        """
+        with self._lock:
+            self._rates[host.lower()] = (rate, burst)
+            self._buckets.pop(host.lower(), None)
+    
+    def bucket(self, url: str) -> TokenBucket:
+        """
+        Token bucket for a URL's host (created on first use).
+        
+        Args:
+            url: Request URL
+        
+        Returns:
+            The host's bucket (unlimited for loopback hosts)
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            if host not in self._buckets:
+                if host in self._rates:
+                    rate, burst = self._rates[host]
+                elif host in self.LOOPBACK_HOSTS or self.default_rate <= 0:
+                    rate, burst = None, 1
+                else:
+                    rate, burst = self.default_rate, self.default_burst
+                self._buckets[host] = TokenBucket(rate, burst)
+            return self._buckets[host]
+    
+    def wait(self, url: str) -> None:
+        """Block the calling thread until a request to url may be sent."""
+        delay = self.bucket(url).reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self, url: str) -> None:
+        """Async version of wait(): sleeps without blocking the event loop."""
+        delay = self.bucket(url).reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    
+    def retry_after(self, url: str, header: Optional[str]) -> Optional[float]:
+        """
+        Put a host on hold after a 429/503.
+        
+        Args:
+            url: Request URL
+            header: The response's Retry-After header (seconds or HTTP date), if any
+        
+        Returns:
+            Seconds the host is on hold, or None if that's longer than
+            MAX_RETRY_AFTER (don't retry)
+        """
+        delay = self._parse_retry_after(header)
+        # Longer holds aren't sat out, but still slow the host down for a while
+        self.bucket(url).pause(min(delay, self.MAX_RETRY_AFTER))
+        return delay if delay <= self.MAX_RETRY_AFTER else None
+    
+    def _parse_retry_after(self, header: Optional[str]) -> float:
+        """Retry-After is either delay-seconds or an HTTP date."""
+        if not header:
+            return self.DEFAULT_RETRY_AFTER
+        header = header.strip()
+        if header.isdigit():
+            return float(header)
+        try:
+            when = parsedate_to_datetime(header)
+        except (TypeError, ValueError):
+            return self.DEFAULT_RETRY_AFTER
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+# Status codes that mean "slow down"
+RETRY_STATUSES = {429, 503}
+
+# Retries per request after a 429/503 (each one waits for Retry-After)
+MAX_RETRIES = 3
+
+
+def make_rate_limiter() -> RateLimiter:
+    """Build a RateLimiter from the configuration (arXiv API gets its own pace)."""
+    limiter = RateLimiter(default_rate=config.host_requests_per_second)
+    if config.arxiv_request_interval > 0:
+        limiter.set_rate("export.arxiv.org", 1 / config.arxiv_request_interval)
+    return limiter
+
+
+# The process-wide limiter every fetcher shares
+rate_limiter = make_rate_limiter()
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    requests transport adapter that paces requests and honors Retry-After.
+    
+    Usage:
+        session = requests.Session()
+        session.mount("https://", RateLimitedAdapter())
+    """
+    
+    def __init__(self, limiter: Optional[RateLimiter] = None, **kwargs):
+        """
+        Initialize the adapter.
+        
+        Args:
+            limiter: RateLimiter to use (the process-wide one if None)
+            **kwargs: Passed to HTTPAdapter (e.g., pool_maxsize)
+        """
+        self.limiter = limiter or rate_limiter
+        super().__init__(**kwargs)
+    
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        for attempt in range(MAX_RETRIES + 1):
+            self.limiter.wait(request.url)
+            response = super().send(request, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            
+            delay = self.limiter.retry_after(request.url, response.headers.get("Retry-After"))
+            if delay is None:
+                return response
+            print(f"  ↻ {response.status_code} from {urlsplit(request.url).hostname}, "
+                  f"retrying in {delay:.0f}s")
+            response.close()
+        return response
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx async transport that paces requests and honors Retry-After.
+    
+    Usage:
+        async with httpx.AsyncClient(transport=RateLimitedTransport()) as client:
+            ...
+    """
+    
+    def __init__(self, limiter: Optional[RateLimiter] = None, **kwargs):
+        """
+        Initialize the transport.
+        
+        Args:
+            limiter: RateLimiter to use (the process-wide one if None)
+            **kwargs: Passed to httpx.AsyncHTTPTransport (e.g., limits)
+        """
+        self.limiter = limiter or rate_limiter
+        self._transport = httpx.AsyncHTTPTransport(**kwargs)
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.extensions.get("rate_limit") is False:
+            return await self._transport.handle_async_request(request)
+        url = str(request.url)
+        for attempt in range(MAX_RETRIES + 1):
+            await self.limiter.wait_async(url)
+            response = await self._transport.handle_async_request(request)
+            if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                return response
+            
+            delay = self.limiter.retry_after(url, response.headers.get("Retry-After"))
+            if delay is None:
+                return response
+            print(f"  ↻ {response.status_code} from {request.url.host}, retrying in {delay:.0f}s")
+            await response.aclose()
+        return response
+    
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def limited_session(pool_size: int = 10, headers: Optional[dict] = None) -> requests.Session:
+    """
+    A requests.Session whose every request goes through the rate limiter.
+    
+    Args:
+        pool_size: Keep-alive connections kept per host
+        headers: Default headers for every request (e.g., User-Agent)
+    
+    Returns:
+        Configured Session
+    """
+    session = requests.Session()
+    adapter = RateLimitedAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
@@ -1,17 +1,34 @@
 """
 Processing state management.
 
-This module handles reading and writing the processing_state.json file
-to track which papers have been processed and avoid duplicates.
+This module tracks which papers have been processed (and which failed) to
+avoid duplicates. Two storage backends are available:
+
+- JsonStateBackend: processing_state.json, rewritten on every change.
+  Simple and human-readable; fine for small vaults.
+- SqliteStateBackend: processing_state.db, an indexed SQLite database in
+  WAL mode. Each change is a single-row upsert, so marking a paper costs
+  the same whether the library has 10 papers or 100,000.
+
+StateManager wraps either one with the same interface. Pick the backend
+with STATE_BACKEND in .env ("json" or "sqlite"); the first time the SQLite
+backend starts, it imports everything from processing_state.json.
 
 Python concepts:
 - Context managers (with statement)
 - JSON serialization
 - File I/O
 - Class methods
+- Locks for thread safety
+- sqlite3: A full SQL database in a single file, built into Python
+- Duck typing: Both backends have the same methods, so StateManager
+  doesn't care which one it's talking to
 """
 
 import json
+import sqlite3
+import threading
+from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -19,24 +36,21 @@ from paper_library.config import config
 from paper_library.models import ProcessingState
 
 
-class StateManager:
+# Sources that count as "processed" (same as ProcessingState.mark_processed)
+TRACKED_SOURCES = ("arxiv", "doi", "web", "local")
+
+
+class JsonStateBackend:
     """
-    Manages the processing state file.
+    State stored in processing_state.json.
     
-    This is a singleton pattern - there's only one state file,
-    so we always work with the same instance.
-    
-    Usage:
-        state = StateManager.load()
-        if not state.is_processed("2312.12345"):
-            # Process the paper
-            state.mark_processed("2312.12345", "arxiv")
-            state.save()
+    The whole state lives in memory as a ProcessingState and the file is
+    rewritten after every change (O(library size) per mark).
     """
     
     def __init__(self, state_file: Path):
         """
-        Initialize the state manager.
+        Initialize the backend.
         
         Args:
             state_file: Path to the processing_state.json file
@@ -44,21 +58,6 @@ class StateManager:
         self.state_file = state_file
         self._state: Optional[ProcessingState] = None
     
-    @classmethod
-    def load(cls) -> "StateManager":
-        """
-        Load the processing state from disk.
-        
-        This is a class method (@classmethod) so you can call it without
-        creating an instance first: StateManager.load()
-        
-        Returns:
-            StateManager instance with loaded state
-        """
-        manager = cls(config.processing_state_file)
-        manager._load_state()
-        return manager
-    
     def _load_state(self) -> None:
         """
         Internal method to load state from JSON file.
@@ -83,6 +82,7 @@ class StateManager:
                 processed_dois=set(data.get("processed_dois", [])),
                 processed_arxiv_ids=set(data.get("processed_arxiv_ids", [])),
                 processed_urls=set(data.get("processed_urls", [])),
+                processed_files=set(data.get("processed_files", [])),
                 failed=data.get("failed", {}),
             )
         except Exception as e:
@@ -104,13 +104,14 @@ class StateManager:
         
         # Convert state to dictionary
         # Pydantic's model_dump() creates a dict from the model
-        data = self._state.model_dump()
+        data = self.state.model_dump()
         
         # Convert sets to lists for JSON (JSON doesn't support sets)
         # list() converts a set to a list
         data["processed_dois"] = list(data["processed_dois"])
         data["processed_arxiv_ids"] = list(data["processed_arxiv_ids"])
         data["processed_urls"] = list(data["processed_urls"])
+        data["processed_files"] = list(data["processed_files"])
         
         # Convert datetime to string (JSON doesn't support datetime)
         if data.get("last_updated"):
@@ -121,6 +122,264 @@ class StateManager:
         # indent=2 makes the JSON human-readable with 2-space indentation
         self.state_file.write_text(json.dumps(data, indent=2))
     
+    @property
+    def state(self) -> ProcessingState:
+        """The in-memory ProcessingState (loaded on first access)."""
+        if self._state is None:
+            self._load_state()
+        return self._state
+    
+    def is_processed(self, identifier: str) -> bool:
+        return self.state.is_processed(identifier)
+    
+    def mark_processed(self, identifier: str, source: str) -> None:
+        self.state.mark_processed(identifier, source)
+        self.save()
+    
+    def mark_failed(self, identifier: str, error: str) -> None:
+        self.state.mark_failed(identifier, error)
+        self.save()
+    
+    def close(self) -> None:
+        pass  # Nothing held open between writes
+
+
+class SqliteStateBackend:
+    """
+    State stored in an SQLite database (WAL mode).
+    
+    Tables:
+        processed(identifier PRIMARY KEY, source, processed_at)
+        failed(identifier PRIMARY KEY, error, failed_at)
+    
+    The primary keys are B-tree indexes, so is_processed() is O(log n) and
+    each mark is a single-row INSERT ... ON CONFLICT DO UPDATE (an "upsert").
+    WAL (write-ahead logging) lets readers keep reading while a write commits.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS processed (
+            identifier TEXT PRIMARY KEY,
+            source TEXT NOT NULL,
+            processed_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS failed (
+            identifier TEXT PRIMARY KEY,
+            error TEXT NOT NULL,
+            failed_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+    """
+    
+    def __init__(self, db_file: Path, import_from: Optional[Path] = None):
+        """
+        Open (or create) the database.
+        
+        Args:
+            db_file: Path to the SQLite database file
+            import_from: processing_state.json to import on first use (optional)
+        """
+        self.db_file = db_file
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One connection shared by all threads, guarded by StateManager's lock
+        # check_same_thread=False allows that sharing
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is safe with WAL: a power cut can lose the last commit, never corrupt
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        
+        if import_from is not None:
+            self.import_json(import_from)
+    
+    def import_json(self, state_file: Path) -> int:
+        """
+        One-time import of an existing processing_state.json.
+        
+        Does nothing if the JSON file doesn't exist or was already imported.
+        
+        Args:
+            state_file: Path to processing_state.json
+        
+        Returns:
+            Number of identifiers imported (processed + failed)
+        """
+        if not state_file.exists():
+            return 0
+        
+        done = self._conn.execute(
+            "SELECT value FROM meta WHERE key = 'imported_json'"
+        ).fetchone()
+        if done:
+            return 0
+        
+        state = JsonStateBackend(state_file).state
+        now = datetime.now().isoformat()
+        processed = (
+            [(i, "arxiv", now) for i in state.processed_arxiv_ids]
+            + [(i, "doi", now) for i in state.processed_dois]
+            + [(i, "web", now) for i in state.processed_urls]
+            + [(i, "local", now) for i in state.processed_files]
+        )
+        failed = [(i, error, now) for i, error in state.failed.items()]
+        
+        # "with conn" wraps everything in one transaction
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO processed VALUES (?, ?, ?)", processed
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO failed VALUES (?, ?, ?)", failed
+            )
+            self._conn.execute(
+                "INSERT INTO meta VALUES ('imported_json', ?)", (str(state_file),)
+            )
+        
+        print(f"Imported {len(processed)} processed and {len(failed)} failed "
+              f"papers from {state_file.name}")
+        return len(processed) + len(failed)
+    
+    @property
+    def state(self) -> ProcessingState:
+        """
+        Snapshot of the whole database as a ProcessingState.
+        
+        This reads every row, so use is_processed()/get_stats() for
+        anything that runs per paper.
+        """
+        state = ProcessingState()
+        for identifier, source in self._conn.execute("SELECT identifier, source FROM processed"):
+            state.mark_processed(identifier, source)
+        state.failed = dict(self._conn.execute("SELECT identifier, error FROM failed"))
+        return state
+    
+    def save(self) -> None:
+        pass  # Every mark is committed right away
+    
+    def is_processed(self, identifier: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM processed WHERE identifier = ?", (identifier,)
+        ).fetchone()
+        return row is not None
+    
+    def mark_processed(self, identifier: str, source: str) -> None:
+        if source not in TRACKED_SOURCES:
+            return
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO processed VALUES (?, ?, ?) "
+                "ON CONFLICT(identifier) DO UPDATE SET "
+                "source = excluded.source, processed_at = excluded.processed_at",
+                (identifier, source, datetime.now().isoformat()),
+            )
+    
+    def mark_failed(self, identifier: str, error: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO failed VALUES (?, ?, ?) "
+                "ON CONFLICT(identifier) DO UPDATE SET "
+                "error = excluded.error, failed_at = excluded.failed_at",
+                (identifier, error, datetime.now().isoformat()),
+            )
+    
+    def get_stats(self) -> dict[str, int]:
+        """Counts straight from SQL (no full snapshot needed)."""
+        counts = dict(self._conn.execute(
+            "SELECT source, COUNT(*) FROM processed GROUP BY source"
+        ))
+        failed = self._conn.execute("SELECT COUNT(*) FROM failed").fetchone()[0]
+        return {
+            "arxiv": counts.get("arxiv", 0),
+            "doi": counts.get("doi", 0),
+            "web": counts.get("web", 0),
+            "local": counts.get("local", 0),
+            "failed": failed,
+            "total": sum(counts.values()),
+        }
+    
+    def close(self) -> None:
+        self._conn.close()
+
+
+class StateManager:
+    """
+    Manages the processing state (JSON file or SQLite database).
+    
+    This is a singleton pattern - there's only one state file,
+    so we always work with the same instance.
+    
+    Usage:
+        state = StateManager.load()
+        if not state.is_processed("2312.12345"):
+            # Process the paper
+            state.mark_processed("2312.12345", "arxiv")  # Saved right away
+        
+        # Pick the backend explicitly (".db" files use SQLite)
+        state = StateManager(Path("vault/_meta/processing_state.db"))
+    """
+    
+    def __init__(self, state_file: Path, backend=None):
+        """
+        Initialize the state manager.
+        
+        Args:
+            state_file: Path to processing_state.json (or a .db/.sqlite file
+                for the SQLite backend)
+            backend: Backend object to use instead of picking one from
+                state_file's suffix
+        """
+        self.state_file = state_file
+        
+        if backend is None:
+            if state_file.suffix in (".db", ".sqlite"):
+                backend = SqliteStateBackend(state_file)
+            else:
+                backend = JsonStateBackend(state_file)
+        self.backend = backend
+        
+        # Pipelined batches mark papers from several worker threads at once
+        # The lock makes "update + save" one step so writes never interleave
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def load(cls) -> "StateManager":
+        """
+        Load the processing state from disk.
+        
+        This is a class method (@classmethod) so you can call it without
+        creating an instance first: StateManager.load()
+        
+        Uses config.state_backend to choose between the JSON file and the
+        SQLite database (which imports the JSON file the first time).
+        
+        Returns:
+            StateManager instance with loaded state
+        """
+        if config.state_backend == "sqlite":
+            backend = SqliteStateBackend(
+                config.state_db_file,
+                import_from=config.processing_state_file
+            )
+            return cls(config.state_db_file, backend=backend)
+        
+        manager = cls(config.processing_state_file)
+        # Read the JSON file now rather than on first use
+        manager.backend._load_state()
+        return manager
+    
+    def save(self) -> None:
+        """
+        Save the current state to disk.
+        
+        The mark_* methods already save, so this is rarely needed.
+        """
+        with self._lock:
+            self.backend.save()
+    
     @property
     def state(self) -> ProcessingState:
         """
@@ -131,23 +390,27 @@ class StateManager:
         instead of:
             manager.state().is_processed("123")
         """
-        if self._state is None:
-            self._load_state()
-        return self._state
+        return self.backend.state
     
     def is_processed(self, identifier: str) -> bool:
         """Convenience method to check if already processed."""
-        return self.state.is_processed(identifier)
+        with self._lock:
+            return self.backend.is_processed(identifier)
     
     def mark_processed(self, identifier: str, source: str) -> None:
         """Convenience method to mark as processed and save."""
-        self.state.mark_processed(identifier, source)
-        self.save()
+        with self._lock:
+            self.backend.mark_processed(identifier, source)
     
     def mark_failed(self, identifier: str, error: str) -> None:
         """Convenience method to mark as failed and save."""
-        self.state.mark_failed(identifier, error)
-        self.save()
+        with self._lock:
+            self.backend.mark_failed(identifier, error)
+    
+    def close(self) -> None:
+        """Close the backend (e.g., the SQLite connection)."""
+        with self._lock:
+            self.backend.close()
     
     def get_stats(self) -> dict[str, int]:
         """
@@ -156,14 +419,21 @@ class StateManager:
         Returns:
             Dictionary with counts of processed papers by source
         """
+        if hasattr(self.backend, "get_stats"):
+            with self._lock:
+                return self.backend.get_stats()
+        
+        state = self.state
         return {
-            "arxiv": len(self.state.processed_arxiv_ids),
-            "doi": len(self.state.processed_dois),
-            "web": len(self.state.processed_urls),
-            "failed": len(self.state.failed),
+            "arxiv": len(state.processed_arxiv_ids),
+            "doi": len(state.processed_dois),
+            "web": len(state.processed_urls),
+            "local": len(state.processed_files),
+            "failed": len(state.failed),
             "total": (
-                len(self.state.processed_arxiv_ids)
-                + len(self.state.processed_dois)
-                + len(self.state.processed_urls)
+                len(state.processed_arxiv_ids)
+                + len(state.processed_dois)
+                + len(state.processed_urls)
+                + len(state.processed_files)
             ),
         }
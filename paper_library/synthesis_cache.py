@@ -0,0 +1,121 @@
+"""
+On-disk cache of Claude syntheses.
+
+A synthesis only depends on what we send Claude: the prompt (which holds
+the truncated paper text and metadata), the prompt template version and
+the model. If none of those changed, asking again just costs money and
+time - e.g., after a --force run to fix a bug in the markdown template.
+
+Each synthesis is stored as one small JSON file under
+vault/_meta/synthesis_cache/, named by its key. The stored Synthesis keeps
+its original cost_usd and token counts, so notes still show what the
+synthesis really cost.
+
+Python concepts:
+- hashlib: Hash the prompt into a short, fixed-length key
+- Pydantic JSON round-trips (model_dump_json / model_validate_json)
+- threading.Lock: Safe to share between pipeline worker threads
+"""
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+
+from pydantic import ValidationError
+
+from paper_library.cache_files import write_atomic
+from paper_library.models import Synthesis
+
+
+class SynthesisCache:
+    """
+    Cache of Synthesis objects keyed by prompt, prompt version and model.
+
+    Usage:
+        cache = SynthesisCache(config.synthesis_cache_dir)
+        key = cache.make_key(prompt, prompt_version=1, model="claude-haiku-4-5")
+
+        synthesis = cache.get(key)
+        if synthesis is None:
+            synthesis = call_claude(prompt)
+            cache.put(key, synthesis)
+    """
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per synthesis
+        """
+        self.cache_dir = cache_dir
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, prompt: str, prompt_version: int, model: str, max_tokens: int) -> str:
+        """
+        Build the cache key for a synthesis request.
+
+        Args:
+            prompt: Full prompt sent to Claude (includes the truncated text)
+            prompt_version: SynthesisGenerator.PROMPT_VERSION
+            model: Model name
+            max_tokens: Response length limit
+
+        Returns:
+            Hex SHA-256 of all four
+        """
+        key = hashlib.sha256()
+        key.update(f"v{prompt_version}\0{model}\0{max_tokens}\0".encode())
+        key.update(prompt.encode('utf-8'))
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[Synthesis]:
+        """
+        Look up a cached synthesis.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            The stored Synthesis, or None on a miss
+        """
+        try:
+            synthesis = Synthesis.model_validate_json(self._path(key).read_text(encoding='utf-8'))
+        except (OSError, ValidationError):
+            # Missing, or unreadable (e.g., written by an older Synthesis model)
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return synthesis
+
+    def put(self, key: str, synthesis: Synthesis) -> None:
+        """
+        Store a synthesis.
+
+        Args:
+            key: Key from make_key()
+            synthesis: Synthesis returned by Claude
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        data = synthesis.model_dump_json(indent=2)
+        write_atomic(self._path(key), lambda tmp_path: tmp_path.write_text(data, encoding='utf-8'))
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters for this run.
+
+        Returns:
+            Dictionary with hits and misses
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _path(self, key: str) -> Path:
+        """File that stores the entry for key."""
+        return self.cache_dir / f"{key}.json"
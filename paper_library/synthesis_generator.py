@@ -11,15 +11,29 @@ It produces structured syntheses with:
 Python concepts:
 - API client libraries (anthropic)
 - Prompt engineering
+- Prompt caching (a fixed, cacheable system prompt before per-paper content)
 - Token counting and cost tracking
 - Structured output parsing
+- async/await version of the API call (for AsyncPaperProcessor)
+- Memoization: reuse a stored answer when the question hasn't changed
+- Generators (yield): Hand back batch results one at a time as they arrive
 """
 
+import json
+import time
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Iterator, Optional
 import anthropic
 
+from paper_library.cache_files import write_atomic
 from paper_library.models import PaperMetadata, ArticleMetadata, Synthesis
+from paper_library.synthesis_cache import SynthesisCache
+
+
+class SynthesisError(Exception):
+    """Raised when Claude couldn't produce a synthesis (e.g., a failed batch request)."""
+    pass
 
 
 class SynthesisGenerator:
@@ -33,6 +47,15 @@ class SynthesisGenerator:
         generator = SynthesisGenerator(api_key="sk-...")
         synthesis = generator.generate_quick_synthesis(paper_text, metadata)
         print(synthesis.summary)
+        
+        # Skip Claude when the same prompt was already answered
+        cache = SynthesisCache(config.synthesis_cache_dir)
+        generator = SynthesisGenerator(api_key="sk-...", cache=cache)
+        
+        # Many papers at once via the Message Batches API (half price, slower)
+        items = {"paper-0": (text, metadata), "paper-1": (text2, metadata2)}
+        for custom_id, result in generator.generate_quick_synthesis_batch(items):
+            ...  # result is a Synthesis or a SynthesisError
     """
     
     # Pricing for Claude Haiku (as of Jan 2026)
@@ -40,19 +63,90 @@ class SynthesisGenerator:
     INPUT_PRICE_PER_MTOK = 1.00   # $1.00 per million input tokens
     OUTPUT_PRICE_PER_MTOK = 5.00  # $5.00 per million output tokens
     
+    # Message Batches API requests cost half the normal price
+    BATCH_PRICE_FACTOR = 0.5
+    
     # Default model to use
     MODEL = "claude-haiku-4-5"  # Fix to use current model -- date not necessary in current API
     
-    def __init__(self, api_key: str):
+    # Version of the quick synthesis prompt and its response format
+    # Bump this whenever QUICK_SYNTHESIS_INSTRUCTIONS, _build_quick_synthesis_prompt
+    # or _parse_quick_synthesis_response changes, so cached syntheses are redone
+    PROMPT_VERSION = 2
+    
+    # Prompt caching prices, as multiples of the normal input price
+    # Writing a prefix into the cache costs a bit more, reading it back far less
+    CACHE_WRITE_PRICE_FACTOR = 1.25
+    CACHE_READ_PRICE_FACTOR = 0.10
+    
+    # Fixed instructions for every quick synthesis (the system prompt)
+    # Identical across papers, so it's marked for prompt caching: Anthropic
+    # reuses the processed prefix instead of charging full price each time.
+    # Note: prefixes shorter than the model's minimum cacheable length are
+    # simply not cached (cache_read/cache_write tokens stay 0).
+    QUICK_SYNTHESIS_INSTRUCTIONS = """I need you to analyze an academic paper and provide a structured synthesis. The paper's title, authors, year, research area and text follow in the user message.
+
+Please read the paper text and provide:
+
+1. SUMMARY: A 3-4 sentence overview in plain, accessible language. Imagine explaining this to a student over coffee - what did they actually do, and what did they find? Avoid jargon where possible, but use it where necessary. Focus on the core contribution and main results. This should help someone who read the paper months ago--or who has heard about it from someone else--remember "oh right, THAT paper." Expand acronyms ("RNNs (Recurrent Neural Networks)") on first usage.
+
+2. WHY_YOU_CARED: 3-4 sentences explaining why this paper matters for someone researching the paper's research area. This is the "so what?" - why would you bookmark this? What problem does it solve or what insight does it provide? Write as if you're reminding your future self why you saved this paper. Use plain language--the goal is to be more casual and skimmable than the original. Expand acronyms ("RNNs (Recurrent Neural Networks)") on first usage.
+
+3. KEY_CONCEPTS: 5-8 key terms or concepts that would be useful as tags. Use lowercase, hyphenated format (e.g., "neural-networks", "attention-mechanism"). These should be searchable concepts. Then add 2-5 general fields or concepts (e.g. "computational-linguistics", "artificial-intelligence") for higher-level search and sorting.
+
+4. MEMORABLE_QUOTE: One standout sentence or phrase from the paper itself (NOT the title, NOT the abstract header). Look through the introduction, conclusion, or key sections for a sentence that captures an important insight, claim, or finding. It should be something memorable that someone would actually quote. Use the exact wording from the paper text. Include quotation marks.
+
+Examples of good quotes:
+- "We show that attention mechanisms alone are sufficient for state-of-the-art translation."
+- "The Transformer achieves faster training while improving performance."
+- "Our approach eliminates the need for recurrence entirely."
+
+DO NOT use:
+- The paper title as the quote
+- Generic phrases like "in this paper we..."
+- Abstract boilerplate
+
+Please format your response exactly like this:
+
+<summary>
+Your 3-4 sentence summary here.
+</summary>
+
+<why_you_cared>
+Your 3-4 sentence explanation here.
+</why_you_cared>
+
+<key_concepts>
+concept-1, concept-2, concept-3, concept-4, concept-5, general-field
+</key_concepts>
+
+<memorable_quote>
+"Your exact quote from the paper here."
+</memorable_quote>
+
+Make sure to use the exact XML-style tags shown above."""
+    
+    def __init__(
+        self,
+        api_key: str,
+        base_url: Optional[str] = None,
+        cache: Optional[SynthesisCache] = None
+    ):
         """
         Initialize the synthesis generator.
         
         Args:
             api_key: Anthropic API key
+            base_url: Optional API base URL (None = Anthropic's default)
+            cache: Optional synthesis cache; hits skip the API call
         """
-        # Create Anthropic client
-        # This handles authentication and API calls
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.cache = cache
+        
+        # Create Anthropic clients
+        # These handle authentication and API calls
+        # The async client is only used by AsyncPaperProcessor
+        self.client = anthropic.Anthropic(api_key=api_key, base_url=base_url)
+        self.async_client = anthropic.AsyncAnthropic(api_key=api_key, base_url=base_url)
     
     def generate_quick_synthesis(
         self,
@@ -80,18 +174,253 @@ class SynthesisGenerator:
         # Build the prompt
         prompt = self._build_quick_synthesis_prompt(text, metadata)
         
+        # Same prompt, version and model as before? Reuse that answer
+        key = self._cache_key(prompt, max_tokens)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
         # Call Claude
-        response = self.client.messages.create(
-            model=self.MODEL,
-            max_tokens=max_tokens,
-            messages=[
+        response = self.client.messages.create(**self._quick_synthesis_params(prompt, max_tokens))
+        
+        synthesis = self._build_synthesis(response)
+        if key:
+            self.cache.put(key, synthesis)
+        return synthesis
+    
+    async def generate_quick_synthesis_async(
+        self,
+        text: str,
+        metadata: PaperMetadata | ArticleMetadata,
+        max_tokens: int = 1500
+    ) -> Synthesis:
+        """
+        Async version of generate_quick_synthesis().
+        
+        Uses the AsyncAnthropic client so many syntheses can wait on Claude
+        at once on a single event loop.
+        
+        Args:
+            text: Full text of the paper/article
+            metadata: Paper metadata (title, authors, etc.)
+            max_tokens: Maximum tokens for Claude's response
+            
+        Returns:
+            Synthesis object with generated content
+        """
+        prompt = self._build_quick_synthesis_prompt(text, metadata)
+        
+        key = self._cache_key(prompt, max_tokens)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = await self.async_client.messages.create(
+            **self._quick_synthesis_params(prompt, max_tokens)
+        )
+        
+        synthesis = self._build_synthesis(response)
+        if key:
+            self.cache.put(key, synthesis)
+        return synthesis
+    
+    def generate_quick_synthesis_batch(
+        self,
+        items: dict[str, tuple[str, PaperMetadata | ArticleMetadata]],
+        max_tokens: int = 1500,
+        poll_interval: float = 60,
+        batch_file: Optional[Path] = None
+    ) -> Iterator[tuple[str, Synthesis | SynthesisError]]:
+        """
+        Generate quick syntheses for many papers with one Message Batch.
+        
+        Instead of one messages.create() call per paper, every prompt is
+        submitted together and Claude works through them in the background
+        (usually minutes, at most 24 hours). We poll until the batch ends,
+        then yield results as they stream in.
+        
+        Cached syntheses are yielded first and never submitted.
+        
+        A submitted batch is already paid for, so with batch_file its ID is
+        saved before polling. If a run is interrupted while waiting, the
+        next one finds the ID there and collects that batch's results
+        instead of submitting the same prompts again. The file is deleted
+        once every result has been read.
+        
+        Args:
+            items: custom_id -> (text, metadata). custom_ids must be 1-64
+                characters of letters, digits, - and _ (Anthropic's rule),
+                and the same for a paper in every run (for resuming)
+            max_tokens: Maximum tokens for each response
+            poll_interval: Seconds between batch status checks
+            batch_file: JSON file remembering the batch being waited on
+            
+        Yields:
+            (custom_id, Synthesis) for successes,
+            (custom_id, SynthesisError) for requests that failed or expired
+        """
+        requests = []
+        keys = {}
+        for custom_id, (text, metadata) in items.items():
+            prompt = self._build_quick_synthesis_prompt(text, metadata)
+            
+            key = self._cache_key(prompt, max_tokens)
+            if key:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    yield custom_id, cached
+                    continue
+                keys[custom_id] = key
+            
+            # Same parameters as generate_quick_synthesis() sends
+            requests.append({
+                "custom_id": custom_id,
+                "params": self._quick_synthesis_params(prompt, max_tokens)
+            })
+        
+        if not requests:
+            return
+        
+        # Prompts an interrupted run already submitted: collect, don't resubmit
+        saved = self._saved_batch(batch_file)
+        if saved is not None:
+            batch_id, saved_ids = saved
+            resumed = {request["custom_id"] for request in requests} & saved_ids
+            if resumed:
+                try:
+                    batch = self.client.messages.batches.retrieve(batch_id)
+                except anthropic.NotFoundError:
+                    print(f"  ⚠ Message batch {batch_id} is gone, submitting its prompts again")
+                else:
+                    print(f"  ↻ Resuming message batch {batch_id} ({len(resumed)} prompts)")
+                    yield from self._batch_results(batch, resumed, keys, poll_interval)
+                    requests = [request for request in requests if request["custom_id"] not in resumed]
+        
+        if requests:
+            # Submit everything at once
+            batch = self.client.messages.batches.create(requests=requests)
+            print(f"  Submitted message batch {batch.id} ({len(requests)} prompts)")
+            custom_ids = {request["custom_id"] for request in requests}
+            if batch_file is not None:
+                data = json.dumps({"batch_id": batch.id, "custom_ids": sorted(custom_ids)})
+                batch_file.parent.mkdir(parents=True, exist_ok=True)
+                write_atomic(batch_file, lambda tmp_path: tmp_path.write_text(data, encoding='utf-8'))
+            yield from self._batch_results(batch, custom_ids, keys, poll_interval)
+        
+        # Every result read (an early stop skips this, so the next run resumes)
+        if batch_file is not None:
+            batch_file.unlink(missing_ok=True)
+    
+    def _batch_results(
+        self,
+        batch,
+        custom_ids: set[str],
+        keys: dict[str, str],
+        poll_interval: float
+    ) -> Iterator[tuple[str, Synthesis | SynthesisError]]:
+        """
+        Wait for a Message Batch to end, then yield its results.
+        
+        Args:
+            batch: MessageBatch from create() or retrieve()
+            custom_ids: Requests to yield (others in the batch are skipped)
+            keys: custom_id -> synthesis cache key, for storing successes
+            poll_interval: Seconds between batch status checks
+        """
+        # Poll until every request has succeeded, errored, expired or been canceled
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+            counts = batch.request_counts
+            print(f"  Batch {batch.id}: {counts.processing} processing, "
+                  f"{counts.succeeded} succeeded, {counts.errored} errored")
+        
+        # Results are streamed line by line (in no particular order)
+        for entry in self.client.messages.batches.results(batch.id):
+            if entry.custom_id not in custom_ids:
+                continue  # Finished by an earlier run, or no longer wanted
+            result = entry.result
+            if result.type == "succeeded":
+                synthesis = self._build_synthesis(result.message, batch=True)
+                if entry.custom_id in keys:
+                    self.cache.put(keys[entry.custom_id], synthesis)
+                yield entry.custom_id, synthesis
+            elif result.type == "errored":
+                yield entry.custom_id, SynthesisError(
+                    f"Batch request failed: {result.error.error.message}"
+                )
+            else:
+                # "canceled" or "expired" (not finished within 24 hours)
+                yield entry.custom_id, SynthesisError(f"Batch request {result.type}")
+    
+    def _saved_batch(self, batch_file: Optional[Path]) -> Optional[tuple[str, set[str]]]:
+        """(batch ID, custom_ids) saved by an interrupted batch run, or None."""
+        if batch_file is None or not batch_file.exists():
+            return None
+        try:
+            data = json.loads(batch_file.read_text(encoding='utf-8'))
+            return data["batch_id"], set(data["custom_ids"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Ignoring unreadable {batch_file.name}: {e}")
+            return None
+    
+    def _quick_synthesis_params(self, prompt: str, max_tokens: int) -> dict:
+        """
+        Request parameters for a quick synthesis.
+        
+        The static instructions go first, as a system block with a
+        cache_control marker, so every paper shares the same cached prefix.
+        The per-paper prompt follows as the user message.
+        
+        Args:
+            prompt: Per-paper prompt from _build_quick_synthesis_prompt()
+            max_tokens: Maximum tokens for Claude's response
+            
+        Returns:
+            Keyword arguments for messages.create()
+        """
+        return {
+            "model": self.MODEL,
+            "max_tokens": max_tokens,
+            "system": [
+                {
+                    "type": "text",
+                    "text": self.QUICK_SYNTHESIS_INSTRUCTIONS,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "messages": [
                 {
                     "role": "user",
                     "content": prompt
                 }
             ]
+        }
+    
+    def _cache_key(self, prompt: str, max_tokens: int) -> Optional[str]:
+        """Synthesis cache key for a prompt, or None if caching is off."""
+        if self.cache is None:
+            return None
+        return self.cache.make_key(
+            self.QUICK_SYNTHESIS_INSTRUCTIONS + "\0" + prompt,
+            self.PROMPT_VERSION,
+            self.MODEL,
+            max_tokens
         )
+    
+    def _build_synthesis(self, response, batch: bool = False) -> Synthesis:
+        """
+        Turn a Claude messages response into a Synthesis.
         
+        Args:
+            response: Message returned by messages.create() (or a batch result)
+            batch: True if the message came from the Message Batches API
+            
+        Returns:
+            Synthesis object with generated content and cost
+        """
         # Extract the response text
         # Claude returns a list of content blocks, we want the text
         response_text = response.content[0].text
@@ -101,9 +430,16 @@ class SynthesisGenerator:
         
         # Calculate cost
         # response.usage gives us token counts
+        # Cache counts are None/missing when prompt caching didn't apply
+        usage = response.usage
+        cache_write_tokens = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        cache_read_tokens = getattr(usage, 'cache_read_input_tokens', None) or 0
         cost = self._calculate_cost(
-            response.usage.input_tokens,
-            response.usage.output_tokens
+            usage.input_tokens,
+            usage.output_tokens,
+            cache_write_tokens=cache_write_tokens,
+            cache_read_tokens=cache_read_tokens,
+            batch=batch
         )
         
         # Create Synthesis object
@@ -114,7 +450,11 @@ class SynthesisGenerator:
             memorable_quote=synthesis_data["memorable_quote"],
             generated_at=datetime.now(),
             model_used=self.MODEL,
-            cost_usd=cost
+            cost_usd=cost,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+            cache_write_tokens=cache_write_tokens,
+            cache_read_tokens=cache_read_tokens
         )
         
         return synthesis
@@ -125,9 +465,10 @@ class SynthesisGenerator:
         metadata: PaperMetadata | ArticleMetadata
     ) -> str:
         """
-        Build the prompt for quick synthesis.
+        Build the per-paper part of the quick synthesis prompt.
         
-        This uses a structured format to get consistent output.
+        This is the user message: paper details plus its text. The fixed
+        instructions and output format are QUICK_SYNTHESIS_INSTRUCTIONS.
         
         Args:
             text: Paper text
@@ -148,61 +489,23 @@ class SynthesisGenerator:
         else:
             authors_str = ", ".join(metadata.authors)
         
+        # Web articles (ArticleMetadata) have no year field
+        year = getattr(metadata, 'year', None) or "unknown"
+        
         # Infer research area for the prompt
         research_area = self._infer_research_area(metadata)
         
-        # Build the prompt
-        # Using XML-style tags helps Claude structure its response
-        prompt = f"""I need you to analyze this academic paper and provide a structured synthesis.
-
-Paper: "{metadata.title}"
+        # Only the per-paper part changes between calls; the instructions
+        # live in QUICK_SYNTHESIS_INSTRUCTIONS (sent as the cached system prompt)
+        prompt = f"""Paper: "{metadata.title}"
 Authors: {authors_str}
-Year: {metadata.year}
-
-Please read the paper text below and provide:
-
-1. SUMMARY: A 3-4 sentence overview in plain, accessible language. Imagine explaining this to a student over coffee - what did they actually do, and what did they find? Avoid jargon where possible, but use it where necessary. Focus on the core contribution and main results. This should help someone who read the paper months ago--or who has heard about it from someone else--remember "oh right, THAT paper." Expand acronyms ("RNNs (Recurrent Neural Networks)") on first usage.
-
-2. WHY_YOU_CARED: 3-4 sentences explaining why this paper matters for someone researching {research_area}. This is the "so what?" - why would you bookmark this? What problem does it solve or what insight does it provide? Write as if you're reminding your future self why you saved this paper. Use plain language--the goal is to be more casual and skimmable than the original. Expand acronyms ("RNNs (Recurrent Neural Networks)") on first usage.
-
-3. KEY_CONCEPTS: 5-8 key terms or concepts that would be useful as tags. Use lowercase, hyphenated format (e.g., "neural-networks", "attention-mechanism"). These should be searchable concepts. Then add 2-5 general fields or concepts (e.g. "computational-linguistics", "artificial-intelligence") for higher-level search and sorting.
-
-4. MEMORABLE_QUOTE: One standout sentence or phrase from the paper itself (NOT the title, NOT the abstract header). Look through the introduction, conclusion, or key sections for a sentence that captures an important insight, claim, or finding. It should be something memorable that someone would actually quote. Use the exact wording from the paper text. Include quotation marks.
-
-Examples of good quotes:
-- "We show that attention mechanisms alone are sufficient for state-of-the-art translation."
-- "The Transformer achieves faster training while improving performance."
-- "Our approach eliminates the need for recurrence entirely."
-
-DO NOT use:
-- The paper title as the quote
-- Generic phrases like "in this paper we..."
-- Abstract boilerplate
+Year: {year}
+Research area: {research_area}
 
 Paper text ({text_length} characters):
 ---
 {text_preview}
----
-
-Please format your response exactly like this:
-
-<summary>
-Your 3-4 sentence summary here.
-</summary>
-
-<why_you_cared>
-Your 3-4 sentence explanation here.
-</why_you_cared>
-
-<key_concepts>
-concept-1, concept-2, concept-3, concept-4, concept-5, general-field
-</key_concepts>
-
-<memorable_quote>
-"Your exact quote from the paper here."
-</memorable_quote>
-
-Make sure to use the exact XML-style tags shown above."""
+---"""
         
         return prompt
     
@@ -222,7 +525,7 @@ Make sure to use the exact XML-style tags shown above."""
         # Simple keyword matching
         # This could be more sophisticated, but works for MVP
         title_lower = metadata.title.lower()
-        venue_lower = getattr(metadata, 'venue', '').lower() if hasattr(metadata, 'venue') else ''
+        venue_lower = (getattr(metadata, 'venue', None) or '').lower()
         
         keywords = {
             "machine learning": ["neural", "learning", "model", "training", "deep"],
@@ -293,16 +596,28 @@ Make sure to use the exact XML-style tags shown above."""
             "memorable_quote": memorable_quote
         }
     
-    def _calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
+    def _calculate_cost(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        cache_write_tokens: int = 0,
+        cache_read_tokens: int = 0,
+        batch: bool = False
+    ) -> float:
         """
         Calculate the cost of an API call.
         
         Claude charges separately for input and output tokens.
-        Prices are per million tokens.
+        Prices are per million tokens. With prompt caching, input_tokens
+        only counts the uncached part; cached prefix tokens are billed
+        separately (writes slightly above, reads far below, the input price).
         
         Args:
-            input_tokens: Number of input tokens used
+            input_tokens: Number of uncached input tokens used
             output_tokens: Number of output tokens generated
+            cache_write_tokens: Input tokens written to the prompt cache
+            cache_read_tokens: Input tokens read from the prompt cache
+            batch: True for Message Batches API requests (discounted)
             
         Returns:
             Cost in USD
@@ -311,8 +626,12 @@ Make sure to use the exact XML-style tags shown above."""
         # Then multiply by token count
         input_cost = (input_tokens / 1_000_000) * self.INPUT_PRICE_PER_MTOK
         output_cost = (output_tokens / 1_000_000) * self.OUTPUT_PRICE_PER_MTOK
+        input_cost += (cache_write_tokens / 1_000_000) * self.INPUT_PRICE_PER_MTOK * self.CACHE_WRITE_PRICE_FACTOR
+        input_cost += (cache_read_tokens / 1_000_000) * self.INPUT_PRICE_PER_MTOK * self.CACHE_READ_PRICE_FACTOR
         
         total_cost = input_cost + output_cost
+        if batch:
+            total_cost *= self.BATCH_PRICE_FACTOR
         
         return round(total_cost, 4)  # Round to 4 decimal places (0.0001 cents)
     
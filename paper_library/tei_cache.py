@@ -0,0 +1,217 @@
+"""
+On-disk cache of GROBID TEI responses.
+
+GROBID is the slowest step in the pipeline (up to 5 minutes per PDF), and
+its output only depends on three things:
+- The exact bytes of the PDF
+- Which GROBID endpoint we called
+- Which GROBID version answered
+
+So we hash those three into a key and keep the TEI XML under
+vault/_meta/tei_cache/. Reprocessing with --force, or meeting the same PDF
+under another identifier, then reads the TEI from disk instead of uploading
+the PDF again.
+
+Entries are gzip-compressed (TEI compresses ~10x) and the cache is
+size-bounded: when it grows past max_bytes, the least recently used entries
+are deleted (see cache_files.py).
+
+The last GROBID version we saw is kept next to the entries (grobid_version),
+so the keys can still be built while GROBID is down and can't be asked.
+
+Python concepts:
+- hashlib: SHA-256 hashing of file contents
+- gzip: Transparent compression of text files
+- threading.Lock: Safe to share between pipeline worker threads
+"""
+
+import gzip
+import hashlib
+import shutil
+import threading
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from paper_library.cache_files import LruDirectory, write_atomic
+
+
+class TeiCache:
+    """
+    Content-addressed, size-bounded cache of GROBID TEI XML.
+
+    Usage:
+        cache = TeiCache(config.tei_cache_dir, max_bytes=512 * 1024 * 1024)
+        key = cache.make_key(pdf_path, endpoint, grobid_version)
+
+        xml = cache.get(key)
+        if xml is None:
+            xml = call_grobid(pdf_path)
+            cache.put(key, xml)
+
+        # Or streamed, never holding the whole TEI in memory
+        tei_file = cache.open(key)  # None on a miss
+        cache.put_stream(key, response_file)
+
+        print(cache.stats())  # {"hits": 1, "misses": 0, ...}
+    """
+
+    SUFFIX = ".tei.xml.gz"
+
+    # File holding the GROBID version the entries were last made with
+    VERSION_FILE = "grobid_version"
+
+    # Read PDFs in 1 MB chunks when hashing (no need to hold the whole file)
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached TEI files
+            max_bytes: Total size (compressed) to keep before evicting
+        """
+        self.cache_dir = cache_dir
+        self.files = LruDirectory(cache_dir, self.SUFFIX, max_bytes)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def make_key(self, pdf_path: Path, endpoint: str, grobid_version: str) -> str:
+        """
+        Build the cache key for a PDF.
+
+        Args:
+            pdf_path: PDF file to hash
+            endpoint: GROBID API URL the PDF would be sent to
+            grobid_version: Version string reported by GROBID
+
+        Returns:
+            Hex SHA-256 of the PDF bytes, endpoint and version
+        """
+        pdf_hash = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            while chunk := f.read(self.CHUNK_SIZE):
+                pdf_hash.update(chunk)
+
+        key = hashlib.sha256()
+        key.update(pdf_hash.hexdigest().encode())
+        key.update(b"\0" + endpoint.encode())
+        key.update(b"\0" + grobid_version.encode())
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up cached TEI.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            TEI XML string, or None on a miss
+        """
+        path = self._path(key)
+        try:
+            xml = gzip.decompress(path.read_bytes()).decode('utf-8')
+            self.files.touch(path)
+        except (OSError, EOFError):
+            # Missing, or a half-written/corrupt file - treat both as a miss
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return xml
+
+    def put(self, key: str, xml: str) -> None:
+        """
+        Store TEI and evict old entries if the cache is over its size limit.
+
+        Args:
+            key: Key from make_key()
+            xml: TEI XML string from GROBID
+        """
+        data = gzip.compress(xml.encode('utf-8'))
+        self.files.write(self._path(key), lambda tmp_path: tmp_path.write_bytes(data))
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """
+        Open cached TEI for streaming (decompressed as it's read).
+
+        A corrupt entry only shows up while reading (OSError/EOFError);
+        callers should treat that as a miss.
+
+        Args:
+            key: Key from make_key()
+
+        Returns:
+            Binary file object (close it when done), or None on a miss
+        """
+        path = self._path(key)
+        try:
+            tei_file = gzip.open(path, 'rb')
+            self.files.touch(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return tei_file
+
+    def put_stream(self, key: str, source: BinaryIO) -> None:
+        """
+        Store TEI from a file object, compressing it chunk by chunk.
+
+        Args:
+            key: Key from make_key()
+            source: Binary file object with the TEI XML (read to the end)
+        """
+        def write(tmp_path: Path) -> None:
+            with gzip.open(tmp_path, 'wb') as tmp_file:
+                shutil.copyfileobj(source, tmp_file, self.CHUNK_SIZE)
+
+        self.files.write(self._path(key), write)
+
+    def remember_version(self, version: str) -> None:
+        """
+        Save the GROBID version that just answered, for last_version().
+
+        Args:
+            version: Version string reported by GROBID
+        """
+        if version == self.last_version():
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        write_atomic(
+            self.cache_dir / self.VERSION_FILE,
+            lambda tmp_path: tmp_path.write_text(version, encoding='utf-8')
+        )
+
+    def last_version(self) -> Optional[str]:
+        """
+        GROBID version saved by remember_version().
+
+        Returns:
+            Version string, or None if GROBID was never reached with this cache
+        """
+        try:
+            return (self.cache_dir / self.VERSION_FILE).read_text(encoding='utf-8').strip() or None
+        except OSError:
+            return None
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters for this run plus the cache's current size.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entries and bytes
+        """
+        return {"hits": self.hits, "misses": self.misses, **self.files.stats()}
+
+    def _path(self, key: str) -> Path:
+        """File that stores the entry for key."""
+        return self.cache_dir / f"{key}{self.SUFFIX}"
@@ -0,0 +1,589 @@
+"""
+Field extraction from GROBID TEI with precompiled XPath.
+
+GrobidProcessor used to ask one question per field, each a separate
+root.find('.//tei:...') search from the top of the document (title? DOI?
+venue? imprint? ...), and then 8-10 more per reference. lxml's find()
+re-reads the path string and walks the tree in Python-level steps every
+time. Fine for 30 references, slow for a survey with 400+.
+
+Here every path is compiled once, at import, into an etree.XPath (run by
+libxml2, in C). The header is visited by one union query that returns
+all the interesting elements in document order, and each <biblStruct> by
+one more. We sort the results into fields in Python.
+
+The answers are exactly the old ones, including the old fallbacks: a
+field missing from the <teiHeader> is looked up in the whole document,
+as the .// searches did (which can find it in a reference). A DOI found
+that way is flagged (doi_in_header=False): it's likely a cited paper's,
+so it mustn't be taken as this paper's identity.
+
+stream_tei() gets the same answers without building the whole tree, for
+TEI too large to hold in memory (see its docstring).
+
+In-text citations are counted too: GROBID links each "[12]" or "(Smith,
+2020)" in the body to its reference with <ref type="bibr" target="#b11">,
+and <biblStruct xml:id="b11"> is that reference. One pass over the body
+counts mentions per xml:id (a Counter), then each citation looks its own
+id up, so a survey with thousands of in-text refs costs one dictionary
+update per ref, not one body search per reference.
+
+Python concepts:
+- Precompiled XPath objects (etree.XPath), called like functions
+- XPath unions (a | b) return matches in document order
+- dataclass for the extracted header fields
+- etree.iterparse: parse a file incrementally, clearing finished elements
+- collections.Counter for tallying mentions
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Mapping, Optional
+
+from lxml import etree
+
+from paper_library.models import Citation
+
+
+NS = {"tei": "http://www.tei-c.org/ns/1.0"}
+
+# Clark notation prefix for comparing tags ("{namespace}tag")
+TEI = "{http://www.tei-c.org/ns/1.0}"
+
+# Everything the metadata needs from the header, in one query
+HEADER_FIELDS = etree.XPath(
+    "descendant::tei:titleStmt/tei:title[@type='main']"
+    " | descendant::tei:analytic/tei:title[@type='main']"
+    " | descendant::tei:monogr/tei:title[@level='j']"
+    " | descendant::tei:monogr/tei:imprint"
+    " | descendant::tei:monogr/tei:imprint/tei:date[@type='published']"
+    " | descendant::tei:profileDesc/tei:abstract"
+    " | descendant::tei:idno[@type='DOI']",
+    namespaces=NS
+)
+
+# Whole-document lookups, for fields the header doesn't have
+DOCUMENT_FIELDS = {
+    "title": etree.XPath("(.//tei:titleStmt/tei:title[@type='main'])[1]", namespaces=NS),
+    "analytic_title": etree.XPath("(.//tei:analytic/tei:title[@type='main'])[1]", namespaces=NS),
+    "venue": etree.XPath("(.//tei:monogr/tei:title[@level='j'])[1]", namespaces=NS),
+    "imprint": etree.XPath("(.//tei:monogr/tei:imprint)[1]", namespaces=NS),
+    "date": etree.XPath("(.//tei:monogr/tei:imprint/tei:date[@type='published'])[1]", namespaces=NS),
+    "abstract": etree.XPath("(.//tei:profileDesc/tei:abstract)[1]", namespaces=NS),
+    "doi": etree.XPath("(.//tei:idno[@type='DOI'])[1]", namespaces=NS),
+}
+
+# Paper authors: every <analytic> author in the document (as before)
+AUTHOR_NAMES = etree.XPath(".//tei:analytic/tei:author/tei:persName[1]", namespaces=NS)
+
+ABSTRACT_PARAGRAPHS = etree.XPath(".//tei:p", namespaces=NS)
+
+# The references: <biblStruct>s of the first <listBibl> in <back>
+REFERENCES = etree.XPath("(.//tei:back//tei:listBibl)[1]/tei:biblStruct", namespaces=NS)
+
+# In-text citations: the body's <ref type="bibr" target="#b0">s
+MENTION_TARGETS = etree.XPath(
+    "descendant::tei:ref[@type='bibr']/@target", namespaces=NS, smart_strings=False
+)
+
+# A <biblStruct>'s id, which mention targets point at
+XML_ID = "{http://www.w3.org/XML/1998/namespace}id"
+
+# All of an element's text, joined in C (same as "".join(elem.itertext()))
+ALL_TEXT = etree.XPath("string()", smart_strings=False)
+
+# Everything a citation needs from its <biblStruct>, in one query
+REFERENCE_FIELDS = etree.XPath(
+    "descendant::tei:title[@level='a' or @level='m']"
+    " | descendant::tei:author/tei:persName[1]"
+    " | descendant::tei:date[@type='published']"
+    " | descendant::tei:idno[@type='DOI']"
+    " | descendant::tei:monogr/tei:title[@level='j']"
+    " | descendant::tei:monogr/tei:imprint",
+    namespaces=NS
+)
+
+# Elements the streaming parser stops at (everything else stays in C)
+STREAM_TAGS = [
+    TEI + tag for tag in (
+        "teiHeader", "title", "imprint", "date", "abstract", "idno", "persName",
+        "back", "listBibl", "biblStruct", "body", "div", "head", "p", "ref",
+    )
+]
+
+WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class TeiHeader:
+    """The paper's own metadata, as found in a TEI document."""
+    title: Optional[str] = None  # Stripped, not yet cleaned
+    authors: list[str] = field(default_factory=list)
+    year: Optional[int] = None
+    abstract: Optional[str] = None
+    venue: Optional[str] = None
+    volume: Optional[str] = None
+    issue: Optional[str] = None
+    pages: Optional[str] = None
+    doi: Optional[str] = None
+    # False if the DOI came from the whole-document fallback (often a reference's)
+    doi_in_header: bool = False
+
+
+def extract_header(root: etree._Element) -> TeiHeader:
+    """
+    Extract the paper's metadata from a parsed TEI document.
+    
+    Args:
+        root: <TEI> root element
+    
+    Returns:
+        TeiHeader (fields GROBID didn't find are None)
+    """
+    header = root.find("tei:teiHeader", NS)
+    found = _header_elements(header) if header is not None else {}
+    doi_in_header = "doi" in found
+    
+    # The header comes first in the document, so a match inside it is
+    # also the first match overall; only misses need the whole document
+    def element(name: str) -> Optional[etree._Element]:
+        if name not in found:
+            matches = DOCUMENT_FIELDS[name](root)
+            found[name] = matches[0] if matches else None
+        return found[name]
+    
+    authors = [name for name in (_author_name(persname) for persname in AUTHOR_NAMES(root)) if name]
+    return _build_header(element, authors, doi_in_header)
+
+
+def extract_references(root: etree._Element) -> list[etree._Element]:
+    """The <biblStruct> elements of the bibliography, in order."""
+    return REFERENCES(root)
+
+
+def count_mentions(body: etree._Element) -> Counter:
+    """
+    Count in-text citations per reference, in one pass over the body.
+    
+    Args:
+        body: <body> element
+    
+    Returns:
+        Counter from <biblStruct> xml:id ("b0") to number of mentions
+    """
+    mentions = Counter()
+    for target in MENTION_TARGETS(body):
+        _add_mentions(mentions, target)
+    return mentions
+
+
+def extract_citation(bibl: etree._Element, mentions: Optional[Mapping[str, int]] = None) -> Optional[Citation]:
+    """
+    Build a Citation from one <biblStruct>.
+    
+    Args:
+        bibl: Reference element from the bibliography
+        mentions: From count_mentions(), if the document has a body
+    
+    Returns:
+        Citation with whatever fields GROBID parsed, or None if the
+        reference text is too short to be a real citation
+    """
+    raw_text = WHITESPACE.sub(" ", ALL_TEXT(bibl).strip())
+    if len(raw_text) < 10:
+        return None
+    
+    article_title = book_title = date_elem = doi_elem = venue_elem = imprint = None
+    authors = []
+    for elem in REFERENCE_FIELDS(bibl):
+        tag = elem.tag
+        if tag == TEI + "persName":
+            surname = None
+            initials = []
+            for child in elem:
+                if child.tag == TEI + "surname" and surname is None:
+                    surname = child
+                elif child.tag == TEI + "forename" and child.text:
+                    initials.append(child.text[0] + ".")
+            if surname is not None and surname.text:
+                authors.append(" ".join([surname.text.strip(), *initials]))
+        elif tag == TEI + "title":
+            level = elem.get("level")
+            if level == "a" and article_title is None:
+                article_title = elem
+            elif level == "m" and book_title is None:
+                book_title = elem
+            elif level == "j" and venue_elem is None:
+                venue_elem = elem
+        elif tag == TEI + "date" and date_elem is None:
+            date_elem = elem
+        elif tag == TEI + "idno" and doi_elem is None:
+            doi_elem = elem
+        elif tag == TEI + "imprint" and imprint is None:
+            imprint = elem
+    
+    year = None
+    if date_elem is not None:
+        date_str = date_elem.get("when") or date_elem.text
+        if date_str:
+            try:
+                year = int(date_str[:4])
+            except ValueError:
+                pass
+    
+    volume, issue, pages = _publication_info(imprint)
+    return Citation(
+        raw_text=raw_text,
+        authors=authors if authors else None,
+        title=_text(article_title if article_title is not None else book_title),
+        year=year,
+        venue=_text(venue_elem),
+        volume=volume,
+        issue=issue,
+        pages=pages,
+        doi=_text(doi_elem),
+        mention_count=_mention_count(bibl, mentions)
+    )
+
+
+def body_sections(body: etree._Element) -> list[tuple[Optional[str], list[str]]]:
+    """
+    Heading and paragraphs of every <div> in a parsed <body>, in order.
+    
+    Args:
+        body: <body> element
+    
+    Returns:
+        (heading or None, paragraph texts) per <div>
+    """
+    sections = []
+    for div in body.iter(TEI + "div"):
+        head = div.find("tei:head", NS)
+        heading = _heading(head) if head is not None else None
+        # Only direct <p> children, so nested divs aren't counted twice
+        paragraphs = [_paragraph(p_elem) for p_elem in div.findall("tei:p", NS)]
+        sections.append((heading, [text for text in paragraphs if text]))
+    return sections
+
+
+def body_text(sections: list[tuple[Optional[str], list[str]]], abstract: Optional[str]) -> Optional[str]:
+    """
+    Join body sections into markdown-ish text, abstract first.
+    
+    Args:
+        sections: From body_sections() (or the streaming parser)
+        abstract: Abstract text, put first if present
+    
+    Returns:
+        Body text, or None if there are no paragraphs at all
+    """
+    # Headings without paragraphs aren't usable text
+    if not any(paragraphs for _, paragraphs in sections):
+        return None
+    
+    parts = [f"## Abstract\n\n{abstract}"] if abstract else []
+    for heading, paragraphs in sections:
+        section = ([f"## {heading}"] if heading else []) + paragraphs
+        if section:
+            parts.append("\n\n".join(section))
+    return "\n\n".join(parts)
+
+
+@dataclass
+class TeiDocument:
+    """Everything GrobidProcessor needs from one streamed TEI document."""
+    header: TeiHeader
+    citations: list[Citation] = field(default_factory=list)  # Not yet garbage-filtered
+    body_text: Optional[str] = None
+
+
+def stream_tei(source) -> TeiDocument:
+    """
+    Extract header, references and body text while the TEI is being parsed.
+    
+    For 300-page theses GROBID's TEI runs to tens of MB. Instead of
+    building the whole tree, etree.iterparse() reads the file in chunks and
+    stops at the end of each element we care about (STREAM_TAGS). Each is
+    handled as soon as it closes and then cleared, together with what came
+    before it, so memory stays flat however long the document is:
+    
+    - Header fields: the first element of each kind is kept (tiny), which
+      gives the same answers as extract_header(), fallbacks included
+    - <biblStruct> in the bibliography: turned into a Citation, then cleared
+    - <head> and <p> of body <div>s: turned into text, then cleared
+    - <ref type="bibr"> in the body: counted (the body comes before <back>,
+      so the counts are complete by the time the references are reached)
+    
+    Args:
+        source: Path or binary file object (e.g., a temp file or gzip stream)
+    
+    Returns:
+        TeiDocument (same results as extract_header() + extract_citation()
+        + body_sections() on the full tree)
+    
+    Raises:
+        etree.XMLSyntaxError: If the XML is malformed
+    """
+    found: dict[str, etree._Element] = {}
+    authors: list[str] = []
+    citations: list[Citation] = []
+    mentions: Counter = Counter()
+    # Keyed by body <div> in document order: [heading, head seen?, paragraphs]
+    sections: dict[etree._Element, list] = {}
+    
+    body = references = None
+    body_done = False
+    in_header = doi_in_header = False
+    back_depth = 0
+    
+    events = etree.iterparse(source, events=("start", "end"), tag=STREAM_TAGS, huge_tree=True)
+    for event, elem in events:
+        tag = elem.tag
+        parent = elem.getparent()
+        
+        if event == "start":
+            if tag == TEI + "body":
+                # Only <TEI><text><body>, the first one (as in the tree version)
+                if (body is None and not body_done and parent is not None
+                        and parent.tag == TEI + "text" and parent.getparent() is not None
+                        and parent.getparent().getparent() is None):
+                    body = elem
+            elif tag == TEI + "div":
+                if body is not None:
+                    sections[elem] = [None, False, []]
+            elif tag == TEI + "back":
+                back_depth += 1
+            elif tag == TEI + "teiHeader":
+                in_header = True
+            elif tag == TEI + "listBibl":
+                if back_depth and references is None:
+                    references = elem
+            continue
+        
+        name = _field_name(elem)
+        if name is not None and name not in found:
+            found[name] = elem
+            if name == "doi":
+                doi_in_header = in_header
+        
+        if tag == TEI + "persName":
+            # Same as AUTHOR_NAMES: first <persName> of an <analytic> author
+            grandparent = parent.getparent() if parent is not None else None
+            if (grandparent is not None and parent.tag == TEI + "author"
+                    and grandparent.tag == TEI + "analytic"
+                    and next(elem.itersiblings(TEI + "persName", preceding=True), None) is None):
+                author = _author_name(elem)
+                if author:
+                    authors.append(author)
+        elif tag == TEI + "ref":
+            # Not released: its text is still part of the paragraph
+            if body is not None and elem.get("type") == "bibr":
+                _add_mentions(mentions, elem.get("target", ""))
+        elif tag == TEI + "biblStruct":
+            if parent is references:
+                citation = extract_citation(elem, mentions if body_done else None)
+                if citation is not None:
+                    citations.append(citation)
+                _release(elem)
+        elif tag == TEI + "head" and parent in sections:
+            section = sections[parent]
+            if not section[1]:
+                section[0] = _heading(elem)
+                section[1] = True
+            _release(elem)
+        elif tag == TEI + "p" and parent in sections:
+            text = _paragraph(elem)
+            if text:
+                sections[parent][2].append(text)
+            _release(elem)
+        elif tag == TEI + "div" and elem in sections:
+            if parent is body or parent in sections:
+                _release(elem)
+        elif tag == TEI + "body" and elem is body:
+            body = None
+            body_done = True
+            _release(elem)
+        elif tag == TEI + "back":
+            back_depth -= 1
+        elif tag == TEI + "teiHeader":
+            in_header = False
+            _release(elem)
+    
+    header = _build_header(found.get, authors, doi_in_header)
+    if not body_done:
+        text = None
+    else:
+        text = body_text([(heading, paragraphs) for heading, _, paragraphs in sections.values()], header.abstract)
+    return TeiDocument(header=header, citations=citations, body_text=text)
+
+
+def _add_mentions(mentions: Counter, target: str) -> None:
+    """Count one <ref>'s target: "#b3", or several ("#b3 #b4")."""
+    mentions.update(ref.lstrip("#") for ref in target.split())
+
+
+def _mention_count(bibl: etree._Element, mentions: Optional[Mapping[str, int]]) -> Optional[int]:
+    """
+    How often the paper cites a reference.
+    
+    At least 1: it's in the bibliography, so it's cited somewhere, even if
+    GROBID didn't link the mention. None without a body to count in (the
+    header and references tiers) or when GROBID linked no mentions at all:
+    the count is unknown, not 1.
+    """
+    if not mentions:
+        return None
+    return max(1, mentions.get(bibl.get(XML_ID), 0))
+
+
+def _build_header(element, authors: list[str], doi_in_header: bool) -> TeiHeader:
+    """
+    Turn the first element found for each field into a TeiHeader.
+    
+    Args:
+        element: Function from field name (see _field_name()) to the first
+            element for that field in the document, or None
+        authors: Formatted author names
+        doi_in_header: Whether element("doi") is inside the <teiHeader>
+    """
+    result = TeiHeader(authors=authors)
+    
+    # Main title, else the title in the header's own <biblStruct>
+    for name in ("title", "analytic_title"):
+        title_elem = element(name)
+        if title_elem is not None and title_elem.text:
+            result.title = title_elem.text.strip()
+            break
+    
+    date_elem = element("date")
+    if date_elem is not None:
+        # @when is ISO ("2023-01-15"), else the text; the year is the first 4 digits
+        date_str = date_elem.get("when") or date_elem.text
+        if date_str:
+            try:
+                result.year = int(date_str.strip()[:4])
+            except ValueError:
+                pass
+    
+    abstract_elem = element("abstract")
+    if abstract_elem is not None:
+        paragraphs = []
+        for p_elem in ABSTRACT_PARAGRAPHS(abstract_elem):
+            text = "".join(p_elem.itertext()).strip()
+            if text:
+                paragraphs.append(text)
+        if paragraphs:
+            result.abstract = "\n\n".join(paragraphs)
+    
+    result.venue = _text(element("venue"))
+    result.volume, result.issue, result.pages = _publication_info(element("imprint"))
+    result.doi = _text(element("doi"))
+    result.doi_in_header = doi_in_header and result.doi is not None
+    return result
+
+
+def _header_elements(header: etree._Element) -> dict[str, etree._Element]:
+    """First header element for each field (fields not in the header are missing)."""
+    found = {}
+    for elem in HEADER_FIELDS(header):
+        found.setdefault(_field_name(elem), elem)
+    return found
+
+
+def _field_name(elem: etree._Element) -> Optional[str]:
+    """Which header field an element holds (a DOCUMENT_FIELDS key), if any."""
+    tag = elem.tag
+    parent = elem.getparent()
+    parent_tag = parent.tag if parent is not None else None
+    
+    if tag == TEI + "title":
+        if parent_tag == TEI + "titleStmt" and elem.get("type") == "main":
+            return "title"
+        if parent_tag == TEI + "analytic" and elem.get("type") == "main":
+            return "analytic_title"
+        if parent_tag == TEI + "monogr" and elem.get("level") == "j":
+            return "venue"
+    elif tag == TEI + "imprint":
+        if parent_tag == TEI + "monogr":
+            return "imprint"
+    elif tag == TEI + "date":
+        if elem.get("type") == "published" and parent_tag == TEI + "imprint":
+            grandparent = parent.getparent()
+            if grandparent is not None and grandparent.tag == TEI + "monogr":
+                return "date"
+    elif tag == TEI + "abstract":
+        if parent_tag == TEI + "profileDesc":
+            return "abstract"
+    elif tag == TEI + "idno":
+        if elem.get("type") == "DOI":
+            return "doi"
+    return None
+
+
+def _author_name(persname: etree._Element) -> Optional[str]:
+    """Format a <persName> as "Lastname, Firstname Middlename"."""
+    surname = None
+    forenames = []
+    for child in persname:
+        if child.tag == TEI + "surname" and surname is None:
+            surname = child
+        elif child.tag == TEI + "forename" and child.text:
+            forenames.append(child.text.strip())
+    
+    surname_text = surname.text.strip() if surname is not None and surname.text else ""
+    if not surname_text:
+        return None
+    return f"{surname_text}, {' '.join(forenames)}" if forenames else surname_text
+
+
+def _publication_info(imprint: Optional[etree._Element]) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """Volume, issue and pages from an <imprint>'s <biblScope>s."""
+    if imprint is None:
+        return None, None, None
+    
+    scopes = {}
+    for child in imprint:
+        if child.tag == TEI + "biblScope":
+            scopes.setdefault(child.get("unit"), child)
+    
+    page_elem = scopes.get("page")
+    pages = None
+    if page_elem is not None:
+        # Pages can be "123-145" or separate @from/@to attributes
+        from_page = page_elem.get("from")
+        to_page = page_elem.get("to")
+        if from_page and to_page:
+            pages = f"{from_page}-{to_page}"
+        else:
+            pages = _text(page_elem)
+    
+    return _text(scopes.get("volume")), _text(scopes.get("issue")), pages
+
+
+def _text(elem: Optional[etree._Element]) -> Optional[str]:
+    """An element's stripped text, or None."""
+    if elem is not None and elem.text:
+        return elem.text.strip()
+    return None
+
+
+def _heading(head: etree._Element) -> str:
+    """Section heading, with its number if GROBID found one ("3.1 Method")."""
+    heading = " ".join(ALL_TEXT(head).split())
+    number = head.get("n")
+    return f"{number} {heading}" if number else heading
+
+
+def _paragraph(p_elem: etree._Element) -> str:
+    """A paragraph's text with whitespace collapsed."""
+    return " ".join(ALL_TEXT(p_elem).split())
+
+
+def _release(elem: etree._Element) -> None:
+    """Free a finished element and the siblings before it (streaming only)."""
+    elem.clear()
+    parent = elem.getparent()
+    if parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
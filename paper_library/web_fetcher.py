@@ -18,25 +18,28 @@ Deliberately excludes (with error messages):
 
 Python concepts:
 - HTTP requests with content negotiation
-- HTML parsing with BeautifulSoup
+- Streaming responses: decide what a URL is from its first bytes, then
+  write PDFs straight to disk instead of holding them in memory
+- HTML parsing with lxml, one pass over the tree (see html_scan.py)
 - Metadata extraction from OG/article tags
-- HTML to markdown conversion
+- HTML to markdown conversion that stops at the length budget (html_markdown.py)
 - Graceful error handling with context
+- async/await version of fetch (for AsyncPaperProcessor)
 """
 
+import httpx
 import requests
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 from datetime import datetime
-from markdownify import markdownify as md
-
-try:
-    from bs4 import BeautifulSoup
-except ImportError:
-    BeautifulSoup = None
 
+from paper_library.downloads import is_complete_pdf
+from paper_library.html_markdown import html_to_markdown
+from paper_library.html_scan import PageScan, scan_html
+from paper_library.http_cache import HttpCache
 from paper_library.models import ArticleMetadata
+from paper_library.rate_limit import limited_session
 
 
 class WebFetchError(Exception):
@@ -102,6 +105,17 @@ class WebFetcher:
     # Some pages are huge (e.g., full discussion threads)
     MAX_CONTENT_LENGTH = 500_000  # ~125k tokens, safe for Claude Haiku
     
+    # Most bytes of HTML we read for one page
+    # Markup is several times larger than the text it holds, so we allow
+    # 8 bytes of HTML per character of article we'd keep
+    MAX_HTML_BYTES = MAX_CONTENT_LENGTH * 8  # ~4 MB
+    
+    # Largest PDF we download from a web page (scanned books can be huge)
+    MAX_PDF_BYTES = 100 * 1024 * 1024  # 100 MB
+    
+    # Bytes per read when streaming responses
+    CHUNK_SIZE = 1024 * 1024
+    
     # Hosts that are definitely NOT articles
     # These get explicit "unsupported" errors instead of parsing attempts
     UNSUPPORTED_HOSTS = {
@@ -116,17 +130,22 @@ class WebFetcher:
         'www.linkedin.com': 'LinkedIn posts',
     }
     
-    def __init__(self, vault_path: Optional[Path] = None):
+    def __init__(self, vault_path: Optional[Path] = None, http_cache: Optional[HttpCache] = None):
         """
         Initialize the web fetcher.
         
         Args:
             vault_path: Optional path to vault (for storing PDFs from URLs)
+            http_cache: Optional HTTP cache; unchanged pages are read from disk
         """
         self.vault_path = vault_path
+        self.http_cache = http_cache
         if vault_path:
             self.pdfs_dir = vault_path / "PDFs"
             self.pdfs_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Requests are paced per host; 429/503 wait for Retry-After and retry
+        self.session = limited_session(headers=self.HEADERS)
     
     def fetch(self, url: str) -> Tuple['ArticleMetadata', str]:
         """
@@ -152,6 +171,89 @@ class WebFetcher:
         """
         print(f"↳ Fetching web content from {url}")
         
+        self._check_url(url)
+        
+        # Detect content type while fetching (one streaming GET)
+        return self._fetch_with_type_detection(url)
+    
+    async def fetch_async(
+        self,
+        url: str,
+        client: httpx.AsyncClient,
+        revalidate: bool = True
+    ) -> Tuple['ArticleMetadata', str]:
+        """
+        Async version of fetch() for use on an event loop.
+        
+        Makes the same single streaming GET as fetch(), awaited on a shared
+        httpx.AsyncClient, then uses the same handlers.
+        
+        Args:
+            url: URL to fetch
+            client: Shared async HTTP client
+            revalidate: Send the HTTP cache's validators (if the page is cached)
+            
+        Returns:
+            Tuple of (ArticleMetadata, markdown_content)
+            
+        Raises:
+            Same errors as fetch()
+        """
+        print(f"↳ Fetching web content from {url}")
+        
+        self._check_url(url)
+        
+        try:
+            async with client.stream(
+                "GET",
+                url,
+                headers={**self.HEADERS, **self._conditional_headers(url, revalidate)},
+                timeout=30,
+                follow_redirects=True
+            ) as response:
+                if response.status_code == 304:
+                    cached = self._not_modified(url)
+                    if cached is None:
+                        # Dropped from the cache meanwhile: fetch it in full
+                        return await self.fetch_async(url, client, revalidate=False)
+                    return cached
+                response.raise_for_status()
+                
+                chunks = response.aiter_bytes(self.CHUNK_SIZE)
+                first = await anext(chunks, b"")
+                content_type = self._sniff_content_type(response.headers, first)
+                
+                if content_type == "application/pdf":
+                    self._check_declared_size(url, response.headers)
+                    pdf_path = await self._save_pdf_async(url, first, chunks)
+                    return self._handle_pdf_from_url(url, pdf_path)
+                
+                content = bytearray(first)
+                async for chunk in chunks:
+                    content += chunk
+                    if len(content) >= self.MAX_HTML_BYTES:
+                        break
+                self._remember_html(url, response.headers, bytes(content))
+        except httpx.TimeoutException:
+            raise WebFetchError(f"Request timed out: {url}")
+        except httpx.HTTPStatusError as e:
+            raise self._status_error(url, e.response.status_code)
+        except httpx.HTTPError as e:
+            raise WebFetchError(f"Failed to fetch {url}: {e}")
+        
+        return self._route_content(url, content_type, self._cap_html(url, bytes(content)))
+    
+    def _check_url(self, url: str) -> None:
+        """
+        Validate a URL and reject explicitly unsupported hosts.
+        
+        Args:
+            url: URL to check
+            
+        Raises:
+            WebFetchError: If the URL can't be parsed
+            UnsupportedSourceError: For Twitter, Reddit, videos, etc.
+        """
         # Validate URL format
         try:
             parsed = urlparse(url)
@@ -169,15 +271,27 @@ class WebFetcher:
                     f"URL: {url}\n"
                     f"Try: Take a screenshot, save as PDF, or use a dedicated archiver."
                 )
+    
+    def _route_content(
+        self,
+        url: str,
+        content_type: str,
+        content: bytes
+    ) -> Tuple['ArticleMetadata', str]:
+        """
+        Send fetched (non-PDF) content to the HTML handler.
         
-        # Detect content type and fetch
-        content_type, content = self._fetch_with_type_detection(url)
-        
-        if content_type == "application/pdf":
-            # Route to PDF handler
-            return self._handle_pdf_from_url(url, content)
+        PDFs never get here: they're streamed to disk while fetching.
         
-        elif content_type.startswith("text/html"):
+        Args:
+            url: Original URL
+            content_type: Content-Type of the response
+            content: Response body
+            
+        Returns:
+            Tuple of (ArticleMetadata, markdown_content)
+        """
+        if content_type.startswith("text/html"):
             # Parse as HTML article
             return self._handle_html(url, content)
         
@@ -189,78 +303,235 @@ class WebFetcher:
                 f"URL: {url}"
             )
     
-    def _fetch_with_type_detection(self, url: str) -> Tuple[str, bytes]:
+    def _status_error(self, url: str, status_code: int) -> WebFetchError:
         """
-        Fetch URL with content-type detection.
+        Turn an HTTP error status into a helpful WebFetchError.
         
-        Uses HEAD request first to check type, then GET if needed.
-        This saves bandwidth for PDFs (we know not to parse them).
+        Args:
+            url: URL that failed
+            status_code: HTTP status code
+            
+        Returns:
+            Exception to raise
+        """
+        if status_code == 404:
+            return WebFetchError(f"Page not found (404): {url}")
+        elif status_code == 403:
+            return PaywallError(f"Access forbidden (403): {url}\nMay be paywalled or restricted.")
+        elif status_code == 429:
+            return WebFetchError(f"Rate limited (429). Wait and try again.")
+        else:
+            return WebFetchError(f"HTTP error {status_code}: {url}")
+    
+    def _fetch_with_type_detection(
+        self,
+        url: str,
+        revalidate: bool = True
+    ) -> Tuple['ArticleMetadata', str]:
+        """
+        Fetch URL with content-type detection, in a single streaming GET.
+        
+        The type is decided from the Content-Type header and the first bytes
+        of the body (servers often send PDFs as application/octet-stream).
+        A PDF is then streamed to disk; HTML is read up to MAX_HTML_BYTES.
+        Nothing bigger than one chunk is ever held in memory for a PDF.
+        
+        Pages in the HTTP cache are requested with their ETag/Last-Modified;
+        a "304 Not Modified" answer is served from disk.
         
         Args:
             url: URL to fetch
+            revalidate: Send the HTTP cache's validators (if the page is cached)
             
         Returns:
-            Tuple of (content_type_header, content_bytes)
+            Tuple of (ArticleMetadata, markdown_content)
             
         Raises:
             WebFetchError: If fetch fails
         """
         try:
-            # Try HEAD first to get content type without downloading everything
-            head_response = requests.head(
+            with self.session.get(
                 url,
-                headers=self.HEADERS,
-                timeout=15,
+                headers={**self.HEADERS, **self._conditional_headers(url, revalidate)},
+                timeout=30,
+                stream=True,
                 allow_redirects=True
-            )
-            
-            content_type = head_response.headers.get('content-type', 'text/html').lower()
-            
-            # If it's a PDF, we know what to do
-            if 'application/pdf' in content_type:
-                # Download the PDF
-                get_response = requests.get(
-                    url,
-                    headers=self.HEADERS,
-                    timeout=30,
-                    stream=False
-                )
-                get_response.raise_for_status()
-                return 'application/pdf', get_response.content
-            
-            # Otherwise, get the full content for parsing
-            get_response = requests.get(
-                url,
-                headers=self.HEADERS,
-                timeout=30
-            )
-            get_response.raise_for_status()
-            
-            # Force UTF-8 encoding (prevents mojibake)
-            get_response.encoding = 'utf-8'
-            
-            return get_response.headers.get('content-type', 'text/html'), get_response.content
+            ) as response:
+                if response.status_code == 304:
+                    cached = self._not_modified(url)
+                    if cached is None:
+                        # Dropped from the cache meanwhile: fetch it in full
+                        return self._fetch_with_type_detection(url, revalidate=False)
+                    return cached
+                response.raise_for_status()
+                
+                chunks = response.iter_content(chunk_size=self.CHUNK_SIZE)
+                first = next(chunks, b"")
+                content_type = self._sniff_content_type(response.headers, first)
+                
+                if content_type == "application/pdf":
+                    self._check_declared_size(url, response.headers)
+                    pdf_path = self._save_pdf(url, first, chunks)
+                    return self._handle_pdf_from_url(url, pdf_path)
+                
+                content = bytearray(first)
+                for chunk in chunks:
+                    content += chunk
+                    if len(content) >= self.MAX_HTML_BYTES:
+                        break
+                self._remember_html(url, response.headers, bytes(content))
             
         except requests.Timeout:
             raise WebFetchError(f"Request timed out: {url}")
         except requests.HTTPError as e:
-            if e.response.status_code == 404:
-                raise WebFetchError(f"Page not found (404): {url}")
-            elif e.response.status_code == 403:
-                raise PaywallError(f"Access forbidden (403): {url}\nMay be paywalled or restricted.")
-            elif e.response.status_code == 429:
-                raise WebFetchError(f"Rate limited (429). Wait and try again.")
-            else:
-                raise WebFetchError(f"HTTP error {e.response.status_code}: {url}")
+            raise self._status_error(url, e.response.status_code)
         except requests.RequestException as e:
             raise WebFetchError(f"Failed to fetch {url}: {e}")
+        
+        return self._route_content(url, content_type, self._cap_html(url, bytes(content)))
     
-    def _handle_pdf_from_url(self, url: str, pdf_content: bytes) -> Tuple['ArticleMetadata', str]:
+    def _conditional_headers(self, url: str, revalidate: bool) -> dict:
+        """If-None-Match / If-Modified-Since for a cached page (else empty)."""
+        if self.http_cache is None or not revalidate:
+            return {}
+        return self.http_cache.conditional_headers(url)
+    
+    def _not_modified(self, url: str) -> Optional[Tuple['ArticleMetadata', str]]:
+        """
+        Handle a 304 answer: parse the cached copy of the page.
+        
+        Returns:
+            Same as fetch(), or None if the cached copy is gone
+        """
+        cached = self.http_cache.revalidated(url) if self.http_cache else None
+        if cached is None:
+            return None
+        print(f"  ✓ Not modified since last fetch (HTTP cache)")
+        return self._route_content(url, cached.content_type.lower(), cached.content)
+    
+    def _remember_html(self, url: str, headers, content: bytes) -> None:
+        """Store a complete HTML page in the HTTP cache (truncated pages aren't)."""
+        if self.http_cache is not None and len(content) < self.MAX_HTML_BYTES:
+            self.http_cache.store(url, headers, content)
+    
+    def _sniff_content_type(self, headers, first_bytes: bytes) -> str:
+        """
+        Decide what a response is from its headers and first bytes.
+        
+        Args:
+            headers: Response headers
+            first_bytes: Beginning of the body
+            
+        Returns:
+            "application/pdf", or the (lower-cased) Content-Type header
+        """
+        content_type = headers.get('content-type', 'text/html').lower()
+        if 'application/pdf' in content_type or first_bytes.lstrip()[:5] == b"%PDF-":
+            return "application/pdf"
+        return content_type
+    
+    def _check_declared_size(self, url: str, headers) -> None:
+        """Fail fast when a PDF's Content-Length is already over MAX_PDF_BYTES."""
+        length = headers.get('content-length')
+        if length and length.isdigit() and int(length) > self.MAX_PDF_BYTES:
+            raise WebFetchError(
+                f"File too large ({int(length) // (1024 * 1024)} MB, "
+                f"limit {self.MAX_PDF_BYTES // (1024 * 1024)} MB): {url}"
+            )
+    
+    def _cap_html(self, url: str, content: bytes) -> bytes:
+        """Cut HTML at MAX_HTML_BYTES (the parser copes with a truncated page)."""
+        if len(content) > self.MAX_HTML_BYTES:
+            print(f"  Warning: Page is over {self.MAX_HTML_BYTES // (1024 * 1024)} MB, "
+                  f"reading only the beginning")
+            return content[:self.MAX_HTML_BYTES]
+        return content
+    
+    def _save_pdf(self, url: str, first: bytes, chunks: Iterator[bytes]) -> Optional[Path]:
+        """
+        Stream a PDF response into the vault.
+        
+        Written to a .part file and renamed once complete, so a failed or
+        oversized download never leaves a half PDF in PDFs/.
+        
+        Args:
+            url: Original URL
+            first: First chunk (already read for sniffing)
+            chunks: The rest of the body
+            
+        Returns:
+            Path to the saved PDF, or None without a vault (nothing is downloaded)
+            
+        Raises:
+            WebFetchError: If the PDF is over MAX_PDF_BYTES or incomplete
+        """
+        if not self.vault_path:
+            return None
+        
+        pdf_path, part = self._pdf_destination(url)
+        try:
+            with open(part, 'wb') as f:
+                f.write(first)
+                size = len(first)
+                for chunk in chunks:
+                    size += len(chunk)
+                    self._check_pdf_size(url, size)
+                    f.write(chunk)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+        return self._publish_pdf(url, part, pdf_path)
+    
+    async def _save_pdf_async(
+        self,
+        url: str,
+        first: bytes,
+        chunks: AsyncIterator[bytes]
+    ) -> Optional[Path]:
+        """Async version of _save_pdf()."""
+        if not self.vault_path:
+            return None
+        
+        pdf_path, part = self._pdf_destination(url)
+        try:
+            with open(part, 'wb') as f:
+                f.write(first)
+                size = len(first)
+                async for chunk in chunks:
+                    size += len(chunk)
+                    self._check_pdf_size(url, size)
+                    f.write(chunk)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+        return self._publish_pdf(url, part, pdf_path)
+    
+    def _pdf_destination(self, url: str) -> Tuple[Path, Path]:
+        """Final path and temporary .part path for a PDF from a URL."""
+        pdf_path = self.pdfs_dir / self._generate_pdf_filename_from_url(url)
+        return pdf_path, pdf_path.with_name(f"{pdf_path.name}.part")
+    
+    def _check_pdf_size(self, url: str, size: int) -> None:
+        """Stop a download that has grown past MAX_PDF_BYTES."""
+        if size > self.MAX_PDF_BYTES:
+            raise WebFetchError(
+                f"PDF larger than {self.MAX_PDF_BYTES // (1024 * 1024)} MB: {url}"
+            )
+    
+    def _publish_pdf(self, url: str, part: Path, pdf_path: Path) -> Path:
+        """Rename a finished .part file into place if it's a complete PDF."""
+        if not is_complete_pdf(part):
+            part.unlink(missing_ok=True)
+            raise WebFetchError(f"Downloaded PDF is incomplete: {url}")
+        part.replace(pdf_path)
+        return pdf_path
+    
+    def _handle_pdf_from_url(self, url: str, pdf_path: Optional[Path]) -> Tuple['ArticleMetadata', str]:
         """
         Handle a PDF found at a URL.
         
         Two strategies:
-        1. If vault_path set: Download PDF to vault, return metadata for arXiv-style processing
+        1. If vault_path set: PDF was streamed to the vault, return metadata for arXiv-style processing
         2. If no vault: Create a minimal ArticleMetadata with URL reference
         
         For now (MVP), we return ArticleMetadata to keep web fetcher output consistent.
@@ -268,7 +539,7 @@ class WebFetcher:
         
         Args:
             url: Original URL
-            pdf_content: PDF bytes
+            pdf_path: Where the PDF was saved (None without a vault)
             
         Returns:
             Tuple of (ArticleMetadata with pdf_path, empty_string)
@@ -276,17 +547,8 @@ class WebFetcher:
         from paper_library.models import ArticleMetadata
         
         print(f"  ✓ Detected PDF at {url}")
-        
-        # Optionally save to vault
-        pdf_path = None
-        if self.vault_path:
-            # Generate filename from URL
-            filename = self._generate_pdf_filename_from_url(url)
-            pdf_path = self.pdfs_dir / filename
-            
-            # Save PDF
-            pdf_path.write_bytes(pdf_content)
-            print(f"  ✓ Saved to {filename}")
+        if pdf_path:
+            print(f"  ✓ Saved to {pdf_path.name}")
         
         # Create minimal metadata
         # We don't have rich metadata, but we have the URL
@@ -309,10 +571,10 @@ class WebFetcher:
         Parse HTML page and extract article metadata + content.
         
         Steps:
-        1. Parse HTML with BeautifulSoup
+        1. Parse HTML and scan it once (metadata, paywall markers, content)
         2. Extract metadata (OG tags, article tags)
-        3. Extract article content using heuristics
-        4. Convert to markdown
+        3. Pick the article content (see scan_html())
+        4. Convert to markdown (only up to MAX_CONTENT_LENGTH)
         5. Validate content length
         6. Check for paywall indicators
         
@@ -329,29 +591,24 @@ class WebFetcher:
         """
         from paper_library.models import ArticleMetadata
         
-        # Parse HTML
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Parse HTML and collect everything we need in one pass
+        page = scan_html(html_content)
         
         # Extract metadata
-        title = self._extract_title(soup, url)
-        authors = self._extract_authors(soup)
-        published_date = self._extract_published_date(soup)
-        publisher = self._extract_publisher(soup)
-        
-        # Extract main article content
-        content_html = self._extract_article_content(soup)
+        title = self._extract_title(page, url)
+        authors = self._extract_authors(page)
+        published_date = self._extract_published_date(page)
+        publisher = self._extract_publisher(page)
         
-        if not content_html:
+        if page.content is None:
             raise TooShortError(
                 f"Could not extract article content from {url}\n"
                 f"Is this a real article? Try saving as PDF instead."
             )
         
-        # Convert HTML to markdown
-        content_md = md(content_html, heading_style="atx")
-        
-        # Clean up markdown
-        content_md = self._clean_markdown(content_md)
+        # Convert the article element to markdown, stopping one character
+        # past the budget (so we can still tell it was truncated)
+        content_md = html_to_markdown(page.content, max_chars=self.MAX_CONTENT_LENGTH + 1)
         
         # Check length
         if len(content_md) < self.MIN_CONTENT_LENGTH:
@@ -362,7 +619,7 @@ class WebFetcher:
             )
         
         # Check for paywall indicators
-        if self._check_paywall_indicators(soup, content_md):
+        if self._check_paywall_indicators(page, content_md):
             raise PaywallError(
                 f"This page appears to be paywalled or restricted: {url}\n"
                 f"Try accessing with institutional credentials or find an open access version."
@@ -387,7 +644,7 @@ class WebFetcher:
         
         return metadata, content_md
     
-    def _extract_title(self, soup, url: str) -> str:
+    def _extract_title(self, page: PageScan, url: str) -> str:
         """
         Extract article title from page.
         
@@ -399,24 +656,22 @@ class WebFetcher:
         5. Domain name (last resort)
         """
         # OG title (most reliable)
-        og_title = soup.find('meta', property='og:title')
-        if og_title and og_title.get('content'):
-            return og_title['content'].strip()
+        og_title = page.first_meta('og:title')
+        if og_title:
+            return og_title.strip()
         
         # Article title
-        article_title = soup.find('meta', property='article:title')
-        if article_title and article_title.get('content'):
-            return article_title['content'].strip()
+        article_title = page.first_meta('article:title')
+        if article_title:
+            return article_title.strip()
         
         # H1 (common for blog posts)
-        h1 = soup.find('h1')
-        if h1 and h1.get_text(strip=True):
-            return h1.get_text(strip=True)
+        if page.h1:
+            return page.h1
         
         # HTML title tag
-        title_tag = soup.find('title')
-        if title_tag and title_tag.get_text(strip=True):
-            title_text = title_tag.get_text(strip=True)
+        if page.title:
+            title_text = page.title
             # Remove trailing " | Domain" or " - Domain"
             title_text = title_text.split('|')[0].split('-')[0].strip()
             if title_text:
@@ -426,7 +681,7 @@ class WebFetcher:
         parsed = urlparse(url)
         return parsed.netloc.replace('www.', '').replace('.com', '').title()
     
-    def _extract_authors(self, soup) -> list[str]:
+    def _extract_authors(self, page: PageScan) -> list[str]:
         """
         Extract author names from page.
         
@@ -439,18 +694,14 @@ class WebFetcher:
         authors = []
         
         # Meta tags
-        author_metas = soup.find_all('meta', property='article:author')
-        authors.extend([m.get('content', '').strip() for m in author_metas if m.get('content')])
+        authors.extend([m.strip() for m in page.meta.get('article:author', []) if m])
         
         # Common byline patterns
-        if not authors:
-            byline = soup.find(class_=['byline', 'author-name', 'author', 'author-info'])
-            if byline:
-                text = byline.get_text(strip=True)
-                # Try to extract just the name (before "•", "Posted", etc.)
-                author_text = text.split('•')[0].split('Posted')[0].strip()
-                if author_text and len(author_text) < 100:  # Sanity check
-                    authors.append(author_text)
+        if not authors and page.byline:
+            # Try to extract just the name (before "•", "Posted", etc.)
+            author_text = page.byline.split('•')[0].split('Posted')[0].strip()
+            if author_text and len(author_text) < 100:  # Sanity check
+                authors.append(author_text)
         
         # Remove duplicates while preserving order
         seen = set()
@@ -462,7 +713,7 @@ class WebFetcher:
         
         return unique_authors or ["Unknown"]
     
-    def _extract_published_date(self, soup) -> Optional[datetime]:
+    def _extract_published_date(self, page: PageScan) -> Optional[datetime]:
         """
         Extract publication date from page.
         
@@ -474,24 +725,24 @@ class WebFetcher:
         Returns None if not found.
         """
         # OG article:published_time
-        pub_time = soup.find('meta', property='article:published_time')
-        if pub_time and pub_time.get('content'):
+        pub_time = page.first_meta('article:published_time')
+        if pub_time:
             try:
-                return datetime.fromisoformat(pub_time['content'].replace('Z', '+00:00'))
+                return datetime.fromisoformat(pub_time.replace('Z', '+00:00'))
             except (ValueError, AttributeError):
                 pass
         
         # Schema.org datePublished
-        date_published = soup.find('meta', property='datePublished')
-        if date_published and date_published.get('content'):
+        date_published = page.first_meta('datePublished')
+        if date_published:
             try:
-                return datetime.fromisoformat(date_published['content'].replace('Z', '+00:00'))
+                return datetime.fromisoformat(date_published.replace('Z', '+00:00'))
             except (ValueError, AttributeError):
                 pass
         
         return None
     
-    def _extract_publisher(self, soup) -> Optional[str]:
+    def _extract_publisher(self, page: PageScan) -> Optional[str]:
         """
         Extract publisher/site name.
         
@@ -501,112 +752,28 @@ class WebFetcher:
         3. Common site name patterns
         """
         # OG site name
-        site_name = soup.find('meta', property='og:site_name')
-        if site_name and site_name.get('content'):
-            return site_name['content'].strip()
+        site_name = page.first_meta('og:site_name')
+        if site_name:
+            return site_name.strip()
         
         # Publisher
-        publisher = soup.find('meta', property='article:publisher')
-        if publisher and publisher.get('content'):
-            return publisher['content'].strip()
+        publisher = page.first_meta('article:publisher')
+        if publisher:
+            return publisher.strip()
         
         return None
     
-    def _extract_article_content(self, soup) -> Optional[str]:
-        """
-        Extract main article content from HTML.
-        
-        Tries to find the actual article text, avoiding:
-        - Navigation/header/footer
-        - Sidebars and ads
-        - Comments
-        
-        Strategy:
-        1. Look for semantic <article> tag
-        2. Look for common article container classes
-        3. Fall back to largest text block
-        
-        Returns HTML string of article content.
-        """
-        # Remove script/style tags (they're not content)
-        for tag in soup(['script', 'style', 'nav', 'header', 'footer', 'aside']):
-            tag.decompose()
-        
-        # Try semantic <article> tag first
-        article = soup.find('article')
-        if article:
-            return str(article)
-        
-        # Try common article container classes
-        common_containers = [
-            {'class': 'article-content'},
-            {'class': 'post-content'},
-            {'class': 'entry-content'},
-            {'class': 'article-body'},
-            {'class': 'content'},
-            {'id': 'main-content'},
-            {'class': 'main-content'},
-        ]
-        
-        for selector in common_containers:
-            container = soup.find(attrs=selector)
-            if container:
-                return str(container)
-        
-        # Fall back to largest <div> or <section> (crude but often works)
-        largest = None
-        largest_size = 0
-        
-        for tag in soup.find_all(['div', 'section']):
-            text_length = len(tag.get_text(strip=True))
-            if text_length > largest_size and text_length > 200:
-                largest = tag
-                largest_size = text_length
-        
-        return str(largest) if largest else None
-    
-    def _clean_markdown(self, markdown: str) -> str:
-        """
-        Clean up markdown from HTML conversion.
-        
-        Removes:
-        - Excessive blank lines
-        - URL artifacts
-        - HTML entities that weren't converted
-        - Trailing whitespace
-        """
-        import re
-        
-        # Remove excessive blank lines (3+ becomes 2)
-        markdown = re.sub(r'\n\n\n+', '\n\n', markdown)
-        
-        # Remove trailing whitespace from lines
-        markdown = '\n'.join(line.rstrip() for line in markdown.split('\n'))
-        
-        # Remove completely blank lines at start/end
-        markdown = markdown.strip()
-        
-        return markdown
-    
-    def _check_paywall_indicators(self, soup, content_md: str) -> bool:
+    def _check_paywall_indicators(self, page: PageScan, content_md: str) -> bool:
         """
         Check if page appears to be paywalled.
         
         Looks for:
         - "Subscribe" prominent in content
         - Very short content (metadata extracted but not article)
-        - Paywall warning classes
+        - Paywall warning classes/ids (found by scan_html())
         """
         # Check for paywall warnings
-        paywall_indicators = [
-            'paywall',
-            'subscribe-wall',
-            'metered-paywall',
-            'limited-access'
-        ]
-        
-        html_text = str(soup).lower()
-        if any(indicator in html_text for indicator in paywall_indicators):
+        if page.paywall_marker:
             return True
         
         # Check if content is mostly subscribe prompts
@@ -0,0 +1,358 @@
+"""
+Offline test helpers: a tiny local HTTP server and sample payloads.
+
+The stub server stands in for arXiv, GROBID, web pages and the Anthropic
+API, so the offline tests can exercise real HTTP code paths without a
+network connection or API key.
+
+Usage:
+    with StubServer() as server:
+        server.route("GET", "/hello", lambda req: (200, {}, b"hi"))
+        requests.get(server.url + "/hello")
+"""
+
+import json
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class StubRequest:
+    """One request received by the stub server."""
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes = b""
+
+
+# A route handler takes the request and returns (status, headers, body)
+Handler = Callable[[StubRequest], tuple[int, dict[str, str], bytes]]
+
+
+@dataclass
+class StubServer:
+    """Local HTTP server with per-path handlers; records every request."""
+    routes: dict[tuple[str, str], Handler] = field(default_factory=dict)
+    requests: list[StubRequest] = field(default_factory=list)
+    _server: Optional[ThreadingHTTPServer] = None
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        """Register a handler for METHOD /path (query string ignored)."""
+        self.routes[(method, path)] = handler
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, method: str, path: str) -> int:
+        """How many requests hit METHOD /path."""
+        return sum(1 for r in self.requests if r.method == method and r.path == path)
+
+    def __enter__(self) -> "StubServer":
+        stub = self
+
+        class RequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                request = StubRequest(
+                    method=self.command,
+                    path=parsed.path,
+                    query=parse_qs(parsed.query),
+                    headers={k.lower(): v for k, v in self.headers.items()},
+                    body=self.rfile.read(length) if length else b"",
+                )
+                stub.requests.append(request)
+
+                handler = stub.routes.get((self.command, parsed.path))
+                if handler is None:
+                    status, headers, body = 404, {}, b"not found"
+                else:
+                    status, headers, body = handler(request)
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_HEAD = _handle
+
+            def log_message(self, *args):
+                pass  # Keep test output quiet
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), RequestHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def respond(body: bytes | str, content_type: str = "text/plain", status: int = 200) -> Handler:
+    """Handler that always returns the same body."""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return lambda request: (status, {"Content-Type": content_type}, body)
+
+
+def make_pdf(
+    text: str = "Hello from a tiny test PDF",
+    info: Optional[dict[str, str]] = None,
+    xmp: Optional[str] = None,
+) -> bytes:
+    """
+    Build a minimal one-page PDF containing `text`.
+
+    Just enough structure (catalog, page, font, content stream, xref) for
+    pdfplumber to extract the text.
+
+    Args:
+        text: Page text
+        info: Document Info entries (e.g., {"Title": ..., "Author": ...})
+        xmp: XMP packet for the catalog's /Metadata stream
+    """
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode("latin-1")
+    extra = []
+    trailer_info = catalog_metadata = ""
+    if info:
+        extra.append(("<< " + " ".join(f"/{k} ({v})" for k, v in info.items()) + " >>").encode("latin-1"))
+        trailer_info = f" /Info {5 + len(extra)} 0 R"
+    if xmp:
+        packet = xmp.encode("utf-8")
+        extra.append(
+            b"<< /Type /Metadata /Subtype /XML /Length " + str(len(packet)).encode()
+            + b" >>\nstream\n" + packet + b"\nendstream"
+        )
+        catalog_metadata = f" /Metadata {5 + len(extra)} 0 R"
+    objects = [
+        f"<< /Type /Catalog /Pages 2 0 R{catalog_metadata} >>".encode(),
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        *extra,
+    ]
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R{trailer_info} >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return pdf
+
+
+def make_atom_entry(arxiv_id: str, title: str, authors: list[str], year: int) -> str:
+    """One <entry> of an arXiv API Atom feed."""
+    author_xml = "".join(f"<author><name>{name}</name></author>" for name in authors)
+    return (
+        f"<entry>"
+        f"<id>http://arxiv.org/abs/{arxiv_id}v1</id>"
+        f"<published>{year}-06-12T17:57:34Z</published>"
+        f"<title>{title}</title>"
+        f"<summary>Abstract of {title}.</summary>"
+        f"{author_xml}"
+        f"</entry>"
+    )
+
+
+def make_atom_feed(entries: list[str]) -> str:
+    """Wrap entries in an arXiv API Atom feed."""
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">'
+        + "".join(entries)
+        + "</feed>"
+    )
+
+
+def make_tei(title: str = "A Test Paper", year: int = 2023, body: str = "") -> str:
+    """
+    Minimal GROBID TEI document with a header, optional body and two references.
+
+    Args:
+        title: Paper title
+        year: Publication year
+        body: Raw XML placed inside <text><body>
+    """
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0" xmlns:xlink="http://www.w3.org/1999/xlink">
+  <teiHeader>
+    <fileDesc>
+      <titleStmt><title level="a" type="main">{title}</title></titleStmt>
+      <sourceDesc>
+        <biblStruct>
+          <analytic>
+            <author><persName><forename type="first">Ada</forename><surname>Lovelace</surname></persName></author>
+            <author><persName><forename type="first">Alan</forename><surname>Turing</surname></persName></author>
+            <title level="a" type="main">{title}</title>
+          </analytic>
+          <monogr>
+            <title level="j">Journal of Tests</title>
+            <imprint>
+              <biblScope unit="volume">12</biblScope>
+              <biblScope unit="page" from="1" to="10"/>
+              <date type="published" when="{year}-05-01">{year}</date>
+            </imprint>
+          </monogr>
+          <idno type="DOI">10.1234/test.{year}</idno>
+        </biblStruct>
+      </sourceDesc>
+    </fileDesc>
+    <profileDesc>
+      <abstract><div><p>This is the abstract.</p></div></abstract>
+    </profileDesc>
+  </teiHeader>
+  <text>
+    <body>{body}</body>
+    <back>
+      <div type="references">
+        <listBibl>
+          <biblStruct xml:id="b0">
+            <analytic>
+              <title level="a" type="main">Attention is all you need</title>
+              <author><persName><forename type="first">Ashish</forename><surname>Vaswani</surname></persName></author>
+            </analytic>
+            <monogr>
+              <title level="j">Advances in Neural Information Processing Systems</title>
+              <imprint><date type="published" when="2017"/></imprint>
+            </monogr>
+          </biblStruct>
+          <biblStruct xml:id="b1">
+            <analytic>
+              <title level="a" type="main">Deep residual learning for image recognition</title>
+              <author><persName><forename type="first">Kaiming</forename><surname>He</surname></persName></author>
+            </analytic>
+            <monogr>
+              <title level="m">Proceedings of CVPR</title>
+              <imprint><date type="published" when="2016"/></imprint>
+            </monogr>
+          </biblStruct>
+        </listBibl>
+      </div>
+    </back>
+  </text>
+</TEI>"""
+
+
+SYNTHESIS_TEXT = """<summary>A short test summary.</summary>
+<why_you_cared>Because tests matter.</why_you_cared>
+<key_concepts>testing, stubs, offline-tests</key_concepts>
+<memorable_quote>"Tests are documentation that runs."</memorable_quote>"""
+
+
+def make_message(text: str = SYNTHESIS_TEXT, input_tokens: int = 1000, output_tokens: int = 200) -> dict:
+    """An Anthropic Messages API response body."""
+    return {
+        "id": "msg_test",
+        "type": "message",
+        "role": "assistant",
+        "model": "claude-haiku-4-5",
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens},
+    }
+
+
+def anthropic_messages_handler(request: StubRequest) -> tuple[int, dict[str, str], bytes]:
+    """Stub for POST /v1/messages that always returns SYNTHESIS_TEXT."""
+    return 200, {"Content-Type": "application/json"}, json.dumps(make_message()).encode()
+
+
+class BatchesStub:
+    """
+    Fake Message Batches API: create, retrieve (in_progress once, then ended)
+    and results as JSONL.
+
+    Each request is answered with make_message(), unless its prompt contains
+    one of `fail_on`, in which case it comes back "errored".
+
+    Usage:
+        batches = BatchesStub(fail_on=["Broken Paper"])
+        batches.install(server)
+    """
+
+    def __init__(self, fail_on: Optional[list[str]] = None):
+        self.fail_on = fail_on or []
+        self.submitted: list[dict] = []
+        self.retrieves = 0
+        self.base_url = ""
+
+    def install(self, server: StubServer) -> None:
+        """Register the batch routes on a running stub server."""
+        self.base_url = server.url
+        server.route("POST", "/v1/messages/batches", self.create)
+        server.route("GET", "/v1/messages/batches/msgbatch_test", self.retrieve)
+        server.route("GET", "/v1/messages/batches/msgbatch_test/results", self.results)
+
+    def _batch(self, ended: bool) -> dict:
+        count = len(self.submitted)
+        failed = sum(1 for request in self.submitted if self._fails(request))
+        return {
+            "id": "msgbatch_test",
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else count,
+                "succeeded": count - failed if ended else 0,
+                "errored": failed if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2026-01-01T00:00:00Z",
+            "expires_at": "2026-01-02T00:00:00Z",
+            "ended_at": "2026-01-01T00:05:00Z" if ended else None,
+            "results_url": (
+                f"{self.base_url}/v1/messages/batches/msgbatch_test/results" if ended else None
+            ),
+        }
+
+    def _fails(self, request: dict) -> bool:
+        prompt = request["params"]["messages"][0]["content"]
+        return any(marker in prompt for marker in self.fail_on)
+
+    def create(self, request: StubRequest) -> tuple[int, dict[str, str], bytes]:
+        self.submitted = json.loads(request.body)["requests"]
+        return 200, {"Content-Type": "application/json"}, json.dumps(self._batch(False)).encode()
+
+    def retrieve(self, request: StubRequest) -> tuple[int, dict[str, str], bytes]:
+        # First poll says "still working", later ones say "ended"
+        self.retrieves += 1
+        batch = self._batch(ended=self.retrieves > 1)
+        return 200, {"Content-Type": "application/json"}, json.dumps(batch).encode()
+
+    def results(self, request: StubRequest) -> tuple[int, dict[str, str], bytes]:
+        lines = []
+        for item in self.submitted:
+            if self._fails(item):
+                result = {
+                    "type": "errored",
+                    "error": {"type": "error", "error": {"type": "api_error", "message": "overloaded"}},
+                }
+            else:
+                result = {"type": "succeeded", "message": make_message()}
+            lines.append(json.dumps({"custom_id": item["custom_id"], "result": result}))
+        return 200, {"Content-Type": "application/binary"}, "\n".join(lines).encode()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk arXiv metadata prefetch.
+
+Runs offline against a stub arXiv API that answers multi-ID id_list
+queries with Atom feeds, and checks that fetch() uses the prefetched
+metadata instead of making its own request.
+
+Usage:
+    python test_arxiv_prefetch.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.arxiv_fetcher import ArxivFetcher
+
+from stubs import StubServer, make_atom_entry, make_atom_feed, make_pdf, respond
+
+
+# What arXiv returns for an ID it doesn't know
+ERROR_ENTRY = (
+    "<entry><id>http://arxiv.org/api/errors#incorrect_id_format_for_9999.99999</id>"
+    "<title>Error</title><summary>incorrect id format for 9999.99999</summary></entry>"
+)
+
+
+def test_prefetch_chunks_and_feeds_fetch():
+    """120 IDs take 3 API calls; fetch() then skips the metadata request."""
+    ids = [f"2401.{n:05d}" for n in range(120)]
+    missing = ids[7]
+    requested = []
+
+    def atom(request):
+        id_list = request.query["id_list"][0].split(",")
+        requested.append(len(id_list))
+        assert int(request.query.get("max_results", ["10"])[0]) >= len(id_list)
+        # `missing` is left out of bulk answers only; 9999.99999 doesn't exist
+        skip = {"9999.99999", missing} if len(id_list) > 1 else {"9999.99999"}
+        entries = [
+            make_atom_entry(arxiv_id, f"Paper {arxiv_id}", ["Ada Lovelace"], 2024)
+            for arxiv_id in id_list
+            if arxiv_id not in skip
+        ]
+        return 200, {"Content-Type": "application/atom+xml"}, make_atom_feed(entries + [ERROR_ENTRY]).encode()
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/api/query", atom)
+        server.route("GET", f"/pdf/{ids[3]}.pdf", respond(make_pdf(), "application/pdf"))
+        server.route("GET", f"/pdf/{missing}.pdf", respond(make_pdf(), "application/pdf"))
+
+        fetcher = ArxivFetcher(Path(tmp))
+        fetcher.API_BASE = f"{server.url}/api/query"
+        fetcher.PDF_BASE = f"{server.url}/pdf"
+
+        # Versions and URLs are normalized; repeats are only asked for once
+        cached = fetcher.prefetch_metadata(
+            ids + [f"https://arxiv.org/abs/{ids[0]}v2", "9999.99999"]
+        )
+        assert cached == 119
+        assert requested == [50, 50, 21]
+
+        pdf_path, metadata = fetcher.fetch(f"arXiv:{ids[3]}v1")
+        assert metadata.title == f"Paper {ids[3]}"
+        assert metadata.authors == ["Lovelace, Ada"]
+        assert pdf_path.exists()
+        assert len(requested) == 3, "fetch() should use the prefetched metadata"
+
+        # Not in the feed: fetch() falls back to its own request
+        _, metadata = fetcher.fetch(missing)
+        assert metadata.title == f"Paper {missing}"
+        assert len(requested) == 4
+        print(f"✓ Prefetch requests: {requested}")
+
+
+if __name__ == "__main__":
+    test_prefetch_chunks_and_feeds_fetch()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test script for AsyncPaperProcessor.
+
+Runs offline against a local stub server that plays arXiv (API + PDFs),
+GROBID and the Anthropic API, and checks that the per-service semaphores
+cap how many requests are in flight at once.
+
+Usage:
+    python test_async_processor.py
+"""
+
+import asyncio
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.async_orchestrator import AsyncPaperProcessor
+from paper_library.config import Config
+from paper_library.state import StateManager
+
+from stubs import (
+    StubServer, anthropic_messages_handler, make_atom_entry, make_atom_feed,
+    make_pdf, make_tei, respond,
+)
+
+
+def test_async_batch():
+    """Process three arXiv papers concurrently with GROBID capped at 2."""
+    ids = ["2401.00001", "2401.00002", "2401.00003"]
+
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def grobid(request):
+        # Slow GROBID so concurrent uploads would overlap if allowed
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.1)
+        with lock:
+            in_flight["now"] -= 1
+        # Title the TEI after the uploaded file so each paper gets its own note
+        arxiv_id = re.search(rb'filename="arxiv_([\d.]+)\.pdf"', request.body).group(1).decode()
+        return 200, {"Content-Type": "application/xml"}, make_tei(f"Paper {arxiv_id}").encode()
+
+    def atom(request):
+        # id_list may hold several comma-separated IDs (bulk prefetch)
+        feed = make_atom_feed([
+            make_atom_entry(arxiv_id, f"Paper {arxiv_id}", ["Ada Lovelace"], 2024)
+            for arxiv_id in request.query["id_list"][0].split(",")
+        ])
+        return 200, {"Content-Type": "application/atom+xml"}, feed.encode()
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/api/query", atom)
+        for arxiv_id in ids:
+            server.route("GET", f"/pdf/{arxiv_id}.pdf", respond(make_pdf(), "application/pdf"))
+        server.route("POST", "/api/processFulltextDocument", grobid)
+        server.route("POST", "/v1/messages", anthropic_messages_handler)
+
+        vault = Path(tmp)
+        cfg = Config(
+            anthropic_api_key="test",
+            grobid_url=server.url,
+            vault_path=vault,
+            grobid_pool_size=2,
+        )
+        state = StateManager(vault / "_meta" / "processing_state.json")
+
+        processor = AsyncPaperProcessor(cfg, state)
+        processor.arxiv_fetcher.API_BASE = f"{server.url}/api/query"
+        processor.arxiv_fetcher.PDF_BASE = f"{server.url}/pdf"
+        processor.synthesis_gen = type(processor.synthesis_gen)("test", base_url=server.url)
+
+        results = asyncio.run(processor.process_batch(ids + [ids[0]]))
+
+        # The repeated ID may race its twin, so it's either skipped or re-done
+        assert results["failed"] == 0, results["errors"]
+        assert results["success"] + results["skipped"] == 4
+        assert results["success"] >= 3
+        assert in_flight["max"] <= 2, f"GROBID saw {in_flight['max']} concurrent uploads"
+        assert len(list((vault / "Papers").glob("*.md"))) == 3
+        assert all(state.is_processed(arxiv_id) for arxiv_id in ids)
+        print(f"✓ Results: {results}, max GROBID in flight: {in_flight['max']}")
+
+
+def test_disk_work_off_the_loop():
+    """Hashing PDFs, parsing TEI and writing state don't stall other coroutines."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("POST", "/api/processFulltextDocument", respond(make_tei(), "application/xml"))
+        server.route("GET", "/api/version", respond("0.8.0", "text/plain"))
+        server.route("POST", "/v1/messages", anthropic_messages_handler)
+
+        vault = Path(tmp)
+        cfg = Config(anthropic_api_key="test", grobid_url=server.url, vault_path=vault)
+        state = StateManager(vault / "_meta" / "processing_state.json")
+        processor = AsyncPaperProcessor(cfg, state)
+        processor.synthesis_gen = type(processor.synthesis_gen)("test", base_url=server.url)
+
+        pdf = vault / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+
+        def slow(method):
+            # Stand-in for a large PDF or TEI: blocks its thread for a while
+            def run(*args, **kwargs):
+                time.sleep(0.2)
+                return method(*args, **kwargs)
+            return run
+
+        sync = processor._sync
+        processor.grobid._cache_key = slow(processor.grobid._cache_key)
+        processor.grobid._store_and_parse = slow(processor.grobid._store_and_parse)
+        sync._stage_fetch = slow(sync._stage_fetch)
+        sync._stage_update_state = slow(sync._stage_update_state)
+
+        async def run():
+            gaps = []
+            paper = asyncio.create_task(processor.process(str(pdf)))
+            while not paper.done():
+                start = time.monotonic()
+                await asyncio.sleep(0.01)
+                gaps.append(time.monotonic() - start)
+            await paper
+            return max(gaps)
+
+        longest_gap = asyncio.run(run())
+        assert state.is_processed(str(pdf))
+        assert longest_gap < 0.15, f"Event loop blocked for {longest_gap:.2f}s"
+        print(f"✓ Event loop never blocked for more than {longest_gap * 1000:.0f}ms")
+
+
+def test_resume_and_duplicate_pdf():
+    """An interrupted paper resumes at its checkpoint; a copy of its PDF is skipped."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("POST", "/api/processFulltextDocument", respond(make_tei(), "application/xml"))
+        server.route("GET", "/api/version", respond("0.8.0", "text/plain"))
+        server.route("POST", "/v1/messages", anthropic_messages_handler)
+
+        vault = Path(tmp)
+        cfg = Config(anthropic_api_key="test", grobid_url=server.url, vault_path=vault)
+        pdf = vault / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+
+        def make_processor():
+            state = StateManager(vault / "_meta" / "processing_state.json")
+            processor = AsyncPaperProcessor(cfg, state)
+            processor.synthesis_gen = type(processor.synthesis_gen)("test", base_url=server.url)
+            fetches = []
+            fetch = processor._sync._stage_fetch
+            processor._sync._stage_fetch = lambda job: (fetches.append(job.identifier), fetch(job))
+            return processor, state, fetches
+
+        # First run dies in synthesis (e.g., Ctrl-C), after fetch and GROBID
+        processor, _, fetches = make_processor()
+
+        async def interrupted(text, metadata):
+            raise KeyboardInterrupt
+
+        processor.synthesis_gen.generate_quick_synthesis_async = interrupted
+        try:
+            asyncio.run(processor.process(str(pdf)))
+        except KeyboardInterrupt:
+            pass
+        assert fetches == [str(pdf)]
+
+        # Second run: no fetch, no GROBID, straight to Claude
+        processor, state, fetches = make_processor()
+        assert asyncio.run(processor.process(str(pdf))) is True
+        assert fetches == []
+        assert server.count("POST", "/api/processFulltextDocument") == 1
+        assert state.is_processed(str(pdf))
+        assert not list(cfg.checkpoints_dir.glob("*.json"))
+
+        # The same bytes under another name are recognized before GROBID and Claude
+        copy = vault / "inbox" / "copy.pdf"
+        copy.parent.mkdir()
+        copy.write_bytes(pdf.read_bytes())
+        results = asyncio.run(processor.process_batch([str(copy)]))
+        assert results["skipped"] == 1 and results["success"] == 0
+        assert server.count("POST", "/v1/messages") == 1
+        assert len(list((vault / "Papers").glob("*.md"))) == 1
+        print("✓ Async run resumed from checkpoint and skipped the duplicate PDF")
+
+
+if __name__ == "__main__":
+    test_async_batch()
+    test_disk_work_off_the_loop()
+    test_resume_and_duplicate_pdf()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared cache-directory helpers.
+
+Runs offline and checks that LruDirectory only scans the directory when a
+write pushes it past max_bytes, and that the scan corrects the running
+total for files changed behind its back.
+
+Usage:
+    python test_cache_files.py
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.cache_files import LruDirectory, write_atomic
+
+
+class CountingDirectory(LruDirectory):
+    """LruDirectory that counts its directory scans."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.scans = 0
+
+    def _entries(self):
+        self.scans += 1
+        return super()._entries()
+
+
+def test_scans_only_past_limit():
+    """Writes under max_bytes keep a running total instead of rescanning."""
+    with tempfile.TemporaryDirectory() as tmp:
+        files = CountingDirectory(Path(tmp), ".bin", 3500)
+
+        for i in range(3):
+            files.write(Path(tmp) / f"{i}.bin", lambda path: path.write_bytes(b"x" * 1000))
+        # One scan to learn the starting size, none after
+        assert files.scans == 1
+        assert files.evictions == 0
+
+        # Overwriting an entry counts only the difference
+        files.write(Path(tmp) / "0.bin", lambda path: path.write_bytes(b"x" * 1500))
+        assert files.scans == 1
+
+        # Crossing the limit scans once and evicts the oldest
+        os.utime(Path(tmp) / "1.bin", (1, 1))
+        files.write(Path(tmp) / "3.bin", lambda path: path.write_bytes(b"x" * 1000))
+        assert files.scans == 2
+        assert files.evictions == 1
+        assert not (Path(tmp) / "1.bin").exists()
+        assert files.stats()["bytes"] == 3500
+        print("✓ Directory scanned only when over the limit")
+
+
+def test_scan_corrects_total():
+    """Files deleted by someone else stop counting after the next scan."""
+    with tempfile.TemporaryDirectory() as tmp:
+        files = LruDirectory(Path(tmp), ".bin", 2500)
+        files.write(Path(tmp) / "a.bin", lambda path: path.write_bytes(b"x" * 1000))
+        files.write(Path(tmp) / "b.bin", lambda path: path.write_bytes(b"x" * 1000))
+        (Path(tmp) / "a.bin").unlink()
+
+        # Running total says 3000, the scan finds 2000: nothing to evict
+        files.write(Path(tmp) / "c.bin", lambda path: path.write_bytes(b"x" * 1000))
+        assert files.evictions == 0
+        assert files._total == 2000
+
+        # Ignores temp and unrelated files
+        write_atomic(Path(tmp) / "other.txt", lambda path: path.write_text("x" * 5000))
+        assert files.stats() == {"evictions": 0, "entries": 2, "bytes": 2000}
+        print("✓ Scan corrects the running total")
+
+
+if __name__ == "__main__":
+    test_scans_only_past_limit()
+    test_scan_corrects_total()
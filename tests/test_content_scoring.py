@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for readability-style content scoring.
+
+Runs offline on small hand-written pages: checks that the scorer prefers
+prose over link-heavy comment sections, handles pages made only of
+<div>s, and copes with very deep nesting.
+
+Usage:
+    python test_content_scoring.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lxml import etree
+
+from paper_library.content_scoring import ContentScorer, best_content_node
+from paper_library.html_scan import parse_html, scan_html
+
+
+PROSE = "<p>Attention lets every token look at every other token, which is expensive, but parallel. </p>"
+LINKS = '<p><a href="/u/1">someone replied to this comment with a link</a></p>'
+
+
+def test_prefers_prose_over_links():
+    """Article text wins over a longer but link-heavy comment section."""
+    html = (
+        '<html><body><div id="wrapper">'
+        f'<div class="story">{PROSE * 6}</div>'
+        f'<div class="comments">{LINKS * 30}</div>'
+        '</div></body></html>'
+    )
+    best = best_content_node(parse_html(html.encode()))
+    assert best is not None and best.get("class") == "story"
+    print("✓ Prose preferred over link-heavy comments")
+
+
+def test_counts_in_one_pass():
+    """Text and link lengths add up like the stripped text of each node."""
+    root = parse_html(f'<div id="a"><!-- hidden -->{PROSE}{LINKS}</div>'.encode())
+    scorer = ContentScorer()
+    for event, element in etree.iterwalk(root, events=("start", "end")):
+        if not isinstance(element.tag, str):
+            continue
+        if event == "start":
+            scorer.start(element)
+        else:
+            scorer.end(element)
+
+    div = root.get_element_by_id("a")
+    stats = scorer.stats[div]
+    assert stats.text_length == sum(len(text.strip()) for text in div.itertext(tag=("p", "a")))
+    assert stats.link_length == len(div.find(".//a").text_content())
+    assert stats.paragraphs == 2
+    print("✓ Node stats match get_text()")
+
+
+def test_div_only_page():
+    """Pages with no <p> tags fall back to text length."""
+    html = "<html><body><div>Menu</div><div id='text'>" + "Plain words, no markup. " * 20 + "</div></body></html>"
+    best = best_content_node(parse_html(html.encode()))
+    assert best is not None and best.get("id") == "text"
+
+    assert best_content_node(parse_html(b"<div>Too short</div>")) is None
+    print("✓ Div-only pages")
+
+
+def test_deeply_nested_page():
+    """A comment thread a thousand levels deep is parsed in full and scored quickly."""
+    depth = 1000
+    thread = "".join(f'<div class="comment">{LINKS}' for _ in range(depth)) + "</div>" * depth
+    html = f"<html><body>{thread}<div class='post'>{PROSE * 6}</div></body></html>"
+
+    start = time.monotonic()
+    page = scan_html(html.encode())
+    assert time.monotonic() - start < 5
+    assert page.content_html.startswith('<div class="post">')
+    print("✓ Deeply nested page")
+
+
+if __name__ == "__main__":
+    test_prefers_prose_over_links()
+    test_counts_in_one_pass()
+    test_div_only_page()
+    test_deeply_nested_page()
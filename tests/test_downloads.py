@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the PDF download manager.
+
+Runs offline against a stub server that supports HTTP Range requests, and
+checks that truncated downloads are resumed rather than trusted, and that
+non-PDF responses never reach the final path.
+
+Usage:
+    python test_downloads.py
+"""
+
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.downloads import DownloadError, DownloadManager, is_complete_pdf
+
+from stubs import StubServer, make_pdf, respond
+
+
+PDF = make_pdf("A paper long enough to cut in half")
+
+
+def ranged(body: bytes, honor_range: bool = True):
+    """Handler serving body, answering Range requests with 206 Partial Content."""
+    def handler(request):
+        match = re.match(r"bytes=(\d+)-", request.headers.get("range", ""))
+        if match and honor_range:
+            start = int(match.group(1))
+            headers = {
+                "Content-Type": "application/pdf",
+                "Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}",
+            }
+            return 206, headers, body[start:]
+        return 200, {"Content-Type": "application/pdf"}, body
+    return handler
+
+
+def test_resumes_truncated_file():
+    """A half-written PDF from a killed run is completed with a Range request."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/paper.pdf", ranged(PDF))
+        dest = Path(tmp) / "arxiv_2312.12345.pdf"
+        dest.write_bytes(PDF[:200])
+        assert not is_complete_pdf(dest)
+
+        downloads = DownloadManager()
+        assert downloads.download_pdf(f"{server.url}/paper.pdf", dest) == dest
+
+        assert dest.read_bytes() == PDF
+        assert server.requests[-1].headers["range"] == "bytes=200-"
+        assert not dest.with_name(f"{dest.name}.part").exists()
+        print("✓ Truncated download resumed")
+
+
+def test_server_ignores_range():
+    """A 200 answer to a Range request replaces the partial file."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/paper.pdf", ranged(PDF, honor_range=False))
+        dest = Path(tmp) / "paper.pdf"
+        dest.with_name("paper.pdf.part").write_bytes(PDF[:300])
+
+        DownloadManager().download_pdf(f"{server.url}/paper.pdf", dest)
+        assert dest.read_bytes() == PDF
+        print("✓ Full body replaces partial file")
+
+
+def test_rejects_non_pdf():
+    """An HTML error page (or a cut-off PDF) never becomes the final file."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/login", respond("<html>Please sign in</html>", "text/html"))
+        server.route("GET", "/cut.pdf", respond(PDF[:-20], "application/pdf"))
+        downloads = DownloadManager()
+
+        for path in ["/login", "/cut.pdf"]:
+            dest = Path(tmp) / "paper.pdf"
+            try:
+                downloads.download_pdf(f"{server.url}{path}", dest)
+                assert False, f"Expected DownloadError for {path}"
+            except DownloadError:
+                pass
+            assert not dest.exists()
+            assert not dest.with_name("paper.pdf.part").exists()
+        print("✓ Non-PDF responses rejected")
+
+
+if __name__ == "__main__":
+    test_resumes_truncated_file()
+    test_server_ignores_range()
+    test_rejects_non_pdf()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for PDF fingerprints.
+
+Runs offline: checks that byte-identical PDFs are recognized under any
+filename (vault/PDFs scan, local copies), that the cheap prehash alone
+doesn't decide a match, and that local PDFs are tracked in the state.
+
+Usage:
+    python test_fingerprints.py
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.config import Config
+from paper_library.fingerprints import FingerprintIndex
+from paper_library.models import PaperMetadata
+from paper_library.orchestrator import PaperJob, PaperProcessor
+from paper_library.state import StateManager
+
+from stubs import make_pdf
+
+
+def test_index_lookup():
+    """Lookup matches identical bytes only, even when the prehash collides."""
+    edge = FingerprintIndex.EDGE_BYTES
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pdfs = tmp / "PDFs"
+        pdfs.mkdir()
+        original = pdfs / "arxiv_2309.14316.pdf"
+        original.write_bytes(b"A" * edge + b"middle-1" + b"Z" * edge)
+
+        index = FingerprintIndex(tmp / "fingerprints.json")
+        assert index.scan(pdfs, key_for=lambda path: path.stem) == 1
+        # Unchanged files aren't hashed again
+        assert index.scan(pdfs, key_for=lambda path: path.stem) == 0
+
+        copy = tmp / "download.pdf"
+        shutil.copy(original, copy)
+        assert index.lookup(copy) == "arxiv_2309.14316"
+
+        # Same size, same first/last 64 KB, different middle
+        lookalike = tmp / "lookalike.pdf"
+        lookalike.write_bytes(b"A" * edge + b"middle-2" + b"Z" * edge)
+        assert index.prehash(lookalike) == index.prehash(original)
+        assert index.lookup(lookalike) is None
+
+        reloaded = FingerprintIndex(tmp / "fingerprints.json")
+        assert reloaded.lookup(copy) == "arxiv_2309.14316"
+        print("✓ Fingerprint index")
+
+
+def test_processor_recognizes_copies():
+    """A renamed copy of a processed PDF counts as processed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        vault = tmp / "vault"
+        cfg = Config(anthropic_api_key="test", vault_path=vault)
+        state = StateManager(cfg.processing_state_file)
+
+        # An arXiv PDF downloaded before fingerprints existed
+        cfg.pdfs_dir.mkdir(parents=True)
+        (cfg.pdfs_dir / "arxiv_2309.14316.pdf").write_bytes(make_pdf("Physics of Language Models"))
+        state.mark_processed("2309.14316", "arxiv")
+
+        renamed = tmp / "physics_lm.pdf"
+        shutil.copy(cfg.pdfs_dir / "arxiv_2309.14316.pdf", renamed)
+
+        processor = PaperProcessor(cfg, state)
+        assert processor.is_processed(str(renamed))
+
+        # A new local PDF is tracked in the state and in the index
+        local = tmp / "new_paper.pdf"
+        local.write_bytes(make_pdf("A Brand New Paper"))
+        assert not processor.is_processed(str(local))
+
+        job = PaperJob(
+            identifier=str(local),
+            pdf_path=local,
+            metadata=PaperMetadata(title="A Brand New Paper", authors=["Test, A."], year=2024),
+        )
+        processor._stage_update_state(job)
+        assert state.is_processed(str(local.resolve()))
+        assert state.get_stats()["local"] == 1
+
+        local_copy = tmp / "new_paper (1).pdf"
+        shutil.copy(local, local_copy)
+        assert processor.is_processed(str(local_copy))
+        print("✓ Copies of processed PDFs are skipped")
+
+
+def test_add_appends_to_journal():
+    """add() appends one journal line; scan() folds the journal into the JSON file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        index = FingerprintIndex(tmp / "fingerprints.json")
+        pdfs = []
+        for i in range(3):
+            pdf = tmp / f"paper{i}.pdf"
+            pdf.write_bytes(make_pdf(f"Paper {i}"))
+            index.add(pdf, f"key{i}")
+            pdfs.append(pdf)
+
+        # Nothing rewritten: just one line per paper
+        assert not index.index_file.exists()
+        assert len(index.journal_file.read_text().splitlines()) == 3
+
+        # A crash mid-append leaves a partial line, which is skipped
+        with open(index.journal_file, "a") as f:
+            f.write('{"path": "half')
+        reloaded = FingerprintIndex(tmp / "fingerprints.json")
+        assert [reloaded.lookup(pdf) for pdf in pdfs] == ["key0", "key1", "key2"]
+
+        reloaded.scan(tmp / "PDFs", key_for=lambda path: path.stem)
+        assert reloaded.index_file.exists() and not reloaded.journal_file.exists()
+        assert FingerprintIndex(tmp / "fingerprints.json").lookup(pdfs[2]) == "key2"
+        print("✓ Fingerprints journaled, then compacted")
+
+
+if __name__ == "__main__":
+    test_index_lookup()
+    test_add_appends_to_journal()
+    test_processor_recognizes_copies()
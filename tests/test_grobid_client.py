@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Test script for GrobidClient (adaptive concurrency, 503 retries, circuit breaker).
+
+Runs offline against a stub GROBID with a fixed number of workers: like the
+real one, it answers 503 when they're all busy. Many concurrent uploads
+must all succeed, with the client's window settling around the stub's
+capacity. A stub GROBID that drops every connection must trip the circuit
+breaker, so later uploads fail at once until /api/isalive answers again.
+
+Usage:
+    python test_grobid_client.py
+"""
+
+import asyncio
+import io
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import requests
+
+from paper_library.grobid_client import AdaptiveLimit, CircuitBreaker, GrobidClient, GrobidUnavailable
+from paper_library.rate_limit import RateLimitedTransport
+
+from stubs import StubServer, make_pdf, make_tei
+
+
+def busy_grobid(server: StubServer, workers: int) -> dict:
+    """Route a GROBID that 503s beyond `workers` concurrent uploads; returns its counters."""
+    counters = {"busy": 0, "max_busy": 0, "rejected": 0}
+    lock = threading.Lock()
+
+    def handler(request):
+        with lock:
+            if counters["busy"] >= workers:
+                counters["rejected"] += 1
+                return 503, {}, b"busy"
+            counters["busy"] += 1
+            counters["max_busy"] = max(counters["max_busy"], counters["busy"])
+        time.sleep(0.05)
+        with lock:
+            counters["busy"] -= 1
+        return 200, {"Content-Type": "application/xml"}, make_tei().encode()
+
+    server.route("POST", "/api/processFulltextDocument", handler)
+    return counters
+
+
+def fast_client(**kwargs) -> GrobidClient:
+    """GrobidClient with millisecond backoffs."""
+    client = GrobidClient(**kwargs)
+    client.BACKOFF_BASE = 0.01
+    return client
+
+
+def test_aimd_window():
+    """Grows by 1/window while saturated, halves once per burst of 503s."""
+    limit = AdaptiveLimit(initial=4, maximum=6)
+
+    tickets = [limit.acquire() for _ in range(4)]
+    limit.release(tickets.pop())  # Saturated: 4 in flight with a window of 4
+    assert limit.limit == 4.25
+    limit.release(tickets.pop())  # 3 in flight: not the bottleneck, no growth
+    assert limit.limit == 4.25
+    for ticket in tickets:
+        limit.release(ticket)
+    assert limit.limit == 4.25
+
+    # Two 503s from uploads sent before the decrease: one halving
+    first, second = limit.acquire(), limit.acquire()
+    limit.release(first, overloaded=True)
+    limit.release(second, overloaded=True)
+    assert limit.limit == 2.125
+    assert limit.window == 2
+
+    # A 503 for an upload sent after it is a new signal
+    limit.release(limit.acquire(), overloaded=True)
+    assert limit.limit == 1.0625
+    limit.release(limit.acquire(), overloaded=True)
+    assert limit.limit == 1  # Never below the minimum
+    print("✓ Window grows additively, shrinks multiplicatively")
+
+
+def test_backpressure():
+    """12 threads at once against 3 workers: no failures, window near capacity."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        grobid = busy_grobid(server, workers=3)
+        pdf = Path(tmp) / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        client = fast_client(initial_concurrency=6, max_concurrency=12)
+        url = f"{server.url}/api/processFulltextDocument"
+
+        def upload(_):
+            dest = io.BytesIO()
+            client.upload(url, pdf, dest)
+            return dest.getvalue()
+
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            bodies = list(pool.map(upload, range(12)))
+
+        stats = client.stats()
+        assert all(body.startswith(b"<?xml") for body in bodies)
+        assert stats["uploads"] == 12 and stats["failures"] == 0
+        assert stats["overloads"] == grobid["rejected"] > 0
+        assert stats["window"] < 6  # Backed off from the too-high start
+        assert grobid["max_busy"] <= 3
+        assert stats["in_flight"] == stats["queued"] == 0
+        assert stats["latency_p95"] >= 0.05
+        print(f"✓ Stats: {stats}")
+
+
+def test_backpressure_async():
+    """Same on the event loop, through the rate-limited transport."""
+    async def run(client, url, pdf):
+        async with httpx.AsyncClient(transport=RateLimitedTransport()) as http:
+            dests = [io.BytesIO() for _ in range(10)]
+            await asyncio.gather(*(client.upload_async(http, url, pdf, dest) for dest in dests))
+            return dests
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        grobid = busy_grobid(server, workers=2)
+        pdf = Path(tmp) / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        client = fast_client(initial_concurrency=4, max_concurrency=8)
+
+        dests = asyncio.run(run(client, f"{server.url}/api/processFulltextDocument", pdf))
+
+        assert all(dest.getvalue().startswith(b"<?xml") for dest in dests)
+        assert client.stats()["uploads"] == 10
+        # 503s reach our window instead of being retried by the transport
+        assert client.stats()["overloads"] == grobid["rejected"] > 0
+        print(f"✓ Async stats: {client.stats()}")
+
+
+def test_gives_up_eventually():
+    """A GROBID that never frees up fails the upload after MAX_RETRIES."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        busy_grobid(server, workers=0)
+        pdf = Path(tmp) / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        client = fast_client()
+
+        try:
+            client.upload(f"{server.url}/api/processFulltextDocument", pdf, io.BytesIO())
+            raise AssertionError("Expected the upload to fail")
+        except requests.HTTPError as e:
+            assert e.response.status_code == 503
+
+        assert server.count("POST", "/api/processFulltextDocument") == client.MAX_RETRIES + 1
+        assert client.stats()["failures"] == 1
+        print("✓ Gave up after MAX_RETRIES")
+
+
+def test_circuit_breaker():
+    """closed -> open after N failures -> half-open probe -> closed or open again."""
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.closed
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.should_probe()  # Still cooling down
+
+    now[0] = 10
+    assert breaker.should_probe() and breaker.state == "half-open"
+    assert not breaker.should_probe()  # One probe at a time
+    breaker.record_failure()  # Probe failed
+    assert breaker.state == "open"
+    assert not breaker.should_probe()
+
+    now[0] = 20
+    assert breaker.should_probe()
+    breaker.record_success()
+    assert breaker.closed and breaker.failures == 0
+    print("✓ Breaker opens, probes and closes")
+
+
+def test_breaker_fails_fast():
+    """A dead GROBID costs two connection attempts, then only health checks."""
+    health = {"down": True}
+
+    def grobid(request):
+        if health["down"]:
+            raise ConnectionResetError("GROBID is down")  # Stub drops the connection
+        return 200, {"Content-Type": "application/xml"}, make_tei().encode()
+
+    def isalive(request):
+        if health["down"]:
+            raise ConnectionResetError("GROBID is down")
+        return 200, {"Content-Type": "text/plain"}, b"true"
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("POST", "/api/processFulltextDocument", grobid)
+        server.route("GET", "/api/isalive", isalive)
+        pdf = Path(tmp) / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        url = f"{server.url}/api/processFulltextDocument"
+        client = fast_client(
+            health_url=f"{server.url}/api/isalive",
+            breaker=CircuitBreaker(failure_threshold=2, reset_timeout=0),
+        )
+
+        for _ in range(3):
+            try:
+                client.upload(url, pdf, io.BytesIO())
+                raise AssertionError("Expected GrobidUnavailable")
+            except GrobidUnavailable:
+                pass
+        assert server.count("POST", "/api/processFulltextDocument") == 2
+        assert server.count("GET", "/api/isalive") == 2
+        assert client.stats()["circuit"] == "open"
+
+        # Back up: the next health check closes the circuit
+        health["down"] = False
+        dest = io.BytesIO()
+        client.upload(url, pdf, dest)
+        assert dest.getvalue().startswith(b"<?xml")
+        assert client.stats()["circuit"] == "closed"
+        print("✓ Dead GROBID fails fast, recovery detected")
+
+
+if __name__ == "__main__":
+    test_aimd_window()
+    test_backpressure()
+    test_backpressure_async()
+    test_gives_up_eventually()
+    test_circuit_breaker()
+    test_breaker_fails_fast()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Test script for processing papers while GROBID is down.
+
+Runs offline against a stub server whose GROBID drops every connection:
+papers must still get notes (PDF metadata, pdfplumber text, no citations),
+fail fast once the circuit breaker is open, and get GROBID's metadata and
+citations from reenrich() once GROBID is back, without paying Claude twice.
+
+Usage:
+    python test_grobid_fallback.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.config import Config
+from paper_library.models import Synthesis
+from paper_library.orchestrator import PaperJob, PaperProcessor
+from paper_library.pdf_metadata import read_pdf_metadata
+from paper_library.state import StateManager
+
+from stubs import StubServer, anthropic_messages_handler, make_pdf, make_tei, respond
+
+XMP = """<x:xmpmeta xmlns:x="adobe:ns:meta/">
+  <rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">
+    <rdf:Description xmlns:dc="http://purl.org/dc/elements/1.1/"
+        xmlns:prism="http://prismstandard.org/namespaces/basic/2.0/"
+        prism:doi="10.5555/xmp.2020">
+      <dc:creator><rdf:Seq><rdf:li>Grace Hopper</rdf:li></rdf:Seq></dc:creator>
+      <dc:date><rdf:Seq><rdf:li>2020-02-02</rdf:li></rdf:Seq></dc:date>
+    </rdf:Description>
+  </rdf:RDF>
+</x:xmpmeta>"""
+
+
+def test_pdf_metadata():
+    """Info dictionary fields, overridden by XMP where it has them; junk titles skipped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = Path(tmp) / "paper.pdf"
+        pdf.write_bytes(make_pdf(
+            info={"Title": "Info Title", "Author": "Ada Lovelace; Alan Turing", "CreationDate": "D:20190101"},
+            xmp=XMP,
+        ))
+        assert read_pdf_metadata(pdf) == {
+            "title": "Info Title",
+            "authors": ["Grace Hopper"],
+            "year": 2020,
+            "doi": "10.5555/xmp.2020",
+        }
+
+        pdf.write_bytes(make_pdf(info={"Title": "draft3.docx", "Author": "Ada Lovelace and Alan Turing"}))
+        assert read_pdf_metadata(pdf) == {"authors": ["Ada Lovelace", "Alan Turing"]}
+        print("✓ PDF Info/XMP metadata read")
+
+
+def test_degraded_then_reenriched():
+    """GROBID down: notes without citations; back up: reenrich() fills them in."""
+    health = {"down": True}
+
+    def grobid(request):
+        if health["down"]:
+            raise ConnectionResetError("GROBID is down")  # Stub drops the connection
+        title = "The Real First Title" if b"paper 0" in request.body else "The Real Second Title"
+        return 200, {"Content-Type": "application/xml"}, make_tei(title).encode()
+
+    def isalive(request):
+        if health["down"]:
+            raise ConnectionResetError("GROBID is down")
+        return 200, {"Content-Type": "text/plain"}, b"true"
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        for endpoint in ("processHeaderDocument", "processReferences", "processFulltextDocument"):
+            server.route("POST", f"/api/{endpoint}", grobid)
+        server.route("GET", "/api/isalive", isalive)
+        server.route("POST", "/v1/messages", anthropic_messages_handler)
+
+        vault = Path(tmp)
+        cfg = Config(
+            anthropic_api_key="test",
+            grobid_url=server.url,
+            vault_path=vault,
+            grobid_breaker_failures=2,
+            grobid_breaker_reset=0,
+        )
+        processor = PaperProcessor(cfg, StateManager(vault / "_meta" / "processing_state.json"))
+        processor.grobid_client.BACKOFF_BASE = 0.01
+        processor.synthesis_gen = type(processor.synthesis_gen)("test", base_url=server.url)
+
+        pdfs = []
+        for i, title in enumerate(["First Local Paper", "Second Local Paper"]):
+            pdf = vault / "inbox" / f"paper{i}.pdf"
+            pdf.parent.mkdir(exist_ok=True)
+            pdf.write_bytes(make_pdf(f"Body of paper {i}", info={"Title": title, "Author": "Ada Lovelace"}))
+            pdfs.append(str(pdf))
+
+        results = processor.process_batch(pdfs)
+
+        assert results["success"] == 2, results["errors"]
+        # Two failed uploads opened the circuit; the second paper never tried
+        assert server.count("POST", "/api/processFulltextDocument") == 2
+        notes = sorted(p.name for p in (vault / "Papers").glob("*.md"))
+        assert len(notes) == 2 and any("First" in name for name in notes), notes
+        assert len(processor.enrichment.identifiers()) == 2
+        # Stored under the paper key: another spelling of the path finds it
+        assert processor.enrichment.load(str(vault / "inbox" / ".." / "inbox" / "paper0.pdf"))
+
+        # GROBID is back: metadata and citations, same syntheses
+        health["down"] = False
+        assert processor.reenrich() == {"enriched": 2, "failed": 0, "remaining": 0}
+        assert processor.enrichment.identifiers() == []
+        # Header and references only: the text was already extracted
+        assert server.count("POST", "/api/processHeaderDocument") == 2
+        assert server.count("POST", "/api/processFulltextDocument") == 2
+        assert server.count("POST", "/v1/messages") == 2
+
+        notes = sorted((vault / "Papers").glob("*.md"))
+        assert len(notes) == 2  # Old notes replaced, not duplicated
+        assert "The Real First Title" in notes[0].name
+        text = notes[0].read_text(encoding="utf-8")
+        assert "Attention is all you need" in text
+        print(f"✓ Degraded then re-enriched: {sorted(p.name for p in notes)}")
+
+
+def test_reenrich_keeps_mention_counts():
+    """Counts from an earlier full-text pass survive a references-only re-enrichment."""
+    body = '<p><ref type="bibr" target="#b1">[2]</ref> and again <ref type="bibr" target="#b1">[2]</ref>.</p>'
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        for endpoint in ("processHeaderDocument", "processReferences"):
+            server.route("POST", f"/api/{endpoint}", respond(make_tei(), "application/xml"))
+        server.route("GET", "/api/isalive", respond("true"))
+
+        vault = Path(tmp)
+        cfg = Config(anthropic_api_key="test", grobid_url=server.url, vault_path=vault)
+        processor = PaperProcessor(cfg, StateManager(vault / "_meta" / "processing_state.json"))
+
+        pdf = vault / "paper.pdf"
+        pdf.write_bytes(make_pdf("Body of the paper"))
+        metadata, text = processor.grobid._parse_tei(make_tei(body=body))
+        assert [c.mention_count for c in metadata.citations] == [1, 2]
+        processor.enrichment.save(PaperJob(
+            identifier=str(pdf),
+            pdf_path=pdf,
+            metadata=metadata,
+            text=text,
+            text_source="grobid",
+            synthesis=Synthesis(
+                summary="A summary.", why_you_cared="Testing.",
+                key_concepts=["tests"], memorable_quote="Quote.",
+            ),
+            completed=list(PaperProcessor.STAGES),
+            needs_enrichment=True,
+        ))
+
+        assert processor.reenrich() == {"enriched": 1, "failed": 0, "remaining": 0}
+        assert server.count("POST", "/api/processFulltextDocument") == 0
+        note = next((vault / "Papers").glob("*.md")).read_text(encoding="utf-8")
+        assert "cited 2×" in note, note
+        print("✓ Re-enrichment kept mention counts")
+
+
+if __name__ == "__main__":
+    test_pdf_metadata()
+    test_degraded_then_reenriched()
+    test_reenrich_keeps_mention_counts()
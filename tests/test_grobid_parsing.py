@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for GROBID TEI parsing (no GROBID server needed).
+
+Parses sample TEI documents like the ones GROBID returns and checks the
+extracted metadata, citations and body text.
+
+Usage:
+    python test_grobid_parsing.py
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.grobid_processor import GrobidProcessor
+
+from stubs import make_tei
+
+
+BODY = """
+<div><head n="1">Introduction</head>
+  <p>Transformers changed <ref type="bibr" target="#b0">[1]</ref> everything.</p>
+  <p>Residual   connections help
+     too.</p>
+</div>
+<div><head n="2">Method</head>
+  <p>We stack layers.</p>
+  <figure><figDesc>Figure 1: not prose</figDesc></figure>
+</div>
+"""
+
+
+def test_body_text():
+    """Sections and paragraphs come back from <text><body>, abstract first."""
+    processor = GrobidProcessor("http://localhost:8070")
+    metadata, body_text = processor._parse_tei(make_tei(body=BODY))
+
+    assert metadata.title == "A Test Paper"
+    assert metadata.authors[:2] == ["Lovelace, Ada", "Turing, Alan"]
+    assert metadata.year == 2023
+    assert len(metadata.citations) == 2
+    assert [c.mention_count for c in metadata.citations] == [1, 1]  # Only b0 is linked, once
+
+    assert body_text == (
+        "## Abstract\n\nThis is the abstract.\n\n"
+        "## 1 Introduction\n\n"
+        "Transformers changed [1] everything.\n\n"
+        "Residual connections help too.\n\n"
+        "## 2 Method\n\n"
+        "We stack layers."
+    )
+    print("✓ Body text extracted section by section")
+
+
+def test_empty_body():
+    """No body paragraphs means no body text (caller falls back to pdfplumber)."""
+    processor = GrobidProcessor("http://localhost:8070")
+    _, body_text = processor._parse_tei(make_tei(body=""))
+    assert body_text is None
+
+    _, body_text = processor._parse_tei(make_tei(body="<div><head>Only a heading</head></div>"))
+    assert body_text is None
+    print("✓ Empty body returns None")
+
+
+class Trickle(io.RawIOBase):
+    """File object that hands out at most 64 bytes per read, like a slow stream."""
+
+    def __init__(self, data: bytes):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self.data.read(min(len(buffer), 64))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+def test_streaming_matches_tree():
+    """The streaming parser gives exactly what the in-memory parser gives."""
+    processor = GrobidProcessor("http://localhost:8070")
+    nested = "<div><head>Outer</head><p>Before.</p><div><head n='2.1'>Inner</head><p>Inside.</p></div><p>After.</p></div>"
+    sparse = make_tei().replace('<idno type="DOI">10.1234/test.2023</idno>', "")
+    no_body = make_tei().replace("<body></body>", "")
+
+    for tei in (make_tei(body=BODY), make_tei(body=nested), make_tei(body=""), sparse, no_body):
+        expected_metadata, expected_body = processor._parse_tei(tei)
+        metadata, body_text = processor._parse_tei_stream(Trickle(tei.encode("utf-8")))
+        assert metadata.model_dump() == expected_metadata.model_dump()
+        assert body_text == expected_body
+
+    _, body_text = processor._parse_tei_stream(io.BytesIO(make_tei(body=nested).encode()))
+    assert body_text.index("## Outer\n\nBefore.\n\nAfter.") < body_text.index("## 2.1 Inner")
+    print("✓ Streaming parse matches the in-memory parse")
+
+
+if __name__ == "__main__":
+    test_body_text()
+    test_empty_body()
+    test_streaming_matches_tree()
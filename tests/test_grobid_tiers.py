@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for GROBID extraction tiers.
+
+Runs offline against a stub GROBID server and checks that each tier hits
+its own endpoint, and that the orchestrator only pays for full text when
+the body text is actually used.
+
+Usage:
+    python test_grobid_tiers.py
+"""
+
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.config import Config
+from paper_library.grobid_processor import GrobidProcessor
+from paper_library.models import PaperMetadata
+from paper_library.orchestrator import PaperJob, PaperProcessor
+from paper_library.state import StateManager
+
+from stubs import StubServer, make_pdf, make_tei, respond
+
+ENDPOINTS = ["processHeaderDocument", "processReferences", "processFulltextDocument"]
+
+
+def header_only_tei() -> str:
+    """What processHeaderDocument returns: the header, no body or bibliography."""
+    return re.sub(r"<text>.*</text>", "", make_tei("From Header"), flags=re.S)
+
+
+def references_only_tei() -> str:
+    """What processReferences returns: an empty header and the bibliography."""
+    return re.sub(r"<teiHeader>.*</teiHeader>", "<teiHeader/>", make_tei(), flags=re.S)
+
+
+def stub_grobid(server: StubServer) -> None:
+    """Route all three tiers."""
+    server.route("POST", "/api/processHeaderDocument", respond(header_only_tei(), "application/xml"))
+    server.route("POST", "/api/processReferences", respond(references_only_tei(), "application/xml"))
+    server.route("POST", "/api/processFulltextDocument", respond(make_tei("From Fulltext"), "application/xml"))
+
+
+def calls(server: StubServer) -> dict[str, int]:
+    """POSTs per GROBID endpoint."""
+    return {name: server.count("POST", f"/api/{name}") for name in ENDPOINTS}
+
+
+def test_tier_endpoints():
+    """process_header() and process_references() use their own endpoints."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        stub_grobid(server)
+        pdf = Path(tmp) / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        processor = GrobidProcessor(server.url)
+
+        header = processor.process_header(pdf)
+        assert header.title == "From Header"
+        assert header.citations == []
+        assert header.pdf_path == str(pdf)
+
+        citations = processor.process_references(pdf)
+        assert [c.year for c in citations] == [2017, 2016]
+
+        assert calls(server) == {
+            "processHeaderDocument": 1, "processReferences": 1, "processFulltextDocument": 0,
+        }
+        # The header endpoint answers BibTeX unless asked for XML
+        assert all(r.headers.get("accept") == "application/xml" for r in server.requests)
+        print("✓ Header and references tiers hit their own endpoints")
+
+
+def run_grobid_stage(server: StubServer, vault: Path, text_source: str, metadata: PaperMetadata) -> PaperJob:
+    """Run only the GROBID stage of PaperProcessor on one job."""
+    cfg = Config(anthropic_api_key="test", grobid_url=server.url, vault_path=vault, text_source=text_source)
+    processor = PaperProcessor(cfg, StateManager(vault / "_meta" / "processing_state.json"))
+    pdf = vault / "paper.pdf"
+    pdf.write_bytes(make_pdf())
+    job = PaperJob(identifier=str(pdf), pdf_path=pdf, metadata=metadata)
+    processor._stage_grobid(job)
+    return job
+
+
+def test_arxiv_without_grobid_body():
+    """arXiv metadata is complete and the body isn't used: references only."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        stub_grobid(server)
+        arxiv = PaperMetadata(
+            title="From arXiv", authors=["Ada Lovelace"], year=2024,
+            abstract="Abstract from arXiv.", arxiv_id="2401.00001", source="arxiv",
+        )
+        job = run_grobid_stage(server, Path(tmp), "pdfplumber", arxiv)
+
+        assert calls(server) == {
+            "processHeaderDocument": 0, "processReferences": 1, "processFulltextDocument": 0,
+        }
+        assert job.metadata.title == "From arXiv"
+        assert len(job.metadata.citations) == 2
+        assert job.text is None  # pdfplumber runs in the next stage
+        print(f"✓ arXiv paper: {calls(server)}")
+
+
+def test_local_pdf_without_grobid_body():
+    """Placeholder metadata: header + references, still no full text."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        stub_grobid(server)
+        local = PaperMetadata(title="Unknown", authors=["Unknown"], year=2023, source="local")
+        job = run_grobid_stage(server, Path(tmp), "pdfplumber", local)
+
+        assert calls(server) == {
+            "processHeaderDocument": 1, "processReferences": 1, "processFulltextDocument": 0,
+        }
+        assert job.metadata.title == "From Header"
+        assert job.metadata.authors[0] == "Lovelace, Ada"
+        assert len(job.metadata.citations) == 2
+        print(f"✓ Local PDF: {calls(server)}")
+
+
+def test_grobid_body_needs_fulltext():
+    """Body text from GROBID: one full-text call covers everything."""
+    body = "<div><head>Intro</head><p>Body paragraph.</p></div>"
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        stub_grobid(server)
+        server.route("POST", "/api/processFulltextDocument", respond(make_tei(body=body), "application/xml"))
+        arxiv = PaperMetadata(
+            title="From arXiv", authors=["Ada Lovelace"], year=2024,
+            abstract="Abstract from arXiv.", source="arxiv",
+        )
+        job = run_grobid_stage(server, Path(tmp), "grobid", arxiv)
+
+        assert calls(server) == {
+            "processHeaderDocument": 0, "processReferences": 0, "processFulltextDocument": 1,
+        }
+        assert job.text_source == "grobid"
+        assert "Body paragraph." in job.text
+        print(f"✓ GROBID body text: {calls(server)}")
+
+
+if __name__ == "__main__":
+    test_tier_endpoints()
+    test_arxiv_without_grobid_body()
+    test_local_pdf_without_grobid_body()
+    test_grobid_body_needs_fulltext()
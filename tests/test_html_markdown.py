@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the lxml HTML-to-markdown converter.
+
+Runs offline. Each page in tests/golden/html_markdown/*.html is converted
+and compared with the .md file next to it (headings, lists, links, code,
+tables, quotes). The .md files are what the old path wrote into our notes
+(markdownify + WebFetcher's _clean_markdown regexes); every place the new
+converter deliberately differs is listed in EXPECTED_DIFFERENCES. Also
+checks that conversion stops at the character budget instead of
+converting the whole page.
+
+After adding a page, regenerate the .md files from the old path (needs
+markdownify, in the dev extras):
+    python test_html_markdown.py --update
+
+Usage:
+    python test_html_markdown.py
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import lxml.html
+
+from paper_library.html_markdown import MarkdownConverter, html_to_markdown
+from paper_library.html_scan import parse_html
+
+
+GOLDEN_DIR = Path(__file__).parent / "golden" / "html_markdown"
+
+# Where the new converter deliberately differs from the old output in the
+# golden files: (why, old text, new text) per page. Every old text must
+# still be in its golden file, so a stale entry fails the test too.
+EXPECTED_DIFFERENCES = {
+    "blog_post": [
+        (
+            "Soft-wrapped source lines are joined (renders the same)",
+            "Each token\nlooks at every other token, weighted by a learned score. The idea is\n[older",
+            "Each token looks at every other token, weighted by a learned score. The idea is [older",
+        ),
+        (
+            "Soft-wrapped source lines are joined (renders the same)",
+            "Scores are\nscaled by",
+            "Scores are scaled by",
+        ),
+        (
+            "Soft-wrapped lines joined; an empty <h3> is dropped, not written as a bare ###",
+            "augmented-rnns/>\nand a link without a target.\n\n###\n\n",
+            "augmented-rnns/> and a link without a target.\n\n",
+        ),
+    ],
+    "code": [
+        (
+            "Blank line after a fence inside a list item (the list is already loose: renders the same)",
+            "   ```\n2. Rename",
+            "   ```\n\n2. Rename",
+        ),
+    ],
+    "distill": [
+        (
+            "Soft-wrapped source lines are joined (renders the same)",
+            "and we can\n*visualize*",
+            "and we can *visualize*",
+        ),
+        (
+            "<noscript> fallback text isn't article content",
+            "Enable JavaScript for the interactive diagram.\n\n",
+            "",
+        ),
+    ],
+    "tables": [
+        (
+            "A | inside a cell is escaped instead of starting a new column",
+            "| ETag | Last-Modified |",
+            "| ETag \\| Last-Modified |",
+        ),
+        (
+            "Short rows are padded to the table's width",
+            "| GROBID | n/a |\n",
+            "| GROBID | n/a |  |\n",
+        ),
+        (
+            "Whitespace inside a cell is collapsed",
+            "| block  cell |",
+            "| block cell |",
+        ),
+    ],
+}
+
+
+def convert_page(html_path: Path) -> str:
+    """Markdown for a golden page's <body>."""
+    return html_to_markdown(parse_html(html_path.read_bytes()).body)
+
+
+def legacy_page(html_path: Path) -> str:
+    """What the old path wrote for a golden page: markdownify + _clean_markdown."""
+    from markdownify import markdownify as md  # Dev extra, only for --update
+
+    body = parse_html(html_path.read_bytes()).body
+    markdown = md(lxml.html.tostring(body, encoding="unicode", with_tail=False), heading_style="atx")
+    markdown = re.sub(r'\n\n\n+', '\n\n', markdown)
+    return '\n'.join(line.rstrip() for line in markdown.split('\n')).strip()
+
+
+def test_golden_files():
+    """Every golden page converts to its old output, plus only the listed differences."""
+    pages = sorted(GOLDEN_DIR.glob("*.html"))
+    assert pages, f"No golden pages in {GOLDEN_DIR}"
+
+    for html_path in pages:
+        expected = html_path.with_suffix(".md").read_text(encoding="utf-8").rstrip("\n")
+        for why, old, new in EXPECTED_DIFFERENCES.get(html_path.stem, []):
+            assert old in expected, f"{html_path.stem}: listed difference not found ({why})"
+            expected = expected.replace(old, new, 1)
+
+        actual = convert_page(html_path)
+        assert actual == expected, (
+            f"{html_path.name} differs from its golden file:\n{actual}"
+        )
+    print(f"✓ {len(pages)} golden pages")
+
+
+def test_stops_at_budget():
+    """A huge page with a small budget is cut early, not converted in full."""
+    paragraph = "<p>" + "Circuits are made of features and weights. " * 10 + "</p>"
+    root = parse_html(f"<html><body>{paragraph * 5000}</body></html>".encode())
+
+    start = time.monotonic()
+    markdown = html_to_markdown(root.body, max_chars=1000)
+    assert time.monotonic() - start < 0.5
+    assert len(markdown) == 1000
+    assert markdown.startswith("Circuits are made of features")
+
+    # Unbudgeted, the converter still yields as it goes
+    first = next(MarkdownConverter().iter_markdown(root.body))
+    assert first.startswith("Circuits")
+    print("✓ Conversion stops at the character budget")
+
+
+def update_golden_files():
+    """Rewrite every .md file from the old markdownify path."""
+    for html_path in sorted(GOLDEN_DIR.glob("*.html")):
+        html_path.with_suffix(".md").write_text(legacy_page(html_path) + "\n", encoding="utf-8")
+        print(f"↻ Updated {html_path.with_suffix('.md').name}")
+
+
+if __name__ == "__main__":
+    if "--update" in sys.argv:
+        update_golden_files()
+    else:
+        test_golden_files()
+        test_stops_at_budget()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass HTML scan.
+
+Runs offline on a hand-written page: checks the metadata WebFetcher reads
+from the scan, that paywall markers come from class/id names only, and
+that navigation and asides never end up in the article content.
+
+Usage:
+    python test_html_scan.py
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.html_scan import scan_html
+from paper_library.web_fetcher import PaywallError, WebFetcher
+
+
+PAGE = """<!DOCTYPE html>
+<html><head>
+<meta charset="utf-8">
+<title>Ignored | Example Blog</title>
+<meta property="og:title" content="  Scanning Pages Once  ">
+<meta property="og:site_name" content="Example Blog">
+<meta property="article:author" content="Grace Hopper">
+<meta property="article:author" content="Alan Turing">
+<meta property="article:published_time" content="2024-03-01T12:00:00Z">
+</head><body>
+<header><h1>Site header</h1><nav><a href="/">Home</a></nav></header>
+<aside><article>Related: another post nobody asked for.</article></aside>
+<div class="post-content">
+<p>Walking a tree once, instead of once per question, keeps parsing cheap. {filler}</p>
+<script>var paywall = true;</script>
+<p>Nobody mentions a paywall here, it is just a word in the text. {filler}</p>
+</div>
+</body></html>
+""".replace("{filler}", "More words to make this a real paragraph. " * 10)
+
+
+def test_metadata():
+    """Title, authors, date and publisher all come from one scan."""
+    fetcher = WebFetcher()
+    page = scan_html(PAGE.encode("utf-8"))
+
+    assert fetcher._extract_title(page, "https://example.com/post") == "Scanning Pages Once"
+    assert fetcher._extract_authors(page) == ["Grace Hopper", "Alan Turing"]
+    assert fetcher._extract_published_date(page).year == 2024
+    assert fetcher._extract_publisher(page) == "Example Blog"
+    assert page.h1 == "Site header"
+    print("✓ Metadata")
+
+
+def test_content_and_paywall():
+    """Content skips the <aside> article and strips scripts; the word "paywall" in text is fine."""
+    page = scan_html(PAGE.encode("utf-8"))
+    content = page.content_html
+
+    assert content.startswith('<div class="post-content">')
+    assert "<script" not in content and "Related:" not in content
+    assert page.paywall_marker is None
+
+    metadata, markdown = WebFetcher()._handle_html("https://example.com/post", PAGE.encode("utf-8"))
+    assert metadata.title == "Scanning Pages Once"
+    assert "keeps parsing cheap" in markdown
+
+    walled = PAGE.replace('<div class="post-content">', '<div class="post-content metered-paywall">')
+    try:
+        WebFetcher()._handle_html("https://example.com/post", walled.encode("utf-8"))
+        assert False, "Expected PaywallError"
+    except PaywallError:
+        pass
+    print("✓ Content and paywall markers")
+
+
+def test_unparseable_page():
+    """An empty body gives an empty scan instead of an exception."""
+    page = scan_html(b"")
+    assert page.content is None and page.meta == {}
+    print("✓ Empty page")
+
+
+if __name__ == "__main__":
+    test_metadata()
+    test_content_and_paywall()
+    test_unparseable_page()
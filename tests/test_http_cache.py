@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the conditional-request HTTP cache.
+
+Runs offline against a stub server that sends an ETag and answers
+"304 Not Modified" when it gets it back. Checks that a repeated web fetch
+and a repeated arXiv metadata fetch are served from disk, and that the
+cache stays under its size limit.
+
+Usage:
+    python test_http_cache.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.arxiv_fetcher import ArxivFetcher
+from paper_library.http_cache import HttpCache
+from paper_library.web_fetcher import WebFetcher
+
+from stubs import StubServer, make_atom_entry, make_atom_feed
+
+
+ARTICLE = (
+    "<html><head><title>Cached Things</title></head>"
+    "<body><article><h1>Cached Things</h1>"
+    + "<p>A page that hasn't changed needn't be downloaded again. </p>" * 20
+    + "</article></body></html>"
+)
+
+
+def etag_handler(body: str, content_type: str, etag: str = '"v1"'):
+    """Handler that answers 304 when If-None-Match matches, else 200 + ETag."""
+    def handler(request):
+        if request.headers.get("if-none-match") == etag:
+            return 304, {"ETag": etag}, b""
+        return 200, {"Content-Type": content_type, "ETag": etag}, body.encode("utf-8")
+    return handler
+
+
+def test_web_page_revalidated():
+    """Second fetch of an unchanged page gets a 304 and parses the cached copy."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/post", etag_handler(ARTICLE, "text/html; charset=utf-8"))
+        cache = HttpCache(Path(tmp) / "http_cache", max_bytes=10 * 1024 * 1024)
+        fetcher = WebFetcher(Path(tmp), http_cache=cache)
+
+        first, first_content = fetcher.fetch(f"{server.url}/post")
+        second, second_content = fetcher.fetch(f"{server.url}/post")
+
+        assert first.title == second.title == "Cached Things"
+        assert first_content == second_content
+        assert server.requests[1].headers.get("if-none-match") == '"v1"'
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+        print("✓ Unchanged web page served from the HTTP cache")
+
+
+def test_arxiv_metadata_revalidated():
+    """Repeated arXiv API queries are revalidated instead of re-downloaded."""
+    feed = make_atom_feed([make_atom_entry("2312.12345", "Cached Paper", ["Ada Lovelace"], 2023)])
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/api/query", etag_handler(feed, "application/atom+xml"))
+        cache = HttpCache(Path(tmp) / "http_cache", max_bytes=10 * 1024 * 1024)
+        fetcher = ArxivFetcher(Path(tmp), http_cache=cache)
+        fetcher.API_BASE = f"{server.url}/api/query"
+
+        assert fetcher._fetch_metadata("2312.12345").title == "Cached Paper"
+        assert fetcher._fetch_metadata("2312.12345").title == "Cached Paper"
+        assert cache.stats()["hits"] == 1
+        print("✓ arXiv metadata served from the HTTP cache")
+
+
+def test_size_limit_evicts():
+    """Past max_bytes the least recently used entries are deleted."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HttpCache(Path(tmp), max_bytes=2500)
+        headers = {"etag": '"x"', "content-type": "text/html"}
+        for i in range(5):
+            cache.store(f"https://example.com/{i}", headers, b"x" * 1000)
+
+        stats = cache.stats()
+        assert stats["bytes"] <= 2500
+        assert stats["evictions"] == 3
+        assert cache.conditional_headers("https://example.com/4") == {"If-None-Match": '"x"'}
+        assert cache.conditional_headers("https://example.com/0") == {}
+
+        # Responses without validators aren't worth keeping
+        cache.store("https://example.com/plain", {"content-type": "text/html"}, b"x")
+        assert cache.conditional_headers("https://example.com/plain") == {}
+        print("✓ Size limit evicts oldest entries")
+
+
+if __name__ == "__main__":
+    test_web_page_revalidated()
+    test_arxiv_metadata_revalidated()
+    test_size_limit_evicts()
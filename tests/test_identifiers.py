@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for canonical identifiers and duplicate detection.
+
+Runs offline: checks that common spellings of the same arXiv ID, DOI or
+URL map to one key, and that a batch skips repeats before any fetching.
+
+Usage:
+    python test_identifiers.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.arxiv_fetcher import ArxivFetcher
+from paper_library.config import Config
+from paper_library.grobid_processor import GrobidProcessor
+from paper_library.identifiers import IdentifierIndex
+from paper_library.orchestrator import PaperJob, PaperProcessor
+from paper_library.state import StateManager
+
+from stubs import make_tei
+from test_staged_pipeline import FakeStagesProcessor
+
+
+def test_canonical_forms():
+    """Every spelling of a paper gets the same key."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        index = IdentifierIndex(tmp / "aliases.json", ArxivFetcher(tmp))
+
+        for form in [
+            "2309.14316",
+            "arXiv:2309.14316v2",
+            "https://arxiv.org/abs/2309.14316",
+            "https://arxiv.org/pdf/2309.14316v1.pdf",
+            "https://doi.org/10.48550/arXiv.2309.14316",
+        ]:
+            assert index.canonical(form) == "2309.14316", form
+
+        for form in [
+            "10.1162/COLI_a_00123",
+            "doi:10.1162/coli_a_00123",
+            "https://doi.org/10.1162/coli_a_00123",
+            "https://dx.doi.org/10.1162/Coli_A_00123",
+        ]:
+            assert index.canonical(form) == "10.1162/coli_a_00123", form
+
+        assert index.canonical(
+            "HTTPS://Example.com/post/?utm_source=x&id=7&fbclid=abc#section"
+        ) == "https://example.com/post?id=7"
+
+        # Aliases learned from metadata
+        index.add_alias("10.1234/Example", "2309.14316")
+        reloaded = IdentifierIndex(tmp / "aliases.json", ArxivFetcher(tmp))
+        assert reloaded.resolve("https://doi.org/10.1234/example") == "2309.14316"
+        print("✓ Canonical forms and aliases")
+
+
+def test_batch_skips_duplicates():
+    """Repeats in a batch, and earlier spellings in the state, are skipped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp)
+        cfg = Config(anthropic_api_key="test", vault_path=vault)
+        state = StateManager(vault / "_meta" / "processing_state.json")
+        state.mark_processed("2404.05405", "arxiv")
+
+        processor = FakeStagesProcessor(cfg, state)
+        results = processor.process_batch([
+            "https://arxiv.org/abs/2309.14316",
+            "2309.14316",
+            "arXiv:2309.14316v2",
+            "arXiv:2404.05405",
+        ], pipelined=True)
+
+        assert results["success"] == 1
+        assert results["skipped"] == 3
+        # The first spelling is the one that was processed
+        assert state.is_processed("https://arxiv.org/abs/2309.14316")
+        print(f"✓ Results: {results}")
+
+
+def test_reference_doi_not_aliased():
+    """A DOI GROBID found only in a reference doesn't make the cited paper a duplicate."""
+    no_header_doi = make_tei().replace('<idno type="DOI">10.1234/test.2023</idno>', "").replace(
+        '<imprint><date type="published" when="2017"/></imprint>',
+        '<imprint><date type="published" when="2017"/></imprint></monogr>'
+        '<idno type="DOI">10.1000/CITED.PAPER</idno><monogr>'
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp)
+        cfg = Config(anthropic_api_key="test", vault_path=vault)
+        state = StateManager(vault / "_meta" / "processing_state.json")
+        processor = PaperProcessor(cfg, state)
+        grobid = GrobidProcessor("http://localhost:8070")
+
+        metadata, _ = grobid._parse_tei(no_header_doi)
+        assert metadata.doi == "10.1000/CITED.PAPER" and metadata.doi_guessed
+        processor._stage_update_state(PaperJob(identifier="2309.14316", metadata=metadata))
+        assert not state.is_processed(processor.identifiers.resolve("https://doi.org/10.1000/CITED.PAPER"))
+
+        # The arXiv API's DOI wins over the guess
+        base = metadata.model_copy(update={"doi": "10.48550/arXiv.2309.14316", "doi_guessed": False})
+        assert processor._merge_metadata(base, metadata).doi == "10.48550/arXiv.2309.14316"
+
+        # The paper's own DOI, from the header, is still an alias
+        metadata, _ = grobid._parse_tei(make_tei())
+        assert not metadata.doi_guessed
+        processor._stage_update_state(PaperJob(identifier="2404.05405", metadata=metadata))
+        assert processor.identifiers.resolve("doi:10.1234/test.2023") == "2404.05405"
+        print("✓ Only the paper's own DOI is recorded as an alias")
+
+
+def test_aliases_journaled():
+    """add_alias() appends a journal line; loading folds the journal into the JSON file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        index = IdentifierIndex(tmp / "aliases.json", ArxivFetcher(tmp))
+        for i in range(3):
+            index.add_alias(f"10.1234/paper.{i}", f"2401.0000{i}")
+
+        # Nothing rewritten: just one line per alias
+        assert not index.alias_file.exists()
+        assert len(index.journal_file.read_text().splitlines()) == 3
+
+        # A crash mid-append leaves a partial line, which is skipped
+        with open(index.journal_file, "a") as f:
+            f.write('{"alias": "10.1')
+        reloaded = IdentifierIndex(tmp / "aliases.json", ArxivFetcher(tmp))
+        assert reloaded.resolve("doi:10.1234/paper.2") == "2401.00002"
+        assert reloaded.alias_file.exists() and not reloaded.journal_file.exists()
+        assert IdentifierIndex(tmp / "aliases.json", ArxivFetcher(tmp)).resolve("10.1234/paper.0") == "2401.00000"
+        print("✓ Aliases journaled, then compacted")
+
+
+if __name__ == "__main__":
+    test_canonical_forms()
+    test_batch_skips_duplicates()
+    test_reference_doi_not_aliased()
+    test_aliases_journaled()
@@ -93,5 +93,37 @@ def test_markdown():
     return markdown
 
 
+def test_key_papers_ranked():
+    """Key Papers lists the most-mentioned citations first."""
+    citations = [
+        Citation(raw_text=f"Reference {i}", authors=[f"Author{i}, A."], title=f"Paper {i}", year=2000 + i, mention_count=count)
+        for i, count in enumerate([1, 5, 1, 2])
+    ]
+    metadata = PaperMetadata(title="Survey", authors=["Lovelace, Ada"], year=2024, citations=citations)
+    synthesis = Synthesis(
+        summary="A survey.", why_you_cared="Context.", key_concepts=["surveys"],
+        memorable_quote="Read the survey.", model_used="claude-haiku-20250514", cost_usd=0.0
+    )
+    
+    markdown = MarkdownWriter.paper_to_markdown(metadata, synthesis)
+    key_papers = markdown.split("## Cites (Key Papers)")[1].split("##")[0]
+    order = [line for line in key_papers.splitlines() if line.startswith("- ")]
+    
+    assert [line.split("Paper ")[1][0] for line in order] == ["1", "3", "0", "2"]  # Ties keep bibliography order
+    assert order[0].endswith("(cited 5×)")
+    assert "cited" not in order[2]
+    
+    # Unknown counts (references tier, no body) rank like a single mention
+    for citation, count in zip(citations, [None, 5, None, 2]):
+        citation.mention_count = count
+    markdown = MarkdownWriter.paper_to_markdown(metadata, synthesis)
+    key_papers = markdown.split("## Cites (Key Papers)")[1].split("##")[0]
+    order = [line for line in key_papers.splitlines() if line.startswith("- ")]
+    assert [line.split("Paper ")[1][0] for line in order] == ["1", "3", "0", "2"]
+    assert "cited" not in order[2]
+    print("✓ Key papers ranked by mentions")
+
+
 if __name__ == "__main__":
     test_markdown()
+    test_key_papers_ranked()
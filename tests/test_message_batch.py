@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for Message Batches mode (process_batch(message_batch=True)).
+
+Runs offline: fetch and GROBID are faked, and a stub server plays the
+Message Batches API, so we can check that every prompt goes out in one
+batch and that notes are written from the batch results.
+
+Usage:
+    python test_message_batch.py
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.config import Config
+from paper_library.models import PaperMetadata
+from paper_library.orchestrator import PaperProcessor
+from paper_library.state import StateManager
+from paper_library.synthesis_generator import SynthesisGenerator
+
+from stubs import BatchesStub, StubServer
+
+
+class FakeFetchProcessor(PaperProcessor):
+    """PaperProcessor with fetch/GROBID faked; synthesis and writing are real."""
+
+    def _stage_fetch(self, job):
+        if job.identifier == "broken":
+            raise RuntimeError("fetch exploded")
+        job.metadata = PaperMetadata(
+            title=f"Paper {job.identifier}",
+            authors=["Lovelace, Ada"],
+            year=2024,
+            venue="Journal of Tests",
+            arxiv_id=job.identifier,
+        )
+
+    def _stage_grobid(self, job):
+        job.text = f"Full text of {job.identifier}."
+        job.text_source = "grobid"
+
+
+def test_message_batch():
+    """One batch for all prompts; successes written, batch errors recorded."""
+    ids = ["1111.11111", "broken", "2222.22222", "3333.33333", "0000.00000"]
+    batches = BatchesStub(fail_on=["Paper 3333.33333"])
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        batches.install(server)
+
+        vault = Path(tmp)
+        cfg = Config(anthropic_api_key="test", vault_path=vault, synthesis_batch_poll_seconds=0)
+        state = StateManager(vault / "_meta" / "processing_state.json")
+        state.mark_processed("0000.00000", "arxiv")
+
+        processor = FakeFetchProcessor(cfg, state)
+        processor.synthesis_gen = SynthesisGenerator("test", base_url=server.url)
+
+        results = processor.process_batch(ids, message_batch=True)
+
+        assert server.count("POST", "/v1/messages/batches") == 1
+        assert len(batches.submitted) == 3
+        assert server.count("POST", "/v1/messages") == 0
+
+        assert results["success"] == 2
+        assert results["skipped"] == 1
+        assert results["failed"] == 2
+        errors = dict(results["errors"])
+        assert "fetch exploded" in errors["broken"]
+        assert "overloaded" in errors["3333.33333"]
+
+        assert len(list((vault / "Papers").glob("*.md"))) == 2
+        assert state.is_processed("1111.11111") and state.is_processed("2222.22222")
+        assert not state.is_processed("3333.33333")
+        print(f"✓ Results: {results}")
+
+
+def test_interrupted_batch_collected():
+    """A run interrupted while polling leaves the batch ID; the next run collects it."""
+    ids = ["1111.11111", "2222.22222"]
+    batches = BatchesStub()
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        batches.install(server)
+
+        vault = Path(tmp)
+        cfg = Config(anthropic_api_key="test", vault_path=vault, synthesis_batch_poll_seconds=0)
+        state = StateManager(vault / "_meta" / "processing_state.json")
+
+        processor = FakeFetchProcessor(cfg, state)
+        processor.synthesis_gen = SynthesisGenerator("test", base_url=server.url)
+
+        def interrupted(batch_id):
+            raise KeyboardInterrupt  # e.g., Ctrl-C while waiting for the batch
+
+        processor.synthesis_gen.client.messages.batches.retrieve = interrupted
+        try:
+            processor.process_batch(ids, message_batch=True)
+        except KeyboardInterrupt:
+            pass
+        assert json.loads(cfg.synthesis_batch_file.read_text())["batch_id"] == "msgbatch_test"
+
+        processor = FakeFetchProcessor(cfg, state)
+        processor.synthesis_gen = SynthesisGenerator("test", base_url=server.url)
+        results = processor.process_batch(ids, message_batch=True)
+
+        assert results["success"] == 2, results["errors"]
+        assert server.count("POST", "/v1/messages/batches") == 1
+        assert not cfg.synthesis_batch_file.exists()
+        assert len(list((vault / "Papers").glob("*.md"))) == 2
+        print("✓ Interrupted batch collected without resubmitting")
+
+
+def test_batch_cost_discount():
+    """Batch results are priced at half the per-request rate."""
+    generator = SynthesisGenerator("test")
+    full = generator._calculate_cost(1_000_000, 100_000)
+    assert generator._calculate_cost(1_000_000, 100_000, batch=True) == round(full / 2, 4)
+    print("✓ Batch discount applied")
+
+
+if __name__ == "__main__":
+    test_message_batch()
+    test_interrupted_batch_collected()
+    test_batch_cost_discount()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for prompt caching in quick synthesis.
+
+Runs offline against a stub Anthropic API and checks that the fixed
+instructions are sent as a cache-marked system block ahead of the
+per-paper text, and that cache token counts end up in the cost.
+
+Usage:
+    python test_prompt_caching.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.models import PaperMetadata
+from paper_library.synthesis_generator import SynthesisGenerator
+
+from stubs import StubServer, make_message
+
+
+def test_cached_system_block():
+    """Instructions go in a cache_control system block; usage is priced."""
+    metadata = PaperMetadata(
+        title="A Test Paper", authors=["Lovelace, Ada"], year=2023, venue="Journal of Tests"
+    )
+
+    def messages(request):
+        message = make_message(input_tokens=300, output_tokens=200)
+        message["usage"]["cache_read_input_tokens"] = 1000
+        message["usage"]["cache_creation_input_tokens"] = 0
+        return 200, {"Content-Type": "application/json"}, json.dumps(message).encode()
+
+    with StubServer() as server:
+        server.route("POST", "/v1/messages", messages)
+        generator = SynthesisGenerator("test", base_url=server.url)
+        synthesis = generator.generate_quick_synthesis("Some paper text.", metadata)
+
+        body = json.loads(server.requests[0].body)
+
+    system = body["system"]
+    assert system[0]["text"] == SynthesisGenerator.QUICK_SYNTHESIS_INSTRUCTIONS
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+
+    user_prompt = body["messages"][0]["content"]
+    assert "Some paper text." in user_prompt
+    assert "A Test Paper" in user_prompt
+    assert "<memorable_quote>" not in user_prompt  # Format spec stays in the system block
+
+    assert synthesis.cache_read_tokens == 1000
+    assert synthesis.cache_write_tokens == 0
+    # 300 input at $1, 200 output at $5, 1000 cache reads at $0.10 (per MTok)
+    assert synthesis.cost_usd == round((300 * 1.0 + 200 * 5.0 + 1000 * 0.1) / 1_000_000, 4)
+    print(f"✓ Cached system block, cost ${synthesis.cost_usd:.4f}")
+
+
+def test_cache_write_cost():
+    """Cache writes cost 1.25x the input price."""
+    generator = SynthesisGenerator("test")
+    assert generator._calculate_cost(0, 0, cache_write_tokens=1_000_000) == 1.25
+    assert generator._calculate_cost(0, 0, cache_read_tokens=1_000_000) == 0.1
+    print("✓ Cache write/read pricing")
+
+
+if __name__ == "__main__":
+    test_cached_system_block()
+    test_cache_write_cost()
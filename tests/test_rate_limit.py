@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script for per-host rate limiting.
+
+Runs offline: checks token bucket arithmetic with a fake clock, and that
+the requests adapter and httpx transport pace requests and wait out a
+429's Retry-After before retrying (against a local stub server).
+
+Usage:
+    python test_rate_limit.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import requests
+
+from paper_library.rate_limit import (
+    RateLimitedAdapter, RateLimitedTransport, RateLimiter, TokenBucket
+)
+
+from stubs import StubServer, respond
+
+
+def test_token_bucket():
+    """One request per 3 s: waits queue up, idle time refills, pauses add debt."""
+    now = [0.0]
+    bucket = TokenBucket(rate=1 / 3, burst=1, clock=lambda: now[0])
+
+    assert bucket.reserve() == 0
+    assert round(bucket.reserve(), 6) == 3
+    assert round(bucket.reserve(), 6) == 6
+
+    now[0] = 100.0
+    assert bucket.reserve() == 0
+
+    bucket.pause(30)
+    assert round(bucket.reserve(), 6) == 33  # 30 s hold + the next 3 s slot
+    print("✓ Token bucket")
+
+
+def too_many_then_ok(retry_after: str):
+    """Handler answering 429 with Retry-After once, then 200."""
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return 429, {"Retry-After": retry_after}, b"slow down"
+        return 200, {"Content-Type": "text/plain"}, b"ok"
+    return handler, calls
+
+
+def test_adapter_paces_and_retries():
+    """Requests to a paced host are spaced; a 429 waits for Retry-After."""
+    limiter = RateLimiter(default_rate=0)
+    limiter.set_rate("127.0.0.1", rate=20, burst=1)
+    session = requests.Session()
+    session.mount("http://", RateLimitedAdapter(limiter))
+
+    with StubServer() as server:
+        server.route("GET", "/page", respond("ok"))
+        handler, calls = too_many_then_ok("1")
+        server.route("GET", "/busy", handler)
+
+        start = time.monotonic()
+        for _ in range(5):
+            assert session.get(f"{server.url}/page").status_code == 200
+        assert time.monotonic() - start >= 0.19  # 4 gaps of 50 ms
+
+        response = session.get(f"{server.url}/busy")
+        assert response.status_code == 200
+        assert len(calls) == 2
+        assert calls[1] - calls[0] >= 0.95
+    print("✓ Adapter paces requests and honors Retry-After")
+
+
+def test_async_transport_retries():
+    """The httpx transport waits out Retry-After too (loopback hosts included)."""
+    limiter = RateLimiter(default_rate=0)
+
+    async def fetch(url):
+        async with httpx.AsyncClient(transport=RateLimitedTransport(limiter)) as client:
+            return await client.get(url)
+
+    with StubServer() as server:
+        handler, calls = too_many_then_ok("1")
+        server.route("GET", "/busy", handler)
+
+        response = asyncio.run(fetch(f"{server.url}/busy"))
+        assert response.status_code == 200
+        assert len(calls) == 2
+        assert calls[1] - calls[0] >= 0.95
+    print("✓ Async transport honors Retry-After")
+
+
+if __name__ == "__main__":
+    test_token_bucket()
+    test_adapter_paces_and_retries()
+    test_async_transport_retries()
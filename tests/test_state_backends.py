@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the processing state backends (JSON and SQLite).
+
+Runs offline in a temporary directory: both backends must answer the same
+way, and the SQLite backend must import an existing JSON state file once.
+
+Usage:
+    python test_state_backends.py
+"""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.state import SqliteStateBackend, StateManager
+
+
+def test_backends_agree():
+    """Same calls, same answers from JSON and SQLite."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for path in [tmp / "state.json", tmp / "state.db"]:
+            state = StateManager(path)
+            state.mark_processed("2312.12345", "arxiv")
+            state.mark_processed("10.1162/coli_a_00123", "doi")
+            state.mark_processed("2312.12345", "arxiv")  # Upsert, not a duplicate
+            state.mark_processed("/tmp/paper.pdf", "local")
+            state.mark_processed("notes.txt", "unknown")  # Not tracked
+            state.mark_failed("broken", "first error")
+            state.mark_failed("broken", "second error")
+
+            assert state.is_processed("2312.12345")
+            assert state.is_processed("/tmp/paper.pdf")
+            assert not state.is_processed("notes.txt")
+            assert state.get_stats() == {"arxiv": 1, "doi": 1, "web": 0, "local": 1, "failed": 1, "total": 3}
+            assert state.state.failed == {"broken": "second error"}
+            state.close()
+
+            # Reopening sees the same data
+            reopened = StateManager(path)
+            assert reopened.is_processed("10.1162/coli_a_00123")
+            reopened.close()
+            print(f"✓ {path.suffix} backend")
+
+
+def test_sqlite_imports_json_once():
+    """Existing processing_state.json is imported the first time only."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        json_state = StateManager(tmp / "processing_state.json")
+        for i in range(50):
+            json_state.mark_processed(f"2401.{i:05d}", "arxiv")
+        json_state.mark_failed("broken", "boom")
+
+        db = SqliteStateBackend(tmp / "processing_state.db", import_from=json_state.state_file)
+        assert db.get_stats()["arxiv"] == 50
+        assert db.get_stats()["failed"] == 1
+        db.close()
+
+        # Later changes to the JSON file are not re-imported
+        json_state.mark_processed("2401.99999", "arxiv")
+        db = SqliteStateBackend(tmp / "processing_state.db", import_from=json_state.state_file)
+        assert db.import_json(json_state.state_file) == 0
+        assert not db.is_processed("2401.99999")
+        db.close()
+        print("✓ JSON state imported once")
+
+
+def test_sqlite_concurrent_marks():
+    """Worker threads can mark papers at the same time."""
+    with tempfile.TemporaryDirectory() as tmp:
+        state = StateManager(Path(tmp) / "state.db")
+
+        def mark(start):
+            for i in range(start, start + 100):
+                state.mark_processed(f"2401.{i:05d}", "arxiv")
+
+        threads = [threading.Thread(target=mark, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert state.get_stats()["total"] == 400
+        state.close()
+        print("✓ 400 concurrent marks")
+
+
+if __name__ == "__main__":
+    test_backends_agree()
+    test_sqlite_imports_json_once()
+    test_sqlite_concurrent_marks()
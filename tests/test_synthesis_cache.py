@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test script for the synthesis cache.
+
+Runs offline against a stub Anthropic API and checks that an unchanged
+prompt is only sent to Claude once, and that the cached synthesis keeps
+its original cost and token counts.
+
+Usage:
+    python test_synthesis_cache.py
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.models import PaperMetadata
+from paper_library.synthesis_cache import SynthesisCache
+from paper_library.synthesis_generator import SynthesisGenerator
+
+from stubs import StubServer, anthropic_messages_handler
+
+
+def test_cache_skips_claude():
+    """Same text, metadata, prompt version and model: one API call."""
+    metadata = PaperMetadata(
+        title="A Test Paper", authors=["Lovelace, Ada"], year=2023, venue="Journal of Tests"
+    )
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("POST", "/v1/messages", anthropic_messages_handler)
+        cache = SynthesisCache(Path(tmp))
+        generator = SynthesisGenerator("test", base_url=server.url, cache=cache)
+
+        first = generator.generate_quick_synthesis("Some paper text.", metadata)
+        second = generator.generate_quick_synthesis("Some paper text.", metadata)
+
+        assert server.count("POST", "/v1/messages") == 1
+        assert second.summary == first.summary == "A short test summary."
+        assert second.cost_usd == first.cost_usd > 0
+        assert (second.input_tokens, second.output_tokens) == (1000, 200)
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+        # Different text, or a new prompt version, means a new API call
+        generator.generate_quick_synthesis("Other paper text.", metadata)
+        generator.PROMPT_VERSION += 1
+        generator.generate_quick_synthesis("Some paper text.", metadata)
+        assert server.count("POST", "/v1/messages") == 3
+        print(f"✓ Cache stats: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    test_cache_skips_claude()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test script for the GROBID TEI cache.
+
+Runs offline against a stub GROBID server and checks that a PDF is only
+uploaded once, that the key depends on the GROBID version, and that the
+cache evicts least recently used entries when it's over its size limit.
+
+Usage:
+    python test_tei_cache.py
+"""
+
+import gzip
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from paper_library.grobid_client import CircuitBreaker, GrobidClient
+from paper_library.grobid_processor import GrobidProcessor
+from paper_library.tei_cache import TeiCache
+
+from stubs import StubServer, make_pdf, make_tei, respond
+
+
+def test_cache_skips_grobid():
+    """Second parse of the same PDF bytes comes from disk, even under another name."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server.route("GET", "/api/version", respond("0.8.0"))
+        server.route("POST", "/api/processFulltextDocument", respond(make_tei(), "application/xml"))
+
+        pdf = tmp / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        copy = tmp / "same_paper_other_name.pdf"
+        copy.write_bytes(make_pdf())
+
+        cache = TeiCache(tmp / "tei_cache", max_bytes=10 * 1024 * 1024)
+        processor = GrobidProcessor(server.url, cache=cache)
+
+        first, _ = processor.process_with_text(pdf)
+        second, _ = processor.process_with_text(copy)
+
+        assert first.title == second.title == "A Test Paper"
+        assert second.pdf_path == str(copy)
+        assert server.count("POST", "/api/processFulltextDocument") == 1
+        assert server.count("GET", "/api/version") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["entries"] == 1
+
+        # A different GROBID version must not reuse the old TEI
+        upgraded = GrobidProcessor(server.url, cache=cache, grobid_version="0.8.1")
+        upgraded.process_with_text(pdf)
+        assert server.count("POST", "/api/processFulltextDocument") == 2
+        print(f"✓ Cache stats: {cache.stats()}")
+
+
+def test_lru_eviction():
+    """Entries past max_bytes are evicted oldest-use first."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Room for exactly two entries
+        entry_size = len(gzip.compress(b"x" * 100))
+        cache = TeiCache(Path(tmp), max_bytes=entry_size * 2)
+
+        cache.put("a", "x" * 100)
+        cache.put("b", "x" * 100)
+        # Make "a" older, then use it so "b" becomes least recently used
+        os.utime(cache._path("a"), (1, 1))
+        os.utime(cache._path("b"), (2, 2))
+        assert cache.get("a") is not None
+
+        cache.put("c", "x" * 100)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats()["evictions"] == 1
+        print("✓ Least recently used entry evicted")
+
+
+def test_corrupt_entry_refetched():
+    """A truncated cache file is treated as a miss: the PDF goes to GROBID again."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server.route("POST", "/api/processFulltextDocument", respond(make_tei(), "application/xml"))
+
+        pdf = tmp / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        cache = TeiCache(tmp / "tei_cache", max_bytes=10 * 1024 * 1024)
+        processor = GrobidProcessor(server.url, cache=cache, grobid_version="0.8.0")
+        processor.process_with_text(pdf)
+
+        (entry,) = (tmp / "tei_cache").glob(f"*{TeiCache.SUFFIX}")
+        entry.write_bytes(entry.read_bytes()[:-40])
+
+        metadata, _ = processor.process_with_text(pdf)
+        assert metadata.title == "A Test Paper"
+        assert server.count("POST", "/api/processFulltextDocument") == 2
+        print("✓ Corrupt cache entry refetched from GROBID")
+
+
+def test_cache_used_while_grobid_down():
+    """GROBID down, version not pinned: the saved version still finds cached TEI."""
+    health = {"down": False}
+
+    def version(request):
+        if health["down"]:
+            raise ConnectionResetError("GROBID is down")  # Stub drops the connection
+        return 200, {"Content-Type": "text/plain"}, b"0.8.0"
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        server.route("POST", "/api/processFulltextDocument", respond(make_tei(), "application/xml"))
+        server.route("GET", "/api/version", version)
+        pdf = tmp / "paper.pdf"
+        pdf.write_bytes(make_pdf())
+        cache = TeiCache(tmp / "tei_cache", max_bytes=10 * 1024 * 1024)
+
+        GrobidProcessor(server.url, cache=cache).process_with_text(pdf)
+        assert cache.last_version() == "0.8.0"
+
+        health["down"] = True
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=3600)
+        processor = GrobidProcessor(server.url, cache=cache, client=GrobidClient(breaker=breaker))
+        for _ in range(2):
+            metadata, _ = processor.process_with_text(pdf)
+            assert metadata.title == "A Test Paper"
+        # The failed version requests opened the circuit...
+        assert breaker.state == CircuitBreaker.OPEN
+        assert server.count("GET", "/api/version") == 3
+
+        # ...so now nothing is sent at all, and the cache still answers
+        metadata, _ = processor.process_with_text(pdf)
+        assert metadata.title == "A Test Paper"
+        assert server.count("GET", "/api/version") == 3
+        assert server.count("POST", "/api/processFulltextDocument") == 1
+        print("✓ Cached TEI used while GROBID is down")
+
+
+if __name__ == "__main__":
+    test_cache_skips_grobid()
+    test_corrupt_entry_refetched()
+    test_lru_eviction()
+    test_cache_used_while_grobid_down()
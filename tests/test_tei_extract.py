@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for precompiled-XPath TEI extraction (tei_extract.py).
+
+Checks header fields, the whole-document fallbacks the old per-field
+find()s had, and citations built from one <biblStruct> query each.
+
+Usage:
+    python test_tei_extract.py
+"""
+
+import io
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lxml import etree
+
+from paper_library.tei_extract import (
+    count_mentions, extract_citation, extract_header, extract_references, stream_tei
+)
+
+from stubs import make_tei
+
+
+def bibl(inner: str) -> etree._Element:
+    """Parse one <biblStruct> in the TEI namespace."""
+    return etree.fromstring(
+        f'<biblStruct xmlns="http://www.tei-c.org/ns/1.0">{inner}</biblStruct>'
+    )
+
+
+def test_header_fields():
+    """One header query fills every field."""
+    root = etree.fromstring(make_tei(title="Compiled Paths", year=2021).encode())
+    header = extract_header(root)
+
+    assert header.title == "Compiled Paths"
+    assert header.authors[:2] == ["Lovelace, Ada", "Turing, Alan"]
+    assert header.year == 2021
+    assert header.abstract == "This is the abstract."
+    assert header.venue == "Journal of Tests"
+    assert (header.volume, header.issue, header.pages) == ("12", None, "1-10")
+    assert header.doi == "10.1234/test.2021"
+    assert header.doi_in_header
+    print("✓ Header fields extracted")
+
+
+def test_header_fallbacks():
+    """Fields missing from the header come from the rest of the document, as before."""
+    tei = make_tei().replace('<idno type="DOI">10.1234/test.2023</idno>', "")
+    tei = tei.replace("<title level=\"j\">Journal of Tests</title>", "")
+    tei = tei.replace(
+        '<imprint><date type="published" when="2017"/></imprint>',
+        '<imprint><date type="published" when="2017"/></imprint></monogr>'
+        '<idno type="DOI">10.5555/first-reference</idno><monogr>'
+    )
+    header = extract_header(etree.fromstring(tei.encode()))
+
+    assert header.doi == "10.5555/first-reference"
+    assert not header.doi_in_header  # A reference's DOI, not the paper's
+    assert stream_tei(io.BytesIO(tei.encode())).header == header
+    assert header.venue == "Advances in Neural Information Processing Systems"
+    assert header.year == 2023  # Still the header's own date
+    print("✓ Missing header fields fall back to the whole document")
+
+
+def test_references():
+    """References come from the first <listBibl> in <back>."""
+    root = etree.fromstring(make_tei().encode())
+    citations = [extract_citation(b) for b in extract_references(root)]
+
+    assert [c.title for c in citations] == [
+        "Attention is all you need",
+        "Deep residual learning for image recognition",
+    ]
+    assert citations[0].authors == ["Vaswani A."]
+    assert citations[0].venue == "Advances in Neural Information Processing Systems"
+    assert citations[1].venue is None
+    assert [c.year for c in citations] == [2017, 2016]
+    print("✓ References extracted in order")
+
+
+def test_citation_fields():
+    """Every citation field from one <biblStruct> query."""
+    citation = extract_citation(bibl("""
+        <analytic>
+          <author><persName><forename>Geoffrey</forename><forename>E</forename><surname>Hinton</surname></persName></author>
+          <author><persName><surname>Bengio</surname></persName></author>
+          <author><orgName>Some Lab</orgName></author>
+        </analytic>
+        <monogr>
+          <title level="m">The Book of Learning</title>
+          <title level="j">Neural Computation</title>
+          <imprint>
+            <biblScope unit="volume"> 18 </biblScope>
+            <biblScope unit="issue">7</biblScope>
+            <biblScope unit="page">1527-1554</biblScope>
+            <date type="published">2006</date>
+          </imprint>
+        </monogr>
+        <idno type="DOI"> 10.1162/neco.2006.18.7.1527 </idno>
+    """))
+
+    assert citation.authors == ["Hinton G. E.", "Bengio"]
+    assert citation.title == "The Book of Learning"  # No level="a" title: book title
+    assert citation.venue == "Neural Computation"
+    assert (citation.volume, citation.issue, citation.pages) == ("18", "7", "1527-1554")
+    assert citation.year == 2006
+    assert citation.doi == "10.1162/neco.2006.18.7.1527"
+    assert citation.raw_text.startswith("GeoffreyEHinton Bengio Some Lab")
+    print("✓ Citation fields extracted")
+
+
+def test_short_reference_skipped():
+    """Reference text under 10 characters isn't a citation."""
+    assert extract_citation(bibl("<monogr><title level='m'>Ibid.</title></monogr>")) is None
+    print("✓ Too-short reference skipped")
+
+
+def test_mention_counts():
+    """In-text <ref type="bibr"> mentions counted per reference, tree and stream alike."""
+    body = """
+    <div><p>As shown <ref type="bibr" target="#b1">[2]</ref> and again
+      <ref type="bibr" target="#b1">[2]</ref>, see also <ref type="bibr" target="#b0 #b1">[1, 2]</ref>.</p>
+      <p>Unlinked <ref type="bibr">[9]</ref>, a figure <ref type="figure" target="#fig_0">1</ref>.</p></div>
+    """
+    tei = make_tei(body=body).encode()
+    root = etree.fromstring(tei)
+
+    mentions = count_mentions(root.find("{http://www.tei-c.org/ns/1.0}text/{http://www.tei-c.org/ns/1.0}body"))
+    assert mentions == {"b0": 1, "b1": 3}
+
+    citations = [extract_citation(b, mentions) for b in extract_references(root)]
+    assert [c.mention_count for c in citations] == [1, 3]
+    assert [c.mention_count for c in stream_tei(io.BytesIO(tei)).citations] == [1, 3]
+
+    # No body (header/references tiers): counts are unknown, not 1
+    assert [extract_citation(b).mention_count for b in extract_references(root)] == [None, None]
+    no_body = make_tei().encode()
+    assert [c.mention_count for c in stream_tei(io.BytesIO(no_body)).citations] == [None, None]
+    print("✓ Mentions counted per reference")
+
+
+if __name__ == "__main__":
+    test_header_fields()
+    test_header_fallbacks()
+    test_references()
+    test_citation_fields()
+    test_short_reference_skipped()
+    test_mention_counts()
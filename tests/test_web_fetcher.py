@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test script for WebFetcher's single streaming GET.
+
+Runs offline against a stub web server and checks that each URL costs one
+GET (no HEAD), that PDFs are recognized by their first bytes and streamed
+into the vault, and that the PDF size cap leaves nothing behind.
+
+Usage:
+    python test_web_fetcher.py
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+
+from paper_library.web_fetcher import WebFetchError, WebFetcher
+
+from stubs import StubServer, make_pdf, respond
+
+
+ARTICLE = (
+    "<html><head><title>Streaming Things</title>"
+    '<meta property="og:title" content="Streaming Things"></head>'
+    "<body><nav>Home</nav><article><h1>Streaming Things</h1>"
+    + "<p>Reading a response as it arrives keeps memory flat. </p>" * 20
+    + "</article></body></html>"
+)
+
+
+def test_one_get_per_url():
+    """HTML and a PDF sent as octet-stream: one GET each, PDF saved to the vault."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/post", respond(ARTICLE, "text/html; charset=utf-8"))
+        server.route("GET", "/files/paper", respond(make_pdf(), "application/octet-stream"))
+        fetcher = WebFetcher(Path(tmp))
+
+        metadata, content = fetcher.fetch(f"{server.url}/post")
+        assert metadata.title == "Streaming Things"
+        assert "keeps memory flat" in content
+
+        metadata, content = fetcher.fetch(f"{server.url}/files/paper")
+        assert metadata.source == "pdf_from_web"
+        saved = list((Path(tmp) / "PDFs").glob("*.pdf"))
+        assert len(saved) == 1 and saved[0].read_bytes() == make_pdf()
+
+        assert server.count("HEAD", "/post") == server.count("HEAD", "/files/paper") == 0
+        assert server.count("GET", "/post") == server.count("GET", "/files/paper") == 1
+        print("✓ One GET per URL")
+
+
+def test_pdf_size_cap():
+    """A PDF over MAX_PDF_BYTES is rejected and no partial file is kept."""
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/big.pdf", respond(make_pdf(), "application/pdf"))
+        fetcher = WebFetcher(Path(tmp))
+        fetcher.MAX_PDF_BYTES = 100
+
+        try:
+            fetcher.fetch(f"{server.url}/big.pdf")
+            assert False, "Expected WebFetchError"
+        except WebFetchError as e:
+            assert "large" in str(e)
+        assert list((Path(tmp) / "PDFs").iterdir()) == []
+        print("✓ PDF size cap")
+
+
+def test_async_streams_pdf():
+    """fetch_async() sniffs and streams PDFs the same way."""
+    async def fetch(fetcher, url):
+        async with httpx.AsyncClient() as client:
+            return await fetcher.fetch_async(url, client)
+
+    with StubServer() as server, tempfile.TemporaryDirectory() as tmp:
+        server.route("GET", "/download", respond(make_pdf(), "application/octet-stream"))
+        fetcher = WebFetcher(Path(tmp))
+
+        metadata, _ = asyncio.run(fetch(fetcher, f"{server.url}/download"))
+        assert metadata.source == "pdf_from_web"
+        assert len(list((Path(tmp) / "PDFs").glob("*.pdf"))) == 1
+        print("✓ Async PDF streamed to vault")
+
+
+if __name__ == "__main__":
+    test_one_get_per_url()
+    test_pdf_size_cap()
+    test_async_streams_pdf()